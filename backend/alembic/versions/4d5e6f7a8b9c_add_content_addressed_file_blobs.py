@@ -0,0 +1,81 @@
+"""add content-addressed file blobs
+
+Revision ID: 4d5e6f7a8b9c
+Revises: 3c4d5e6f7a8b
+Create Date: 2026-10-18 10:00:00.000000
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "4d5e6f7a8b9c"
+down_revision: Union[str, None] = "3c4d5e6f7a8b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+file_blob_encoding_enum = postgresql.ENUM(
+    "full",
+    "text_delta",
+    name="fileblobencoding",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    file_blob_encoding_enum.create(bind, checkfirst=True)
+
+    op.create_table(
+        "file_blobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("storage_key", sa.String(length=2048), nullable=False),
+        sa.Column("encoding", file_blob_encoding_enum, nullable=False, server_default="full"),
+        sa.Column("base_blob_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("delta_depth", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("byte_size", sa.Integer(), nullable=False),
+        sa.Column("stored_size", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["base_blob_id"], ["file_blobs.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("project_id", "sha256", name="uq_file_blobs_project_sha256"),
+        sa.UniqueConstraint("storage_key", name="uq_file_blobs_storage_key"),
+    )
+    op.create_index("ix_file_blobs_project_id", "file_blobs", ["project_id"])
+    op.create_index("ix_file_blobs_base_blob_id", "file_blobs", ["base_blob_id"])
+
+    op.add_column("file_entry_revisions", sa.Column("blob_id", postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        "fk_file_entry_revisions_blob_id",
+        "file_entry_revisions",
+        "file_blobs",
+        ["blob_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index("ix_file_entry_revisions_blob_id", "file_entry_revisions", ["blob_id"])
+    op.drop_constraint("uq_file_entry_revisions_storage_key", "file_entry_revisions", type_="unique")
+    op.create_index("ix_file_entry_revisions_storage_key", "file_entry_revisions", ["storage_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_file_entry_revisions_storage_key", table_name="file_entry_revisions")
+    op.create_unique_constraint("uq_file_entry_revisions_storage_key", "file_entry_revisions", ["storage_key"])
+    op.drop_index("ix_file_entry_revisions_blob_id", table_name="file_entry_revisions")
+    op.drop_constraint("fk_file_entry_revisions_blob_id", "file_entry_revisions", type_="foreignkey")
+    op.drop_column("file_entry_revisions", "blob_id")
+
+    op.drop_index("ix_file_blobs_base_blob_id", table_name="file_blobs")
+    op.drop_index("ix_file_blobs_project_id", table_name="file_blobs")
+    op.drop_table("file_blobs")
+    file_blob_encoding_enum.drop(op.get_bind(), checkfirst=True)
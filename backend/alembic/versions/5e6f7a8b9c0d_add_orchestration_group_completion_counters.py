@@ -0,0 +1,60 @@
+"""add orchestration group completion counters
+
+Revision ID: 5e6f7a8b9c0d
+Revises: 4d5e6f7a8b9c
+Create Date: 2026-10-18 12:00:00.000000
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "5e6f7a8b9c0d"
+down_revision: Union[str, None] = "4d5e6f7a8b9c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("orchestration_groups", sa.Column("member_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("orchestration_groups", sa.Column("success_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("orchestration_groups", sa.Column("failure_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("orchestration_group_members", sa.Column("counted_at", sa.DateTime(timezone=True), nullable=True))
+
+    # Backfill counters for groups that already exist from their member rows.
+    op.execute(
+        """
+        UPDATE orchestration_groups AS g
+        SET member_count = counts.total,
+            success_count = counts.succeeded,
+            failure_count = counts.failed
+        FROM (
+            SELECT
+                group_id,
+                COUNT(*) AS total,
+                COUNT(*) FILTER (WHERE status = 'completed') AS succeeded,
+                COUNT(*) FILTER (WHERE status IN ('failed', 'cancelled', 'missing')) AS failed
+            FROM orchestration_group_members
+            GROUP BY group_id
+        ) AS counts
+        WHERE counts.group_id = g.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE orchestration_group_members
+        SET counted_at = updated_at
+        WHERE status IN ('completed', 'failed', 'cancelled', 'missing')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("orchestration_group_members", "counted_at")
+    op.drop_column("orchestration_groups", "failure_count")
+    op.drop_column("orchestration_groups", "success_count")
+    op.drop_column("orchestration_groups", "member_count")
@@ -0,0 +1,66 @@
+"""add stats rollups
+
+Revision ID: 7a8b9c0d1e2f
+Revises: 6f7a8b9c0d1e
+Create Date: 2026-10-18 17:00:00.000000
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "7a8b9c0d1e2f"
+down_revision: Union[str, None] = "6f7a8b9c0d1e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    granularity = postgresql.ENUM("hour", "day", name="statsrollupgranularity", create_type=False)
+    granularity.create(op.get_bind(), checkfirst=True)
+    op.create_table(
+        "stats_rollups",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("granularity", granularity, nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("subject_kind", sa.String(length=32), nullable=False),
+        sa.Column("subject_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("metric", sa.String(length=64), nullable=False),
+        sa.Column("dimension", sa.String(length=160), nullable=False, server_default=""),
+        sa.Column("value", sa.Float(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_stats_rollups_org_granularity_bucket",
+        "stats_rollups",
+        ["organization_id", "granularity", "bucket_start"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_stats_rollups_granularity_bucket",
+        "stats_rollups",
+        ["granularity", "bucket_start"],
+        unique=False,
+    )
+    op.create_table(
+        "stats_rollup_watermarks",
+        sa.Column("rollup_name", sa.String(length=64), nullable=False),
+        sa.Column("rolled_up_to", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("rollup_name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("stats_rollup_watermarks")
+    op.drop_index("ix_stats_rollups_granularity_bucket", table_name="stats_rollups")
+    op.drop_index("ix_stats_rollups_org_granularity_bucket", table_name="stats_rollups")
+    op.drop_table("stats_rollups")
+    postgresql.ENUM(name="statsrollupgranularity").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,34 @@
+"""index published app visitors
+
+Revision ID: 8b9c0d1e2f3a
+Revises: 7a8b9c0d1e2f
+Create Date: 2026-10-19 10:00:00.000000
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "8b9c0d1e2f3a"
+down_revision: Union[str, None] = "7a8b9c0d1e2f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_published_app_analytics_app_occurred_visitor",
+        "published_app_analytics_events",
+        ["published_app_id", "occurred_at", "visitor_key"],
+        unique=False,
+        postgresql_include=["surface"],
+    )
+    # Unique visitors are no longer rolled up (one row per visitor per bucket).
+    op.execute("DELETE FROM stats_rollups WHERE metric = 'app_visitors'")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_published_app_analytics_app_occurred_visitor", table_name="published_app_analytics_events")
@@ -0,0 +1,40 @@
+"""track stats rollup coverage and run updates
+
+Revision ID: 9c0d1e2f3a4b
+Revises: 8b9c0d1e2f3a
+Create Date: 2026-10-19 14:00:00.000000
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "9c0d1e2f3a4b"
+down_revision: Union[str, None] = "8b9c0d1e2f3a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing watermarks have no recorded coverage start; readers ignore them until
+    # the next refresh rebuilds the backfill window and records it.
+    op.add_column("stats_rollup_watermarks", sa.Column("rolled_up_from", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        "stats_rollup_watermarks",
+        sa.Column("hourly_rolled_up_from", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Added without a default so existing rows are not rewritten; new rows get one.
+    op.add_column("agent_runs", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+    op.alter_column("agent_runs", "updated_at", server_default=sa.text("now()"))
+    op.create_index("ix_agent_runs_updated_at", "agent_runs", ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_agent_runs_updated_at", table_name="agent_runs")
+    op.drop_column("agent_runs", "updated_at")
+    op.drop_column("stats_rollup_watermarks", "hourly_rolled_up_from")
+    op.drop_column("stats_rollup_watermarks", "rolled_up_from")
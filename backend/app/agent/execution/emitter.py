@@ -7,8 +7,11 @@ All methods are non-blocking and swallow errors.
 """
 import asyncio
 import logging
+import time
 from typing import Any, Optional
 
+from app.core.env_loader import env_float, env_int
+
 from .types import ExecutionEvent, EventVisibility
 
 logger = logging.getLogger(__name__)
@@ -20,6 +23,7 @@ import contextvars
 # This allows node executors to access the emitter without partial plumbing through LangGraph config
 active_emitter = contextvars.ContextVar("active_emitter", default=None)
 
+
 class EventEmitter:
     """
     Abstraction for emitting execution events from node executors.
@@ -29,6 +33,11 @@ class EventEmitter:
     - All emit_* methods never throw (errors are logged).
     - All emit_* methods never await I/O.
     - All emit_* methods never affect control flow.
+
+    Consecutive tokens from the same node are coalesced into one token event,
+    flushed once the window elapses or the buffer reaches the size limit, and
+    always before any other event so ordering is preserved. A zero window and
+    zero size limit emit every token as its own event.
     """
     
     def __init__(
@@ -37,23 +46,71 @@ class EventEmitter:
         run_id: str,
         mode: str = "debug",
         orchestration_surface: str = "option_a_graphspec_v2",
+        token_coalesce_window_ms: Optional[float] = None,
+        token_coalesce_max_chars: Optional[int] = None,
     ):
         self._queue = queue
         self._run_id = run_id
         self._mode = mode
         self._orchestration_surface = orchestration_surface
+        window_ms = (
+            token_coalesce_window_ms
+            if token_coalesce_window_ms is not None
+            else env_float("AGENT_STREAM_TOKEN_COALESCE_WINDOW_MS", 25.0)
+        )
+        self._token_window_seconds = max(0.0, float(window_ms)) / 1000.0
+        self._token_max_chars = max(
+            0,
+            token_coalesce_max_chars
+            if token_coalesce_max_chars is not None
+            else env_int("AGENT_STREAM_TOKEN_COALESCE_MAX_CHARS", 512),
+        )
+        self._pending_tokens: list[str] = []
+        self._pending_token_chars = 0
+        self._pending_token_key: Optional[tuple[str, Optional[str]]] = None
+        self._pending_token_started_at: Optional[float] = None
+        self._pending_token_timer: Optional[asyncio.TimerHandle] = None
 
     def emit_token(self, content: str, node_id: str, span_id: Optional[str] = None) -> None:
-        """Emit a token (streaming content) event."""
-        self._emit(ExecutionEvent(
-            event="token",
-            data={"content": content},
-            run_id=self._run_id,
-            span_id=span_id,
-            name=node_id,
-            visibility=EventVisibility.CLIENT_SAFE,
-            metadata=self._metadata()
-        ))
+        """Emit a token (streaming content) event, coalescing bursts from the same node."""
+        if not self._token_window_seconds and not self._token_max_chars:
+            self._emit(self._token_event(content, node_id, span_id))
+            return
+        try:
+            key = (node_id, span_id)
+            if self._pending_token_key is not None and self._pending_token_key != key:
+                self.flush()
+            self._pending_token_key = key
+            self._pending_tokens.append(content)
+            self._pending_token_chars += len(content)
+            if self._token_max_chars and self._pending_token_chars >= self._token_max_chars:
+                self.flush()
+                return
+            if not self._token_window_seconds:
+                return
+            now = time.monotonic()
+            if self._pending_token_started_at is None:
+                self._pending_token_started_at = now
+                self._schedule_token_flush()
+            elif now - self._pending_token_started_at >= self._token_window_seconds:
+                self.flush()
+        except Exception as e:
+            logger.error(f"[EventEmitter] Failed to buffer token: {e}")
+
+    def flush(self) -> None:
+        """Emit any buffered tokens as a single token event."""
+        if self._pending_token_timer is not None:
+            self._pending_token_timer.cancel()
+            self._pending_token_timer = None
+        key = self._pending_token_key
+        content = "".join(self._pending_tokens)
+        self._pending_tokens = []
+        self._pending_token_chars = 0
+        self._pending_token_key = None
+        self._pending_token_started_at = None
+        if key is None:
+            return
+        self._put(self._token_event(content, key[0], key[1]))
     
     def emit_node_start(self, node_id: str, name: str, node_type: str, input_data: Any = None) -> None:
         """Emit a node start event."""
@@ -327,7 +384,30 @@ class EventEmitter:
             metadata.update(extra)
         return metadata
 
+    def _token_event(self, content: str, node_id: str, span_id: Optional[str]) -> ExecutionEvent:
+        return ExecutionEvent(
+            event="token",
+            data={"content": content},
+            run_id=self._run_id,
+            span_id=span_id,
+            name=node_id,
+            visibility=EventVisibility.CLIENT_SAFE,
+            metadata=self._metadata()
+        )
+
+    def _schedule_token_flush(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._pending_token_timer = loop.call_later(self._token_window_seconds, self.flush)
+
     def _emit(self, event: ExecutionEvent) -> None:
+        if self._pending_token_key is not None:
+            self.flush()
+        self._put(event)
+
+    def _put(self, event: ExecutionEvent) -> None:
         """
         Fire-and-forget event emission.
         Uses put_nowait to avoid blocking. If queue is full, logs warning.
@@ -9,7 +9,7 @@ from typing import Dict, Any, Optional, AsyncGenerator, Callable
 from dataclasses import dataclass
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import case, func, select, update
 
 from app.db.postgres.models.agents import Agent, AgentRun, RunStatus
 from app.agent.graph.compiler import AgentCompiler
@@ -30,6 +30,7 @@ from app.agent.execution.run_task_registry import (
     unregister_run_task,
 )
 from app.agent.cel_engine import evaluate_template
+from app.agent.executors.tool_catalog import get_run_tool_catalog_cache
 from app.agent.execution.trace_recorder import ExecutionTraceRecorder
 from app.db.postgres.models.agent_threads import AgentThreadSurface, AgentThreadTurnStatus
 from app.services.prompt_reference_resolver import PromptReferenceResolver
@@ -80,6 +81,20 @@ class RequestedModelTarget:
     ref: str | None
 
 
+@dataclass(frozen=True)
+class RunStartRequest:
+    agent_id: UUID
+    input_params: dict[str, Any]
+    user_id: UUID | None = None
+    root_run_id: UUID | None = None
+    parent_run_id: UUID | None = None
+    parent_node_id: str | None = None
+    depth: int = 0
+    spawn_key: str | None = None
+    orchestration_group_id: UUID | None = None
+    thread_id: UUID | None = None
+
+
 @dataclass(frozen=True)
 class SyncRunExecutionResult:
     run_id: UUID
@@ -627,6 +642,47 @@ class AgentExecutorService:
 
         execute_agent_run_task.apply_async(args=[str(run_id)], queue="agent_runs")
 
+    async def _enqueue_background_runs(self, run_ids: list[UUID]) -> None:
+        from celery import group
+
+        from app.workers.tasks import execute_agent_run_task
+        from app.workers.celery_app import celery_app
+
+        if not run_ids:
+            return
+        await self.db.execute(
+            update(AgentRun)
+            .where(AgentRun.id.in_(run_ids))
+            .values(
+                dispatch_count=func.coalesce(AgentRun.dispatch_count, 0) + 1,
+                last_dispatched_at=datetime.now(timezone.utc),
+                execution_owner_kind=case(
+                    (func.coalesce(func.trim(AgentRun.execution_owner_kind), "") == "", "celery"),
+                    else_=AgentRun.execution_owner_kind,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+
+        if bool(getattr(celery_app.conf, "task_always_eager", False)):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+            else:
+                for run_id in run_ids:
+                    asyncio.create_task(
+                        self.__class__.execute_worker_run_with_new_session(
+                            run_id=run_id,
+                            owner_id=f"eager-{uuid4()}",
+                        ),
+                        name=f"agent-run-eager-dispatch:{run_id}",
+                    )
+                return
+
+        group(execute_agent_run_task.s(str(run_id)) for run_id in run_ids).apply_async(queue="agent_runs")
+
     @classmethod
     async def _claim_run_for_worker(
         cls,
@@ -824,7 +880,127 @@ class AgentExecutorService:
 
         await self._assert_parent_run_accepting_children(parent_run_id)
 
-        # Create Run record
+        run = await self._build_run_record(
+            agent,
+            input_params=input_params,
+            user_id=user_id,
+            mode=mode,
+            root_run_id=root_run_id,
+            parent_run_id=parent_run_id,
+            parent_node_id=parent_node_id,
+            depth=depth,
+            spawn_key=spawn_key,
+            orchestration_group_id=orchestration_group_id,
+            thread_id=thread_id,
+        )
+        self.db.add(run)
+        await self.db.flush()
+
+        await self.db.commit()
+        await self.db.refresh(run)
+
+        # Root runs self-reference for efficient run-tree queries.
+        if run.root_run_id is None:
+            run.root_run_id = run.id
+            await self.db.commit()
+            await self.db.refresh(run)
+        record_run_lineage(run.id, root_run_id=run.root_run_id or run.id, parent_run_id=run.parent_run_id)
+
+        if background:
+            await self._enqueue_background_run(run.id)
+        
+        return run.id
+
+    async def start_runs(
+        self,
+        requests: list[RunStartRequest],
+        *,
+        background: bool = True,
+        mode: ExecutionMode = ExecutionMode.DEBUG,
+    ) -> list[UUID]:
+        """
+        Starts a batch of runs with the same per-run preparation as `start_run`,
+        committing once and handing every run to the workers through one dispatch.
+        """
+        runs = await self.prepare_runs(requests, mode=mode)
+        await self.db.commit()
+        await self.dispatch_prepared_runs(runs, background=background)
+        return [run.id for run in runs]
+
+    async def prepare_runs(
+        self,
+        requests: list[RunStartRequest],
+        *,
+        mode: ExecutionMode = ExecutionMode.DEBUG,
+    ) -> list[AgentRun]:
+        """
+        Builds and flushes queued run records for a batch without committing, so callers
+        can write companion rows in the same transaction before `dispatch_prepared_runs`.
+        """
+        if not requests:
+            return []
+        for parent_run_id, root_run_id in {(item.parent_run_id, item.root_run_id) for item in requests}:
+            if is_run_cancel_requested(run_id=parent_run_id, root_run_id=root_run_id):
+                raise RuntimeError("Cannot start run under a cancelled run tree")
+
+        agent_ids = {item.agent_id for item in requests}
+        agents_res = await self.db.execute(select(Agent).where(Agent.id.in_(agent_ids)))
+        agents = {agent.id: agent for agent in agents_res.scalars().all()}
+        for item in requests:
+            if item.agent_id not in agents:
+                raise ValueError(f"Agent {item.agent_id} not found")
+
+        for parent_run_id in {item.parent_run_id for item in requests}:
+            await self._assert_parent_run_accepting_children(parent_run_id)
+
+        runs: list[AgentRun] = []
+        for item in requests:
+            run = await self._build_run_record(
+                agents[item.agent_id],
+                input_params=item.input_params,
+                user_id=item.user_id,
+                mode=mode,
+                root_run_id=item.root_run_id,
+                parent_run_id=item.parent_run_id,
+                parent_node_id=item.parent_node_id,
+                depth=item.depth,
+                spawn_key=item.spawn_key,
+                orchestration_group_id=item.orchestration_group_id,
+                thread_id=item.thread_id,
+            )
+            # Ids are client-side, so root runs can self-reference without a second write.
+            if run.root_run_id is None:
+                run.root_run_id = run.id
+            runs.append(run)
+
+        self.db.add_all(runs)
+        await self.db.flush()
+        return runs
+
+    async def dispatch_prepared_runs(self, runs: list[AgentRun], *, background: bool = True) -> None:
+        run_ids = [run.id for run in runs]
+        for run in runs:
+            record_run_lineage(run.id, root_run_id=run.root_run_id or run.id, parent_run_id=run.parent_run_id)
+        if background:
+            await self._enqueue_background_runs(run_ids)
+
+    async def _build_run_record(
+        self,
+        agent: Agent,
+        *,
+        input_params: Dict[str, Any],
+        user_id: Optional[UUID],
+        mode: ExecutionMode,
+        root_run_id: Optional[UUID],
+        parent_run_id: Optional[UUID],
+        parent_node_id: Optional[str],
+        depth: int,
+        spawn_key: Optional[str],
+        orchestration_group_id: Optional[UUID],
+        thread_id: Optional[UUID],
+    ) -> AgentRun:
+        """Resolves thread, attachments, policy, quota and context window for a new, unsaved run."""
+        agent_id = agent.id
         runtime_context = {}
         if isinstance(input_params, dict):
             runtime_context = dict(input_params.get("context") or {})
@@ -1098,23 +1274,7 @@ class AgentExecutorService:
             started_at=None,
             completed_at=None
         )
-        self.db.add(run)
-        await self.db.flush()
-
-        await self.db.commit()
-        await self.db.refresh(run)
-
-        # Root runs self-reference for efficient run-tree queries.
-        if run.root_run_id is None:
-            run.root_run_id = run.id
-            await self.db.commit()
-            await self.db.refresh(run)
-        record_run_lineage(run.id, root_run_id=run.root_run_id or run.id, parent_run_id=run.parent_run_id)
-
-        if background:
-            await self._enqueue_background_run(run.id)
-        
-        return run.id
+        return run
 
     async def _execute_with_new_session(self, run_id: UUID, resume_payload: Optional[Dict[str, Any]] = None, mode: ExecutionMode = ExecutionMode.DEBUG):
         """Wrapper to provide a fresh session for inline execution."""
@@ -1751,6 +1911,12 @@ class AgentExecutorService:
                         metadata=thread_metadata,
                     )
                 await db.commit()
+                await self._notify_orchestration_join(
+                    db,
+                    run_id=run.id,
+                    orchestration_group_id=run.orchestration_group_id,
+                    final_status=final_status,
+                )
                 yield run_status_event
 
             except asyncio.CancelledError:
@@ -1784,6 +1950,7 @@ class AgentExecutorService:
         finally:
             await self.trace_recorder.drain()
             unregister_run_task(run_id)
+            get_run_tool_catalog_cache().discard_run(run_id)
 
     async def _mark_run_failed(self, run_id: UUID, error: Exception, *, mode: ExecutionMode | None = None) -> None:
         error_text = str(error)
@@ -1856,9 +2023,41 @@ class AgentExecutorService:
                         metadata=merged_metadata,
                     )
                 await err_db.commit()
+                await self._notify_orchestration_join(
+                    err_db,
+                    run_id=err_run.id,
+                    orchestration_group_id=err_run.orchestration_group_id,
+                    final_status=RunStatus.failed,
+                )
         except Exception as se:
             logger.error(f"Failed to save error status for {run_id}: {se}")
 
+    @staticmethod
+    async def _notify_orchestration_join(
+        db: AsyncSession,
+        *,
+        run_id: UUID,
+        orchestration_group_id: UUID | None,
+        final_status: RunStatus,
+    ) -> None:
+        """Count a finished child against its group, or resume a just-paused orchestrator whose join is ready."""
+        if final_status != RunStatus.paused and orchestration_group_id is None:
+            return
+        from app.services.orchestration_kernel_service import OrchestrationKernelService
+
+        try:
+            kernel = OrchestrationKernelService(db)
+            if final_status == RunStatus.paused:
+                await kernel.resume_ready_joins(orchestrator_run_id=run_id)
+            else:
+                await kernel.record_child_terminal(
+                    run_id=run_id,
+                    orchestration_group_id=orchestration_group_id,
+                    status=final_status,
+                )
+        except Exception as exc:
+            logger.warning(f"Failed to update orchestration join for run {run_id}: {exc}")
+
     def _serialize_state(self, state: Any) -> Any:
         """Helper to make state JSON serializable (handling LangChain messages)."""
         if isinstance(state, dict):
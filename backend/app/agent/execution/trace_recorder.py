@@ -1,10 +1,8 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
-import threading
 from datetime import datetime, timezone
 from typing import Any, Callable
 from uuid import UUID, uuid4
@@ -14,11 +12,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.agent.execution.types import ExecutionEvent
 from app.db.postgres.models.agents import AgentTrace
+from app.services.trace_sink import get_trace_sink
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_TRACE_FILE = "/tmp/talmudpedia-agent-execution-events.jsonl"
-_FILE_WRITE_LOCK = threading.Lock()
 
 
 def execution_trace_file_logging_enabled() -> bool:
@@ -203,16 +201,7 @@ class ExecutionTraceRecorder:
     def _mirror_to_file(self, payload: dict[str, Any]) -> None:
         if not execution_trace_file_logging_enabled():
             return
-        try:
-            rendered = json.dumps(payload, sort_keys=True, default=str)
-        except Exception:
-            rendered = str(payload)
-        try:
-            with _FILE_WRITE_LOCK:
-                with open(execution_trace_file_path(), "a", encoding="utf-8") as handle:
-                    handle.write(rendered + "\n")
-        except Exception:
-            pass
+        get_trace_sink().emit(execution_trace_file_path(), payload)
 
     @staticmethod
     def _parse_timestamp(raw: Any) -> datetime:
@@ -2,6 +2,10 @@ from enum import Enum
 from typing import Any, Dict, Optional, List
 from pydantic import BaseModel
 
+# Resume payload key that carries a satisfied orchestration join back into a parked run.
+ORCHESTRATION_JOIN_RESUME_KEY = "orchestration_join"
+
+
 class ExecutionMode(str, Enum):
     DEBUG = "debug"         # Playground/Builder: All events, full fidelity
     PRODUCTION = "production" # End-User: Client-safe events only, specific taxonomy
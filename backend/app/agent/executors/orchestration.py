@@ -3,6 +3,8 @@ import json
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
+from langgraph.types import interrupt
+
 from app.agent.executors.base import BaseNodeExecutor
 from app.services.orchestration_kernel_service import OrchestrationKernelService
 from app.services.orchestration_policy_service import (
@@ -408,14 +410,20 @@ class JoinNodeExecutor(_BaseOrchestrationExecutor):
         if group_id is None:
             raise ValueError("join requires orchestration_group_id")
 
+        # "suspend" parks the run until child completions satisfy the join;
+        # "poll" routes to `pending` and leaves re-driving to the graph.
+        suspend = (self._as_text(config.get("wait_mode")) or "poll") == "suspend"
         result = await kernel.join(
             caller_run_id=caller_run_id,
             orchestration_group_id=group_id,
             mode=self._as_text(config.get("mode")),
             quorum_threshold=config.get("quorum_threshold"),
             timeout_s=config.get("timeout_s"),
+            park=suspend,
         )
         self._emit_join_decision(context=context, node_id=node_id, result=result)
+        if result.get("parked"):
+            interrupt({"orchestration_group_id": str(group_id), "reason": "join_waiting"})
         cancellation = result.get("cancellation_propagated")
         if isinstance(cancellation, dict) and int(cancellation.get("count") or 0) > 0:
             self._emit_cancellation_propagation(
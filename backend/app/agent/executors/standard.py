@@ -29,6 +29,7 @@ from app.agent.execution.tool_input_contracts import (
     sanitize_schema_dict,
 )
 from app.agent.executors.base import BaseNodeExecutor, ValidationResult
+from app.agent.executors.tool_catalog import ResolvedToolCatalog, get_run_tool_catalog_cache
 from app.agent.registry import AgentOperatorRegistry, AgentOperatorSpec, AgentStateField, AgentExecutorRegistry
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, BaseMessage, ToolMessage
 from langchain_core.tools import BaseTool
@@ -999,6 +1000,52 @@ class ReasoningNodeExecutor(BaseNodeExecutor):
 
         return registry_tool_cls()
 
+    async def _resolve_tool_catalog(self, tool_ids: List[Any], context: Dict[str, Any] | None) -> ResolvedToolCatalog:
+        """Load registry tools and mounted MCP tools once per run; later nodes in the run reuse the result."""
+        context = context or {}
+        runtime_user_id = context.get("initiator_user_id") or context.get("user_id")
+        cache = get_run_tool_catalog_cache()
+        cache_key = cache.build_key(
+            run_id=context.get("run_id"),
+            organization_id=self.organization_id,
+            agent_id=context.get("agent_id"),
+            user_id=runtime_user_id,
+            tool_ids=tool_ids,
+        )
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        tool_records = await self._load_tool_records(tool_ids)
+        mcp_tools: list[Any] = []
+        mcp_load_failed = False
+        if self.db is not None and self.organization_id is not None:
+            agent_id_raw = context.get("agent_id")
+            if agent_id_raw:
+                try:
+                    agent_uuid = UUID(str(agent_id_raw))
+                    runtime_user_uuid = UUID(str(runtime_user_id)) if runtime_user_id else None
+                    mcp_tools = await McpRuntimeService(self.db, self.organization_id).list_agent_tools(
+                        agent_id=agent_uuid,
+                        user_id=runtime_user_uuid,
+                    )
+                except Exception as exc:
+                    mcp_load_failed = True
+                    logger.warning(f"Failed to load MCP mounted tools: {exc}")
+        if mcp_tools:
+            tool_records.extend(mcp_tools)
+        catalog = ResolvedToolCatalog(
+            tool_records=tuple(tool_records),
+            mcp_tool_ids=tuple(str(t.id) for t in mcp_tools if getattr(t, "id", None)),
+            langchain_tools=tuple(self._build_langchain_tool(t) for t in tool_records),
+            accounting_payloads=tuple(_serialize_tool_for_accounting(t) for t in tool_records),
+        )
+        # Do not pin a transient MCP lookup failure for the rest of the run.
+        if cache_key is not None and not mcp_load_failed:
+            cache.put(cache_key, catalog)
+        return catalog
+
     async def _load_tool_records(self, tool_ids: List[Any]) -> List[Any]:
         if not self.db or not tool_ids:
             return []
@@ -1551,23 +1598,8 @@ class ReasoningNodeExecutor(BaseNodeExecutor):
                     "tool_execution_mode": tool_execution_mode,
                 })
 
-            tool_records = await self._load_tool_records(tools)
-            mcp_tools: list[Any] = []
-            if self.db is not None and self.organization_id is not None:
-                agent_id_raw = (context or {}).get("agent_id")
-                if agent_id_raw:
-                    try:
-                        agent_uuid = UUID(str(agent_id_raw))
-                        runtime_user_id = (context or {}).get("initiator_user_id") or (context or {}).get("user_id")
-                        runtime_user_uuid = UUID(str(runtime_user_id)) if runtime_user_id else None
-                        mcp_tools = await McpRuntimeService(self.db, self.organization_id).list_agent_tools(
-                            agent_id=agent_uuid,
-                            user_id=runtime_user_uuid,
-                        )
-                    except Exception as exc:
-                        logger.warning(f"Failed to load MCP mounted tools: {exc}")
-            if mcp_tools:
-                tool_records.extend(mcp_tools)
+            catalog = await self._resolve_tool_catalog(tools, context)
+            tool_records = list(catalog.tool_records)
             tool_records_by_id = {str(t.id): t for t in tool_records if getattr(t, "id", None)}
             tool_records_by_name = {
                 str(
@@ -1577,9 +1609,9 @@ class ReasoningNodeExecutor(BaseNodeExecutor):
                 for t in tool_records
                 if getattr(t, "builtin_key", None) or getattr(t, "name", None)
             }
-            effective_tools = list(tools or []) + [str(t.id) for t in mcp_tools if getattr(t, "id", None)]
-            langchain_tools = [self._build_langchain_tool(t) for t in tool_records] if tool_records else []
-            tool_accounting_payloads = [_serialize_tool_for_accounting(t) for t in tool_records]
+            effective_tools = list(tools or []) + list(catalog.mcp_tool_ids)
+            langchain_tools = list(catalog.langchain_tools)
+            tool_accounting_payloads = [dict(payload) for payload in catalog.accounting_payloads]
 
             conversation_messages = list(formatted_messages)
             emitted_messages: List[BaseMessage] = []
@@ -2635,6 +2667,7 @@ def register_standard_operators():
                 },
                 "quorum_threshold": {"type": "number"},
                 "timeout_s": {"type": "number"},
+                "wait_mode": {"type": "string", "enum": ["poll", "suspend"], "default": "poll"},
             },
         },
         ui={
@@ -2663,6 +2696,19 @@ def register_standard_operators():
                 },
                 {"name": "quorum_threshold", "label": "Quorum Threshold", "fieldType": "number", "required": False, "visibility": "simple", "group": "routing", "dependsOn": {"field": "mode", "equals": "quorum"}},
                 {"name": "timeout_s", "label": "Timeout (seconds)", "fieldType": "number", "required": False, "visibility": "advanced", "group": "reliability"},
+                {
+                    "name": "wait_mode",
+                    "label": "Wait Mode",
+                    "fieldType": "select",
+                    "required": False,
+                    "default": "poll",
+                    "visibility": "advanced",
+                    "group": "reliability",
+                    "options": [
+                        {"value": "poll", "label": "Poll (route pending)"},
+                        {"value": "suspend", "label": "Suspend until children finish"},
+                    ],
+                },
             ],
         },
     ))
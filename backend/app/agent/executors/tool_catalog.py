@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from app.core.env_loader import env_float, env_int
+
+
+@dataclass(frozen=True)
+class ResolvedToolCatalog:
+    """Tools bound by one agent node: registry records plus mounted MCP tools, ready to bind."""
+
+    tool_records: tuple[Any, ...]
+    mcp_tool_ids: tuple[str, ...]
+    langchain_tools: tuple[Any, ...]
+    accounting_payloads: tuple[dict[str, Any], ...]
+
+
+@dataclass
+class _CatalogEntry:
+    run_id: str
+    catalog: ResolvedToolCatalog
+    expires_at: float
+
+
+class RunToolCatalogCache:
+    """Per-run cache of resolved tool catalogs, shared by every agent node in the run.
+
+    Entries are keyed by run id plus everything that shapes the catalog (organization,
+    agent, runtime user, configured tool ids), dropped when the run finishes, and
+    bounded by size and TTL in case a run never reports completion.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int | None = None,
+        ttl_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max(1, max_entries or env_int("AGENT_RUN_TOOL_CATALOG_CACHE_MAX_ENTRIES", 512))
+        self._ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else env_float("AGENT_RUN_TOOL_CATALOG_CACHE_TTL_SECONDS", 1800.0)
+        )
+        self._clock = clock
+        self._entries: OrderedDict[tuple[Hashable, ...], _CatalogEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build_key(
+        *,
+        run_id: Any,
+        organization_id: Any,
+        agent_id: Any,
+        user_id: Any,
+        tool_ids: list[Any] | None,
+    ) -> tuple[Hashable, ...] | None:
+        if run_id in (None, ""):
+            return None
+        return (
+            str(run_id),
+            str(organization_id or ""),
+            str(agent_id or ""),
+            str(user_id or ""),
+            tuple(str(tool_id) for tool_id in (tool_ids or [])),
+        )
+
+    def get(self, key: tuple[Hashable, ...]) -> ResolvedToolCatalog | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return entry.catalog
+
+    def put(self, key: tuple[Hashable, ...], catalog: ResolvedToolCatalog) -> None:
+        with self._lock:
+            self._entries[key] = _CatalogEntry(
+                run_id=str(key[0]),
+                catalog=catalog,
+                expires_at=self._clock() + self._ttl_seconds,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def discard_run(self, run_id: Any) -> None:
+        run_key = str(run_id)
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.run_id == run_key]:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_RUN_TOOL_CATALOG_CACHE = RunToolCatalogCache()
+
+
+def get_run_tool_catalog_cache() -> RunToolCatalogCache:
+    return _RUN_TOOL_CATALOG_CACHE
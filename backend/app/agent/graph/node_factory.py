@@ -3,6 +3,7 @@ from typing import Any, Dict, Optional
 from uuid import UUID
 
 from langchain_core.messages import AIMessage
+from langgraph.errors import GraphBubbleUp
 from sqlalchemy import select
 
 from app.agent.execution.run_task_registry import is_run_cancel_requested
@@ -147,6 +148,9 @@ def build_node_fn(node: GraphIRNode, organization_id: Optional[UUID], db: Any):
                         )
 
             return state_update
+        except GraphBubbleUp:
+            # interrupt() pauses the run; it is not a node failure.
+            raise
         except Exception as e:
             logger.error(f"Error executing node {node.id} ({node.type}): {e}")
             if emitter:
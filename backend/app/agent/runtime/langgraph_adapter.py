@@ -8,7 +8,7 @@ from langgraph.types import Command
 
 from app.agent.core.state import AgentState
 from app.agent.execution.emitter import EventEmitter, active_emitter
-from app.agent.execution.types import ExecutionEvent
+from app.agent.execution.types import ORCHESTRATION_JOIN_RESUME_KEY, ExecutionEvent
 from app.agent.graph.ir import GraphIR, RoutingMap
 from app.agent.graph.node_factory import build_node_fn
 from app.agent.runtime.base import RuntimeAdapter, RuntimeExecutable, RuntimeState
@@ -108,6 +108,7 @@ class LangGraphAdapter(RuntimeAdapter):
             except Exception as e:
                 execution_error = e
             finally:
+                emitter.flush()
                 execution_done.set()
 
         graph_task = asyncio.create_task(run_graph())
@@ -140,6 +141,9 @@ class LangGraphAdapter(RuntimeAdapter):
 
     def _prepare_input(self, input_data: Dict[str, Any], config: Dict[str, Any]) -> Any:
         resume_payload = config.get("resume_payload")
+        if isinstance(resume_payload, dict) and ORCHESTRATION_JOIN_RESUME_KEY in resume_payload:
+            # Parked joins pause through interrupt(), so they resume with a value.
+            return Command(resume=resume_payload[ORCHESTRATION_JOIN_RESUME_KEY])
         if resume_payload:
             # For interrupt_before-based pauses, we need to update state on resume.
             # `resume` is used with interrupt() calls, but we do not use interrupt(),
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import importlib
+import logging
+import os
+import threading
+import time
+from typing import Iterable
+
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+def lazy_routers_enabled() -> bool:
+    raw = os.getenv("API_LAZY_ROUTERS", "1")
+    return str(raw).strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class LazyRouterSpec:
+    module: str
+    prefix: str = ""
+    tags: tuple[str, ...] = ()
+    attr: str = "router"
+
+
+class LazyRouterLoader:
+    """
+    Imports router modules and includes them on the app the first time a request needs them.
+
+    Routers are included in declaration order, so route precedence is the same as with
+    eager registration. Exempt paths (health probes) are answered without loading.
+
+    Imports run on a worker thread (`warm_up` starts them from the lifespan); requests
+    that arrive first wait on that shared load instead of importing on the event loop.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        specs: Iterable[LazyRouterSpec],
+        *,
+        exempt_paths: Iterable[str] = ("/health",),
+    ) -> None:
+        self._app = app
+        self._specs = tuple(specs)
+        self._exempt_paths = frozenset(exempt_paths)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._warmup: asyncio.Task | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def needs_load(self, scope: Scope) -> bool:
+        if self._loaded or scope["type"] not in {"http", "websocket"}:
+            return False
+        return scope.get("path") not in self._exempt_paths
+
+    def _import_routers(self) -> list:
+        return [getattr(importlib.import_module(spec.module), spec.attr) for spec in self._specs]
+
+    def _mount(self, routers: list, started: float) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            for spec, router in zip(self._specs, routers):
+                options: dict = {}
+                if spec.prefix:
+                    options["prefix"] = spec.prefix
+                if spec.tags:
+                    options["tags"] = list(spec.tags)
+                self._app.include_router(router, **options)
+            # Drop any schema generated before the routers were mounted.
+            self._app.openapi_schema = None
+            self._loaded = True
+        logger.info("Loaded %d API routers in %.2fs", len(self._specs), time.perf_counter() - started)
+
+    def load(self) -> None:
+        if self._loaded:
+            return
+        started = time.perf_counter()
+        self._mount(self._import_routers(), started)
+
+    async def _load_in_thread(self) -> None:
+        started = time.perf_counter()
+        routers = await asyncio.to_thread(self._import_routers)
+        # Routes are mounted on the loop thread, between requests.
+        self._mount(routers, started)
+
+    def warm_up(self) -> asyncio.Task | None:
+        """Start importing the routers in the background; the returned task is shared with requests."""
+        if self._loaded:
+            return None
+        loop = asyncio.get_running_loop()
+        task = self._warmup
+        failed = task is not None and task.done() and (task.cancelled() or task.exception() is not None)
+        if task is None or failed or task.get_loop() is not loop:
+            task = loop.create_task(self._load_in_thread())
+            task.add_done_callback(_log_warmup_failure)
+            self._warmup = task
+        return task
+
+    async def aload(self) -> None:
+        task = self.warm_up()
+        if task is not None:
+            await asyncio.shield(task)
+
+
+def _log_warmup_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Loading API routers failed", exc_info=task.exception())
+
+
+class LazyRouterMiddleware:
+    def __init__(self, app: ASGIApp, loader: LazyRouterLoader) -> None:
+        self.app = app
+        self.loader = loader
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.loader.needs_load(scope):
+            await self.loader.aload()
+        await self.app(scope, receive, send)
+
+
+def include_routers(
+    app: FastAPI,
+    specs: Iterable[LazyRouterSpec],
+    *,
+    lazy: bool | None = None,
+) -> LazyRouterLoader:
+    """Registers routers eagerly, or defers them to a background load when lazy loading is on."""
+    loader = LazyRouterLoader(app, specs)
+    if lazy is None:
+        lazy = lazy_routers_enabled()
+    if lazy:
+        app.add_middleware(LazyRouterMiddleware, loader=loader)
+    else:
+        loader.load()
+    return loader
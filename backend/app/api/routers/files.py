@@ -5,8 +5,8 @@ from typing import Any
 from urllib.parse import quote
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -18,6 +18,12 @@ from app.services.file_spaces.service import (
     FileSpaceService,
     FileSpaceValidationError,
 )
+from app.services.storage_streaming import (
+    STREAMING_RESPONSE_THRESHOLD_BYTES,
+    ByteRangeNotSatisfiable,
+    aiter_in_thread,
+    parse_byte_range,
+)
 
 
 router = APIRouter(prefix="/admin/files", tags=["files"])
@@ -335,16 +341,28 @@ async def upload_entry(
 ):
     organization_id, project_id = _required_context(principal)
     try:
-        payload = await file.read()
-        entry, revision = await FileSpaceService(db).upload_file(
-            organization_id=organization_id,
-            project_id=project_id,
-            space_id=space_id,
-            path=path,
-            payload=payload,
-            content_type=file.content_type,
-            user_id=_principal_user_id(principal),
-        )
+        service = FileSpaceService(db)
+        if file.size is not None and file.size > STREAMING_RESPONSE_THRESHOLD_BYTES:
+            entry, revision = await service.upload_file_stream(
+                organization_id=organization_id,
+                project_id=project_id,
+                space_id=space_id,
+                path=path,
+                source=file.file,
+                content_type=file.content_type,
+                user_id=_principal_user_id(principal),
+            )
+        else:
+            payload = await file.read()
+            entry, revision = await service.upload_file(
+                organization_id=organization_id,
+                project_id=project_id,
+                space_id=space_id,
+                path=path,
+                payload=payload,
+                content_type=file.content_type,
+                user_id=_principal_user_id(principal),
+            )
         await db.commit()
         await db.refresh(entry)
         await db.refresh(revision)
@@ -359,6 +377,7 @@ async def upload_entry(
 
 @router.get("/{space_id}/entries/download")
 async def download_entry(
+    request: Request,
     space_id: UUID,
     path: str = Query(...),
     db: AsyncSession = Depends(get_db),
@@ -367,14 +386,35 @@ async def download_entry(
 ):
     organization_id, project_id = _required_context(principal)
     try:
-        entry, revision, payload = await FileSpaceService(db).read_file_bytes(
+        service = FileSpaceService(db)
+        entry, revision = await service.read_file_revision(
             organization_id=organization_id,
             project_id=project_id,
             space_id=space_id,
             path=path,
         )
-        headers = {"Content-Disposition": _build_download_content_disposition(entry.path)}
-        return Response(content=payload, media_type=revision.mime_type, headers=headers)
+        total_size = int(revision.byte_size or 0)
+        try:
+            byte_range = parse_byte_range(request.headers.get("range"), total_size)
+        except ByteRangeNotSatisfiable:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{total_size}"})
+        headers = {
+            "Content-Disposition": _build_download_content_disposition(entry.path),
+            "Accept-Ranges": "bytes",
+        }
+        if byte_range is None and total_size <= STREAMING_RESPONSE_THRESHOLD_BYTES:
+            payload = await service.read_revision_bytes(revision)
+            return Response(content=payload, media_type=revision.mime_type, headers=headers)
+        stream = await service.open_revision_stream(revision, byte_range=byte_range)
+        headers["Content-Length"] = str(stream.content_length)
+        if byte_range is not None:
+            headers["Content-Range"] = byte_range.content_range(total_size)
+        return StreamingResponse(
+            aiter_in_thread(stream.iter_chunks),
+            status_code=206 if byte_range is not None else 200,
+            media_type=revision.mime_type,
+            headers=headers,
+        )
     except Exception as exc:
         raise _handle_service_error(exc) from exc
 
@@ -6,7 +6,7 @@ import os
 import re
 import secrets
 import time
-from typing import Any
+from typing import Any, AsyncIterator
 from urllib.parse import urlencode, urlparse, urlunparse
 from uuid import UUID
 
@@ -14,7 +14,8 @@ import httpx
 import websockets
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from starlette.requests import ClientDisconnect
 from starlette.websockets import WebSocketState
 from sqlalchemy import select
@@ -32,6 +33,11 @@ from app.services.published_app_auth_service import (
 )
 from app.services.published_app_draft_dev_runtime import PublishedAppDraftDevRuntimeService
 from app.services.published_app_draft_dev_runtime_client import PublishedAppDraftDevRuntimeClient
+from app.services.published_app_preview_proxy_pool import (
+    get_preview_latency_histograms,
+    get_preview_target_cache,
+    get_preview_upstream_client_pool,
+)
 from app.services.published_app_sandbox_backend_factory import load_published_app_sandbox_backend_config
 from app.services.published_app_sprite_proxy_tunnel import get_sprite_proxy_tunnel_manager
 from app.services.runtime_attachment_service import RuntimeAttachmentOwner
@@ -79,6 +85,7 @@ router = APIRouter(tags=["published-apps-builder-preview-proxy"])
 _PREVIEW_WEBSOCKET_OPEN_TIMEOUT_SECONDS = 20.0
 _PREVIEW_WEBSOCKET_CONNECT_ATTEMPTS = 3
 _PREVIEW_HTTP_RETRY_DELAYS_SECONDS = (0.0, 0.35, 0.75, 1.5)
+_PREVIEW_BUFFERED_REQUEST_BODY_MAX_BYTES = 1024 * 1024
 _HTML_URL_ATTR_PATTERN = re.compile(r"""(?P<prefix>\b(?:src|href)=["'])(?P<path>/[^"'?#]+(?:[?#][^"']*)?)""")
 _HTML_RELATIVE_ASSET_URL_ATTR_PATTERN = re.compile(
     r"""(?P<prefix>\b(?:src|href)=["'])(?P<path>(?:\./)?assets/[^"'?#]+(?:[?#][^"']*)?)"""
@@ -831,7 +838,13 @@ async def _refresh_preview_target(
     session: PublishedAppDraftDevSession,
     current_target: dict[str, str],
 ) -> dict[str, str] | None:
-    _ = db
+    # The cached session snapshot may predate a sandbox restart; re-read the stored metadata.
+    get_preview_target_cache().invalidate_session(str(session.id))
+    await get_preview_upstream_client_pool().discard(str(current_target.get("upstream_base_url") or ""))
+    try:
+        session = await _load_session(db=db, session_id=str(session.id))
+    except HTTPException:
+        return None
     refreshed_target = await _resolve_preview_target(session)
     if refreshed_target is None or refreshed_target == current_target:
         return None
@@ -853,44 +866,34 @@ async def _request_preview_upstream(
     request: Request,
     upstream_url: str,
     target: dict[str, str],
-    body: bytes,
+    body: bytes | AsyncIterator[bytes],
 ) -> httpx.Response:
+    """Send the request over the pooled client for the target and return the still-open upstream response.
+
+    Callers own the returned response and must read or close it.
+    """
     started_at = time.perf_counter()
-    async with httpx.AsyncClient(follow_redirects=False, timeout=60.0) as client:
-        upstream = None
-        last_error: httpx.HTTPError | None = None
-        attempt_count = 0
-        for delay in _PREVIEW_HTTP_RETRY_DELAYS_SECONDS:
-            attempt_count += 1
-            if delay > 0:
-                await asyncio.sleep(delay)
-            attempt_started_at = time.perf_counter()
-            try:
-                candidate = await client.request(
+    client = await get_preview_upstream_client_pool().get_client(str(target.get("upstream_base_url") or ""))
+    upstream = None
+    last_error: httpx.HTTPError | None = None
+    attempt_count = 0
+    for delay in _PREVIEW_HTTP_RETRY_DELAYS_SECONDS:
+        attempt_count += 1
+        if delay > 0:
+            await asyncio.sleep(delay)
+        attempt_started_at = time.perf_counter()
+        try:
+            candidate = await client.send(
+                client.build_request(
                     request.method,
                     upstream_url,
                     headers=_proxy_headers(request, target=target),
                     content=body if body else None,
-                )
-            except httpx.HTTPError as exc:
-                last_error = exc
-                apps_builder_trace(
-                    "preview.proxy.upstream_attempt",
-                    domain="preview.proxy",
-                    method=request.method,
-                    upstream_url=upstream_url,
-                    attempt=attempt_count,
-                    delay_ms=int(delay * 1000),
-                    duration_ms=int((time.perf_counter() - attempt_started_at) * 1000),
-                    error=str(exc),
-                    error_type=exc.__class__.__name__,
-                    retryable=_should_retry_preview_request(method=request.method, error=exc),
-                )
-                if _is_refreshable_preview_error(exc):
-                    raise
-                if _should_retry_preview_request(method=request.method, error=exc):
-                    continue
-                raise
+                ),
+                stream=True,
+            )
+        except httpx.HTTPError as exc:
+            last_error = exc
             apps_builder_trace(
                 "preview.proxy.upstream_attempt",
                 domain="preview.proxy",
@@ -899,32 +902,103 @@ async def _request_preview_upstream(
                 attempt=attempt_count,
                 delay_ms=int(delay * 1000),
                 duration_ms=int((time.perf_counter() - attempt_started_at) * 1000),
-                status_code=candidate.status_code,
-                retryable=_should_retry_preview_request(method=request.method, status_code=candidate.status_code),
+                error=str(exc),
+                error_type=exc.__class__.__name__,
+                retryable=_should_retry_preview_request(method=request.method, error=exc),
             )
-            if _should_retry_preview_request(method=request.method, status_code=candidate.status_code):
-                upstream = candidate
+            if _is_refreshable_preview_error(exc):
+                raise
+            if _should_retry_preview_request(method=request.method, error=exc):
                 continue
-            upstream = candidate
+            raise
+        if upstream is not None:
+            await upstream.aclose()
+        upstream = candidate
+        if not _should_retry_preview_request(method=request.method, status_code=candidate.status_code):
             break
-        if upstream is None:
-            if last_error is not None:
-                raise last_error
-            raise HTTPException(status_code=502, detail="Draft dev preview upstream request failed")
-        probe = _preview_body_probe(upstream.content, content_type=str(upstream.headers.get("content-type") or ""))
+        # Successful first attempts are covered by preview.proxy.completed; only trace the retries.
+        apps_builder_trace(
+            "preview.proxy.upstream_attempt",
+            domain="preview.proxy",
+            method=request.method,
+            upstream_url=upstream_url,
+            attempt=attempt_count,
+            delay_ms=int(delay * 1000),
+            duration_ms=int((time.perf_counter() - attempt_started_at) * 1000),
+            status_code=candidate.status_code,
+            retryable=True,
+        )
+    if upstream is None:
+        if last_error is not None:
+            raise last_error
+        raise HTTPException(status_code=502, detail="Draft dev preview upstream request failed")
+    if attempt_count > 1:
+        apps_builder_trace(
+            "preview.proxy.upstream_response",
+            domain="preview.proxy",
+            method=request.method,
+            upstream_url=upstream_url,
+            attempt_count=attempt_count,
+            total_duration_ms=int((time.perf_counter() - started_at) * 1000),
+            status_code=upstream.status_code,
+            content_security_policy=str(upstream.headers.get("content-security-policy") or ""),
+            x_frame_options=str(upstream.headers.get("x-frame-options") or ""),
+        )
+    return upstream
+
+
+def _should_stream_preview_request_body(request: Request) -> bool:
+    content_length = request.headers.get("content-length")
+    if content_length is None:
+        return "chunked" in str(request.headers.get("transfer-encoding") or "").lower()
+    try:
+        return int(content_length) > _PREVIEW_BUFFERED_REQUEST_BODY_MAX_BYTES
+    except ValueError:
+        return False
+
+
+def _stream_preview_request_body(request: Request, *, state: dict[str, bool]) -> AsyncIterator[bytes]:
+    async def _iterate() -> AsyncIterator[bytes]:
+        # Once the body starts flowing upstream it cannot be replayed for a refresh retry.
+        state["started"] = True
+        async for chunk in request.stream():
+            if chunk:
+                yield chunk
+
+    return _iterate()
+
+
+def _preview_client_disconnected(
+    *,
+    session: PublishedAppDraftDevSession,
+    request: Request,
+    path: str,
+    request_kind: str,
+) -> Response:
     apps_builder_trace(
-        "preview.proxy.upstream_response",
+        "preview.proxy.client_disconnected",
         domain="preview.proxy",
+        session_id=str(session.id),
+        app_id=str(session.published_app_id),
+        revision_id=str(session.revision_id or ""),
+        sandbox_id=str(getattr(session, "sandbox_id", "") or ""),
         method=request.method,
-        upstream_url=upstream_url,
-        attempt_count=attempt_count,
-        total_duration_ms=int((time.perf_counter() - started_at) * 1000),
-        status_code=upstream.status_code,
-        content_security_policy=str(upstream.headers.get("content-security-policy") or ""),
-        x_frame_options=str(upstream.headers.get("x-frame-options") or ""),
-        **probe,
+        path=path,
+        request_kind=request_kind,
     )
-    return upstream
+    return Response(status_code=499)
+
+
+def _observe_preview_latency(*, request_kind: str, duration_ms: float) -> None:
+    histograms = get_preview_latency_histograms()
+    histograms.observe(request_kind, duration_ms)
+    report = histograms.take_due_report()
+    if report is not None:
+        apps_builder_trace(
+            "preview.proxy.latency_histogram",
+            domain="preview.proxy",
+            histograms=report,
+        )
 
 
 def _preview_rewrite_summary(
@@ -1886,78 +1960,90 @@ async def proxy_builder_preview(
 ) -> Response:
     proxy_started_at = time.perf_counter()
     requested_session_id = str(session_id)
-    session = await _load_builder_preview_session_from_query_token(
-        db=db,
-        requested_session_id=requested_session_id,
-        request=request,
-    )
-    token, payload, token_source = _resolve_builder_preview_query_token_for_session(session=session, request=request)
-    await _touch_preview_session_activity(
-        db=db,
-        session=session,
-        reason="http_request",
-        throttle_seconds=30,
-    )
-    target = await _resolve_preview_target(session)
     request_kind = _preview_request_kind(path)
+    target_cache = get_preview_target_cache()
+    query_token = str(request.query_params.get("runtime_token") or "").strip()
+    cached_target = target_cache.get(query_token) if query_token else None
+    if cached_target is not None:
+        # A page load fans out into many asset requests with the same token; skip the
+        # session lookup, token validation and activity touch for the short cache TTL.
+        session = cached_target.session
+        target = cached_target.target
+        token, token_source = query_token, "query"
+    else:
+        session = await _load_builder_preview_session_from_query_token(
+            db=db,
+            requested_session_id=requested_session_id,
+            request=request,
+        )
+        token, payload, token_source = _resolve_builder_preview_query_token_for_session(session=session, request=request)
+        await _touch_preview_session_activity(
+            db=db,
+            session=session,
+            reason="http_request",
+            throttle_seconds=30,
+        )
+        target = await _resolve_preview_target(session)
+        target_cache.put(token, session=session, payload=payload, target=target)
     upstream_url = _upstream_url(
         path=path,
         query_params=request.query_params,
         target=target,
     )
-    backend_metadata = dict(session.backend_metadata or {}) if isinstance(session.backend_metadata, dict) else {}
-    live_preview = (
-        dict(backend_metadata.get("live_preview") or {})
-        if isinstance(backend_metadata.get("live_preview"), dict)
-        else {}
-    )
-    requested_build_id = str(request.query_params.get("__build") or "").strip() or None
-    apps_builder_trace(
-        "preview.proxy.requested",
-        domain="preview.proxy",
-        requested_session_id=requested_session_id,
-        session_id=str(session.id),
-        app_id=str(session.published_app_id),
-        revision_id=str(session.revision_id or ""),
-        sandbox_id=str(getattr(session, "sandbox_id", "") or ""),
-        method=request.method,
-        path=path,
-        request_kind=request_kind,
-        token_source=token_source,
-        query_keys=sorted(str(key) for key in request.query_params.keys()),
-        preview_route=str(request.query_params.get("preview_route") or ""),
-        requested_build_id=requested_build_id,
-        live_preview_current_build_id=str(live_preview.get("current_build_id") or "").strip() or None,
-        live_preview_last_successful_build_id=str(live_preview.get("last_successful_build_id") or "").strip() or None,
-        requested_build_matches_last_successful=(
-            requested_build_id == (str(live_preview.get("last_successful_build_id") or "").strip() or None)
-            if requested_build_id is not None
-            else None
-        ),
-        upstream_url=upstream_url,
-        upstream_base_url=str(target.get("upstream_base_url") or ""),
-        target_base_path=str(target.get("base_path") or ""),
-        target_upstream_path=str(target.get("upstream_path") or ""),
-    )
-    apps_builder_trace(
-        "preview.proxy.target_resolved",
-        domain="preview.proxy",
-        requested_session_id=requested_session_id,
-        session_id=str(session.id),
-        app_id=str(session.published_app_id),
-        revision_id=str(session.revision_id or ""),
-        sandbox_id=str(getattr(session, "sandbox_id", "") or ""),
-        path=path,
-        request_kind=request_kind,
-        resolver_kind=str(target.get("resolver_kind") or ""),
-        provider=str(target.get("provider") or ""),
-        upstream_base_url=str(target.get("upstream_base_url") or ""),
-        target_base_path=str(target.get("base_path") or ""),
-        target_upstream_path=str(target.get("upstream_path") or ""),
-        has_auth_token=bool(str(target.get("auth_token") or "").strip()),
-        auth_header_name=str(target.get("auth_header_name") or ""),
-        has_extra_headers=bool(str(target.get("extra_headers") or "").strip() not in {"", "{}"}),
-    )
+    if cached_target is None:
+        backend_metadata = dict(session.backend_metadata or {}) if isinstance(session.backend_metadata, dict) else {}
+        live_preview = (
+            dict(backend_metadata.get("live_preview") or {})
+            if isinstance(backend_metadata.get("live_preview"), dict)
+            else {}
+        )
+        requested_build_id = str(request.query_params.get("__build") or "").strip() or None
+        apps_builder_trace(
+            "preview.proxy.requested",
+            domain="preview.proxy",
+            requested_session_id=requested_session_id,
+            session_id=str(session.id),
+            app_id=str(session.published_app_id),
+            revision_id=str(session.revision_id or ""),
+            sandbox_id=str(getattr(session, "sandbox_id", "") or ""),
+            method=request.method,
+            path=path,
+            request_kind=request_kind,
+            token_source=token_source,
+            query_keys=sorted(str(key) for key in request.query_params.keys()),
+            preview_route=str(request.query_params.get("preview_route") or ""),
+            requested_build_id=requested_build_id,
+            live_preview_current_build_id=str(live_preview.get("current_build_id") or "").strip() or None,
+            live_preview_last_successful_build_id=str(live_preview.get("last_successful_build_id") or "").strip() or None,
+            requested_build_matches_last_successful=(
+                requested_build_id == (str(live_preview.get("last_successful_build_id") or "").strip() or None)
+                if requested_build_id is not None
+                else None
+            ),
+            upstream_url=upstream_url,
+            upstream_base_url=str(target.get("upstream_base_url") or ""),
+            target_base_path=str(target.get("base_path") or ""),
+            target_upstream_path=str(target.get("upstream_path") or ""),
+        )
+        apps_builder_trace(
+            "preview.proxy.target_resolved",
+            domain="preview.proxy",
+            requested_session_id=requested_session_id,
+            session_id=str(session.id),
+            app_id=str(session.published_app_id),
+            revision_id=str(session.revision_id or ""),
+            sandbox_id=str(getattr(session, "sandbox_id", "") or ""),
+            path=path,
+            request_kind=request_kind,
+            resolver_kind=str(target.get("resolver_kind") or ""),
+            provider=str(target.get("provider") or ""),
+            upstream_base_url=str(target.get("upstream_base_url") or ""),
+            target_base_path=str(target.get("base_path") or ""),
+            target_upstream_path=str(target.get("upstream_path") or ""),
+            has_auth_token=bool(str(target.get("auth_token") or "").strip()),
+            auth_header_name=str(target.get("auth_header_name") or ""),
+            has_extra_headers=bool(str(target.get("extra_headers") or "").strip() not in {"", "{}"}),
+        )
     preview_route = _normalize_preview_route(request.query_params.get("preview_route"))
     runtime_context: RuntimeBootstrapResponse | None = None
     if request.method.upper() == "GET" and not path:
@@ -1968,23 +2054,16 @@ async def proxy_builder_preview(
             app=app,
             revision=revision,
         )
-    body = b""
+    body: bytes | AsyncIterator[bytes] = b""
+    body_stream_state: dict[str, bool] = {}
     if request.method.upper() not in {"GET", "HEAD"}:
-        try:
-            body = await request.body()
-        except ClientDisconnect:
-            apps_builder_trace(
-                "preview.proxy.client_disconnected",
-                domain="preview.proxy",
-                session_id=str(session.id),
-                app_id=str(session.published_app_id),
-                revision_id=str(session.revision_id or ""),
-                sandbox_id=str(getattr(session, "sandbox_id", "") or ""),
-                method=request.method,
-                path=path,
-                request_kind=request_kind,
-            )
-            return Response(status_code=499)
+        if _should_stream_preview_request_body(request):
+            body = _stream_preview_request_body(request, state=body_stream_state)
+        else:
+            try:
+                body = await request.body()
+            except ClientDisconnect:
+                return _preview_client_disconnected(session=session, request=request, path=path, request_kind=request_kind)
     try:
         try:
             upstream = await _request_preview_upstream(
@@ -1994,7 +2073,7 @@ async def proxy_builder_preview(
                 body=body,
             )
         except httpx.HTTPError as exc:
-            if not _is_refreshable_preview_error(exc):
+            if not _is_refreshable_preview_error(exc) or body_stream_state.get("started"):
                 raise
             refreshed_target = await _refresh_preview_target(
                 db=db,
@@ -2009,6 +2088,8 @@ async def proxy_builder_preview(
                 query_params=request.query_params,
                 target=target,
             )
+            if not isinstance(body, bytes):
+                body = _stream_preview_request_body(request, state=body_stream_state)
             apps_builder_trace(
                 "preview.proxy.retrying_after_refresh",
                 domain="preview.proxy",
@@ -2028,6 +2109,8 @@ async def proxy_builder_preview(
                 target=target,
                 body=body,
             )
+    except ClientDisconnect:
+        return _preview_client_disconnected(session=session, request=request, path=path, request_kind=request_kind)
     except httpx.TimeoutException as exc:
         apps_builder_trace(
             "preview.proxy.failed",
@@ -2057,40 +2140,63 @@ async def proxy_builder_preview(
         )
         raise HTTPException(status_code=502, detail="Draft dev preview upstream request failed") from exc
     content_type = str(upstream.headers.get("content-type") or "")
-    response_content = upstream.content
+    normalized_content_type = content_type.split(";", 1)[0].strip().lower()
+    buffer_response = (
+        request.method.upper() == "GET"
+        and upstream.status_code == 200
+        and normalized_content_type.startswith(_REWRITABLE_TEXT_PREFIXES)
+    )
     content_rewritten = False
     rewrite_started_at = time.perf_counter()
-    if request.method.upper() == "GET" and upstream.status_code == 200:
+    rewrite_summary: dict[str, Any] | None = None
+    if buffer_response:
+        try:
+            original_content = await upstream.aread()
+        finally:
+            await upstream.aclose()
         response_content, content_rewritten = _rewrite_text_preview_content(
             target=target,
             path=path,
             content_type=content_type,
-            content=upstream.content,
+            content=original_content,
             runtime_token=token,
             runtime_context=runtime_context,
             preview_route=preview_route,
         )
-    rewrite_summary = _preview_rewrite_summary(
-        path=path,
-        content_type=content_type,
-        original_content=upstream.content,
-        rewritten_content=response_content,
-        runtime_context=runtime_context,
-    )
-    excluded_headers = {"content-encoding", "transfer-encoding", "connection", "content-length"}
-    if content_rewritten:
-        excluded_headers.update({"etag", "last-modified"})
-    response = Response(
-        content=response_content,
-        status_code=upstream.status_code,
-        media_type=content_type,
-    )
+        rewrite_summary = _preview_rewrite_summary(
+            path=path,
+            content_type=content_type,
+            original_content=original_content,
+            rewritten_content=response_content,
+            runtime_context=runtime_context,
+        )
+        response_probe = _preview_body_probe(response_content, content_type=content_type)
+        excluded_headers = {"content-encoding", "transfer-encoding", "connection", "content-length"}
+        if content_rewritten:
+            excluded_headers.update({"etag", "last-modified"})
+        response: Response = Response(
+            content=response_content,
+            status_code=upstream.status_code,
+            media_type=content_type,
+        )
+    else:
+        # Pass-through bodies are relayed as raw (still encoded) chunks, so the upstream
+        # content-encoding and content-length stay valid and nothing is held in memory.
+        response_probe = {"content_type": normalized_content_type, "probeable": False, "streamed": True}
+        excluded_headers = {"transfer-encoding", "connection"}
+        response = StreamingResponse(
+            upstream.aiter_raw(),
+            status_code=upstream.status_code,
+            media_type=content_type,
+            background=BackgroundTask(upstream.aclose),
+        )
     for key, value in upstream.headers.items():
         if key.lower() in excluded_headers or key.lower() == "content-type":
             continue
         response.headers[key] = value
     if content_rewritten:
         response.headers["Cache-Control"] = "no-store"
+    proxy_duration_ms = (time.perf_counter() - proxy_started_at) * 1000
     apps_builder_trace(
         "preview.proxy.completed",
         domain="preview.proxy",
@@ -2102,14 +2208,17 @@ async def proxy_builder_preview(
         path=path,
         request_kind=request_kind,
         token_source=token_source,
-        proxy_duration_ms=int((time.perf_counter() - proxy_started_at) * 1000),
+        target_cache_hit=cached_target is not None,
+        proxy_duration_ms=int(proxy_duration_ms),
         rewrite_duration_ms=int((time.perf_counter() - rewrite_started_at) * 1000),
         status_code=upstream.status_code,
         content_type=content_type,
         content_rewritten=content_rewritten,
+        streamed=not buffer_response,
         rewrite_summary=rewrite_summary,
-        response_probe=_preview_body_probe(response_content, content_type=content_type),
+        response_probe=response_probe,
     )
+    _observe_preview_latency(request_kind=request_kind, duration_ms=proxy_duration_ms)
     return response
 
 
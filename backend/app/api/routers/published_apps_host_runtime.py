@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import secrets
 from datetime import datetime, timezone
@@ -8,7 +9,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse, RedirectResponse, Response
+from fastapi.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -65,10 +66,18 @@ from app.services.runtime_surface import (
 from app.services.thread_detail_service import serialize_thread_summary
 from app.services.published_app_bundle_storage import (
     PublishedAppBundleAssetNotFound,
+    PublishedAppBundleAssetStream,
     PublishedAppBundleStorage,
     PublishedAppBundleStorageError,
     PublishedAppBundleStorageNotConfigured,
 )
+from app.services.storage_streaming import (
+    STREAMING_RESPONSE_THRESHOLD_BYTES,
+    ByteRange,
+    ByteRangeNotSatisfiable,
+    aiter_in_thread,
+    parse_byte_range,
+)
 
 
 router = APIRouter(tags=["published-apps-host-runtime"])
@@ -156,17 +165,23 @@ def _build_host_runtime_bootstrap(*, request: Request, app: PublishedApp, revisi
     )
 
 
-async def _read_published_asset_bytes(*, revision: PublishedAppRevision, asset_path: str) -> tuple[bytes, str]:
+async def _open_published_asset(
+    *,
+    revision: PublishedAppRevision,
+    asset_path: str,
+    byte_range: Optional[ByteRange] = None,
+) -> PublishedAppBundleAssetStream:
     dist_prefix = (revision.dist_storage_prefix or "").strip()
     if not dist_prefix:
         raise HTTPException(status_code=404, detail="Published assets are unavailable for this app")
     try:
         storage = PublishedAppBundleStorage.from_env()
-        payload, content_type = storage.read_asset_bytes(
+        return await asyncio.to_thread(
+            storage.open_asset,
             dist_storage_prefix=dist_prefix,
             asset_path=asset_path,
+            byte_range=byte_range,
         )
-        return payload, content_type
     except PublishedAppBundleAssetNotFound:
         raise HTTPException(status_code=404, detail="Published asset not found")
     except PublishedAppBundleStorageNotConfigured as exc:
@@ -177,6 +192,37 @@ async def _read_published_asset_bytes(*, revision: PublishedAppRevision, asset_p
         raise HTTPException(status_code=400, detail=str(exc))
 
 
+async def _stat_published_asset(*, revision: PublishedAppRevision, asset_path: str) -> int:
+    dist_prefix = (revision.dist_storage_prefix or "").strip()
+    if not dist_prefix:
+        raise HTTPException(status_code=404, detail="Published assets are unavailable for this app")
+    try:
+        storage = PublishedAppBundleStorage.from_env()
+        total_size, _content_type = await asyncio.to_thread(
+            storage.stat_asset,
+            dist_storage_prefix=dist_prefix,
+            asset_path=asset_path,
+        )
+        return total_size
+    except PublishedAppBundleAssetNotFound:
+        raise HTTPException(status_code=404, detail="Published asset not found")
+    except PublishedAppBundleStorageNotConfigured as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    except PublishedAppBundleStorageError as exc:
+        raise HTTPException(status_code=500, detail=f"Failed to load published asset: {exc}")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+async def _read_published_asset_bytes(*, revision: PublishedAppRevision, asset_path: str) -> tuple[bytes, str]:
+    stream = await _open_published_asset(revision=revision, asset_path=asset_path)
+    try:
+        payload = await asyncio.to_thread(stream.read)
+    except PublishedAppBundleStorageError as exc:
+        raise HTTPException(status_code=500, detail=f"Failed to load published asset: {exc}")
+    return payload, stream.content_type
+
+
 async def _resolve_app_for_host_or_none(db: AsyncSession, request: Request) -> Optional[PublishedApp]:
     public_id = _public_id_from_host(request.headers.get("host"))
     if not public_id:
@@ -352,12 +398,45 @@ async def _serve_published_asset_response(
     normalized_asset_path = (asset_path or "").strip().lstrip("/")
     if not normalized_asset_path:
         normalized_asset_path = _entry_html_from_revision(revision)
-    payload, content_type = await _read_published_asset_bytes(revision=revision, asset_path=normalized_asset_path)
-    response = Response(
-        content=payload,
-        media_type=content_type,
-        headers={"Cache-Control": "private, max-age=60" if app.auth_enabled else "public, max-age=60"},
+    headers = {
+        "Cache-Control": "private, max-age=60" if app.auth_enabled else "public, max-age=60",
+        "Accept-Ranges": "bytes",
+    }
+    status_code = 200
+    byte_range: Optional[ByteRange] = None
+    range_header = request.headers.get("range")
+    if range_header:
+        # Only the size is needed to resolve the range; the body is fetched once, ranged.
+        total_size = await _stat_published_asset(revision=revision, asset_path=normalized_asset_path)
+        try:
+            byte_range = parse_byte_range(range_header, total_size)
+        except ByteRangeNotSatisfiable:
+            response = Response(status_code=416, headers={"Content-Range": f"bytes */{total_size}"})
+            if stale_cookie:
+                _clear_session_cookie(response=response, request=request)
+            return response
+    stream = await _open_published_asset(
+        revision=revision,
+        asset_path=normalized_asset_path,
+        byte_range=byte_range,
     )
+    if byte_range is not None:
+        headers["Content-Range"] = byte_range.content_range(stream.total_size)
+        status_code = 206
+    if status_code == 200 and stream.total_size <= STREAMING_RESPONSE_THRESHOLD_BYTES:
+        response = Response(
+            content=await asyncio.to_thread(stream.read),
+            media_type=stream.content_type,
+            headers=headers,
+        )
+    else:
+        headers["Content-Length"] = str(stream.content_length)
+        response = StreamingResponse(
+            aiter_in_thread(stream.iter_chunks),
+            status_code=status_code,
+            media_type=stream.content_type,
+            headers=headers,
+        )
     if stale_cookie:
         _clear_session_cookie(response=response, request=request)
     return response
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import re
 from pathlib import PurePosixPath
@@ -45,6 +46,7 @@ from app.services.published_app_bundle_storage import (
     PublishedAppBundleStorageError,
     PublishedAppBundleStorageNotConfigured,
 )
+from app.services.storage_streaming import STREAMING_RESPONSE_THRESHOLD_BYTES, aiter_in_thread
 from app.services.published_app_auth_service import PublishedAppAuthError, PublishedAppAuthService
 from app.services.resource_policy_quota_service import ResourcePolicyQuotaExceeded
 from app.services.usage_quota_service import QuotaExceededError
@@ -638,10 +640,26 @@ async def get_preview_asset(
 
     try:
         storage = PublishedAppBundleStorage.from_env()
-        payload, content_type = storage.read_asset_bytes(
+        stream = await asyncio.to_thread(
+            storage.open_asset,
             dist_storage_prefix=dist_prefix,
             asset_path=asset_path,
         )
+        content_type = stream.content_type
+        # Only rewritable text and small assets are buffered; everything else is
+        # relayed chunk by chunk so large media never sits in worker memory.
+        if (
+            not content_type.lower().startswith(_PREVIEW_REWRITABLE_TEXT_PREFIXES)
+            and stream.total_size > STREAMING_RESPONSE_THRESHOLD_BYTES
+        ):
+            response = StreamingResponse(
+                aiter_in_thread(stream.iter_chunks),
+                media_type=content_type,
+                headers={"Cache-Control": "no-store", "Content-Length": str(stream.content_length)},
+            )
+            set_preview_cookie(response=response, request=request, token=principal.get("auth_token"))
+            return response
+        payload = await asyncio.to_thread(stream.read)
     except PublishedAppBundleAssetNotFound:
         raise HTTPException(status_code=404, detail="Preview asset not found")
     except PublishedAppBundleStorageNotConfigured as exc:
@@ -26,6 +26,7 @@ from app.services.opencode_server_client import (
 from app.services.opencode_server_launch import build_official_opencode_bootstrap_command
 from app.services.published_app_draft_dev_local_runtime import (
     LocalDraftDevRuntimeError,
+    LocalDraftDevRuntimeSyncConflictError,
     get_local_draft_dev_runtime_manager,
 )
 
@@ -88,6 +89,9 @@ class SyncSessionRequest(BaseModel):
     idle_timeout_seconds: int = 180
     dependency_hash: str = ""
     install_dependencies: bool = False
+    base_manifest_digest: str | None = None
+    changed_files: dict[str, str] = Field(default_factory=dict)
+    deleted_paths: list[str] = Field(default_factory=list)
 
 
 class HeartbeatRequest(BaseModel):
@@ -496,6 +500,8 @@ def _resolve_requested_workspace_path(
 def _translate_runtime_error(exc: Exception) -> HTTPException:
     if isinstance(exc, HTTPException):
         return exc
+    if isinstance(exc, LocalDraftDevRuntimeSyncConflictError):
+        return HTTPException(status_code=409, detail=str(exc))
     if isinstance(exc, LocalDraftDevRuntimeError):
         return HTTPException(status_code=400, detail=str(exc))
     if isinstance(exc, OpenCodeServerClientError):
@@ -535,11 +541,20 @@ async def start_session(payload: StartSessionRequest) -> dict[str, Any]:
 async def sync_session(sandbox_id: str, payload: SyncSessionRequest) -> dict[str, Any]:
     manager = get_local_draft_dev_runtime_manager()
     try:
+        # Only delta syncs carry the manifest fields; full syncs keep the original call shape.
+        delta_kwargs: dict[str, Any] = {}
+        if payload.base_manifest_digest:
+            delta_kwargs = {
+                "base_manifest_digest": payload.base_manifest_digest,
+                "changed_files": payload.changed_files,
+                "deleted_paths": payload.deleted_paths,
+            }
         return await manager.sync_session(
             sandbox_id=sandbox_id,
             files=payload.files,
             dependency_hash=payload.dependency_hash,
             install_dependencies=payload.install_dependencies,
+            **delta_kwargs,
         )
     except Exception as exc:
         raise _translate_runtime_error(exc) from exc
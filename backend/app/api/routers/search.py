@@ -11,6 +11,18 @@ class SearchRequest(BaseModel):
 
 router = APIRouter()
 
+
+def _get_vector_store(request: Request):
+    vector_store = getattr(request.app.state, "vector_store", None)
+    if vector_store is None:
+        # Built lazily so startup does not pay for the embedding/Pinecone clients.
+        from vector_store import VectorStore
+
+        vector_store = VectorStore()
+        request.app.state.vector_store = vector_store
+    return vector_store
+
+
 @router.post("/search")
 async def search_documents(request_body: SearchRequest, request: Request):
     """
@@ -21,18 +33,7 @@ async def search_documents(request_body: SearchRequest, request: Request):
         raise HTTPException(status_code=400, detail="Query cannot be empty")
 
     try:
-        vector_store = getattr(request.app.state, "vector_store", None)
-        # Added safety check for vector_store presence
-        if not vector_store:
-             # Fallback or error if not initialized
-             # Assuming main.py initializes it.
-             # If strictly required:
-             # raise HTTPException(status_code=503, detail="Vector store not initialized")
-             pass 
-        
-        # Note: Original code accessed it directly. Safe to assume it exists if app configured correctly.
-        # But 'getattr' with default is safer.
-        vector_store = request.app.state.vector_store
+        vector_store = _get_vector_store(request)
 
         results = vector_store.search(request_body.query, limit=request_body.limit)
         
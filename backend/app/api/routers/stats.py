@@ -25,15 +25,12 @@ from app.db.postgres.models.registry import (
 )
 from app.db.postgres.models.operators import CustomOperator
 from app.services.admin_monitoring_service import AdminMonitoringService
-from app.services.model_accounting import (
-    cost_estimated_expr,
-    cost_exact_expr,
-    cost_total_expr,
-    cost_unknown_count_expr,
-    usage_estimated_expr,
-    usage_exact_expr,
-    usage_total_expr,
-    usage_unknown_count_expr,
+from app.services.model_accounting import usage_total_expr
+from app.services.stats_rollup_service import (
+    AGENT_RUN_METRICS,
+    SUBJECT_AGENT,
+    StatsRollupService,
+    StatsRollupTotals,
 )
 
 from app.api.schemas.stats import (
@@ -172,45 +169,34 @@ def supports_percentile_cont(db: AsyncSession) -> bool:
     return bool(bind and bind.dialect.name != "sqlite")
 
 
-async def _load_accounting_aggregates(
+async def _load_run_rollups(
     *,
     db: AsyncSession,
     organization_id: UUID,
     start: datetime,
     end: datetime,
     agent_id: UUID | None = None,
-) -> dict[str, float | int]:
-    query = (
-        select(
-            func.coalesce(func.sum(usage_total_expr(AgentRun)), 0).label("total_tokens"),
-            func.coalesce(func.sum(usage_exact_expr(AgentRun)), 0).label("total_tokens_exact"),
-            func.coalesce(func.sum(usage_estimated_expr(AgentRun)), 0).label("total_tokens_estimated"),
-            func.coalesce(func.sum(usage_unknown_count_expr(AgentRun)), 0).label("runs_with_unknown_usage"),
-            func.coalesce(func.sum(cost_total_expr(AgentRun)), 0.0).label("total_spend_all_usd"),
-            func.coalesce(func.sum(cost_exact_expr(AgentRun)), 0.0).label("total_spend_exact_usd"),
-            func.coalesce(func.sum(cost_estimated_expr(AgentRun)), 0.0).label("total_spend_estimated_usd"),
-            func.coalesce(func.sum(cost_unknown_count_expr(AgentRun)), 0).label("runs_with_unknown_cost"),
-        )
-        .where(
-            and_(
-                AgentRun.organization_id == organization_id,
-                AgentRun.created_at >= start,
-                AgentRun.created_at <= end,
-            )
-        )
+) -> StatsRollupTotals:
+    return await StatsRollupService(db).load_totals(
+        organization_id=organization_id,
+        start=start,
+        end=end,
+        subject_kind=SUBJECT_AGENT,
+        metrics=AGENT_RUN_METRICS,
+        subject_ids=[agent_id] if agent_id else None,
     )
-    if agent_id:
-        query = query.where(AgentRun.agent_id == agent_id)
-    row = (await db.execute(query)).one()
+
+
+def _accounting_from_rollups(run_totals: StatsRollupTotals) -> dict[str, float | int]:
     return {
-        "total_tokens": int(row.total_tokens or 0),
-        "total_tokens_exact": int(row.total_tokens_exact or 0),
-        "total_tokens_estimated": int(row.total_tokens_estimated or 0),
-        "runs_with_unknown_usage": int(row.runs_with_unknown_usage or 0),
-        "total_spend_all_usd": float(row.total_spend_all_usd or 0.0),
-        "total_spend_exact_usd": float(row.total_spend_exact_usd or 0.0),
-        "total_spend_estimated_usd": float(row.total_spend_estimated_usd or 0.0),
-        "runs_with_unknown_cost": int(row.runs_with_unknown_cost or 0),
+        "total_tokens": int(run_totals.total("tokens_total")),
+        "total_tokens_exact": int(run_totals.total("tokens_exact")),
+        "total_tokens_estimated": int(run_totals.total("tokens_estimated")),
+        "runs_with_unknown_usage": int(run_totals.total("runs_unknown_usage")),
+        "total_spend_all_usd": float(run_totals.total("spend_total")),
+        "total_spend_exact_usd": float(run_totals.total("spend_exact")),
+        "total_spend_estimated_usd": float(run_totals.total("spend_estimated")),
+        "runs_with_unknown_cost": int(run_totals.total("runs_unknown_cost")),
     }
 
 
@@ -273,32 +259,16 @@ async def get_overview_stats(
     )
     total_messages = int((await db.execute(q_messages)).scalar() or 0)
 
-    accounting = await _load_accounting_aggregates(
+    run_totals = await _load_run_rollups(
         db=db,
         organization_id=organization_id,
         start=start,
         end=end,
     )
+    accounting = _accounting_from_rollups(run_totals)
     total_tokens = int(accounting["total_tokens"])
-
-    q_runs = select(func.count(AgentRun.id)).where(
-        and_(
-            AgentRun.organization_id == organization_id,
-            AgentRun.created_at >= start,
-            AgentRun.created_at <= end,
-        )
-    )
-    agent_runs = int((await db.execute(q_runs)).scalar() or 0)
-
-    q_failed_runs = select(func.count(AgentRun.id)).where(
-        and_(
-            AgentRun.organization_id == organization_id,
-            AgentRun.status == RunStatus.failed,
-            AgentRun.created_at >= start,
-            AgentRun.created_at <= end,
-        )
-    )
-    agent_runs_failed = int((await db.execute(q_failed_runs)).scalar() or 0)
+    agent_runs = int(run_totals.total("runs"))
+    agent_runs_failed = int(run_totals.total("runs_failed"))
 
     q_jobs = select(func.count(PipelineJob.id)).where(
         and_(
@@ -328,28 +298,8 @@ async def get_overview_stats(
     avg_messages_per_chat = round(total_messages / total_chats, 2) if total_chats > 0 else 0.0
     estimated_spend = float(accounting["total_spend_all_usd"])
 
-    q_daily_tokens = (
-        select(
-            func.date(AgentRun.created_at).label("date"),
-            func.coalesce(func.sum(usage_total_expr(AgentRun)), 0).label("value"),
-            func.coalesce(func.sum(cost_total_expr(AgentRun)), 0.0).label("spend_value"),
-        )
-        .where(
-            and_(
-                AgentRun.organization_id == organization_id,
-                AgentRun.created_at >= start,
-                AgentRun.created_at <= end,
-            )
-        )
-        .group_by(func.date(AgentRun.created_at))
-        .order_by(func.date(AgentRun.created_at))
-    )
-    tokens_result = await db.execute(q_daily_tokens)
-    token_rows = tokens_result.all()
-    tokens_map = {normalize_grouped_date(r.date): float(r.value) for r in token_rows}
-    spend_map = {normalize_grouped_date(r.date): float(r.spend_value or 0.0) for r in token_rows}
-    tokens_by_day = fill_daily_data(tokens_map, start, end)
-    spend_by_day = fill_daily_data(spend_map, start, end)
+    tokens_by_day = fill_daily_data(run_totals.by_day("tokens_total"), start, end)
+    spend_by_day = fill_daily_data(run_totals.by_day("spend_total"), start, end)
 
     daily_active_rows = await monitoring.daily_active_actor_counts(start=start, end=end)
     dau_map = {str(item["date"]): float(item["count"]) for item in daily_active_rows}
@@ -813,33 +763,17 @@ async def get_agent_stats(
     total_runs = sum(a.run_count for a in agents)
     total_failed = sum(a.failed_count for a in agents)
     failure_rate = (total_failed / total_runs * 100) if total_runs > 0 else 0
-    accounting = await _load_accounting_aggregates(
+    run_totals = await _load_run_rollups(
         db=db,
         organization_id=organization_id,
         start=start,
         end=end,
         agent_id=agent_id,
     )
+    accounting = _accounting_from_rollups(run_totals)
     
     # Runs by day
-    q_daily_runs = (
-        select(
-            func.date(AgentRun.created_at).label('date'),
-            func.count(AgentRun.id).label('value')
-        )
-        .where(and_(
-            AgentRun.organization_id == organization_id,
-            AgentRun.created_at >= start,
-            AgentRun.created_at <= end
-        ))
-        .group_by(func.date(AgentRun.created_at))
-        .order_by(func.date(AgentRun.created_at))
-    )
-    if agent_id:
-        q_daily_runs = q_daily_runs.where(AgentRun.agent_id == agent_id)
-    daily_runs_result = await db.execute(q_daily_runs)
-    runs_map = {normalize_grouped_date(r.date): float(r.value) for r in daily_runs_result.all()}
-    runs_by_day = fill_daily_data(runs_map, start, end)
+    runs_by_day = fill_daily_data(run_totals.by_day("runs"), start, end)
     
     # Runs by status
     q_status = (
@@ -925,24 +859,7 @@ async def get_agent_stats(
     # Tokens usage
     tokens_used_total = int(accounting["total_tokens"])
 
-    q_tokens_by_day = (
-        select(
-            func.date(AgentRun.created_at).label('date'),
-            func.coalesce(func.sum(usage_total_expr(AgentRun)), 0).label('value')
-        )
-        .where(and_(
-            AgentRun.organization_id == organization_id,
-            AgentRun.created_at >= start,
-            AgentRun.created_at <= end
-        ))
-        .group_by(func.date(AgentRun.created_at))
-        .order_by(func.date(AgentRun.created_at))
-    )
-    if agent_id:
-        q_tokens_by_day = q_tokens_by_day.where(AgentRun.agent_id == agent_id)
-    tokens_day_result = await db.execute(q_tokens_by_day)
-    tokens_map = {normalize_grouped_date(r.date): float(r.value) for r in tokens_day_result.all()}
-    tokens_by_day = fill_daily_data(tokens_map, start, end)
+    tokens_by_day = fill_daily_data(run_totals.by_day("tokens_total"), start, end)
 
     # Top agents by tokens
     q_top_agents_tokens = (
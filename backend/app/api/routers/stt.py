@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import json
+
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.postgres.session import get_db
+from app.services.audio_segmentation import AudioSegmentationError
 from app.services.speech_to_text_service import SpeechToTextService
 
 
@@ -25,3 +29,54 @@ async def transcribe_audio(
         return {"text": result.text}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.post("/transcribe/stream")
+async def transcribe_audio_stream(
+    file: UploadFile = File(...),
+    segment_seconds: float | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Streams partial transcripts as server-sent events, one per audio segment, in order."""
+    try:
+        segments = await SpeechToTextService(db, None).transcribe_stream(
+            file,
+            mime_type=file.content_type,
+            filename=file.filename,
+            segment_seconds=segment_seconds,
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+    async def event_generator():
+        parts: list[str] = []
+        index = 0
+        try:
+            async for segment in segments:
+                text = segment.text.strip()
+                if text:
+                    parts.append(text)
+                payload = {
+                    "event": "segment",
+                    "index": index,
+                    "text": text,
+                    "start_ms": segment.start_ms,
+                    "end_ms": segment.end_ms,
+                }
+                index += 1
+                yield f"data: {json.dumps(payload)}\n\n"
+            yield f"data: {json.dumps({'event': 'done', 'text': ' '.join(parts), 'segments': index})}\n\n"
+        except AudioSegmentationError as exc:
+            yield f"data: {json.dumps({'event': 'error', 'error': str(exc), 'code': 'invalid_audio'})}\n\n"
+        except Exception as exc:
+            yield f"data: {json.dumps({'event': 'error', 'error': str(exc)})}\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -18,6 +18,35 @@ def running_under_pytest() -> bool:
     return bool(os.getenv("PYTEST_CURRENT_TEST")) or "pytest" in sys.modules
 
 
+def env_flag(name: str, default: bool = False) -> bool:
+    raw = str(os.getenv(name) or "").strip().lower()
+    if not raw:
+        return default
+    return raw in {"1", "true", "yes", "on"}
+
+
+def env_int(name: str, default: int) -> int:
+    """Integer setting from the environment; `default` when unset or malformed."""
+    raw = str(os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """Float setting from the environment; `default` when unset or malformed."""
+    raw = str(os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
 def resolve_backend_env_file(
     *,
     backend_dir: Path | None = None,
@@ -13,6 +13,7 @@ from .registry import (
     ModelProviderType,
     IntegrationCredential,
     IntegrationCredentialCategory,
+    RegistrySeedState,
 )
 from .rag import RAGPipeline, VisualPipeline, ExecutablePipeline, PipelineJob, OperatorCategory, PipelineJobStatus, PipelineStepExecution, PipelineStepStatus, KnowledgeStore, KnowledgeStoreStatus, StorageBackend, RetrievalPolicy
 from .agents import Agent, AgentVersion, AgentRun, AgentRunInvocation, AgentTrace, RunStatus, AgentStatus
@@ -35,6 +36,8 @@ from .files import (
     FileSpaceEntry,
     FileEntryType,
     FileEntryRevision,
+    FileBlob,
+    FileBlobEncoding,
     AgentFileSpaceLink,
     FileAccessMode,
 )
@@ -104,6 +107,7 @@ from .published_app_analytics import (
     PublishedAppAnalyticsEventType,
     PublishedAppAnalyticsSurface,
 )
+from .stats_rollups import StatsRollup, StatsRollupGranularity, StatsRollupWatermark
 from .artifact_runtime import (
     Artifact,
     ArtifactCodingMessage,
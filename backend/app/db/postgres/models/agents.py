@@ -191,6 +191,9 @@ class AgentRun(Base):
     started_at = Column(DateTime(timezone=True), nullable=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Nullable so the column could be added without rewriting existing rows; stats
+    # rollups use it to restate hours whose runs changed after they were rolled up.
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=True, index=True)
 
     # Relationships
     organization = relationship("Organization")
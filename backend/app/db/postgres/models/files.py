@@ -35,6 +35,11 @@ class FileAccessMode(str, enum.Enum):
     read_write = "read_write"
 
 
+class FileBlobEncoding(str, enum.Enum):
+    full = "full"
+    text_delta = "text_delta"
+
+
 class FileSpace(Base):
     __tablename__ = "file_spaces"
 
@@ -100,7 +105,8 @@ class FileEntryRevision(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     entry_id = Column(UUID(as_uuid=True), ForeignKey("file_space_entries.id", ondelete="CASCADE"), nullable=False, index=True)
-    storage_key = Column(String(2048), nullable=False, unique=True)
+    blob_id = Column(UUID(as_uuid=True), ForeignKey("file_blobs.id", ondelete="SET NULL"), nullable=True, index=True)
+    storage_key = Column(String(2048), nullable=False, index=True)
     mime_type = Column(String(255), nullable=False)
     byte_size = Column(Integer, nullable=False)
     sha256 = Column(String(64), nullable=False, index=True)
@@ -111,6 +117,7 @@ class FileEntryRevision(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     entry = relationship("FileSpaceEntry", back_populates="revisions", foreign_keys=[entry_id])
+    blob = relationship("FileBlob")
     creator = relationship("User")
     run = relationship("AgentRun")
 
@@ -119,6 +126,28 @@ class FileEntryRevision(Base):
     )
 
 
+class FileBlob(Base):
+    __tablename__ = "file_blobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    sha256 = Column(String(64), nullable=False)
+    storage_key = Column(String(2048), nullable=False, unique=True)
+    encoding = Column(SQLEnum(FileBlobEncoding), nullable=False, default=FileBlobEncoding.full)
+    base_blob_id = Column(UUID(as_uuid=True), ForeignKey("file_blobs.id"), nullable=True, index=True)
+    delta_depth = Column(Integer, nullable=False, default=0, server_default="0")
+    byte_size = Column(Integer, nullable=False)
+    stored_size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    base_blob = relationship("FileBlob", remote_side=[id])
+
+    __table_args__ = (
+        UniqueConstraint("project_id", "sha256", name="uq_file_blobs_project_sha256"),
+    )
+
+
 class AgentFileSpaceLink(Base):
     __tablename__ = "agent_file_space_links"
 
@@ -79,6 +79,12 @@ class OrchestrationGroup(Base):
     timeout_s = Column(Integer, nullable=False, default=60)
     status = Column(String, nullable=False, default="running")
 
+    # Completion counters maintained as member runs finish, so a parked join can
+    # be re-evaluated without scanning every member run.
+    member_count = Column(Integer, nullable=False, default=0)
+    success_count = Column(Integer, nullable=False, default=0)
+    failure_count = Column(Integer, nullable=False, default=0)
+
     policy_snapshot = Column(JSONB, nullable=False, default=dict)
 
     started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -99,6 +105,7 @@ class OrchestrationGroupMember(Base):
     run_id = Column(UUID(as_uuid=True), ForeignKey("agent_runs.id", ondelete="CASCADE"), nullable=False, index=True)
     ordinal = Column(Integer, nullable=False, default=0)
     status = Column(String, nullable=False, default="queued")
+    counted_at = Column(DateTime(timezone=True), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
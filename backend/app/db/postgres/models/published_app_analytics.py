@@ -64,4 +64,12 @@ class PublishedAppAnalyticsEvent(Base):
             "published_app_id",
             "occurred_at",
         ),
+        # Serves the unique-visitor COUNT(DISTINCT visitor_key) per app and range as an index-only scan.
+        Index(
+            "ix_published_app_analytics_app_occurred_visitor",
+            "published_app_id",
+            "occurred_at",
+            "visitor_key",
+            postgresql_include=["surface"],
+        ),
     )
@@ -349,3 +349,12 @@ class IntegrationCredential(Base):
             sqlite_where=and_(is_default == True, provider_variant == None),
         ),
     )
+
+
+class RegistrySeedState(Base):
+    """Fingerprint of the seed definitions last applied by a startup seeding pass."""
+    __tablename__ = "registry_seed_states"
+
+    seed_name = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
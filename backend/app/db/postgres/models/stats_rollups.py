@@ -0,0 +1,64 @@
+import enum
+import uuid
+
+from sqlalchemy import Column, DateTime, Enum as SQLEnum, Float, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from ..base import Base
+
+
+def _enum_values(enum_cls):
+    return [e.value for e in enum_cls]
+
+
+class StatsRollupGranularity(str, enum.Enum):
+    hour = "hour"
+    day = "day"
+
+
+class StatsRollup(Base):
+    """Pre-aggregated metric value for one subject (agent or published app) in one time bucket."""
+    __tablename__ = "stats_rollups"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    granularity = Column(
+        SQLEnum(StatsRollupGranularity, values_callable=_enum_values),
+        nullable=False,
+    )
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    subject_kind = Column(String(32), nullable=False)
+    subject_id = Column(UUID(as_uuid=True), nullable=False)
+    metric = Column(String(64), nullable=False)
+    dimension = Column(String(160), nullable=False, default="")
+    value = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        Index(
+            "ix_stats_rollups_org_granularity_bucket",
+            "organization_id",
+            "granularity",
+            "bucket_start",
+        ),
+        Index(
+            "ix_stats_rollups_granularity_bucket",
+            "granularity",
+            "bucket_start",
+        ),
+    )
+
+
+class StatsRollupWatermark(Base):
+    """Bounds of the buckets a rollup pass has fully materialized.
+
+    Daily rows cover [rolled_up_from, rolled_up_to); hourly rows older than
+    hourly_rolled_up_from have been pruned.
+    """
+    __tablename__ = "stats_rollup_watermarks"
+
+    rollup_name = Column(String(64), primary_key=True)
+    rolled_up_to = Column(DateTime(timezone=True), nullable=False)
+    rolled_up_from = Column(DateTime(timezone=True), nullable=True)
+    hourly_rolled_up_from = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,4 +1,37 @@
-from app.api.routers.published_apps_host_runtime import PublishedAppsHostRuntimeMiddleware
+from __future__ import annotations
 
-__all__ = ["PublishedAppsHostRuntimeMiddleware"]
+import asyncio
+import importlib
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.services.published_app_host_runtime_support import _public_id_from_host
+
+_HOST_RUNTIME_MODULE = "app.api.routers.published_apps_host_runtime"
+
+
+class PublishedAppsHostRuntimeMiddleware:
+    """
+    Startup-cheap wrapper around the host runtime middleware.
 
+    The real middleware lives in the host runtime router, which pulls in the agent
+    execution stack. Only requests for a published-app host reach it; the first one
+    imports it on a worker thread, and every other request passes straight through.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._delegate: ASGIApp | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _public_id_from_host(Headers(scope=scope).get("host")) is None:
+            await self.app(scope, receive, send)
+            return
+        if self._delegate is None:
+            module = await asyncio.to_thread(importlib.import_module, _HOST_RUNTIME_MODULE)
+            self._delegate = module.PublishedAppsHostRuntimeMiddleware(self.app)
+        await self._delegate(scope, receive, send)
+
+
+__all__ = ["PublishedAppsHostRuntimeMiddleware"]
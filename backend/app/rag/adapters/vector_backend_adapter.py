@@ -54,9 +54,15 @@ class VectorBackendAdapter(ABC):
         vector: List[float],
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
-        namespace: Optional[str] = None
+        namespace: Optional[str] = None,
+        search_params: Optional[Dict[str, Any]] = None
     ) -> List[SearchResult]:
-        """Query for similar vectors. Returns list of search results."""
+        """
+        Query for similar vectors. Returns list of search results.
+
+        `search_params` carries backend-specific query-time knobs (e.g. pgvector
+        `ef_search` / `probes`); backends without such knobs ignore it.
+        """
         pass
     
     @abstractmethod
@@ -69,6 +75,10 @@ class VectorBackendAdapter(ABC):
         """Count total vectors in the namespace."""
         pass
 
+    async def refresh_index(self) -> bool:
+        """Bring backend-side indexes up to date after an ingestion run. Returns True if any work was done."""
+        return False
+
 
 class PineconeAdapter(VectorBackendAdapter):
     """Adapter for Pinecone vector store."""
@@ -107,7 +117,8 @@ class PineconeAdapter(VectorBackendAdapter):
         vector: List[float],
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
-        namespace: Optional[str] = None
+        namespace: Optional[str] = None,
+        search_params: Optional[Dict[str, Any]] = None
     ) -> List[SearchResult]:
         results = await self._store.search(
             self._index_name,
@@ -146,6 +157,8 @@ class PgVectorAdapter(VectorBackendAdapter):
         from app.rag.providers.vector_store.pgvector import PgvectorVectorStore
         
         self._collection_name = config.get("collection_name", config.get("index_name"))
+        self._index_profile = config.get("index_profile")
+        self._search_params = config.get("search_params") if isinstance(config.get("search_params"), dict) else {}
         self._store = PgvectorVectorStore()
     
     @property
@@ -160,7 +173,11 @@ class PgVectorAdapter(VectorBackendAdapter):
         dimension = next((len(v.values) for v in vectors if isinstance(v.values, list) and v.values), 0)
         if dimension <= 0:
             raise ValueError("No valid embedding vectors were provided for PGVector upsert")
-        await self._store.create_index(self._collection_name, dimension)
+        await self._store.create_index(
+            self._collection_name,
+            dimension,
+            index_profile=self._index_profile,
+        )
 
         docs = [
             VectorDocument(
@@ -177,14 +194,19 @@ class PgVectorAdapter(VectorBackendAdapter):
         vector: List[float],
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
-        namespace: Optional[str] = None
+        namespace: Optional[str] = None,
+        search_params: Optional[Dict[str, Any]] = None
     ) -> List[SearchResult]:
+        params = {**self._search_params, **(search_params or {})}
         results = await self._store.search(
             self._collection_name,
             vector,
             top_k,
             namespace=namespace,
-            filter=filters
+            filter=filters,
+            ef_search=params.get("ef_search"),
+            probes=params.get("probes"),
+            iterative_scan=params.get("iterative_scan"),
         )
         return [
             SearchResult(
@@ -200,8 +222,12 @@ class PgVectorAdapter(VectorBackendAdapter):
         success = await self._store.delete(self._collection_name, ids, namespace)
         return len(ids) if success else 0
     
+    async def refresh_index(self) -> bool:
+        # Auto-sized ivfflat indexes are built and resized from the rows actually stored.
+        return await self._store.ensure_embedding_index(self._collection_name, index_profile=self._index_profile)
+
     async def count(self, namespace: Optional[str] = None) -> int:
-        # PGVector stats - implementation depends on your pgvector store
+        # Approximate: pgvector stats come from planner statistics, not COUNT(*).
         try:
             stats = await self._store.get_index_stats(self._collection_name)
             return stats.total_vector_count if stats else 0
@@ -241,7 +267,8 @@ class QdrantAdapter(VectorBackendAdapter):
         vector: List[float],
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
-        namespace: Optional[str] = None
+        namespace: Optional[str] = None,
+        search_params: Optional[Dict[str, Any]] = None
     ) -> List[SearchResult]:
         results = await self._store.search(
             self._collection_name,
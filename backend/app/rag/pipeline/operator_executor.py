@@ -1076,25 +1076,10 @@ class ChunkerExecutor(OperatorExecutor):
             **{k: v for k, v in config_dict.items() if k != "strategy"}
         )
         
-        chunker = RAGFactory.create_chunker(chunker_config)
-        
-        all_chunks = []
-        documents = input_data.data
-        if not isinstance(documents, list):
-            documents = [documents]
-            
-        for doc in documents:
-            if isinstance(doc, dict):
-                text = doc.get("text") or doc.get("content", "")
-                doc_id = str(doc.get("id", "unknown"))
-                metadata = doc.get("metadata", {})
-            else:
-                text = str(doc)
-                doc_id = "unknown"
-                metadata = {}
-                
-            chunks = chunker.chunk(text, doc_id=doc_id, metadata=metadata)
-            all_chunks.extend([c.model_dump() for c in chunks])
+        # Tokenization is CPU-bound: chunk in a thread, or on the process pool for large inputs.
+        from app.services.chunking_service import get_chunking_service
+
+        all_chunks = await get_chunking_service().chunk_documents(chunker_config, input_data.data)
             
         return OperatorOutput(
             data=all_chunks,
@@ -1543,6 +1528,13 @@ class KnowledgeStoreSinkExecutor(OperatorExecutor):
                 f"Vector upsert completed with 0 records (backend={store.backend.value}, namespace={namespace})"
             )
         
+        # Index maintenance must not fail an ingestion whose vectors are already stored.
+        index_refresh: Dict[str, Any] = {}
+        try:
+            index_refresh["index_refreshed"] = await adapter.refresh_index()
+        except Exception as exc:
+            index_refresh["index_refresh_error"] = str(exc)
+
         # Update store metrics
         store.chunk_count = (store.chunk_count or 0) + total_upserted
         await db.commit()
@@ -1560,6 +1552,7 @@ class KnowledgeStoreSinkExecutor(OperatorExecutor):
                     "input_documents": len(documents),
                     "attempted_vectors": len(vectors),
                     "skipped_empty_vectors": skipped_empty_vectors,
+                    **index_refresh,
                 },
             },
             metadata=input_data.metadata,
@@ -1,14 +1,18 @@
 import re
 import hashlib
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 import tiktoken
 
 from app.rag.interfaces.chunker import ChunkerStrategy, Chunk
+from app.rag.providers.chunker.token_index import TokenOffsetIndex
+
+# (start, end) character offsets into the document being chunked.
+Span = Tuple[int, int]
 
 
 class RecursiveChunker(ChunkerStrategy):
-    
+
     DEFAULT_SEPARATORS = [
         "\n\n",
         "\n",
@@ -20,7 +24,7 @@ class RecursiveChunker(ChunkerStrategy):
         " ",
         ""
     ]
-    
+
     def __init__(
         self,
         chunk_size: int = 1000,
@@ -34,92 +38,121 @@ class RecursiveChunker(ChunkerStrategy):
         self._separators = separators or self.DEFAULT_SEPARATORS
         self._encoding = tiktoken.get_encoding(encoding_name)
         self._length_function = length_function
-    
+
     @property
     def strategy_name(self) -> str:
         return "recursive"
-    
+
     def count_tokens(self, text: str) -> int:
         return len(self._encoding.encode(text or ""))
-    
+
     def _length(self, text: str) -> int:
         if self._length_function == "tokens":
             return self.count_tokens(text)
         return len(text)
-    
+
+    def _span_length(self, index: TokenOffsetIndex, start: int, end: int) -> int:
+        if self._length_function == "tokens":
+            return index.count(start, end)
+        return end - start
+
     def _generate_chunk_id(self, doc_id: str, chunk_index: int, text: str) -> str:
         content_hash = hashlib.md5(text.encode()).hexdigest()[:8]
         return f"{doc_id}__chunk_{chunk_index}__{content_hash}"
-    
+
     def _split_text(self, text: str, separators: List[str]) -> List[str]:
+        index = TokenOffsetIndex(self._encoding, text)
+        return [text[start:end] for start, end in self._split_spans(text, index, 0, len(text), separators)]
+
+    def _split_spans(
+        self,
+        text: str,
+        index: TokenOffsetIndex,
+        start: int,
+        end: int,
+        separators: List[str]
+    ) -> List[Span]:
         if not separators:
-            return [text]
-        
+            return [(start, end)]
+
         separator = separators[0]
         remaining_separators = separators[1:]
-        
+
         if separator == "":
-            return list(text)
-        
-        splits = text.split(separator)
-        
-        final_chunks = []
-        good_splits = []
-        
+            return [(position, position + 1) for position in range(start, end)]
+
+        # Same pieces as text[start:end].split(separator), as offsets into the document.
+        splits: List[Span] = []
+        cursor = start
+        while True:
+            found = text.find(separator, cursor, end)
+            if found == -1:
+                splits.append((cursor, end))
+                break
+            splits.append((cursor, found))
+            cursor = found + len(separator)
+
+        final_chunks: List[Span] = []
+        good_splits: List[Span] = []
+
         for split in splits:
-            if self._length(split) < self._chunk_size:
+            if self._span_length(index, *split) < self._chunk_size:
                 good_splits.append(split)
             else:
                 if good_splits:
-                    merged = self._merge_splits(good_splits, separator)
+                    merged = self._merge_spans(index, good_splits, separator)
                     final_chunks.extend(merged)
                     good_splits = []
-                
+
                 if remaining_separators:
-                    sub_splits = self._split_text(split, remaining_separators)
+                    sub_splits = self._split_spans(text, index, split[0], split[1], remaining_separators)
                     final_chunks.extend(sub_splits)
                 else:
                     final_chunks.append(split)
-        
+
         if good_splits:
-            merged = self._merge_splits(good_splits, separator)
+            merged = self._merge_spans(index, good_splits, separator)
             final_chunks.extend(merged)
-        
+
         return final_chunks
-    
-    def _merge_splits(self, splits: List[str], separator: str) -> List[str]:
-        merged_chunks = []
-        current_chunk: List[str] = []
+
+    def _merge_spans(self, index: TokenOffsetIndex, splits: List[Span], separator: str) -> List[Span]:
+        # Consecutive splits are joined by exactly one separator in the document, so a
+        # merged run is the span from its first split's start to its last split's end.
+        merged_chunks: List[Span] = []
+        current_chunk: List[Span] = []
+        current_lengths: List[int] = []
         current_length = 0
-        
+
         for split in splits:
-            split_length = self._length(split)
-            
+            split_length = self._span_length(index, *split)
+
             if current_length + split_length + (len(separator) if current_chunk else 0) > self._chunk_size:
                 if current_chunk:
-                    merged_chunks.append(separator.join(current_chunk))
-                    
-                    overlap_chunks = []
+                    merged_chunks.append((current_chunk[0][0], current_chunk[-1][1]))
+
+                    keep = 0
                     overlap_length = 0
-                    for prev_split in reversed(current_chunk):
-                        prev_len = self._length(prev_split)
+                    for prev_len in reversed(current_lengths):
                         if overlap_length + prev_len <= self._chunk_overlap:
-                            overlap_chunks.insert(0, prev_split)
+                            keep += 1
                             overlap_length += prev_len + len(separator)
                         else:
                             break
-                    
-                    current_chunk = overlap_chunks
+
+                    current_chunk = current_chunk[len(current_chunk) - keep:]
+                    current_lengths = current_lengths[len(current_lengths) - keep:]
                     current_length = overlap_length
-            
+
             current_chunk.append(split)
+            current_lengths.append(split_length)
             current_length += split_length + len(separator)
-        
+
         if current_chunk:
-            merged_chunks.append(separator.join(current_chunk))
-        
+            merged_chunks.append((current_chunk[0][0], current_chunk[-1][1]))
+
         return merged_chunks
-    
+
     def chunk(
         self,
         text: str,
@@ -128,34 +161,42 @@ class RecursiveChunker(ChunkerStrategy):
     ) -> List[Chunk]:
         if not text or not text.strip():
             return []
-        
+
         metadata = metadata or {}
         text = text.strip()
-        
-        split_texts = self._split_text(text, self._separators)
-        
+
+        # Tokenize once; split lengths, overlaps and chunk token counts all come from the index.
+        index = TokenOffsetIndex(self._encoding, text)
+        split_spans = self._split_spans(text, index, 0, len(text), self._separators)
+
         chunks = []
         char_position = 0
-        
-        for i, chunk_text in enumerate(split_texts):
+
+        for i, (span_start, span_end) in enumerate(split_spans):
+            chunk_text = text[span_start:span_end]
             if not chunk_text.strip():
                 continue
-            
-            start_idx = text.find(chunk_text, char_position)
+
+            # First occurrence at or after char_position; when the span itself qualifies,
+            # that occurrence cannot lie past it, so the search stops there.
+            if span_start >= char_position:
+                start_idx = text.find(chunk_text, char_position, span_end)
+            else:
+                start_idx = text.find(chunk_text, char_position)
             if start_idx == -1:
                 start_idx = char_position
-            
+
             end_idx = start_idx + len(chunk_text)
-            
+
             chunks.append(Chunk(
                 id=self._generate_chunk_id(doc_id, i, chunk_text),
                 text=chunk_text.strip(),
                 metadata=metadata.copy(),
                 start_index=start_idx,
                 end_index=end_idx,
-                token_count=self.count_tokens(chunk_text)
+                token_count=index.count(span_start, span_end)
             ))
-            
+
             char_position = end_idx
-        
+
         return chunks
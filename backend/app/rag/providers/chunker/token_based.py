@@ -1,6 +1,7 @@
+import os
 import re
 import hashlib
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 import tiktoken
 
@@ -14,19 +15,36 @@ class TokenBasedChunker(ChunkerStrategy):
         target_tokens: int = 650,
         max_tokens: int = 750,
         overlap_tokens: int = 50,
-        encoding_name: str = "cl100k_base"
+        encoding_name: str = "cl100k_base",
+        encode_threads: Optional[int] = None
     ):
         self._target_tokens = target_tokens
         self._max_tokens = max_tokens
         self._overlap_tokens = overlap_tokens
         self._encoding = tiktoken.get_encoding(encoding_name)
+        if encode_threads is None:
+            try:
+                encode_threads = int(os.getenv("RAG_CHUNKER_ENCODE_THREADS") or 1)
+            except ValueError:
+                encode_threads = 1
+        self._encode_threads = max(1, encode_threads)
     
     @property
     def strategy_name(self) -> str:
         return "token_based"
     
     def count_tokens(self, text: str) -> int:
-        return len(self._encoding.encode(text or ""))
+        return len(self._encoding.encode_ordinary(text or ""))
+
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        if not texts:
+            return []
+        if self._encode_threads > 1 and len(texts) > 1:
+            # tiktoken releases the GIL while encoding, so the batch API scales across threads.
+            batches = self._encoding.encode_ordinary_batch(texts, num_threads=self._encode_threads)
+            return [len(tokens) for tokens in batches]
+        encode = self._encoding.encode_ordinary
+        return [len(encode(text)) for text in texts]
     
     def _clean_text(self, text: str) -> str:
         if not text:
@@ -51,16 +69,17 @@ class TokenBasedChunker(ChunkerStrategy):
         
         metadata = metadata or {}
         sentences = self._split_into_sentences(clean_text)
+        # One batch encode per document; overlap windows reuse these counts.
+        sentence_token_counts = self.count_tokens_batch(sentences)
         
         chunks: List[Chunk] = []
         current_sentences: List[str] = []
+        current_counts: List[int] = []
         current_tokens = 0
         current_start = 0
         char_position = 0
         
-        for sentence in sentences:
-            sentence_tokens = self.count_tokens(sentence)
-            
+        for sentence, sentence_tokens in zip(sentences, sentence_token_counts):
             if sentence_tokens >= self._max_tokens:
                 if current_sentences:
                     chunk_text = " ".join(current_sentences)
@@ -73,6 +92,7 @@ class TokenBasedChunker(ChunkerStrategy):
                         token_count=current_tokens
                     ))
                     current_sentences = []
+                    current_counts = []
                     current_tokens = 0
                 
                 chunks.append(Chunk(
@@ -98,12 +118,12 @@ class TokenBasedChunker(ChunkerStrategy):
                     token_count=current_tokens
                 ))
                 
-                overlap_sentences = self._get_overlap_sentences(current_sentences)
-                current_sentences = overlap_sentences
-                current_tokens = sum(self.count_tokens(s) for s in overlap_sentences)
-                current_start = char_position - sum(len(s) + 1 for s in overlap_sentences)
+                current_sentences, current_counts = self._get_overlap_sentences(current_sentences, current_counts)
+                current_tokens = sum(current_counts)
+                current_start = char_position - sum(len(s) + 1 for s in current_sentences)
             
             current_sentences.append(sentence)
+            current_counts.append(sentence_tokens)
             current_tokens += sentence_tokens
             char_position += len(sentence) + 1
             
@@ -118,10 +138,9 @@ class TokenBasedChunker(ChunkerStrategy):
                     token_count=current_tokens
                 ))
                 
-                overlap_sentences = self._get_overlap_sentences(current_sentences)
-                current_sentences = overlap_sentences
-                current_tokens = sum(self.count_tokens(s) for s in overlap_sentences)
-                current_start = char_position - sum(len(s) + 1 for s in overlap_sentences)
+                current_sentences, current_counts = self._get_overlap_sentences(current_sentences, current_counts)
+                current_tokens = sum(current_counts)
+                current_start = char_position - sum(len(s) + 1 for s in current_sentences)
         
         if current_sentences:
             chunk_text = " ".join(current_sentences)
@@ -141,19 +160,24 @@ class TokenBasedChunker(ChunkerStrategy):
         sentences = sentence_endings.split(text)
         return [s.strip() for s in sentences if s.strip()]
     
-    def _get_overlap_sentences(self, sentences: List[str]) -> List[str]:
+    def _get_overlap_sentences(
+        self,
+        sentences: List[str],
+        token_counts: List[int]
+    ) -> Tuple[List[str], List[int]]:
         if not sentences or self._overlap_tokens <= 0:
-            return []
+            return [], []
         
         overlap: List[str] = []
+        overlap_counts: List[int] = []
         overlap_tokens = 0
         
-        for sentence in reversed(sentences):
-            tokens = self.count_tokens(sentence)
+        for sentence, tokens in zip(reversed(sentences), reversed(token_counts)):
             if overlap_tokens + tokens <= self._overlap_tokens:
                 overlap.insert(0, sentence)
+                overlap_counts.insert(0, tokens)
                 overlap_tokens += tokens
             else:
                 break
         
-        return overlap
+        return overlap, overlap_counts
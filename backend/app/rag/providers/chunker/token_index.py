@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+import regex
+import tiktoken
+
+_WHITESPACE = regex.compile(r"\s")
+
+
+class TokenOffsetIndex:
+    """
+    Token counts for any character span of one document, from a single tokenization.
+
+    tiktoken splits text into pre-token pieces with its regex and BPE-encodes each
+    piece on its own. The document is split once; per-piece token counts are kept
+    as prefix sums keyed by piece start offsets.
+
+    A span that starts and ends on piece boundaries tokenizes into exactly those
+    pieces, so its count is a prefix-sum difference. For any other span only the
+    edges are re-split: pieces are matched from the span start until they line up
+    with a document boundary, then from the last boundary before the span end (or
+    before trailing whitespace, which the pattern splits with lookahead). Every
+    count equals `len(encoding.encode_ordinary(text[start:end]))`.
+
+    This relies on the split pattern having no lookbehind. When it has one, or the
+    single pass does not reproduce tiktoken's own count, spans are encoded directly.
+    """
+
+    def __init__(self, encoding: tiktoken.Encoding, text: str) -> None:
+        self._encoding = encoding
+        self._text = text
+        self._piece_tokens: Dict[str, int] = {}
+        self._span_tokens: Dict[tuple, int] = {}
+        self._pattern: Optional[regex.Pattern] = None
+        self._starts: List[int] = []
+        self._prefix: List[int] = []
+        self.exact = False
+
+        pat_str = getattr(encoding, "_pat_str", None)
+        if not pat_str or "(?<" in pat_str or not hasattr(encoding, "_encode_single_piece"):
+            return
+        pattern = regex.compile(pat_str)
+        if pattern.groups:
+            return
+        pieces = pattern.findall(text)
+        starts = [0, *accumulate(map(len, pieces))]
+        # Unmatched characters are skipped by tiktoken too, but a gap breaks the map.
+        if starts[-1] != len(text):
+            return
+        prefix = [0, *accumulate(map(self._count_piece, pieces))]
+        if prefix[-1] != len(encoding.encode_ordinary(text)):
+            return
+
+        self._pattern = pattern
+        self._starts = starts
+        self._prefix = prefix
+        self.exact = True
+
+    @property
+    def total_tokens(self) -> int:
+        if self.exact:
+            return self._prefix[-1]
+        return self.count(0, len(self._text))
+
+    def _count_piece(self, piece: str) -> int:
+        cached = self._piece_tokens.get(piece)
+        if cached is None:
+            cached = len(self._encoding._encode_single_piece(piece))
+            self._piece_tokens[piece] = cached
+        return cached
+
+    def _boundary(self, offset: int) -> Optional[int]:
+        position = bisect_left(self._starts, offset)
+        if position < len(self._starts) and self._starts[position] == offset:
+            return position
+        return None
+
+    def _count_matches(self, start: int, end: int, *, stop_on_boundary: bool) -> tuple[int, int]:
+        """Tokens of the pieces matched in text[start:end]; stops after the first piece ending on a document boundary."""
+        assert self._pattern is not None
+        tokens = 0
+        for match in self._pattern.finditer(self._text, start, end):
+            tokens += self._count_piece(match.group())
+            if stop_on_boundary and self._boundary(match.end()) is not None:
+                return tokens, match.end()
+        return tokens, end
+
+    def count(self, start: int, end: int) -> int:
+        if end <= start:
+            return 0
+        if not self.exact:
+            key = (start, end)
+            cached = self._span_tokens.get(key)
+            if cached is None:
+                cached = len(self._encoding.encode_ordinary(self._text[start:end]))
+                self._span_tokens[key] = cached
+            return cached
+
+        # Whitespace pieces look ahead across their whole run, so a run reaching `end`
+        # may split differently inside the span than in the document.
+        stable_end = end
+        while stable_end > start and _WHITESPACE.match(self._text, stable_end - 1):
+            stable_end -= 1
+
+        first = self._boundary(start)
+        last = self._boundary(end)
+        if first is not None and last is not None and stable_end == end:
+            return self._prefix[last] - self._prefix[first]
+
+        tokens = 0
+        if first is None:
+            tokens, start = self._count_matches(start, end, stop_on_boundary=True)
+            if start >= end:
+                return tokens
+            first = self._boundary(start)
+        last = bisect_right(self._starts, stable_end) - 1
+        if last <= first:
+            return tokens + self._count_matches(start, end, stop_on_boundary=False)[0]
+        tail_tokens, _ = self._count_matches(self._starts[last], end, stop_on_boundary=False)
+        return tokens + self._prefix[last] - self._prefix[first] + tail_tokens
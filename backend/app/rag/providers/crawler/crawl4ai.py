@@ -10,6 +10,7 @@ import httpx
 
 from app.rag.interfaces import RawDocument, WebCrawlerProvider, WebCrawlerRequest
 from app.rag.interfaces.document_loader import DocumentType
+from app.services.http_client_pool import get_http_client_pool
 
 
 class Crawl4AIProvider(WebCrawlerProvider):
@@ -42,16 +43,27 @@ class Crawl4AIProvider(WebCrawlerProvider):
             headers["Authorization"] = f"Bearer {self._bearer_token}"
 
         timeout = httpx.Timeout(self._request_timeout_s)
-        async with httpx.AsyncClient(base_url=self._base_url, headers=headers, timeout=timeout) as client:
-            task_id, immediate_result = await self._submit_job(client, request)
-            if immediate_result is not None:
-                return self._normalize_documents(immediate_result, request)
+        client = await get_http_client_pool().get_client(
+            self._base_url,
+            auth_identity=self._auth_identity(),
+            headers=headers,
+            timeout=timeout,
+        )
+        task_id, immediate_result = await self._submit_job(client, request)
+        if immediate_result is not None:
+            return self._normalize_documents(immediate_result, request)
 
-            if not task_id:
-                raise ValueError("Crawl4AI did not return crawl results or a task identifier")
+        if not task_id:
+            raise ValueError("Crawl4AI did not return crawl results or a task identifier")
 
-            result_payload = await self._poll_for_result(client, task_id)
-            return self._normalize_documents(result_payload, request)
+        result_payload = await self._poll_for_result(client, task_id)
+        return self._normalize_documents(result_payload, request)
+
+    def _auth_identity(self) -> Optional[str]:
+        # The bearer token is a client default header, so pooled clients must not be shared across tokens.
+        if not self._bearer_token:
+            return None
+        return hashlib.sha256(self._bearer_token.encode("utf-8")).hexdigest()[:16]
 
     async def _submit_job(
         self,
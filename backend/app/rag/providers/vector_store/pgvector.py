@@ -1,8 +1,11 @@
 import os
 import asyncio
 import json
+import math
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 
+from app.core.env_loader import env_int
 from app.rag.interfaces.vector_store import (
     VectorStoreProvider,
     VectorDocument,
@@ -11,8 +14,162 @@ from app.rag.interfaces.vector_store import (
 )
 
 
+INDEX_METHOD_HNSW = "hnsw"
+INDEX_METHOD_IVFFLAT = "ivfflat"
+# pgvector caps hnsw.ef_search at 1000 and ivfflat lists at 32768.
+MAX_EF_SEARCH = 1000
+MAX_IVFFLAT_LISTS = 32768
+# An auto-sized ivfflat index is rebuilt once the collection needs this many times its lists.
+IVFFLAT_REBUILD_GROWTH = 2
+ITERATIVE_SCAN_MODES = {"off", "relaxed_order", "strict_order"}
+
+
+def _positive_int(value: Any) -> Optional[int]:
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed > 0 else None
+
+
+def _reloption_int(options: Optional[List[str]], name: str) -> Optional[int]:
+    for option in options or []:
+        key, _, value = str(option).partition("=")
+        if key == name:
+            return _positive_int(value)
+    return None
+
+
+@dataclass(frozen=True)
+class PgvectorIndexProfile:
+    """ANN index settings for one collection, read from the knowledge store's `index_profile`."""
+
+    method: str = INDEX_METHOD_HNSW
+    m: int = 16
+    ef_construction: int = 64
+    lists: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "PgvectorIndexProfile":
+        config = config if isinstance(config, dict) else {}
+        method = str(config.get("method") or os.getenv("PGVECTOR_INDEX_METHOD") or INDEX_METHOD_HNSW).strip().lower()
+        if method not in {INDEX_METHOD_HNSW, INDEX_METHOD_IVFFLAT}:
+            raise ValueError(f"Unsupported pgvector index method '{method}'")
+        return cls(
+            method=method,
+            m=_positive_int(config.get("m")) or env_int("PGVECTOR_HNSW_M", 16),
+            ef_construction=_positive_int(config.get("ef_construction"))
+            or env_int("PGVECTOR_HNSW_EF_CONSTRUCTION", 64),
+            lists=_positive_int(config.get("lists")),
+        )
+
+    @property
+    def sized_from_rows(self) -> bool:
+        """ivfflat without explicit `lists` is sized from, and trained on, the rows present at build time."""
+        return self.method == INDEX_METHOD_IVFFLAT and not self.lists
+
+    def ivfflat_lists(self, row_estimate: int) -> int:
+        """Explicit `lists`, else pgvector's guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond."""
+        if self.lists:
+            return min(self.lists, MAX_IVFFLAT_LISTS)
+        rows = max(0, int(row_estimate))
+        lists = rows // 1000 if rows <= 1_000_000 else int(math.sqrt(rows))
+        return min(max(1, lists), MAX_IVFFLAT_LISTS)
+
+    def index_sql(self, table: str, distance_op: str, row_estimate: int) -> str:
+        if self.method == INDEX_METHOD_IVFFLAT:
+            return f"""
+                CREATE INDEX IF NOT EXISTS {table}_embedding_idx
+                ON {table} USING ivfflat (embedding {distance_op})
+                WITH (lists = {self.ivfflat_lists(row_estimate)})
+            """
+        return f"""
+            CREATE INDEX IF NOT EXISTS {table}_embedding_idx
+            ON {table} USING hnsw (embedding {distance_op})
+            WITH (m = {int(self.m)}, ef_construction = {int(self.ef_construction)})
+        """
+
+
+def _filter_scalar_variants(value: Any) -> List[Any]:
+    """
+    JSON values that match `value` for a metadata filter.
+
+    Filters used to compare `metadata->>key` as text, so "3" matched a stored 3 and
+    vice versa; containment is type-strict, so both spellings are searched.
+    """
+    if isinstance(value, bool):
+        return [value, "true" if value else "false"]
+    if isinstance(value, (int, float)):
+        return [value, str(value)]
+    if isinstance(value, str):
+        variants: List[Any] = [value]
+        lowered = value.strip().lower()
+        if lowered in {"true", "false"}:
+            variants.append(lowered == "true")
+        else:
+            try:
+                number = int(value) if lowered.lstrip("-").isdigit() else float(value)
+            except ValueError:
+                number = None
+            if number is not None and math.isfinite(number):
+                variants.append(number)
+        return variants
+    return [value]
+
+
+def build_metadata_filter_clauses(
+    filter: Optional[Dict[str, Any]],
+    first_param_idx: int,
+) -> tuple[List[str], List[str]]:
+    """
+    Translate a metadata filter into `metadata @> $n::jsonb` clauses.
+
+    Containment is served by the collection's GIN (jsonb_path_ops) index; `$in` and
+    loosely typed values become an OR of containments, which the planner answers with
+    a BitmapOr over the same index. Keys travel as JSON parameters, never as SQL text.
+    """
+    clauses: List[str] = []
+    params: List[str] = []
+    param_idx = first_param_idx
+    for key, condition in (filter or {}).items():
+        if isinstance(condition, dict):
+            unknown = set(condition) - {"$eq", "$in"}
+            if unknown:
+                raise ValueError(f"Unsupported metadata filter operator(s) for '{key}': {sorted(unknown)}")
+            values: List[Any] = []
+            if "$eq" in condition:
+                values.append(condition["$eq"])
+            if "$in" in condition:
+                in_values = condition["$in"]
+                values.extend(in_values if isinstance(in_values, (list, tuple, set)) else [in_values])
+        else:
+            values = [condition]
+
+        alternatives: List[str] = []
+        seen: set[str] = set()
+        for value in values:
+            for variant in _filter_scalar_variants(value):
+                encoded = json.dumps({str(key): variant}, sort_keys=True, default=str)
+                if encoded in seen:
+                    continue
+                seen.add(encoded)
+                alternatives.append(f"metadata @> ${param_idx}::jsonb")
+                params.append(encoded)
+                param_idx += 1
+        if not alternatives:
+            # An empty `$in` matches nothing.
+            clauses.append("FALSE")
+        elif len(alternatives) == 1:
+            clauses.append(alternatives[0])
+        else:
+            clauses.append("(" + " OR ".join(alternatives) + ")")
+    return clauses, params
+
+
 class PgvectorVectorStore(VectorStoreProvider):
     MAX_IVFFLAT_DIMENSION = 2000
+    # HNSW and ivfflat on `vector` share pgvector's 2000-dimension limit.
+    MAX_INDEXED_DIMENSION = 2000
     
     def __init__(
         self,
@@ -22,6 +179,7 @@ class PgvectorVectorStore(VectorStoreProvider):
         self._connection_string = connection_string or os.getenv("PGVECTOR_CONNECTION_STRING")
         self._table_prefix = table_prefix
         self._pool = None
+        self._ensured_indexes: set[str] = set()
     
     @property
     def provider_name(self) -> str:
@@ -59,15 +217,24 @@ class PgvectorVectorStore(VectorStoreProvider):
         metric: str = "cosine",
         **kwargs: Any
     ) -> bool:
+        """
+        Create the collection table and its indexes.
+
+        `index_profile` (dict or PgvectorIndexProfile) selects HNSW (default) or ivfflat.
+        Existing indexes are left as they are; use `rebuild_embedding_index` to switch
+        profiles. An ivfflat index without explicit `lists` is built and resized by
+        `ensure_embedding_index` once rows have been written.
+        """
         try:
             pool = await self._get_pool()
             table = self._table_name(name)
+            if table in self._ensured_indexes:
+                return True
+            profile = kwargs.get("index_profile")
+            if not isinstance(profile, PgvectorIndexProfile):
+                profile = PgvectorIndexProfile.from_config(profile)
             
-            distance_op = {
-                "cosine": "vector_cosine_ops",
-                "euclidean": "vector_l2_ops",
-                "inner_product": "vector_ip_ops"
-            }.get(metric, "vector_cosine_ops")
+            distance_op = self._distance_op(metric)
             
             async with pool.acquire() as conn:
                 await conn.execute(f"""
@@ -80,25 +247,124 @@ class PgvectorVectorStore(VectorStoreProvider):
                     )
                 """)
 
-                # ivfflat rejects dimensions above 2000; keep the table usable and
-                # fall back to exact search when embeddings exceed that threshold.
-                if dimension <= self.MAX_IVFFLAT_DIMENSION:
-                    await conn.execute(f"""
-                        CREATE INDEX IF NOT EXISTS {table}_embedding_idx 
-                        ON {table} USING ivfflat (embedding {distance_op})
-                        WITH (lists = 100)
-                    """)
+                # pgvector indexes reject dimensions above 2000; keep the table usable and
+                # fall back to exact search when embeddings exceed that threshold. An
+                # auto-sized ivfflat index waits for `ensure_embedding_index`: built on an
+                # empty table it would get a single list.
+                if dimension <= self.MAX_INDEXED_DIMENSION and not profile.sized_from_rows:
+                    row_estimate = await self._estimate_rows(conn, table)
+                    await conn.execute(profile.index_sql(table, distance_op, row_estimate))
                 
                 await conn.execute(f"""
                     CREATE INDEX IF NOT EXISTS {table}_namespace_idx 
                     ON {table} (namespace)
                 """)
+                await conn.execute(f"""
+                    CREATE INDEX IF NOT EXISTS {table}_metadata_idx
+                    ON {table} USING gin (metadata jsonb_path_ops)
+                """)
             
+            self._ensured_indexes.add(table)
             return True
         except Exception as e:
             raise RuntimeError(
                 f"PGVector create_index failed for collection '{name}': {e}"
             ) from e
+
+    async def rebuild_embedding_index(
+        self,
+        name: str,
+        metric: str = "cosine",
+        index_profile: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Rebuild the ANN index with the given profile, sizing ivfflat lists from the current row estimate."""
+        try:
+            pool = await self._get_pool()
+            table = self._table_name(name)
+            profile = PgvectorIndexProfile.from_config(index_profile)
+            async with pool.acquire() as conn:
+                row_estimate = await self._analyzed_row_estimate(conn, table)
+                await conn.execute(f"DROP INDEX IF EXISTS {table}_embedding_idx")
+                await conn.execute(profile.index_sql(table, self._distance_op(metric), row_estimate))
+                await conn.execute(f"ANALYZE {table}")
+            return True
+        except Exception as e:
+            raise RuntimeError(
+                f"PGVector rebuild_embedding_index failed for collection '{name}': {e}"
+            ) from e
+
+    async def ensure_embedding_index(
+        self,
+        name: str,
+        metric: str = "cosine",
+        index_profile: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Build or resize an auto-sized ivfflat index after rows were written; True if it was (re)built.
+
+        The index is built once the collection has rows and rebuilt when the row count
+        calls for `IVFFLAT_REBUILD_GROWTH` times its current lists. Other profiles are
+        built by `create_index` and left alone.
+        """
+        profile = PgvectorIndexProfile.from_config(index_profile)
+        if not profile.sized_from_rows:
+            return False
+        try:
+            pool = await self._get_pool()
+            table = self._table_name(name)
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    SELECT a.atttypmod AS dimension,
+                           (SELECT reloptions FROM pg_class WHERE oid = to_regclass($2)) AS options,
+                           to_regclass($2) IS NOT NULL AS indexed
+                    FROM pg_attribute a
+                    WHERE a.attrelid = to_regclass($1) AND a.attname = 'embedding' AND NOT a.attisdropped
+                    """,
+                    table,
+                    f"{table}_embedding_idx",
+                )
+                if not row or not 0 < (row["dimension"] or 0) <= self.MAX_INDEXED_DIMENSION:
+                    return False
+                row_estimate = await self._analyzed_row_estimate(conn, table)
+            if row_estimate <= 0:
+                return False
+            current_lists = _reloption_int(row["options"], "lists") if row["indexed"] else None
+            if current_lists is not None and profile.ivfflat_lists(row_estimate) < current_lists * IVFFLAT_REBUILD_GROWTH:
+                return False
+        except Exception as e:
+            raise RuntimeError(
+                f"PGVector ensure_embedding_index failed for collection '{name}': {e}"
+            ) from e
+        return await self.rebuild_embedding_index(name, metric, index_profile)
+
+    @staticmethod
+    def _distance_op(metric: str) -> str:
+        return {
+            "cosine": "vector_cosine_ops",
+            "euclidean": "vector_l2_ops",
+            "inner_product": "vector_ip_ops"
+        }.get(metric, "vector_cosine_ops")
+
+    @staticmethod
+    async def _estimate_rows(conn, table: str) -> int:
+        """Planner row estimate from pg_class; `reltuples` is -1 until the table is first analyzed."""
+        row = await conn.fetchrow(
+            "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = to_regclass($1)",
+            table,
+        )
+        if not row or row["estimate"] is None:
+            return 0
+        return max(0, int(row["estimate"]))
+
+    @classmethod
+    async def _analyzed_row_estimate(cls, conn, table: str) -> int:
+        """Row estimate, analyzing the table first if it has no statistics yet."""
+        row_estimate = await cls._estimate_rows(conn, table)
+        if row_estimate <= 0:
+            await conn.execute(f"ANALYZE {table}")
+            row_estimate = await cls._estimate_rows(conn, table)
+        return row_estimate
     
     async def delete_index(self, name: str) -> bool:
         try:
@@ -107,6 +373,7 @@ class PgvectorVectorStore(VectorStoreProvider):
             
             async with pool.acquire() as conn:
                 await conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._ensured_indexes.discard(table)
             
             return True
         except Exception:
@@ -133,26 +400,64 @@ class PgvectorVectorStore(VectorStoreProvider):
             return []
     
     async def get_index_stats(self, name: str) -> Optional[IndexStats]:
+        """
+        Approximate collection stats from the catalog rather than scanning the table.
+
+        Row counts come from pg_class and namespace counts from the namespace column's
+        most-common-values statistics. Tables that have never been analyzed, or small
+        tables without usable statistics, fall back to exact counts.
+        """
         try:
             pool = await self._get_pool()
             table = self._table_name(name)
+            exact_max_rows = env_int("PGVECTOR_EXACT_STATS_MAX_ROWS", 50_000)
             
             async with pool.acquire() as conn:
-                count_row = await conn.fetchrow(f"SELECT COUNT(*) as count FROM {table}")
-                total_count = count_row["count"] if count_row else 0
-                
-                dim_row = await conn.fetchrow(f"""
-                    SELECT vector_dims(embedding) as dim 
-                    FROM {table} LIMIT 1
-                """)
-                dimension = dim_row["dim"] if dim_row else 0
-                
-                ns_rows = await conn.fetch(f"""
-                    SELECT namespace, COUNT(*) as count 
-                    FROM {table} 
-                    GROUP BY namespace
-                """)
-                namespaces = {row["namespace"] or "": row["count"] for row in ns_rows}
+                catalog_row = await conn.fetchrow("""
+                    SELECT c.reltuples::bigint AS estimate, a.atttypmod AS dimension
+                    FROM pg_class c
+                    LEFT JOIN pg_attribute a
+                        ON a.attrelid = c.oid AND a.attname = 'embedding' AND NOT a.attisdropped
+                    WHERE c.oid = to_regclass($1)
+                """, table)
+                if not catalog_row:
+                    return None
+                estimate = catalog_row["estimate"]
+                dimension = catalog_row["dimension"] if (catalog_row["dimension"] or 0) > 0 else 0
+                analyzed = estimate is not None and estimate >= 0
+
+                if analyzed:
+                    total_count = int(estimate)
+                else:
+                    count_row = await conn.fetchrow(f"SELECT COUNT(*) as count FROM {table}")
+                    total_count = count_row["count"] if count_row else 0
+
+                if not dimension and total_count:
+                    dim_row = await conn.fetchrow(f"""
+                        SELECT vector_dims(embedding) as dim 
+                        FROM {table} LIMIT 1
+                    """)
+                    dimension = dim_row["dim"] if dim_row else 0
+
+                namespaces: Dict[str, int] = {}
+                if analyzed:
+                    stats_row = await conn.fetchrow("""
+                        SELECT most_common_vals::text::text[] AS vals,
+                               most_common_freqs AS freqs,
+                               null_frac
+                        FROM pg_stats
+                        WHERE schemaname = current_schema() AND tablename = $1 AND attname = 'namespace'
+                    """, table)
+                    if stats_row and stats_row["vals"]:
+                        for value, freq in zip(stats_row["vals"], stats_row["freqs"] or []):
+                            namespaces[value or ""] = int(round(float(freq) * total_count))
+                if not namespaces and total_count <= exact_max_rows:
+                    ns_rows = await conn.fetch(f"""
+                        SELECT namespace, COUNT(*) as count 
+                        FROM {table} 
+                        GROUP BY namespace
+                    """)
+                    namespaces = {row["namespace"] or "": row["count"] for row in ns_rows}
             
             return IndexStats(
                 name=name,
@@ -223,8 +528,19 @@ class PgvectorVectorStore(VectorStoreProvider):
         query_vector: List[float],
         top_k: int = 10,
         namespace: Optional[str] = None,
-        filter: Optional[Dict[str, Any]] = None
+        filter: Optional[Dict[str, Any]] = None,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        iterative_scan: Optional[str] = None,
     ) -> List[VectorSearchResult]:
+        """
+        Nearest-neighbour search with metadata filters pushed into SQL.
+
+        `ef_search` (HNSW) and `probes` (ivfflat) are applied with SET LOCAL for this
+        query only. `iterative_scan` (pgvector >= 0.8) lets filtered HNSW/ivfflat scans
+        keep searching until `top_k` rows pass the filter.
+        """
         try:
             pool = await self._get_pool()
             table = self._table_name(index_name)
@@ -234,7 +550,7 @@ class PgvectorVectorStore(VectorStoreProvider):
                 FROM {table}
                 WHERE 1=1
             """
-            params = [self._to_pgvector_literal(query_vector)]
+            params: List[Any] = [self._to_pgvector_literal(query_vector)]
             param_idx = 2
             
             if namespace:
@@ -242,21 +558,25 @@ class PgvectorVectorStore(VectorStoreProvider):
                 params.append(namespace)
                 param_idx += 1
             
-            if filter:
-                for key, value in filter.items():
-                    if isinstance(value, dict) and "$in" in value:
-                        query += f" AND metadata->>'{key}' = ANY(${param_idx})"
-                        params.append(value["$in"])
-                    else:
-                        query += f" AND metadata->>'{key}' = ${param_idx}"
-                        params.append(str(value))
-                    param_idx += 1
+            filter_clauses, filter_params = build_metadata_filter_clauses(filter, param_idx)
+            for clause in filter_clauses:
+                query += f" AND {clause}"
+            params.extend(filter_params)
+            param_idx += len(filter_params)
             
             query += f" ORDER BY embedding <=> $1::vector LIMIT ${param_idx}"
             params.append(top_k)
+
+            settings = self._search_settings(ef_search=ef_search, probes=probes, iterative_scan=iterative_scan)
             
             async with pool.acquire() as conn:
-                rows = await conn.fetch(query, *params)
+                if settings:
+                    async with conn.transaction():
+                        for setting in settings:
+                            await conn.execute(setting)
+                        rows = await conn.fetch(query, *params)
+                else:
+                    rows = await conn.fetch(query, *params)
             
             return [
                 VectorSearchResult(
@@ -268,3 +588,26 @@ class PgvectorVectorStore(VectorStoreProvider):
             ]
         except Exception as e:
             raise RuntimeError(f"PGVector search failed for collection '{index_name}': {e}") from e
+
+    @staticmethod
+    def _search_settings(
+        *,
+        ef_search: Optional[int],
+        probes: Optional[int],
+        iterative_scan: Optional[str],
+    ) -> List[str]:
+        settings: List[str] = []
+        ef_search = _positive_int(ef_search)
+        if ef_search:
+            settings.append(f"SET LOCAL hnsw.ef_search = {min(ef_search, MAX_EF_SEARCH)}")
+        probes = _positive_int(probes)
+        if probes:
+            settings.append(f"SET LOCAL ivfflat.probes = {min(probes, MAX_IVFFLAT_LISTS)}")
+        mode = str(iterative_scan or "").strip().lower()
+        if mode and mode != "off":
+            if mode not in ITERATIVE_SCAN_MODES:
+                raise ValueError(f"Unsupported pgvector iterative_scan mode '{iterative_scan}'")
+            settings.append(f"SET LOCAL hnsw.iterative_scan = {mode}")
+            if mode == "relaxed_order":
+                settings.append(f"SET LOCAL ivfflat.iterative_scan = {mode}")
+        return settings
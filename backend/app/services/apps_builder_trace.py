@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-import json
+from functools import lru_cache
 import os
-import threading
+import random
 from typing import Any
 
+from app.services.trace_sink import get_trace_sink
+
 _DEFAULT_TRACE_FILE = "/tmp/talmudpedia-apps-builder-events.jsonl"
-_WRITE_LOCK = threading.Lock()
 
 
 def apps_builder_trace_enabled() -> bool:
@@ -23,27 +24,55 @@ def apps_builder_trace_file_path() -> str:
     return path or _DEFAULT_TRACE_FILE
 
 
+@lru_cache(maxsize=8)
+def _parse_sample_rates(raw: str) -> dict[str, float]:
+    rates: dict[str, float] = {}
+    for item in raw.split(","):
+        key, sep, value = item.partition("=")
+        if not sep or not key.strip():
+            continue
+        try:
+            rates[key.strip()] = min(1.0, max(0.0, float(value)))
+        except ValueError:
+            continue
+    return rates
+
+
+def apps_builder_trace_sample_rate(event: str, domain: str) -> float:
+    """Sampling rate for an event, from `APPS_BUILDER_TRACE_SAMPLE_RATES`.
+
+    The variable holds comma-separated `key=rate` rules; an exact event name wins over
+    its domain, which wins over `*`. Unlisted events are always kept.
+    """
+    raw = str(os.getenv("APPS_BUILDER_TRACE_SAMPLE_RATES") or "").strip()
+    if not raw:
+        return 1.0
+    rates = _parse_sample_rates(raw)
+    for key in (event, domain, "*"):
+        if key in rates:
+            return rates[key]
+    return 1.0
+
+
 def apps_builder_trace(event: str, *, domain: str, **fields: Any) -> None:
     if not apps_builder_trace_enabled():
         return
 
+    event_name = str(event or "").strip() or "unknown"
+    domain_name = str(domain or "").strip() or "unknown"
+    sample_rate = apps_builder_trace_sample_rate(event_name, domain_name)
+    if sample_rate < 1.0 and random.random() >= sample_rate:
+        return
+
     payload: dict[str, Any] = {
         "ts": datetime.now(timezone.utc).isoformat(),
-        "event": str(event or "").strip() or "unknown",
-        "domain": str(domain or "").strip() or "unknown",
+        "event": event_name,
+        "domain": domain_name,
         "pid": os.getpid(),
         **fields,
     }
+    if sample_rate < 1.0:
+        payload["sample_rate"] = sample_rate
 
-    try:
-        rendered = json.dumps(payload, sort_keys=True, default=str)
-    except Exception:
-        rendered = str(payload)
-
-    try:
-        with _WRITE_LOCK:
-            with open(apps_builder_trace_file_path(), "a", encoding="utf-8") as handle:
-                handle.write(rendered + "\n")
-    except Exception:
-        # Tracing must never block request or sandbox execution paths.
-        pass
+    # The line is rendered here; only the file I/O happens on the trace sink's writer thread.
+    get_trace_sink().emit(apps_builder_trace_file_path(), payload)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import struct
+from typing import AsyncIterator, Protocol
+
+_WAV_MIME_TYPES = {"audio/wav", "audio/x-wav", "audio/wave", "audio/vnd.wave"}
+_PCM_MIME_TYPES = {"audio/l16", "audio/pcm", "audio/x-pcm"}
+_WAVE_FORMAT_PCM = 1
+_STREAMING_DATA_SIZES = {0, 0xFFFFFFFF}
+_SKIP_CHUNK_BYTES = 64 * 1024
+
+
+class AudioSegmentationError(ValueError):
+    pass
+
+
+class AsyncByteReader(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+@dataclass(frozen=True)
+class PcmFormat:
+    sample_rate: int
+    channels: int
+    block_align: int
+    fmt_chunk: bytes
+
+    @classmethod
+    def pcm(cls, *, sample_rate: int, channels: int = 1, sample_width: int = 2) -> "PcmFormat":
+        block_align = channels * sample_width
+        fmt_chunk = struct.pack(
+            "<HHIIHH",
+            _WAVE_FORMAT_PCM,
+            channels,
+            sample_rate,
+            sample_rate * block_align,
+            block_align,
+            sample_width * 8,
+        )
+        return cls(sample_rate=sample_rate, channels=channels, block_align=block_align, fmt_chunk=fmt_chunk)
+
+
+@dataclass(frozen=True)
+class AudioSegment:
+    index: int
+    start_ms: int
+    end_ms: int
+    wav_bytes: bytes
+
+
+def _mime_base_and_params(mime_type: str | None) -> tuple[str, dict[str, str]]:
+    parts = [part.strip() for part in str(mime_type or "").split(";")]
+    params: dict[str, str] = {}
+    for part in parts[1:]:
+        key, _, value = part.partition("=")
+        if key and value:
+            params[key.strip().lower()] = value.strip().strip('"')
+    return parts[0].lower(), params
+
+
+def pcm_format_from_mime(mime_type: str | None) -> PcmFormat | None:
+    """Raw 16-bit PCM described by its mime type, e.g. `audio/L16; rate=16000; channels=1`."""
+    base, params = _mime_base_and_params(mime_type)
+    if base not in _PCM_MIME_TYPES:
+        return None
+    try:
+        sample_rate = int(params.get("rate") or 16000)
+        channels = int(params.get("channels") or 1)
+    except ValueError as exc:
+        raise AudioSegmentationError(f"Invalid PCM parameters in mime type '{mime_type}'") from exc
+    if sample_rate <= 0 or channels <= 0:
+        raise AudioSegmentationError(f"Invalid PCM parameters in mime type '{mime_type}'")
+    return PcmFormat.pcm(sample_rate=sample_rate, channels=channels)
+
+
+def is_segmentable_audio(mime_type: str | None, filename: str | None = None) -> bool:
+    base, _params = _mime_base_and_params(mime_type)
+    if base in _WAV_MIME_TYPES or base in _PCM_MIME_TYPES:
+        return True
+    return str(filename or "").lower().endswith(".wav")
+
+
+def build_wav(pcm_format: PcmFormat, pcm: bytes) -> bytes:
+    fmt_size = len(pcm_format.fmt_chunk)
+    header = b"".join(
+        [
+            b"RIFF",
+            struct.pack("<I", 4 + 8 + fmt_size + (fmt_size % 2) + 8 + len(pcm)),
+            b"WAVE",
+            b"fmt ",
+            struct.pack("<I", fmt_size),
+            pcm_format.fmt_chunk,
+            b"\x00" * (fmt_size % 2),
+            b"data",
+            struct.pack("<I", len(pcm)),
+        ]
+    )
+    return header + pcm
+
+
+async def _read_exact(reader: AsyncByteReader, size: int) -> bytes:
+    parts: list[bytes] = []
+    remaining = size
+    while remaining > 0:
+        chunk = await reader.read(remaining)
+        if not chunk:
+            break
+        parts.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(parts)
+
+
+async def _skip(reader: AsyncByteReader, size: int) -> None:
+    remaining = size
+    while remaining > 0:
+        chunk = await reader.read(min(remaining, _SKIP_CHUNK_BYTES))
+        if not chunk:
+            return
+        remaining -= len(chunk)
+
+
+async def read_wav_header(reader: AsyncByteReader) -> tuple[PcmFormat, int | None]:
+    """Consume a RIFF/WAVE header up to the start of the `data` payload.
+
+    Returns the sample format and the declared data length (None when the writer
+    streamed the file and left the length unset).
+    """
+    riff = await _read_exact(reader, 12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        raise AudioSegmentationError("Audio is not a RIFF/WAVE file")
+
+    pcm_format: PcmFormat | None = None
+    while True:
+        chunk_header = await _read_exact(reader, 8)
+        if len(chunk_header) < 8:
+            raise AudioSegmentationError("WAV file has no data chunk")
+        chunk_id = chunk_header[:4]
+        (chunk_size,) = struct.unpack("<I", chunk_header[4:])
+        if chunk_id == b"fmt ":
+            fmt_chunk = await _read_exact(reader, chunk_size)
+            if len(fmt_chunk) < 16:
+                raise AudioSegmentationError("WAV fmt chunk is truncated")
+            if chunk_size % 2:
+                await _skip(reader, 1)
+            _audio_format, channels, sample_rate, _byte_rate, block_align, _bits = struct.unpack(
+                "<HHIIHH", fmt_chunk[:16]
+            )
+            if channels <= 0 or sample_rate <= 0 or block_align <= 0:
+                raise AudioSegmentationError("WAV fmt chunk describes an empty stream")
+            pcm_format = PcmFormat(
+                sample_rate=sample_rate,
+                channels=channels,
+                block_align=block_align,
+                fmt_chunk=fmt_chunk,
+            )
+            continue
+        if chunk_id == b"data":
+            if pcm_format is None:
+                raise AudioSegmentationError("WAV data chunk precedes its fmt chunk")
+            return pcm_format, None if chunk_size in _STREAMING_DATA_SIZES else chunk_size
+        await _skip(reader, chunk_size + (chunk_size % 2))
+
+
+async def iter_audio_segments(
+    reader: AsyncByteReader,
+    *,
+    mime_type: str | None = None,
+    filename: str | None = None,
+    segment_seconds: float = 30.0,
+) -> AsyncIterator[AudioSegment]:
+    """Split WAV or raw PCM audio into standalone WAV segments of at most `segment_seconds`.
+
+    Only one segment's worth of samples is read at a time, so memory does not grow
+    with the length of the recording.
+    """
+    pcm_format = pcm_format_from_mime(mime_type)
+    remaining: int | None = None
+    if pcm_format is None:
+        if not is_segmentable_audio(mime_type, filename):
+            raise AudioSegmentationError(f"Cannot segment audio of type '{mime_type or filename}'")
+        pcm_format, remaining = await read_wav_header(reader)
+
+    block_align = pcm_format.block_align
+    frames_per_segment = max(1, int(pcm_format.sample_rate * max(segment_seconds, 0.001)))
+    segment_bytes = frames_per_segment * block_align
+    frames_read = 0
+    index = 0
+    while remaining is None or remaining > 0:
+        want = segment_bytes if remaining is None else min(segment_bytes, remaining)
+        pcm = await _read_exact(reader, want)
+        if remaining is not None:
+            remaining -= len(pcm)
+        # Drop a trailing partial frame rather than hand the provider misaligned samples.
+        pcm = pcm[: len(pcm) - (len(pcm) % block_align)]
+        if not pcm:
+            break
+        frames = len(pcm) // block_align
+        yield AudioSegment(
+            index=index,
+            start_ms=frames_read * 1000 // pcm_format.sample_rate,
+            end_ms=(frames_read + frames) * 1000 // pcm_format.sample_rate,
+            wav_bytes=build_wav(pcm_format, pcm),
+        )
+        frames_read += frames
+        index += 1
+        if len(pcm) < want:
+            break
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from typing import Any
+
+from app.core.env_loader import env_int
+
+logger = logging.getLogger(__name__)
+
+# (doc_id, text, metadata) — plain tuples so batches pickle cheaply to worker processes.
+ChunkingDocument = tuple[str, str, dict[str, Any]]
+
+
+def normalize_chunking_documents(documents: Any) -> list[ChunkingDocument]:
+    """Normalize pipeline payloads (dicts with text/content, or raw values) into chunker inputs."""
+    if not isinstance(documents, list):
+        documents = [documents]
+    normalized: list[ChunkingDocument] = []
+    for doc in documents:
+        if isinstance(doc, dict):
+            text = doc.get("text") or doc.get("content", "")
+            doc_id = str(doc.get("id", "unknown"))
+            metadata = doc.get("metadata", {})
+        else:
+            text = str(doc)
+            doc_id = "unknown"
+            metadata = {}
+        normalized.append((doc_id, text, metadata))
+    return normalized
+
+
+@lru_cache(maxsize=32)
+def _cached_chunker(config_key: str):
+    """One chunker (and so one loaded tiktoken encoder) per config per process."""
+    from app.rag.factory import ChunkerConfig, RAGFactory
+
+    return RAGFactory.create_chunker(ChunkerConfig(**json.loads(config_key)))
+
+
+def _chunk_batch(config_key: str, documents: list[ChunkingDocument]) -> list[dict[str, Any]]:
+    chunker = _cached_chunker(config_key)
+    chunks: list[dict[str, Any]] = []
+    for doc_id, text, metadata in documents:
+        chunks.extend(chunk.model_dump() for chunk in chunker.chunk(text, doc_id=doc_id, metadata=metadata))
+    return chunks
+
+
+def _init_worker() -> None:
+    # Parallelism comes from the pool; keep each worker's encoder single-threaded.
+    os.environ["RAG_CHUNKER_ENCODE_THREADS"] = "1"
+
+
+class ChunkingService:
+    """
+    Runs chunkers off the event loop.
+
+    Small inputs are chunked in a thread. Inputs of at least `min_parallel_chars`
+    characters are split into contiguous batches and chunked on a process pool, so
+    tokenization uses every core instead of holding the GIL of the serving process.
+    Batches are gathered in submission order, so the output order matches the input
+    order. Each worker caches its chunkers and their encoders across batches.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int | None = None,
+        min_parallel_chars: int | None = None,
+        batches_per_worker: int | None = None,
+        start_method: str | None = None,
+    ) -> None:
+        self._max_workers = (
+            max_workers if max_workers is not None else env_int("RAG_CHUNKING_PROCESSES", os.cpu_count() or 1)
+        )
+        self._min_parallel_chars = (
+            min_parallel_chars
+            if min_parallel_chars is not None
+            else env_int("RAG_CHUNKING_PARALLEL_MIN_CHARS", 200_000)
+        )
+        self._batches_per_worker = max(
+            1,
+            batches_per_worker if batches_per_worker is not None else env_int("RAG_CHUNKING_BATCHES_PER_WORKER", 4),
+        )
+        # spawn/forkserver workers do not inherit the serving process's threads or locks.
+        self._start_method = start_method or os.getenv("RAG_CHUNKING_START_METHOD") or "spawn"
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        return max(0, self._max_workers)
+
+    def _pool_available(self) -> bool:
+        # Celery prefork children are daemonic and may not start their own processes.
+        return self.max_workers > 1 and not multiprocessing.current_process().daemon
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self._start_method),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def plan_batches(self, documents: list[ChunkingDocument]) -> list[list[ChunkingDocument]]:
+        """Contiguous batches of roughly equal character volume, `batches_per_worker` per worker."""
+        if not documents:
+            return []
+        total_chars = sum(len(text or "") for _doc_id, text, _metadata in documents)
+        target_batches = max(1, min(len(documents), self.max_workers * self._batches_per_worker))
+        batch_chars = max(1, total_chars // target_batches)
+        batches: list[list[ChunkingDocument]] = []
+        current: list[ChunkingDocument] = []
+        current_chars = 0
+        for document in documents:
+            current.append(document)
+            current_chars += len(document[1] or "")
+            if current_chars >= batch_chars:
+                batches.append(current)
+                current = []
+                current_chars = 0
+        if current:
+            batches.append(current)
+        return batches
+
+    async def chunk_documents(self, chunker_config: Any, documents: Any) -> list[dict[str, Any]]:
+        """Chunk documents with the chunker described by `chunker_config`; returns chunk dicts in input order."""
+        config_key = json.dumps(chunker_config.model_dump(mode="json"), sort_keys=True)
+        normalized = normalize_chunking_documents(documents)
+        if not normalized:
+            return []
+        total_chars = sum(len(text or "") for _doc_id, text, _metadata in normalized)
+        if total_chars < self._min_parallel_chars or not self._pool_available():
+            return await asyncio.to_thread(_chunk_batch, config_key, normalized)
+
+        batches = self.plan_batches(normalized)
+        if len(batches) < 2:
+            return await asyncio.to_thread(_chunk_batch, config_key, normalized)
+
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        try:
+            results = await asyncio.gather(
+                *(loop.run_in_executor(pool, _chunk_batch, config_key, batch) for batch in batches)
+            )
+        except BrokenProcessPool:
+            logger.warning("Chunking process pool broke; chunking this request in-process", exc_info=True)
+            self._discard_pool(pool)
+            return await asyncio.to_thread(_chunk_batch, config_key, normalized)
+        chunks: list[dict[str, Any]] = []
+        for batch_chunks in results:
+            chunks.extend(batch_chunks)
+        return chunks
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            pool = self._pool
+            self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+_CHUNKING_SERVICE = ChunkingService()
+
+
+def get_chunking_service() -> ChunkingService:
+    return _CHUNKING_SERVICE
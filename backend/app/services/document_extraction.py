@@ -0,0 +1,441 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import csv
+from dataclasses import dataclass
+import io
+import json
+import logging
+import multiprocessing
+import os
+from pathlib import Path
+import threading
+import weakref
+from typing import Any, Awaitable, Callable
+from xml.etree import ElementTree
+from zipfile import ZipFile
+
+from app.core.env_loader import env_float, env_int, running_under_pytest
+
+logger = logging.getLogger(__name__)
+
+MAX_DOCUMENT_TEXT_CHARS = 20000
+_DOCX_NAMESPACE = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
+
+
+class DocumentExtractionError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class DocumentExtractionLimits:
+    max_bytes: int
+    max_pdf_pages: int
+    max_text_chars: int
+    timeout_seconds: float
+
+    @classmethod
+    def from_env(cls) -> "DocumentExtractionLimits":
+        return cls(
+            max_bytes=env_int("DOCUMENT_EXTRACTION_MAX_BYTES", 50 * 1024 * 1024),
+            max_pdf_pages=env_int("DOCUMENT_EXTRACTION_MAX_PDF_PAGES", 500),
+            max_text_chars=env_int("DOCUMENT_EXTRACTION_MAX_TEXT_CHARS", 5_000_000),
+            timeout_seconds=env_float("DOCUMENT_EXTRACTION_TIMEOUT_SECONDS", 30.0),
+        )
+
+
+# Parsers. These run in worker processes, so they must stay module-level and only
+# take and return picklable values.
+
+
+def extract_pdf_text(payload: bytes, max_pages: int, max_chars: int) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(payload))
+    pages: list[str] = []
+    total_chars = 0
+    for page_index, page in enumerate(reader.pages):
+        if max_pages > 0 and page_index >= max_pages:
+            break
+        normalized = (page.extract_text() or "").strip()
+        if normalized:
+            pages.append(normalized)
+            total_chars += len(normalized) + 2
+            if max_chars > 0 and total_chars >= max_chars:
+                break
+    text = "\n\n".join(pages)
+    return text[:max_chars] if max_chars > 0 else text
+
+
+def extract_docx_text(payload: bytes, max_chars: int) -> str:
+    with ZipFile(io.BytesIO(payload)) as archive:
+        try:
+            document_xml = archive.read("word/document.xml")
+        except KeyError as exc:
+            raise DocumentExtractionError("docx document.xml is missing") from exc
+
+    root = ElementTree.fromstring(document_xml)
+    paragraphs: list[str] = []
+    for paragraph in root.findall(".//w:body/w:p", _DOCX_NAMESPACE):
+        parts: list[str] = []
+        for node in paragraph.iter():
+            tag = node.tag.rsplit("}", 1)[-1]
+            if tag == "t":
+                parts.append(node.text or "")
+            elif tag == "tab":
+                parts.append("\t")
+            elif tag in {"br", "cr"}:
+                parts.append("\n")
+        text = "".join(parts).strip()
+        if text:
+            paragraphs.append(text)
+    text = "\n\n".join(paragraphs)
+    return text[:max_chars] if max_chars > 0 else text
+
+
+def extract_workbook_slice(payload: bytes, sheet: str | None, max_rows: int) -> dict[str, Any]:
+    """First `max_rows` rows of a sheet (the first sheet by default); `sheet` is None when it does not exist."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(filename=io.BytesIO(payload), read_only=True, data_only=True)
+    try:
+        sheet_names = list(workbook.sheetnames)
+        selected_sheet = str(sheet or "").strip() or (sheet_names[0] if sheet_names else "")
+        if not selected_sheet or selected_sheet not in sheet_names:
+            return {"sheet_names": sheet_names, "sheet": None, "rows": [], "truncated": False}
+        rows: list[list[Any]] = []
+        truncated = False
+        for row_index, row in enumerate(workbook[selected_sheet].iter_rows(values_only=True), start=1):
+            if row_index > max_rows:
+                truncated = True
+                break
+            rows.append(list(row))
+        return {"sheet_names": sheet_names, "sheet": selected_sheet, "rows": rows, "truncated": truncated}
+    finally:
+        workbook.close()
+
+
+def extract_attachment_text(*, payload: bytes, mime_type: str, filename: str) -> str:
+    """Prompt text for a document attachment, capped at `MAX_DOCUMENT_TEXT_CHARS`."""
+    normalized_mime = str(mime_type or "").strip().lower()
+    if normalized_mime == "application/pdf" or Path(filename).suffix.lower() == ".pdf":
+        limits = DocumentExtractionLimits.from_env()
+        return extract_pdf_text(payload, limits.max_pdf_pages, MAX_DOCUMENT_TEXT_CHARS).strip()
+
+    decoded = payload.decode("utf-8", errors="replace")
+    if normalized_mime == "application/json":
+        try:
+            parsed = json.loads(decoded)
+        except Exception:
+            return decoded[:MAX_DOCUMENT_TEXT_CHARS].strip()
+        return json.dumps(parsed, ensure_ascii=False, indent=2)[:MAX_DOCUMENT_TEXT_CHARS].strip()
+
+    if normalized_mime == "text/csv":
+        reader = csv.reader(io.StringIO(decoded))
+        rows = []
+        for row in reader:
+            rows.append(", ".join(cell.strip() for cell in row if str(cell).strip()))
+        return "\n".join(item for item in rows if item)[:MAX_DOCUMENT_TEXT_CHARS].strip()
+
+    return decoded[:MAX_DOCUMENT_TEXT_CHARS].strip()
+
+
+def _call_with_keywords(payload: bytes, parser: Callable[..., Any], keywords: tuple[tuple[str, Any], ...]) -> Any:
+    return parser(payload=payload, **dict(keywords))
+
+
+def _result_size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_result_size(item) for item in value.values()) + 64
+    if isinstance(value, (list, tuple)):
+        return sum(_result_size(item) for item in value) + 8 * len(value)
+    return 16
+
+
+class ExtractionResultCache:
+    """LRU of extraction results bounded by an approximate character budget."""
+
+    def __init__(self, max_chars: int) -> None:
+        self._max_chars = max(0, max_chars)
+        self._entries: OrderedDict[tuple[Any, ...], tuple[Any, int]] = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, key: tuple[Any, ...]) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple[Any, ...], value: Any) -> None:
+        size = _result_size(value)
+        if size > self._max_chars:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= previous[1]
+            self._entries[key] = (value, size)
+            self._chars += size
+            while self._chars > self._max_chars and self._entries:
+                _key, (_value, evicted_size) = self._entries.popitem(last=False)
+                self._chars -= evicted_size
+
+
+class DocumentExtractionService:
+    """
+    Runs document parsers off the event loop, bounded and cached.
+
+    Parsers run on a small process pool, so a slow or hostile file can be cut off at
+    `timeout_seconds` by replacing the pool; other extractions that were running on
+    the replaced pool are resubmitted to the new one. Jobs wait for a free worker before
+    they are submitted, so queueing never counts against the timeout. Threads are used instead when the pool
+    is disabled or the caller is itself a daemonic worker (Celery prefork). Payloads
+    over `max_bytes` are rejected and PDFs stop after `max_pdf_pages` pages.
+
+    Results are cached by content hash (the revision or attachment sha256) plus the
+    extraction parameters, so repeated reads of the same revision skip parsing.
+    """
+
+    def __init__(
+        self,
+        *,
+        limits: DocumentExtractionLimits | None = None,
+        max_workers: int | None = None,
+        cache_chars: int | None = None,
+        start_method: str | None = None,
+    ) -> None:
+        self.limits = limits or DocumentExtractionLimits.from_env()
+        self._max_workers = (
+            max_workers
+            if max_workers is not None
+            else env_int("DOCUMENT_EXTRACTION_PROCESSES", 0 if running_under_pytest() else 2)
+        )
+        self._start_method = start_method or os.getenv("DOCUMENT_EXTRACTION_START_METHOD") or "spawn"
+        self.cache = ExtractionResultCache(
+            cache_chars if cache_chars is not None else env_int("DOCUMENT_EXTRACTION_CACHE_CHARS", 64_000_000)
+        )
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        self._terminated_pools: weakref.WeakSet[ProcessPoolExecutor] = weakref.WeakSet()
+        self._slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _use_pool(self) -> bool:
+        return self._max_workers > 0 and not multiprocessing.current_process().daemon
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context(self._start_method),
+                )
+            return self._pool
+
+    def _pool_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self._max_workers)
+        return slots
+
+    def _discard_pool(self, pool: ProcessPoolExecutor, *, terminate: bool) -> None:
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        if terminate:
+            # A timed-out parser cannot be cancelled; stop the pool's workers instead. The
+            # other futures fail with BrokenProcessPool, and `_run_in_pool` resubmits them.
+            self._terminated_pools.add(pool)
+            for process in list((getattr(pool, "_processes", None) or {}).values()):
+                try:
+                    process.terminate()
+                except Exception:
+                    pass
+        pool.shutdown(wait=False, cancel_futures=not terminate)
+
+    def check_size(self, byte_size: int) -> None:
+        if self.limits.max_bytes > 0 and byte_size > self.limits.max_bytes:
+            raise DocumentExtractionError(
+                f"File is too large to extract ({byte_size} bytes; limit {self.limits.max_bytes})"
+            )
+
+    async def run(
+        self,
+        kind: str,
+        parser: Callable[..., Any],
+        payload: bytes | Callable[[], Awaitable[bytes]],
+        *args: Any,
+        cache_key: str | None = None,
+        byte_size: int | None = None,
+    ) -> Any:
+        """
+        Run `parser(payload, *args)` within the extraction limits, caching by `cache_key`.
+
+        `payload` may be an async loader, so a cache hit never reads the file; pass
+        `byte_size` to reject oversized files before loading them.
+        """
+        key = (kind, cache_key, args) if cache_key else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if byte_size is not None:
+            self.check_size(byte_size)
+        if callable(payload):
+            payload = await payload()
+        self.check_size(len(payload))
+
+        timeout = self.limits.timeout_seconds if self.limits.timeout_seconds > 0 else None
+        if self._use_pool():
+            result = await self._run_in_pool(parser, payload, args, timeout)
+        else:
+            try:
+                result = await asyncio.wait_for(asyncio.to_thread(parser, payload, *args), timeout)
+            except asyncio.TimeoutError as exc:
+                raise DocumentExtractionError(f"Document extraction timed out after {timeout:g}s") from exc
+
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+
+    async def _run_in_pool(
+        self,
+        parser: Callable[..., Any],
+        payload: bytes,
+        args: tuple[Any, ...],
+        timeout: float | None,
+    ) -> Any:
+        # Only `max_workers` jobs are submitted at a time, so the timeout covers parsing
+        # rather than time spent queued behind other extractions.
+        async with self._pool_slots():
+            while True:
+                pool = self._get_pool()
+                try:
+                    future = pool.submit(parser, payload, *args)
+                except BrokenProcessPool:
+                    self._discard_pool(pool, terminate=False)
+                    pool = self._get_pool()
+                    future = pool.submit(parser, payload, *args)
+                try:
+                    return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+                except asyncio.TimeoutError as exc:
+                    self._discard_pool(pool, terminate=True)
+                    raise DocumentExtractionError(f"Document extraction timed out after {timeout:g}s") from exc
+                except BrokenProcessPool as exc:
+                    if pool in self._terminated_pools:
+                        # Another extraction timed out and took this pool down; run again.
+                        continue
+                    self._discard_pool(pool, terminate=False)
+                    raise DocumentExtractionError("Document extraction worker crashed") from exc
+
+    async def pdf_text(
+        self,
+        payload: bytes | Callable[[], Awaitable[bytes]],
+        *,
+        cache_key: str | None = None,
+        byte_size: int | None = None,
+    ) -> str:
+        return await self.run(
+            "pdf_text",
+            extract_pdf_text,
+            payload,
+            self.limits.max_pdf_pages,
+            self.limits.max_text_chars,
+            cache_key=cache_key,
+            byte_size=byte_size,
+        )
+
+    async def docx_text(
+        self,
+        payload: bytes | Callable[[], Awaitable[bytes]],
+        *,
+        cache_key: str | None = None,
+        byte_size: int | None = None,
+    ) -> str:
+        return await self.run(
+            "docx_text",
+            extract_docx_text,
+            payload,
+            self.limits.max_text_chars,
+            cache_key=cache_key,
+            byte_size=byte_size,
+        )
+
+    async def workbook_slice(
+        self,
+        payload: bytes | Callable[[], Awaitable[bytes]],
+        *,
+        sheet: str | None,
+        max_rows: int,
+        cache_key: str | None = None,
+        byte_size: int | None = None,
+    ) -> dict[str, Any]:
+        return await self.run(
+            "workbook_slice",
+            extract_workbook_slice,
+            payload,
+            sheet,
+            max_rows,
+            cache_key=cache_key,
+            byte_size=byte_size,
+        )
+
+    async def attachment_text(
+        self,
+        payload: bytes | Callable[[], Awaitable[bytes]],
+        *,
+        mime_type: str,
+        filename: str,
+        parser: Callable[..., str] = extract_attachment_text,
+        cache_key: str | None = None,
+        byte_size: int | None = None,
+    ) -> str:
+        keywords = (("mime_type", mime_type), ("filename", filename))
+        return await self.run(
+            "attachment_text",
+            _call_with_keywords,
+            payload,
+            parser,
+            keywords,
+            cache_key=cache_key,
+            byte_size=byte_size,
+        )
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            pool = self._pool
+            self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+_DOCUMENT_EXTRACTION_SERVICE = DocumentExtractionService()
+
+
+def get_document_extraction_service() -> DocumentExtractionService:
+    return _DOCUMENT_EXTRACTION_SERVICE
@@ -1,19 +1,17 @@
 from __future__ import annotations
 
 import csv
-from io import BytesIO, StringIO
+from io import StringIO
 from pathlib import PurePosixPath
-from typing import Any
-from xml.etree import ElementTree
-from zipfile import ZipFile
+from typing import Any, Awaitable, Callable
 
 import markdown as markdown_renderer
-from openpyxl import load_workbook
-from pypdf import PdfReader
 
+from app.db.postgres.models.files import FileEntryType
+from app.services.document_extraction import DocumentExtractionError, get_document_extraction_service
 from app.services.file_reference_access import (
+    AuthorizedFileReference,
     AuthorizedFileSpaceContext,
-    read_authorized_bytes_reference,
     read_authorized_text_reference,
     resolve_authorized_file_reference,
 )
@@ -180,41 +178,43 @@ def _normalize_tabular_rows(rows: list[list[Any]]) -> tuple[list[list[str]], int
     return normalized_rows, column_count
 
 
-def _extract_pdf_text(payload: bytes) -> str:
-    reader = PdfReader(BytesIO(payload))
-    pages: list[str] = []
-    for page in reader.pages:
-        extracted = page.extract_text() or ""
-        normalized = extracted.strip()
-        if normalized:
-            pages.append(normalized)
-    return "\n\n".join(pages)
-
-
-def _extract_docx_text(payload: bytes) -> str:
-    namespace = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
-    with ZipFile(BytesIO(payload)) as archive:
-        try:
-            document_xml = archive.read("word/document.xml")
-        except KeyError as exc:
-            raise FileSpaceValidationError("docx document.xml is missing") from exc
-
-    root = ElementTree.fromstring(document_xml)
-    paragraphs: list[str] = []
-    for paragraph in root.findall(".//w:body/w:p", namespace):
-        parts: list[str] = []
-        for node in paragraph.iter():
-            tag = node.tag.rsplit("}", 1)[-1]
-            if tag == "t":
-                parts.append(node.text or "")
-            elif tag == "tab":
-                parts.append("\t")
-            elif tag in {"br", "cr"}:
-                parts.append("\n")
-        text = "".join(parts).strip()
-        if text:
-            paragraphs.append(text)
-    return "\n\n".join(paragraphs)
+def _workbook_extractor(entry: Any, revision: Any | None) -> Callable[..., Awaitable[dict[str, Any]]] | None:
+    return get_document_extraction_service().workbook_slice if _is_xlsx(entry, revision) else None
+
+
+def _document_text_extractor(entry: Any, revision: Any | None) -> Callable[..., Awaitable[str]] | None:
+    if _is_pdf(entry, revision):
+        return get_document_extraction_service().pdf_text
+    if _is_docx(entry, revision):
+        return get_document_extraction_service().docx_text
+    return None
+
+
+async def _read_revision_extraction(
+    ctx: AuthorizedFileSpaceContext,
+    *,
+    path: str,
+    select_extractor: Callable[[Any, Any], Callable[..., Awaitable[Any]] | None],
+    unsupported_message: str,
+    **options: Any,
+) -> tuple[AuthorizedFileReference, Any]:
+    # Resolve the revision first so a cached extraction (keyed by its sha256) skips reading the blob.
+    file_ref = await resolve_authorized_file_reference(ctx, path=path)
+    revision = file_ref.revision
+    if revision is None or file_ref.entry.entry_type != FileEntryType.file:
+        raise FileSpaceValidationError("entry is not a file")
+    extract = select_extractor(file_ref.entry, revision)
+    if extract is None:
+        raise FileSpaceValidationError(unsupported_message)
+
+    async def _load() -> bytes:
+        return await ctx.service.read_revision_bytes(revision)
+
+    try:
+        result = await extract(_load, cache_key=revision.sha256, byte_size=revision.byte_size, **options)
+    except DocumentExtractionError as exc:
+        raise FileSpaceValidationError(str(exc)) from exc
+    return file_ref, result
 
 
 async def inspect_file(
@@ -295,44 +295,37 @@ async def read_representation(
         }
 
     if normalized_representation == WORKBOOK_REPRESENTATION:
-        file_ref, payload = await read_authorized_bytes_reference(ctx, path=path)
-        if not _is_xlsx(file_ref.entry, file_ref.revision):
-            raise FileSpaceValidationError("workbook is not supported for this file")
-        workbook = load_workbook(filename=BytesIO(payload), read_only=True, data_only=True)
-        sheet_names = list(workbook.sheetnames)
-        selected_sheet = str(normalized_options.get("sheet") or "").strip() or (sheet_names[0] if sheet_names else "")
-        if not selected_sheet or selected_sheet not in workbook.sheetnames:
-            raise FileSpaceValidationError("requested sheet is not available")
-        worksheet = workbook[selected_sheet]
         max_rows = _coerce_max_rows(normalized_options.get("max_rows") or normalized_options.get("maxRows"))
-        rows: list[list[Any]] = []
-        truncated = False
-        for row_index, row in enumerate(worksheet.iter_rows(values_only=True), start=1):
-            if row_index > max_rows:
-                truncated = True
-                break
-            rows.append(list(row))
-        normalized_rows, column_count = _normalize_tabular_rows(rows)
+        file_ref, workbook_slice = await _read_revision_extraction(
+            ctx,
+            path=path,
+            select_extractor=_workbook_extractor,
+            unsupported_message="workbook is not supported for this file",
+            sheet=str(normalized_options.get("sheet") or "").strip() or None,
+            max_rows=max_rows,
+        )
+        if workbook_slice["sheet"] is None:
+            raise FileSpaceValidationError("requested sheet is not available")
+        normalized_rows, column_count = _normalize_tabular_rows(workbook_slice["rows"])
         return {
             "representation": WORKBOOK_REPRESENTATION,
             "entry": FileSpaceService.serialize_entry(file_ref.entry),
             "revision": FileSpaceService.serialize_revision(file_ref.revision),
-            "sheet_names": sheet_names,
-            "sheet": selected_sheet,
+            "sheet_names": workbook_slice["sheet_names"],
+            "sheet": workbook_slice["sheet"],
             "rows": normalized_rows,
             "displayed_row_count": len(normalized_rows),
             "column_count": column_count,
-            "truncated": truncated,
+            "truncated": workbook_slice["truncated"],
         }
 
     if normalized_representation == DOCUMENT_TEXT_REPRESENTATION:
-        file_ref, payload = await read_authorized_bytes_reference(ctx, path=path)
-        if _is_pdf(file_ref.entry, file_ref.revision):
-            content = _extract_pdf_text(payload)
-        elif _is_docx(file_ref.entry, file_ref.revision):
-            content = _extract_docx_text(payload)
-        else:
-            raise FileSpaceValidationError("document_text is not supported for this file")
+        file_ref, content = await _read_revision_extraction(
+            ctx,
+            path=path,
+            select_extractor=_document_text_extractor,
+            unsupported_message="document_text is not supported for this file",
+        )
         return {
             "representation": DOCUMENT_TEXT_REPRESENTATION,
             "entry": FileSpaceService.serialize_entry(file_ref.entry),
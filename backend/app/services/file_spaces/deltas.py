@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import difflib
+import json
+import zlib
+from typing import Any
+
+
+TEXT_DELTA_FORMAT_VERSION = 1
+
+
+class TextDeltaError(Exception):
+    pass
+
+
+def _split_lines(text: str) -> list[str]:
+    return text.splitlines(keepends=True)
+
+
+def encode_text_delta(*, base: str, target: str) -> bytes:
+    """Encode `target` as zlib-compressed line copy/insert ops against `base`."""
+    base_lines = _split_lines(base)
+    target_lines = _split_lines(target)
+    ops: list[list[Any]] = []
+    matcher = difflib.SequenceMatcher(a=base_lines, b=target_lines, autojunk=False)
+    for tag, base_start, base_end, target_start, target_end in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["c", base_start, base_end - base_start])
+        elif tag in {"replace", "insert"}:
+            ops.append(["i", "".join(target_lines[target_start:target_end])])
+    document = {"v": TEXT_DELTA_FORMAT_VERSION, "ops": ops}
+    return zlib.compress(json.dumps(document, separators=(",", ":")).encode("utf-8"))
+
+
+def apply_text_delta(*, base: str, delta: bytes) -> str:
+    try:
+        document = json.loads(zlib.decompress(delta).decode("utf-8"))
+    except Exception as exc:
+        raise TextDeltaError("text delta payload is corrupt") from exc
+    if not isinstance(document, dict) or document.get("v") != TEXT_DELTA_FORMAT_VERSION:
+        raise TextDeltaError("unsupported text delta format")
+    base_lines = _split_lines(base)
+    parts: list[str] = []
+    for op in document.get("ops") or []:
+        if op[0] == "c":
+            start, count = int(op[1]), int(op[2])
+            if start < 0 or start + count > len(base_lines):
+                raise TextDeltaError("text delta copy range is out of bounds")
+            parts.extend(base_lines[start:start + count])
+        elif op[0] == "i":
+            parts.append(str(op[1]))
+        else:
+            raise TextDeltaError(f"unknown text delta op '{op[0]}'")
+    return "".join(parts)
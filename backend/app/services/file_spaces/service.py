@@ -1,21 +1,30 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import codecs
 import hashlib
+import logging
 import mimetypes
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import PurePosixPath
-from typing import Any
+from typing import Any, BinaryIO, Iterator
 from uuid import UUID, uuid4
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, delete, event, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from app.core.env_loader import env_flag, env_int
 from app.db.postgres.models.agents import Agent
 from app.db.postgres.models.files import (
     AgentFileSpaceLink,
     FileAccessMode,
+    FileBlob,
+    FileBlobEncoding,
     FileEntryRevision,
     FileEntryType,
     FileSpace,
@@ -23,7 +32,12 @@ from app.db.postgres.models.files import (
     FileSpaceStatus,
 )
 from app.db.postgres.models.workspace import Project
+from app.services.file_spaces.deltas import TextDeltaError, apply_text_delta, encode_text_delta
 from app.services.file_spaces.storage import FileSpaceStorage
+from app.services.published_app_bundle_storage import PublishedAppBundleAssetStream
+from app.services.storage_streaming import STREAM_CHUNK_SIZE, ByteRange
+
+logger = logging.getLogger(__name__)
 
 
 TEXT_MIME_FALLBACKS = {
@@ -44,6 +58,50 @@ TEXT_MIME_FALLBACKS = {
     ".sql": "application/sql",
 }
 
+_PENDING_BLOB_DELETES_KEY = "file_space_pending_blob_deletes"
+_BLOB_DELETE_TASKS: set[asyncio.Task[None]] = set()
+
+
+async def _delete_blob_bytes(deletes: list[tuple[FileSpaceStorage, str]]) -> None:
+    for storage, storage_key in deletes:
+        try:
+            await storage.adelete_bytes(storage_key=storage_key)
+        except Exception:
+            # Orphaned bytes only cost space; the rows that referenced them are gone.
+            logger.warning("Failed to delete file blob bytes %s", storage_key, exc_info=True)
+
+
+def _delete_committed_blob_bytes(session: Session) -> None:
+    deletes = session.info.pop(_PENDING_BLOB_DELETES_KEY, None)
+    if not deletes:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        for storage, storage_key in deletes:
+            try:
+                storage.delete_bytes(storage_key=storage_key)
+            except Exception:
+                logger.warning("Failed to delete file blob bytes %s", storage_key, exc_info=True)
+        return
+    task = loop.create_task(_delete_blob_bytes(deletes))
+    _BLOB_DELETE_TASKS.add(task)
+    task.add_done_callback(_BLOB_DELETE_TASKS.discard)
+
+
+def _discard_pending_blob_deletes(session: Session) -> None:
+    session.info.pop(_PENDING_BLOB_DELETES_KEY, None)
+
+
+async def wait_for_blob_deletes() -> None:
+    """Wait for blob byte deletions scheduled by committed sessions."""
+    while _BLOB_DELETE_TASKS:
+        await asyncio.gather(*list(_BLOB_DELETE_TASKS), return_exceptions=True)
+
+
+TEXT_DELTA_CONTENT_TYPE = "application/x-file-space-text-delta"
+DEFAULT_DELTA_SNAPSHOT_INTERVAL = 16
+
 
 class FileSpaceServiceError(Exception):
     pass
@@ -76,9 +134,29 @@ class FileSpaceGrant:
 
 
 class FileSpaceService:
-    def __init__(self, db: AsyncSession, *, storage: FileSpaceStorage | None = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        *,
+        storage: FileSpaceStorage | None = None,
+        text_deltas_enabled: bool | None = None,
+        delta_snapshot_interval: int | None = None,
+    ):
         self.db = db
         self.storage = storage or FileSpaceStorage()
+        # Text revisions may be stored as deltas against the previous revision;
+        # every `delta_snapshot_interval` links in a chain is a full snapshot.
+        self.text_deltas_enabled = (
+            env_flag("FILE_SPACE_TEXT_DELTAS") if text_deltas_enabled is None else bool(text_deltas_enabled)
+        )
+        self.delta_snapshot_interval = max(
+            1,
+            int(
+                delta_snapshot_interval
+                if delta_snapshot_interval is not None
+                else env_int("FILE_SPACE_DELTA_SNAPSHOT_INTERVAL", DEFAULT_DELTA_SNAPSHOT_INTERVAL)
+            ),
+        )
 
     @staticmethod
     def _utcnow() -> datetime:
@@ -244,6 +322,15 @@ class FileSpaceService:
     async def archive_space(self, *, organization_id: UUID, project_id: UUID, space_id: UUID) -> FileSpace:
         space = await self.get_space(organization_id=organization_id, project_id=project_id, space_id=space_id)
         space.status = FileSpaceStatus.archived
+        result = await self.db.execute(
+            select(FileEntryRevision)
+            .join(FileSpaceEntry, FileSpaceEntry.id == FileEntryRevision.entry_id)
+            .where(
+                FileSpaceEntry.space_id == space.id,
+                FileEntryRevision.blob_id.is_not(None),
+            )
+        )
+        await self._release_revision_blobs(list(result.scalars().all()))
         return space
 
     async def list_entries(self, *, organization_id: UUID, project_id: UUID, space_id: UUID) -> list[FileSpaceEntry]:
@@ -341,7 +428,34 @@ class FileSpaceService:
         encoding: str | None,
         user_id: UUID | None,
         run_id: UUID | None,
+        base_payload: bytes | None = None,
     ) -> tuple[FileSpaceEntry, FileEntryRevision]:
+        entry = await self._prepare_file_entry(space=space, path=path, user_id=user_id)
+        base_revision = None
+        if entry.current_revision_id:
+            base_revision = await self.db.get(FileEntryRevision, entry.current_revision_id)
+        sha256 = self._sha256(payload)
+        blob = await self._acquire_blob(
+            space=space,
+            payload=payload,
+            sha256=sha256,
+            mime_type=mime_type,
+            is_text=is_text,
+            encoding=encoding,
+            base_revision=base_revision,
+            base_payload=base_payload,
+        )
+        return await self._record_revision(
+            entry=entry,
+            blob=blob,
+            mime_type=mime_type,
+            is_text=is_text,
+            encoding=encoding,
+            user_id=user_id,
+            run_id=run_id,
+        )
+
+    async def _prepare_file_entry(self, *, space: FileSpace, path: str, user_id: UUID | None) -> FileSpaceEntry:
         await self._ensure_directory_chain(space=space, path=path, user_id=user_id)
         entry = await self._get_entry(space_id=space.id, path=path, include_deleted=True)
         if entry is None:
@@ -361,25 +475,27 @@ class FileSpaceService:
         else:
             entry.deleted_at = None
             entry.updated_by = user_id
+        return entry
 
-        filename = PurePosixPath(path).name or "file.bin"
-        revision_id = uuid4()
-        storage_key = self.storage.write_bytes(
-            project_id=str(space.project_id),
-            space_id=str(space.id),
-            entry_id=str(entry.id),
-            revision_id=str(revision_id),
-            filename=filename,
-            payload=payload,
-            content_type=mime_type,
-        )
+    async def _record_revision(
+        self,
+        *,
+        entry: FileSpaceEntry,
+        blob: FileBlob,
+        mime_type: str,
+        is_text: bool,
+        encoding: str | None,
+        user_id: UUID | None,
+        run_id: UUID | None,
+    ) -> tuple[FileSpaceEntry, FileEntryRevision]:
         revision = FileEntryRevision(
-            id=revision_id,
+            id=uuid4(),
             entry_id=entry.id,
-            storage_key=storage_key,
+            blob_id=blob.id,
+            storage_key=blob.storage_key,
             mime_type=mime_type,
-            byte_size=len(payload),
-            sha256=self._sha256(payload),
+            byte_size=int(blob.byte_size),
+            sha256=blob.sha256,
             is_text=is_text,
             encoding=encoding,
             created_by=user_id,
@@ -397,6 +513,260 @@ class FileSpaceService:
         await self.db.flush()
         return entry, revision
 
+    async def _get_blob(self, *, project_id: UUID, sha256: str) -> FileBlob | None:
+        return await self.db.scalar(
+            select(FileBlob).where(
+                FileBlob.project_id == project_id,
+                FileBlob.sha256 == sha256,
+            )
+        )
+
+    async def _retain_blob(self, blob_id: UUID) -> None:
+        await self.db.execute(
+            update(FileBlob).where(FileBlob.id == blob_id).values(ref_count=FileBlob.ref_count + 1)
+        )
+
+    async def _acquire_blob(
+        self,
+        *,
+        space: FileSpace,
+        payload: bytes,
+        sha256: str,
+        mime_type: str,
+        is_text: bool,
+        encoding: str | None,
+        base_revision: FileEntryRevision | None,
+        base_payload: bytes | None,
+    ) -> FileBlob:
+        existing = await self._get_blob(project_id=space.project_id, sha256=sha256)
+        if existing is not None:
+            await self._retain_blob(existing.id)
+            return existing
+
+        stored_payload = payload
+        content_type = mime_type
+        blob_encoding = FileBlobEncoding.full
+        base_blob: FileBlob | None = None
+        delta = await self._build_text_delta(
+            payload=payload,
+            is_text=is_text,
+            encoding=encoding,
+            base_revision=base_revision,
+            base_payload=base_payload,
+        )
+        if delta is not None:
+            stored_payload, base_blob = delta
+            content_type = TEXT_DELTA_CONTENT_TYPE
+            blob_encoding = FileBlobEncoding.text_delta
+
+        storage_key = await self.storage.awrite_blob(
+            project_id=str(space.project_id),
+            sha256=sha256,
+            base_sha256=base_blob.sha256 if base_blob is not None else None,
+            payload=stored_payload,
+            content_type=content_type,
+        )
+        blob = FileBlob(
+            id=uuid4(),
+            project_id=space.project_id,
+            sha256=sha256,
+            storage_key=storage_key,
+            encoding=blob_encoding,
+            base_blob_id=base_blob.id if base_blob is not None else None,
+            delta_depth=int(base_blob.delta_depth or 0) + 1 if base_blob is not None else 0,
+            byte_size=len(payload),
+            stored_size=len(stored_payload),
+            ref_count=1,
+        )
+        stored = await self._insert_blob(blob)
+        if stored is blob and base_blob is not None:
+            await self._retain_blob(base_blob.id)
+        return stored
+
+    async def _insert_blob(self, blob: FileBlob) -> FileBlob:
+        try:
+            async with self.db.begin_nested():
+                self.db.add(blob)
+                await self.db.flush()
+        except IntegrityError:
+            # A concurrent writer stored the same content first; reuse its blob.
+            existing = await self._get_blob(project_id=blob.project_id, sha256=blob.sha256)
+            if existing is None:
+                raise
+            if existing.storage_key != blob.storage_key:
+                await self.storage.adelete_bytes(storage_key=blob.storage_key)
+            await self._retain_blob(existing.id)
+            return existing
+        return blob
+
+    async def _acquire_streamed_blob(
+        self,
+        *,
+        space: FileSpace,
+        source: BinaryIO,
+        sha256: str,
+        byte_size: int,
+        mime_type: str,
+    ) -> FileBlob:
+        existing = await self._get_blob(project_id=space.project_id, sha256=sha256)
+        if existing is not None:
+            await self._retain_blob(existing.id)
+            return existing
+        await asyncio.to_thread(source.seek, 0)
+        storage_key = await asyncio.to_thread(
+            self.storage.write_blob_stream,
+            project_id=str(space.project_id),
+            sha256=sha256,
+            chunks=self._iter_source_chunks(source),
+            content_type=mime_type,
+        )
+        return await self._insert_blob(
+            FileBlob(
+                id=uuid4(),
+                project_id=space.project_id,
+                sha256=sha256,
+                storage_key=storage_key,
+                encoding=FileBlobEncoding.full,
+                base_blob_id=None,
+                delta_depth=0,
+                byte_size=byte_size,
+                stored_size=byte_size,
+                ref_count=1,
+            )
+        )
+
+    @staticmethod
+    def _iter_source_chunks(source: BinaryIO) -> Iterator[bytes]:
+        while True:
+            chunk = source.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    @classmethod
+    def _digest_source(cls, source: BinaryIO) -> tuple[str, int, bool]:
+        source.seek(0)
+        digest = hashlib.sha256()
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        byte_size = 0
+        is_utf8 = True
+        for chunk in cls._iter_source_chunks(source):
+            digest.update(chunk)
+            byte_size += len(chunk)
+            if is_utf8:
+                try:
+                    decoder.decode(chunk)
+                except UnicodeDecodeError:
+                    is_utf8 = False
+        if is_utf8:
+            try:
+                decoder.decode(b"", final=True)
+            except UnicodeDecodeError:
+                is_utf8 = False
+        return digest.hexdigest(), byte_size, is_utf8
+
+    async def _build_text_delta(
+        self,
+        *,
+        payload: bytes,
+        is_text: bool,
+        encoding: str | None,
+        base_revision: FileEntryRevision | None,
+        base_payload: bytes | None,
+    ) -> tuple[bytes, FileBlob] | None:
+        if not self.text_deltas_enabled or not is_text or encoding != "utf-8":
+            return None
+        if base_revision is None or base_revision.blob_id is None or base_revision.encoding != "utf-8":
+            return None
+        base_blob = await self.db.get(FileBlob, base_revision.blob_id)
+        if base_blob is None or int(base_blob.delta_depth or 0) + 1 >= self.delta_snapshot_interval:
+            return None
+        if base_payload is None or self._sha256(base_payload) != base_blob.sha256:
+            base_payload = await self._read_blob_bytes(base_blob)
+        try:
+            delta = encode_text_delta(base=base_payload.decode("utf-8"), target=payload.decode("utf-8"))
+        except UnicodeDecodeError:
+            return None
+        if len(delta) >= len(payload):
+            return None
+        return delta, base_blob
+
+    async def _read_blob_bytes(self, blob: FileBlob) -> bytes:
+        chain = [blob]
+        while chain[-1].encoding == FileBlobEncoding.text_delta:
+            base_blob_id = chain[-1].base_blob_id
+            base_blob = await self.db.get(FileBlob, base_blob_id) if base_blob_id else None
+            if base_blob is None:
+                raise FileSpaceServiceError("file blob delta base is missing")
+            chain.append(base_blob)
+        payload = await self.storage.aread_bytes(storage_key=chain[-1].storage_key)
+        for item in reversed(chain[:-1]):
+            try:
+                text = apply_text_delta(
+                    base=payload.decode("utf-8"),
+                    delta=await self.storage.aread_bytes(storage_key=item.storage_key),
+                )
+            except (TextDeltaError, UnicodeDecodeError) as exc:
+                raise FileSpaceServiceError(f"file blob delta could not be applied: {exc}") from exc
+            payload = text.encode("utf-8")
+        if self._sha256(payload) != blob.sha256:
+            raise FileSpaceServiceError("file blob checksum mismatch")
+        return payload
+
+    async def read_revision_bytes(self, revision: FileEntryRevision) -> bytes:
+        if revision.blob_id is None:
+            return await self.storage.aread_bytes(storage_key=revision.storage_key)
+        blob = await self.db.get(FileBlob, revision.blob_id)
+        if blob is None:
+            raise FileSpaceNotFoundError("file content not found")
+        return await self._read_blob_bytes(blob)
+
+    def _delete_bytes_after_commit(self, storage_key: str) -> None:
+        """Queue blob bytes for deletion once the session commits; a rollback keeps them."""
+        info = self.db.sync_session.info
+        pending = info.get(_PENDING_BLOB_DELETES_KEY)
+        if pending is None:
+            pending = info[_PENDING_BLOB_DELETES_KEY] = []
+            if not event.contains(self.db.sync_session, "after_commit", _delete_committed_blob_bytes):
+                event.listen(self.db.sync_session, "after_commit", _delete_committed_blob_bytes)
+                event.listen(self.db.sync_session, "after_rollback", _discard_pending_blob_deletes)
+        pending.append((self.storage, storage_key))
+
+    async def _release_revision_blobs(self, revisions: list[FileEntryRevision]) -> None:
+        released: Counter[UUID] = Counter()
+        for revision in revisions:
+            if revision.blob_id is None:
+                continue
+            released[revision.blob_id] += 1
+            revision.blob_id = None
+        if not released:
+            return
+        await self.db.flush()
+        pending = list(released.items())
+        while pending:
+            blob_id, count = pending.pop()
+            remaining = await self.db.scalar(
+                update(FileBlob)
+                .where(FileBlob.id == blob_id)
+                .values(ref_count=FileBlob.ref_count - count)
+                .returning(FileBlob.ref_count)
+            )
+            if remaining is None or int(remaining) > 0:
+                continue
+            blob = await self.db.get(FileBlob, blob_id)
+            if blob is None:
+                continue
+            storage_key = blob.storage_key
+            base_blob_id = blob.base_blob_id
+            deleted = await self.db.execute(
+                delete(FileBlob).where(FileBlob.id == blob_id, FileBlob.ref_count <= 0)
+            )
+            if not deleted.rowcount:
+                continue
+            self._delete_bytes_after_commit(storage_key)
+            if base_blob_id is not None:
+                pending.append((base_blob_id, 1))
+
     async def write_text_file(
         self,
         *,
@@ -457,6 +827,44 @@ class FileSpaceService:
             run_id=run_id,
         )
 
+    async def upload_file_stream(
+        self,
+        *,
+        organization_id: UUID,
+        project_id: UUID,
+        space_id: UUID,
+        path: str,
+        source: BinaryIO,
+        content_type: str | None,
+        user_id: UUID | None,
+        run_id: UUID | None = None,
+    ) -> tuple[FileSpaceEntry, FileEntryRevision]:
+        """Store a large upload by hashing and copying it in chunks instead of buffering it."""
+        space = await self.get_space(organization_id=organization_id, project_id=project_id, space_id=space_id)
+        normalized = self._normalize_file_path(path)
+        sha256, byte_size, is_utf8 = await asyncio.to_thread(self._digest_source, source)
+        mime_type, is_text = self._resolve_mime_type(filename=normalized, explicit=content_type)
+        if not content_type and not is_text:
+            is_text = is_utf8
+        is_text = is_text and is_utf8
+        entry = await self._prepare_file_entry(space=space, path=normalized, user_id=user_id)
+        blob = await self._acquire_streamed_blob(
+            space=space,
+            source=source,
+            sha256=sha256,
+            byte_size=byte_size,
+            mime_type=mime_type,
+        )
+        return await self._record_revision(
+            entry=entry,
+            blob=blob,
+            mime_type=mime_type,
+            is_text=is_text,
+            encoding="utf-8" if is_text else None,
+            user_id=user_id,
+            run_id=run_id,
+        )
+
     async def read_entry(
         self,
         *,
@@ -493,17 +901,17 @@ class FileSpaceService:
             raise FileSpaceValidationError("entry is not a readable file")
         if not revision.is_text:
             raise FileSpaceValidationError("file is binary and cannot be read as text")
-        payload = self.storage.read_bytes(storage_key=revision.storage_key)
+        payload = await self.read_revision_bytes(revision)
         return entry, revision, payload.decode(revision.encoding or "utf-8", errors="replace")
 
-    async def read_file_bytes(
+    async def read_file_revision(
         self,
         *,
         organization_id: UUID,
         project_id: UUID,
         space_id: UUID,
         path: str,
-    ) -> tuple[FileSpaceEntry, FileEntryRevision, bytes]:
+    ) -> tuple[FileSpaceEntry, FileEntryRevision]:
         entry, revision = await self.read_entry(
             organization_id=organization_id,
             project_id=project_id,
@@ -512,7 +920,38 @@ class FileSpaceService:
         )
         if entry.entry_type != FileEntryType.file or revision is None:
             raise FileSpaceValidationError("entry is not a file")
-        return entry, revision, self.storage.read_bytes(storage_key=revision.storage_key)
+        return entry, revision
+
+    async def read_file_bytes(
+        self,
+        *,
+        organization_id: UUID,
+        project_id: UUID,
+        space_id: UUID,
+        path: str,
+    ) -> tuple[FileSpaceEntry, FileEntryRevision, bytes]:
+        entry, revision = await self.read_file_revision(
+            organization_id=organization_id,
+            project_id=project_id,
+            space_id=space_id,
+            path=path,
+        )
+        return entry, revision, await self.read_revision_bytes(revision)
+
+    async def open_revision_stream(
+        self,
+        revision: FileEntryRevision,
+        *,
+        byte_range: ByteRange | None = None,
+    ) -> PublishedAppBundleAssetStream:
+        blob = await self.db.get(FileBlob, revision.blob_id) if revision.blob_id is not None else None
+        if blob is not None and blob.encoding == FileBlobEncoding.text_delta:
+            # Delta chains must be rebuilt in memory; they only exist for text revisions.
+            payload = await self._read_blob_bytes(blob)
+            return PublishedAppBundleAssetStream.from_bytes(payload, revision.mime_type, byte_range=byte_range)
+        stream = await self.storage.aopen_stream(storage_key=revision.storage_key, byte_range=byte_range)
+        stream.content_type = revision.mime_type
+        return stream
 
     async def patch_text_file(
         self,
@@ -535,15 +974,19 @@ class FileSpaceService:
         if old_text not in content:
             raise FileSpaceValidationError("old_text was not found in file")
         updated = content.replace(old_text, new_text, 1)
-        return await self.write_text_file(
-            organization_id=organization_id,
-            project_id=project_id,
-            space_id=space_id,
+        space = await self.get_space(organization_id=organization_id, project_id=project_id, space_id=space_id)
+        payload = updated.encode("utf-8")
+        resolved_mime, _ = self._resolve_mime_type(filename=entry.path, explicit=entry.mime_type, payload=payload)
+        return await self._upsert_file_revision(
+            space=space,
             path=entry.path,
-            content=updated,
+            payload=payload,
+            mime_type=resolved_mime,
+            is_text=True,
+            encoding="utf-8",
             user_id=user_id,
             run_id=run_id,
-            mime_type=entry.mime_type,
+            base_payload=content.encode("utf-8"),
         )
 
     async def move_entry(
@@ -635,6 +1078,42 @@ class FileSpaceService:
         )
         return list(result.scalars().all())
 
+    async def prune_revisions(
+        self,
+        *,
+        organization_id: UUID,
+        project_id: UUID,
+        space_id: UUID,
+        path: str,
+        keep_latest: int,
+    ) -> int:
+        entry, _ = await self.read_entry(
+            organization_id=organization_id,
+            project_id=project_id,
+            space_id=space_id,
+            path=path,
+        )
+        if entry.entry_type != FileEntryType.file:
+            return 0
+        result = await self.db.execute(
+            select(FileEntryRevision)
+            .where(FileEntryRevision.entry_id == entry.id)
+            .order_by(FileEntryRevision.created_at.desc())
+        )
+        revisions = list(result.scalars().all())
+        stale = [
+            revision
+            for revision in revisions[max(1, int(keep_latest)):]
+            if revision.id != entry.current_revision_id
+        ]
+        if not stale:
+            return 0
+        await self._release_revision_blobs(stale)
+        for revision in stale:
+            await self.db.delete(revision)
+        await self.db.flush()
+        return len(stale)
+
     async def list_agent_links(
         self,
         *,
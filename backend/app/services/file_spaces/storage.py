@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import mimetypes
 import os
+import tempfile
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from app.services.published_app_bundle_storage import (
+    PublishedAppBundleAssetStream,
     PublishedAppBundleStorage,
     PublishedAppBundleStorageError,
     PublishedAppBundleStorageNotConfigured,
 )
+from app.services.storage_streaming import STREAM_CHUNK_SIZE, ByteRange
 
 
 FILES_STORAGE_PREFIX = "file-spaces"
@@ -32,6 +38,18 @@ class FileSpaceStorage:
         safe_name = Path(filename or "file.bin").name or "file.bin"
         return f"{project_id}/{space_id}/{entry_id}/{revision_id}/{safe_name}"
 
+    @staticmethod
+    def build_blob_storage_key(*, project_id: str, sha256: str, base_sha256: str | None = None) -> str:
+        digest = str(sha256 or "").strip().lower()
+        if len(digest) != 64:
+            raise FileSpaceStorageError("Blob digest is invalid")
+        key = f"{project_id}/blobs/{digest[:2]}/{digest}"
+        if base_sha256:
+            # Deltas are keyed by their base too, so two writers encoding the
+            # same content against different bases never overwrite each other.
+            key = f"{key}.{str(base_sha256).strip().lower()[:16]}.delta"
+        return key
+
     def write_bytes(
         self,
         *,
@@ -50,6 +68,21 @@ class FileSpaceStorage:
             revision_id=revision_id,
             filename=filename,
         )
+        return self._write_key(storage_key=storage_key, payload=payload, content_type=content_type)
+
+    def write_blob(
+        self,
+        *,
+        project_id: str,
+        sha256: str,
+        payload: bytes,
+        content_type: str,
+        base_sha256: str | None = None,
+    ) -> str:
+        storage_key = self.build_blob_storage_key(project_id=project_id, sha256=sha256, base_sha256=base_sha256)
+        return self._write_key(storage_key=storage_key, payload=payload, content_type=content_type)
+
+    def _write_key(self, *, storage_key: str, payload: bytes, content_type: str) -> str:
         if self._bundle_storage is not None:
             try:
                 self._bundle_storage.write_asset_bytes(
@@ -67,10 +100,27 @@ class FileSpaceStorage:
         absolute_path.write_bytes(payload)
         return storage_key
 
-    def read_bytes(self, *, storage_key: str) -> bytes:
+    @staticmethod
+    def _normalize_storage_key(storage_key: str) -> str:
         normalized = Path(str(storage_key or "").strip().lstrip("/")).as_posix().strip("/")
         if not normalized:
             raise FileSpaceStorageError("File storage key is invalid")
+        return normalized
+
+    def delete_bytes(self, *, storage_key: str) -> None:
+        normalized = self._normalize_storage_key(storage_key)
+        if self._bundle_storage is not None:
+            try:
+                self._bundle_storage.delete_asset_bytes(
+                    dist_storage_prefix=FILES_STORAGE_PREFIX,
+                    asset_path=normalized,
+                )
+            except PublishedAppBundleStorageError:
+                pass
+        (self._base_dir / normalized).unlink(missing_ok=True)
+
+    def read_bytes(self, *, storage_key: str) -> bytes:
+        normalized = self._normalize_storage_key(storage_key)
         if self._bundle_storage is not None:
             try:
                 payload, _ = self._bundle_storage.read_asset_bytes(
@@ -84,3 +134,101 @@ class FileSpaceStorage:
         if not absolute_path.exists() or not absolute_path.is_file():
             raise FileSpaceStorageError("File content not found")
         return absolute_path.read_bytes()
+
+    def write_blob_stream(
+        self,
+        *,
+        project_id: str,
+        sha256: str,
+        chunks: Iterable[bytes],
+        content_type: str,
+    ) -> str:
+        storage_key = self.build_blob_storage_key(project_id=project_id, sha256=sha256)
+        if self._bundle_storage is not None:
+            # Chunk iterators cannot be replayed, so a bundle-storage failure is not
+            # retried against the local directory the way buffered writes are.
+            self._bundle_storage.write_asset_stream(
+                dist_storage_prefix=FILES_STORAGE_PREFIX,
+                asset_path=storage_key,
+                chunks=chunks,
+                content_type=content_type,
+                cache_control="private,max-age=31536000,immutable",
+            )
+            return storage_key
+        absolute_path = self._base_dir / storage_key
+        absolute_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=absolute_path.parent, prefix=f".{absolute_path.name}.", delete=False) as handle:
+            temp_path = Path(handle.name)
+            try:
+                for chunk in chunks:
+                    if chunk:
+                        handle.write(chunk)
+            except BaseException:
+                handle.close()
+                temp_path.unlink(missing_ok=True)
+                raise
+        os.replace(temp_path, absolute_path)
+        return storage_key
+
+    def open_stream(self, *, storage_key: str, byte_range: ByteRange | None = None) -> PublishedAppBundleAssetStream:
+        normalized = self._normalize_storage_key(storage_key)
+        if self._bundle_storage is not None:
+            try:
+                return self._bundle_storage.open_asset(
+                    dist_storage_prefix=FILES_STORAGE_PREFIX,
+                    asset_path=normalized,
+                    byte_range=byte_range,
+                )
+            except PublishedAppBundleStorageError:
+                pass
+        absolute_path = self._base_dir / normalized
+        if not absolute_path.exists() or not absolute_path.is_file():
+            raise FileSpaceStorageError("File content not found")
+        total_size = absolute_path.stat().st_size
+        start = byte_range.start if byte_range is not None else 0
+        length = byte_range.length if byte_range is not None else total_size
+
+        def _open_chunks() -> Iterator[bytes]:
+            with absolute_path.open("rb") as handle:
+                handle.seek(start)
+                remaining = length
+                while remaining > 0:
+                    chunk = handle.read(min(STREAM_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        return
+                    remaining -= len(chunk)
+                    yield chunk
+
+        return PublishedAppBundleAssetStream(
+            content_type=mimetypes.guess_type(absolute_path.name)[0] or "application/octet-stream",
+            total_size=total_size,
+            byte_range=byte_range,
+            _open_chunks=_open_chunks,
+        )
+
+    async def aread_bytes(self, *, storage_key: str) -> bytes:
+        return await asyncio.to_thread(self.read_bytes, storage_key=storage_key)
+
+    async def awrite_blob(
+        self,
+        *,
+        project_id: str,
+        sha256: str,
+        payload: bytes,
+        content_type: str,
+        base_sha256: str | None = None,
+    ) -> str:
+        return await asyncio.to_thread(
+            self.write_blob,
+            project_id=project_id,
+            sha256=sha256,
+            payload=payload,
+            content_type=content_type,
+            base_sha256=base_sha256,
+        )
+
+    async def adelete_bytes(self, *, storage_key: str) -> None:
+        await asyncio.to_thread(self.delete_bytes, storage_key=storage_key)
+
+    async def aopen_stream(self, *, storage_key: str, byte_range: ByteRange | None = None) -> PublishedAppBundleAssetStream:
+        return await asyncio.to_thread(self.open_stream, storage_key=storage_key, byte_range=byte_range)
@@ -0,0 +1,388 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, AsyncIterator, Callable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.env_loader import env_flag, env_float, env_int
+
+
+def http_origin(url: str) -> str:
+    """Return `scheme://host[:port]` for `url`, the granularity outbound clients are pooled at."""
+    parsed = urlsplit(str(url or "").strip())
+    if not parsed.scheme or not parsed.netloc:
+        return str(url or "").strip().rstrip("/")
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+
+def _timeout_key(timeout: Any) -> tuple[Any, ...]:
+    resolved = timeout if isinstance(timeout, httpx.Timeout) else httpx.Timeout(timeout)
+    return (resolved.connect, resolved.read, resolved.write, resolved.pool)
+
+
+class _RejectAllCookiesPolicy(DefaultCookiePolicy):
+    def set_ok(self, cookie: Any, request: Any) -> bool:
+        return False
+
+
+def _no_cookie_jar() -> CookieJar:
+    # Pooled clients are shared between callers; never carry Set-Cookie state from one request to the next.
+    return CookieJar(policy=_RejectAllCookiesPolicy())
+
+
+@dataclass
+class _ClientStats:
+    max_connections: int
+    in_flight: int = 0
+    requests: int = 0
+    waits: int = 0
+    last_used_at: float = field(default_factory=time.monotonic)
+
+    def acquire(self) -> None:
+        if self.in_flight >= self.max_connections:
+            self.waits += 1
+        self.in_flight += 1
+        self.requests += 1
+        self.last_used_at = time.monotonic()
+
+    def release(self) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        self.last_used_at = time.monotonic()
+
+
+class _MeteredByteStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, stats: _ClientStats) -> None:
+        self._stream = stream
+        self._stats: Optional[_ClientStats] = stats
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._stats is not None:
+                self._stats.release()
+                self._stats = None
+
+
+class _MeteredTransport(httpx.AsyncBaseTransport):
+    """Counts in-flight requests (until the response body is closed) around the real transport."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, stats: _ClientStats) -> None:
+        self._inner = inner
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._stats.acquire()
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:
+            self._stats.release()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_MeteredByteStream(response.stream, self._stats),
+            extensions=response.extensions,
+        )
+
+    def idle_connections(self) -> int:
+        pool = getattr(self._inner, "_pool", None)
+        count = 0
+        for connection in list(getattr(pool, "connections", None) or []):
+            is_idle = getattr(connection, "is_idle", None)
+            if callable(is_idle) and is_idle():
+                count += 1
+        return count
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+@dataclass
+class _PooledClient:
+    client: httpx.AsyncClient
+    loop_ref: "weakref.ReferenceType[asyncio.AbstractEventLoop]"
+    base_url: str
+    stats: _ClientStats
+    transport: Optional[_MeteredTransport]
+
+    def belongs_to(self, loop: asyncio.AbstractEventLoop) -> bool:
+        return self.loop_ref() is loop
+
+    def is_orphaned(self) -> bool:
+        loop = self.loop_ref()
+        return loop is None or loop.is_closed()
+
+
+class HttpClientPool:
+    """Process-wide keep-alive HTTP clients for outbound integration calls.
+
+    Clients are keyed by (event loop, base URL, auth identity, timeout profile,
+    redirect policy), so MCP servers, OpenCode, Crawl4AI and the sandbox APIs reuse
+    warm (HTTP/2 where available) connections instead of opening a fresh client per
+    call. Each client caps its connections per host, does not persist cookies, and
+    is closed once it has been idle for `idle_client_seconds`. Callers must not
+    close the clients they are handed.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_clients: int | None = None,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry_seconds: float | None = None,
+        idle_client_seconds: float | None = None,
+        http2: bool | None = None,
+        default_timeout_seconds: float = 30.0,
+        default_max_connections: int = 32,
+        transport_factory: Callable[..., httpx.AsyncBaseTransport] | None = None,
+        env_prefix: str = "OUTBOUND_HTTP_POOL",
+    ) -> None:
+        self._max_clients = max(1, max_clients or env_int(f"{env_prefix}_MAX_CLIENTS", 256))
+        resolved_max_connections = max(
+            1,
+            max_connections or env_int(f"{env_prefix}_MAX_CONNECTIONS", default_max_connections),
+        )
+        self._limits = httpx.Limits(
+            max_connections=resolved_max_connections,
+            max_keepalive_connections=max(
+                0,
+                max_keepalive_connections
+                if max_keepalive_connections is not None
+                else env_int(f"{env_prefix}_MAX_KEEPALIVE_CONNECTIONS", resolved_max_connections),
+            ),
+            keepalive_expiry=(
+                keepalive_expiry_seconds
+                if keepalive_expiry_seconds is not None
+                else env_float(f"{env_prefix}_KEEPALIVE_SECONDS", 30.0)
+            ),
+        )
+        self._idle_client_seconds = (
+            idle_client_seconds
+            if idle_client_seconds is not None
+            else env_float(f"{env_prefix}_IDLE_CLIENT_SECONDS", 300.0)
+        )
+        requested_http2 = http2 if http2 is not None else env_flag(f"{env_prefix}_HTTP2", True)
+        self._http2 = bool(requested_http2 and importlib.util.find_spec("h2") is not None)
+        self._default_timeout_seconds = default_timeout_seconds
+        self._transport_factory = transport_factory or httpx.AsyncHTTPTransport
+        self._clients: OrderedDict[tuple[Any, ...], _PooledClient] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return self._limits
+
+    async def get_client(
+        self,
+        base_url: str,
+        *,
+        auth_identity: str | None = None,
+        timeout: Any = None,
+        follow_redirects: bool = False,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.AsyncClient:
+        """Return the shared client for `base_url`.
+
+        `headers` become client defaults, so any credentials in them must be reflected
+        in `auth_identity`; per-request headers should be passed on the request instead.
+        """
+        loop = asyncio.get_running_loop()
+        normalized_base_url = str(base_url or "").strip().rstrip("/")
+        resolved_timeout = self._default_timeout_seconds if timeout is None else timeout
+        # Clients are bound to the event loop that opened their connections.
+        key = (
+            id(loop),
+            normalized_base_url,
+            str(auth_identity or ""),
+            _timeout_key(resolved_timeout),
+            bool(follow_redirects),
+        )
+        stale: list[_PooledClient] = []
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None and not entry.belongs_to(loop):
+                stale.append(self._clients.pop(key))
+                entry = None
+            if entry is None:
+                entry = self._build_entry(
+                    loop,
+                    base_url=normalized_base_url,
+                    timeout=resolved_timeout,
+                    follow_redirects=follow_redirects,
+                    headers=headers,
+                )
+                self._clients[key] = entry
+            else:
+                self._clients.move_to_end(key)
+            entry.stats.last_used_at = time.monotonic()
+            stale.extend(self._evict_locked(loop, keep=key))
+        await self._close_entries(stale, loop)
+        return entry.client
+
+    @asynccontextmanager
+    async def client(
+        self,
+        url: str,
+        *,
+        auth_identity: str | None = None,
+        timeout: Any = None,
+        follow_redirects: bool = False,
+    ) -> AsyncIterator[httpx.AsyncClient]:
+        """Drop-in for `async with httpx.AsyncClient(...)`: yields the shared client for the origin of `url`."""
+        yield await self.get_client(
+            http_origin(url),
+            auth_identity=auth_identity,
+            timeout=timeout,
+            follow_redirects=follow_redirects,
+        )
+
+    async def discard(self, base_url: str) -> None:
+        """Close every pooled client for `base_url`, e.g. after the upstream was replaced."""
+        normalized = str(base_url or "").strip().rstrip("/")
+        with self._lock:
+            keys = [key for key, entry in self._clients.items() if entry.base_url == normalized]
+            stale = [self._clients.pop(key) for key in keys]
+        await self._close_entries(stale, asyncio.get_running_loop())
+
+    def metrics(self) -> dict[str, Any]:
+        """Snapshot of pool usage: clients, in-flight and waiting requests, idle connections, per base URL."""
+        hosts: dict[str, dict[str, int]] = {}
+        totals = {"clients": 0, "in_use": 0, "idle_connections": 0, "waits": 0, "requests": 0}
+        with self._lock:
+            entries = list(self._clients.values())
+        for entry in entries:
+            idle_connections = entry.transport.idle_connections() if entry.transport is not None else 0
+            host = hosts.setdefault(
+                entry.base_url,
+                {"clients": 0, "in_use": 0, "idle_connections": 0, "waits": 0, "requests": 0},
+            )
+            for bucket in (host, totals):
+                bucket["clients"] += 1
+                bucket["in_use"] += entry.stats.in_flight
+                bucket["idle_connections"] += idle_connections
+                bucket["waits"] += entry.stats.waits
+                bucket["requests"] += entry.stats.requests
+        return {
+            **totals,
+            "http2": self._http2,
+            "max_connections_per_client": self._limits.max_connections,
+            "hosts": hosts,
+        }
+
+    async def aclose(self) -> None:
+        with self._lock:
+            stale = list(self._clients.values())
+            self._clients.clear()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        await self._close_entries(stale, loop)
+
+    def reset(self) -> None:
+        """Drop every pooled client without closing it (for tests that swap the transport)."""
+        with self._lock:
+            self._clients.clear()
+
+    def _build_entry(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        *,
+        base_url: str,
+        timeout: Any,
+        follow_redirects: bool,
+        headers: dict[str, str] | None,
+    ) -> _PooledClient:
+        stats = _ClientStats(max_connections=int(self._limits.max_connections or 0) or 1)
+        transport = _MeteredTransport(
+            self._transport_factory(http2=self._http2, limits=self._limits),
+            stats,
+        )
+        client_kwargs: dict[str, Any] = {
+            "timeout": timeout,
+            "follow_redirects": follow_redirects,
+            "cookies": _no_cookie_jar(),
+            "limits": self._limits,
+            "transport": transport,
+        }
+        if base_url:
+            client_kwargs["base_url"] = base_url
+        if headers:
+            client_kwargs["headers"] = dict(headers)
+        client = httpx.AsyncClient(**client_kwargs)
+        return _PooledClient(
+            client=client,
+            loop_ref=weakref.ref(loop),
+            base_url=base_url,
+            stats=stats,
+            transport=transport,
+        )
+
+    def _evict_locked(self, loop: asyncio.AbstractEventLoop, *, keep: tuple[Any, ...]) -> list[_PooledClient]:
+        now = time.monotonic()
+        evicted: list[_PooledClient] = []
+        for key, entry in list(self._clients.items()):
+            if key == keep:
+                continue
+            if entry.is_orphaned():
+                evicted.append(self._clients.pop(key))
+            elif entry.stats.in_flight == 0 and now - entry.stats.last_used_at >= self._idle_client_seconds:
+                evicted.append(self._clients.pop(key))
+        for key, entry in list(self._clients.items()):
+            if len(self._clients) <= self._max_clients:
+                break
+            if key != keep and entry.stats.in_flight == 0:
+                evicted.append(self._clients.pop(key))
+        return evicted
+
+    @staticmethod
+    async def _close_entries(entries: list[_PooledClient], loop: asyncio.AbstractEventLoop) -> None:
+        for entry in entries:
+            # Clients from another (or a closed) loop cannot be closed from here; let them be collected.
+            if entry.belongs_to(loop):
+                await _close_quietly(entry.client)
+
+
+async def _close_quietly(client: Any) -> None:
+    close = getattr(client, "aclose", None)
+    if close is None:
+        return
+    try:
+        await close()
+    except Exception:
+        pass
+
+
+_HTTP_CLIENT_POOL = HttpClientPool()
+
+# Long-lived streams (SSE event feeds) hold a connection for a whole run, so they get
+# their own clients and cap; otherwise concurrent runs would starve short requests
+# to the same origin and each other of the request pool's connections.
+_STREAMING_HTTP_CLIENT_POOL = HttpClientPool(
+    env_prefix="OUTBOUND_HTTP_STREAM_POOL",
+    default_max_connections=1024,
+)
+
+
+def get_http_client_pool() -> HttpClientPool:
+    return _HTTP_CLIENT_POOL
+
+
+def get_streaming_http_client_pool() -> HttpClientPool:
+    return _STREAMING_HTTP_CLIENT_POOL
@@ -16,6 +16,7 @@ from urllib.parse import urlparse
 
 import httpx
 
+from app.services.http_client_pool import get_http_client_pool
 
 MCP_PROTOCOL_VERSION = "2025-03-26"
 DEFAULT_TIMEOUT_S = 20
@@ -288,7 +289,11 @@ async def initialize_mcp_session(
     session_id = None if force_reinitialize else _cached_session_id(cache_key)
     request_headers = _auth_headers(headers, bearer_token)
 
-    async with httpx.AsyncClient(timeout=_normalize_timeout(timeout_s)) as client:
+    async with get_http_client_pool().client(
+        server_url,
+        timeout=_normalize_timeout(timeout_s),
+        auth_identity=auth_identity,
+    ) as client:
         response = await _post_jsonrpc(
             client=client,
             server_url=server_url,
@@ -339,7 +344,11 @@ async def list_mcp_tools(
         timeout_s=timeout_s,
         auth_identity=auth_identity,
     )
-    async with httpx.AsyncClient(timeout=_normalize_timeout(timeout_s)) as client:
+    async with get_http_client_pool().client(
+        server_url,
+        timeout=_normalize_timeout(timeout_s),
+        auth_identity=auth_identity,
+    ) as client:
         response = await _post_jsonrpc(
             client=client,
             server_url=server_url,
@@ -380,7 +389,11 @@ async def call_mcp_tool(
         timeout_s=timeout_s,
         auth_identity=auth_identity,
     )
-    async with httpx.AsyncClient(timeout=_normalize_timeout(timeout_s)) as client:
+    async with get_http_client_pool().client(
+        server_url,
+        timeout=_normalize_timeout(timeout_s),
+        auth_identity=auth_identity,
+    ) as client:
         response = await _post_jsonrpc(
             client=client,
             server_url=server_url,
@@ -403,7 +416,7 @@ def parse_www_authenticate_header(header_value: str | None) -> dict[str, str]:
 
 
 async def fetch_json_document(url: str, *, timeout_s: int | None = None) -> dict[str, Any]:
-    async with httpx.AsyncClient(timeout=_normalize_timeout(timeout_s)) as client:
+    async with get_http_client_pool().client(url, timeout=_normalize_timeout(timeout_s)) as client:
         response = await client.get(url, headers={"Accept": "application/json"})
         response.raise_for_status()
         payload = response.json()
@@ -539,7 +552,7 @@ async def register_oauth_client(
     payload: dict[str, Any],
     timeout_s: int | None = None,
 ) -> dict[str, Any]:
-    async with httpx.AsyncClient(timeout=_normalize_timeout(timeout_s)) as client:
+    async with get_http_client_pool().client(registration_endpoint, timeout=_normalize_timeout(timeout_s)) as client:
         response = await client.post(
             registration_endpoint,
             json=payload,
@@ -571,7 +584,7 @@ async def exchange_oauth_code(
     }
     if client_secret:
         data["client_secret"] = client_secret
-    async with httpx.AsyncClient(timeout=_normalize_timeout(timeout_s)) as client:
+    async with get_http_client_pool().client(token_endpoint, timeout=_normalize_timeout(timeout_s)) as client:
         response = await client.post(
             token_endpoint,
             data=data,
@@ -599,7 +612,7 @@ async def refresh_oauth_token(
     }
     if client_secret:
         data["client_secret"] = client_secret
-    async with httpx.AsyncClient(timeout=_normalize_timeout(timeout_s)) as client:
+    async with get_http_client_pool().client(token_endpoint, timeout=_normalize_timeout(timeout_s)) as client:
         response = await client.post(
             token_endpoint,
             data=data,
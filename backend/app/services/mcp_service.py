@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import copy
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 import html
 import json
 import secrets
+import threading
 from types import SimpleNamespace
 from typing import Any
 from urllib.parse import urlencode
@@ -96,6 +99,68 @@ class ResolvedMcpAuth:
     account_connection: McpUserAccountConnection | None = None
 
 
+class McpAgentToolCatalogCache:
+    """Process-wide cache of the virtual MCP tools mounted on each agent.
+
+    Entries are validated against a fingerprint of the agent's active mounts
+    (mount id, applied snapshot version, server id and name), which is re-read on
+    every lookup, so a re-applied snapshot or a mount change in another process is
+    still picked up. `sync_server` and mount mutations also drop entries eagerly.
+    """
+
+    def __init__(self, *, max_entries: int = 1024) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[tuple[str, str], tuple[tuple[Any, ...], list[SimpleNamespace], frozenset[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str], fingerprint: tuple[Any, ...]) -> list[SimpleNamespace] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != fingerprint:
+                return None
+            self._entries.move_to_end(key)
+            tools = entry[1]
+        return [copy.copy(tool) for tool in tools]
+
+    def put(
+        self,
+        key: tuple[str, str],
+        fingerprint: tuple[Any, ...],
+        tools: list[SimpleNamespace],
+        *,
+        server_ids: set[str],
+    ) -> None:
+        with self._lock:
+            self._entries[key] = (fingerprint, [copy.copy(tool) for tool in tools], frozenset(server_ids))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_agent(self, organization_id: UUID, agent_id: UUID) -> None:
+        with self._lock:
+            self._entries.pop((str(organization_id), str(agent_id)), None)
+
+    def invalidate_server(self, organization_id: UUID, server_id: UUID) -> None:
+        org_key = str(organization_id)
+        server_key = str(server_id)
+        with self._lock:
+            for key in [
+                key for key, entry in self._entries.items() if key[0] == org_key and server_key in entry[2]
+            ]:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_MCP_AGENT_TOOL_CATALOG_CACHE = McpAgentToolCatalogCache()
+
+
+def get_mcp_agent_tool_catalog_cache() -> McpAgentToolCatalogCache:
+    return _MCP_AGENT_TOOL_CATALOG_CACHE
+
+
 class McpService:
     def __init__(self, db: AsyncSession, organization_id: UUID):
         self.db = db
@@ -499,6 +564,7 @@ class McpService:
             if discovered.name:
                 self.db.add(discovered)
         await self.db.flush()
+        get_mcp_agent_tool_catalog_cache().invalidate_server(self.organization_id, server.id)
         return {"snapshot_version": version, "tool_count": len(response.get("tools", []))}
 
     async def ensure_oauth_metadata(self, server: McpServer) -> dict[str, Any]:
@@ -750,6 +816,7 @@ class McpService:
         )
         self.db.add(mount)
         await self.db.flush()
+        get_mcp_agent_tool_catalog_cache().invalidate_agent(self.organization_id, agent_id)
         return mount
 
     async def update_agent_mount(self, mount_id: UUID, payload: dict[str, Any]) -> McpAgentMount:
@@ -769,6 +836,7 @@ class McpService:
             server = await self._get_server(mount.server_id)
             mount.applied_snapshot_version = int(server.tool_snapshot_version or 0)
         await self.db.flush()
+        get_mcp_agent_tool_catalog_cache().invalidate_agent(self.organization_id, mount.agent_id)
         return mount
 
     async def delete_agent_mount(self, mount_id: UUID) -> None:
@@ -781,6 +849,7 @@ class McpService:
         if mount is None:
             raise McpNotFoundError("MCP agent mount not found")
         await self.db.delete(mount)
+        get_mcp_agent_tool_catalog_cache().invalidate_agent(self.organization_id, mount.agent_id)
 
 
 class McpRuntimeService:
@@ -805,8 +874,18 @@ class McpRuntimeService:
             )
             .order_by(McpAgentMount.created_at.asc())
         )
+        mounts = list(mounts_result.all())
+        cache = get_mcp_agent_tool_catalog_cache()
+        cache_key = (str(self.organization_id), str(agent_id))
+        fingerprint = tuple(
+            (str(mount.id), int(mount.applied_snapshot_version or 0), str(server.id), server.name)
+            for mount, server in mounts
+        )
+        cached = cache.get(cache_key, fingerprint)
+        if cached is not None:
+            return cached
         virtual_tools: list[SimpleNamespace] = []
-        for mount, server in mounts_result.all():
+        for mount, server in mounts:
             tools_result = await self.db.execute(
                 select(McpDiscoveredTool)
                 .where(
@@ -845,6 +924,7 @@ class McpRuntimeService:
                         mcp_virtual=True,
                     )
                 )
+        cache.put(cache_key, fingerprint, virtual_tools, server_ids={str(server.id) for _, server in mounts})
         return virtual_tools
 
     async def resolve_virtual_tool(self, tool_id: str) -> tuple[McpAgentMount, McpServer, McpDiscoveredTool]:
@@ -17,6 +17,7 @@ from uuid import uuid4
 
 import httpx
 
+from app.services.http_client_pool import get_http_client_pool, get_streaming_http_client_pool
 from app.services.published_app_draft_dev_runtime_client import (
     PublishedAppDraftDevRuntimeClient,
     PublishedAppDraftDevRuntimeClientError,
@@ -695,7 +696,7 @@ class OpenCodeServerClient:
         )
         while True:
             try:
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with get_streaming_http_client_pool().client(url, timeout=timeout) as client:
                     async with client.stream("GET", url, headers=self._headers()) as response:
                         if response.status_code >= 400:
                             body = (await response.aread()).decode("utf-8", errors="replace").strip()
@@ -1640,7 +1641,7 @@ class OpenCodeServerClient:
             write=self._config.request_timeout_seconds,
             pool=self._config.request_timeout_seconds,
         )
-        async with httpx.AsyncClient(timeout=stream_timeout) as client:
+        async with get_streaming_http_client_pool().client(url, timeout=stream_timeout) as client:
             async with client.stream("GET", url, headers=self._headers()) as response:
                 if response.status_code >= 400:
                     body = (await response.aread()).decode("utf-8", errors="replace").strip()
@@ -2416,7 +2417,7 @@ class OpenCodeServerClient:
         }
         timeout = httpx.Timeout(timeout=2.0, connect=1.5)
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with get_http_client_pool().client(url, timeout=timeout) as client:
                 response = await client.post(url, headers=self._headers(), json=payload)
         except Exception:
             return
@@ -3153,7 +3154,7 @@ class OpenCodeServerClient:
 
         for _ in range(attempts):
             try:
-                async with httpx.AsyncClient(timeout=self._timeout()) as client:
+                async with get_http_client_pool().client(url, timeout=self._timeout()) as client:
                     request_kwargs: dict[str, Any] = {"headers": headers}
                     if method.upper() != "GET":
                         request_kwargs["json"] = json_payload
@@ -4,10 +4,11 @@ from datetime import datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.agent.execution.service import AgentExecutorService
+from app.agent.execution.service import AgentExecutorService, RunStartRequest
+from app.agent.execution.types import ORCHESTRATION_JOIN_RESUME_KEY
 from app.agent.execution.run_task_registry import (
     cancel_run_tasks,
     is_run_cancel_requested,
@@ -21,6 +22,10 @@ from app.services.orchestration_policy_service import (
     OrchestrationPolicyService,
 )
 
+_JOIN_WAITING = "waiting"
+_JOIN_READY = "ready"
+_JOIN_RESUMED = "resumed"
+
 
 class OrchestrationKernelService:
     """
@@ -163,6 +168,9 @@ class OrchestrationKernelService:
             parent_run_id=caller_run.parent_run_id,
         ):
             raise RuntimeError(f"Caller run {caller_run_id} is cancelled")
+        caller_status = caller_run.status.value if hasattr(caller_run.status, "value") else str(caller_run.status)
+        if caller_status == RunStatus.cancelled.value:
+            raise RuntimeError(f"Caller run {caller_run_id} is cancelled")
         policy = await self.policy.get_policy(caller_run.organization_id, caller_run.agent_id)
 
         if not targets:
@@ -175,6 +183,19 @@ class OrchestrationKernelService:
             if quorum_threshold is None or int(quorum_threshold) < 1:
                 raise ValueError("quorum_threshold is required for quorum join_mode")
 
+        # Policy, allowlist and quota are shared by every child, so they are checked
+        # once for the whole fan-out instead of once per spawned run.
+        resolved_targets = await self._resolve_targets(
+            organization_id=caller_run.organization_id,
+            target_agent_ids=[self._as_uuid(target.get("target_agent_id")) for target in targets],
+        )
+        await self.policy.assert_targets_allowed(
+            organization_id=caller_run.organization_id,
+            orchestrator_agent_id=caller_run.agent_id,
+            targets=list({target.id: target for target in resolved_targets}.values()),
+            policy=policy,
+        )
+
         await self.policy.assert_spawn_limits(
             policy=policy,
             root_run_id=caller_run.root_run_id or caller_run.id,
@@ -198,37 +219,69 @@ class OrchestrationKernelService:
             quorum_threshold=quorum_threshold,
             timeout_s=timeout_s or policy.join_timeout_s,
             status="running",
+            member_count=len(targets),
+            success_count=0,
+            failure_count=0,
             policy_snapshot=policy.as_dict(),
         )
         self.db.add(group)
         await self.db.flush()
 
-        spawned: list[str] = []
-        for idx, target in enumerate(targets):
-            key = f"{idempotency_key_prefix}:{idx}"
-            result = await self.spawn_run(
-                caller_run_id=caller_run_id,
-                parent_node_id=parent_node_id,
-                target_agent_id=self._as_uuid(target.get("target_agent_id")),
-                mapped_input_payload=target.get("mapped_input_payload") if isinstance(target.get("mapped_input_payload"), dict) else {},
-                failure_policy=failure_policy,
-                timeout_s=timeout_s,
-                scope_subset=scope_subset,
-                idempotency_key=key,
-                start_background=start_background,
-                orchestration_group_id=group.id,
-                thread_id=self._as_uuid(target.get("thread_id")),
+        keys = [f"{idempotency_key_prefix}:{idx}" for idx in range(len(targets))]
+        existing_res = await self.db.execute(
+            select(AgentRun.spawn_key, AgentRun.id).where(
+                AgentRun.parent_run_id == caller_run.id,
+                AgentRun.spawn_key.in_(keys),
             )
-            run_id = result["spawned_run_ids"][0]
-            spawned.append(run_id)
-
-            member = OrchestrationGroupMember(
-                group_id=group.id,
-                run_id=UUID(run_id),
-                ordinal=idx,
-                status="queued",
+        )
+        existing_by_key = {str(spawn_key): run_id for spawn_key, run_id in existing_res.all()}
+
+        requests: list[RunStartRequest] = []
+        for idx, (target, resolved) in enumerate(zip(targets, resolved_targets)):
+            if keys[idx] in existing_by_key:
+                continue
+            mapped_input_payload = target.get("mapped_input_payload")
+            requests.append(
+                RunStartRequest(
+                    agent_id=resolved.id,
+                    input_params=self._build_child_input_payload(
+                        caller_run=caller_run,
+                        mapped_input_payload=mapped_input_payload if isinstance(mapped_input_payload, dict) else {},
+                        parent_node_id=parent_node_id,
+                        scope_subset=scope_subset,
+                        idempotency_key=keys[idx],
+                        orchestration_group_id=group.id,
+                    ),
+                    user_id=caller_run.initiator_user_id or caller_run.user_id,
+                    root_run_id=caller_run.root_run_id or caller_run.id,
+                    parent_run_id=caller_run.id,
+                    parent_node_id=parent_node_id,
+                    depth=int(caller_run.depth or 0) + 1,
+                    spawn_key=keys[idx],
+                    orchestration_group_id=group.id,
+                    thread_id=self._as_uuid(target.get("thread_id")),
+                )
             )
-            self.db.add(member)
+
+        executor = AgentExecutorService(db=self.db)
+        child_runs = await executor.prepare_runs(requests)
+        run_ids_by_key = dict(existing_by_key)
+        run_ids_by_key.update({run.spawn_key: run.id for run in child_runs})
+        spawned = [str(run_ids_by_key[key]) for key in keys]
+
+        self.db.add_all(
+            [
+                OrchestrationGroupMember(
+                    group_id=group.id,
+                    run_id=run_ids_by_key[key],
+                    ordinal=idx,
+                    status="queued",
+                )
+                for idx, key in enumerate(keys)
+            ]
+        )
+        await self.db.commit()
+        await executor.dispatch_prepared_runs(child_runs, background=start_background)
 
         await self.db.commit()
 
@@ -256,7 +309,14 @@ class OrchestrationKernelService:
         mode: str | None,
         quorum_threshold: int | None,
         timeout_s: int | None,
+        park: bool = False,
     ) -> dict[str, Any]:
+        """Evaluate a group's join policy from its members' run states.
+
+        With ``park`` an incomplete group is marked as waiting on its orchestrator;
+        child completions then resume the orchestrator once the policy is met
+        instead of the caller re-driving the join.
+        """
         _ = await self._require_run(caller_run_id)
         group = await self.db.get(OrchestrationGroup, orchestration_group_id)
         if group is None:
@@ -318,42 +378,14 @@ class OrchestrationKernelService:
         effective_quorum = quorum_threshold if quorum_threshold is not None else group.quorum_threshold
         effective_timeout = timeout_s if timeout_s is not None else group.timeout_s
 
-        complete = False
-        outcome = "running"
-        cancellation_reason: str | None = None
-
-        if effective_mode == "first_success":
-            if success >= 1:
-                complete = True
-                outcome = "completed"
-                cancellation_reason = "join_first_success"
-            elif running == 0:
-                complete = True
-                outcome = "failed"
-        elif effective_mode == "quorum":
-            if not effective_quorum or effective_quorum < 1:
-                raise ValueError("quorum_threshold is required for quorum mode")
-            if effective_quorum > total_members:
-                raise ValueError("quorum_threshold cannot exceed group size")
-            if success >= effective_quorum:
-                complete = True
-                outcome = "completed"
-                cancellation_reason = "join_quorum_reached"
-            elif success + running < effective_quorum:
-                complete = True
-                outcome = "failed"
-        elif effective_mode == "fail_fast":
-            if failed > 0:
-                complete = True
-                outcome = "failed"
-                cancellation_reason = "join_fail_fast"
-            elif running == 0:
-                complete = True
-                outcome = "completed" if failed == 0 else "failed"
-        else:
-            if running == 0:
-                complete = True
-                outcome = "completed" if failed == 0 else "completed_with_errors"
+        complete, outcome, cancellation_reason = self._evaluate_join_outcome(
+            mode=effective_mode,
+            quorum_threshold=effective_quorum,
+            success=success,
+            failed=failed,
+            running=running,
+            total_members=total_members,
+        )
 
         started_at = group.started_at
         if started_at is not None and started_at.tzinfo is None:
@@ -381,16 +413,34 @@ class OrchestrationKernelService:
                 failed += len(cancelled_run_ids)
                 running = max(0, running - len(cancelled_run_ids))
 
-        group.status = outcome if complete else "running"
+        parked = bool(park and not complete)
         if complete:
+            group.status = outcome
             group.completed_at = now
+        elif parked:
+            group.status = _JOIN_WAITING
+            # Keep the parked policy on the group so child completions evaluate
+            # the same join the orchestrator asked for.
+            group.join_mode = effective_mode
+            group.quorum_threshold = effective_quorum
+            if effective_timeout is not None:
+                group.timeout_s = int(effective_timeout)
+        else:
+            group.status = "running"
 
         await self.db.commit()
 
+        if parked:
+            # A child may have finished between the member scan and parking; the
+            # group is then flagged ready and the orchestrator resumes itself once
+            # its pause is committed.
+            await self._mark_parked_join_ready(group.id)
+
         return {
             "group_id": str(group.id),
-            "status": group.status,
+            "status": "running" if parked else group.status,
             "complete": complete,
+            "parked": parked,
             "mode": effective_mode,
             "failure_policy": effective_failure_policy,
             "quorum_threshold": effective_quorum,
@@ -406,6 +456,91 @@ class OrchestrationKernelService:
             },
         }
 
+    async def record_child_terminal(
+        self,
+        *,
+        run_id: UUID,
+        orchestration_group_id: UUID | None,
+        status: Any,
+    ) -> bool:
+        """Count a finished child against its group and resume a parked orchestrator.
+
+        Each member is counted once (guarded by ``counted_at``), so repeated
+        terminal notifications for the same run do not skew the group counters.
+        Returns True when this call resumed the orchestrator run.
+        """
+        group_id = orchestration_group_id
+        if group_id is None:
+            return False
+        status = status.value if hasattr(status, "value") else str(status)
+        if status == RunStatus.completed.value:
+            counter = OrchestrationGroup.success_count
+        elif status in {RunStatus.failed.value, RunStatus.cancelled.value}:
+            counter = OrchestrationGroup.failure_count
+        else:
+            return False
+
+        counted = await self.db.execute(
+            update(OrchestrationGroupMember)
+            .where(
+                OrchestrationGroupMember.group_id == group_id,
+                OrchestrationGroupMember.run_id == run_id,
+                OrchestrationGroupMember.counted_at.is_(None),
+            )
+            .values(status=status, counted_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        if not counted.rowcount:
+            return False
+        await self.db.execute(
+            update(OrchestrationGroup)
+            .where(OrchestrationGroup.id == group_id)
+            .values({counter.key: counter + 1})
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+
+        if not await self._mark_parked_join_ready(group_id):
+            return False
+        return await self._dispatch_join_resume(group_id)
+
+    async def resume_ready_joins(self, *, orchestrator_run_id: UUID) -> int:
+        """Resume a just-paused orchestrator whose parked join became ready meanwhile."""
+        groups_res = await self.db.execute(
+            select(OrchestrationGroup.id).where(
+                OrchestrationGroup.orchestrator_run_id == orchestrator_run_id,
+                OrchestrationGroup.status == _JOIN_READY,
+            )
+        )
+        resumed = 0
+        for group_id in list(groups_res.scalars().all()):
+            if await self._dispatch_join_resume(group_id):
+                resumed += 1
+        return resumed
+
+    async def resume_timed_out_joins(self, *, now: datetime | None = None) -> int:
+        """Resume orchestrators parked on groups whose join timeout has elapsed."""
+        current = now or datetime.now(timezone.utc)
+        groups_res = await self.db.execute(
+            select(OrchestrationGroup).where(OrchestrationGroup.status == _JOIN_WAITING)
+        )
+        expired: list[UUID] = []
+        for group in groups_res.scalars().all():
+            if group.timeout_s is None or int(group.timeout_s) <= 0:
+                continue
+            started_at = group.started_at or current
+            if started_at.tzinfo is None:
+                started_at = started_at.replace(tzinfo=timezone.utc)
+            if current >= started_at + timedelta(seconds=int(group.timeout_s)):
+                expired.append(group.id)
+
+        resumed = 0
+        for group_id in expired:
+            if await self._claim_join_transition(group_id, from_status=_JOIN_WAITING, to_status=_JOIN_READY):
+                if await self._dispatch_join_resume(group_id):
+                    resumed += 1
+        return resumed
+
     async def cancel_subtree(
         self,
         *,
@@ -437,6 +572,7 @@ class OrchestrationKernelService:
 
         changed = 0
         cancelled_ids: list[str] = []
+        cancelled_members: list[tuple[UUID, UUID]] = []
         for item in runs:
             status = item.status.value if hasattr(item.status, "value") else str(item.status)
             if status in {RunStatus.queued.value, RunStatus.running.value, RunStatus.paused.value}:
@@ -445,11 +581,20 @@ class OrchestrationKernelService:
                 item.completed_at = datetime.now(timezone.utc)
                 changed += 1
                 cancelled_ids.append(str(item.id))
+                if item.orchestration_group_id is not None:
+                    cancelled_members.append((item.id, item.orchestration_group_id))
 
         mark_run_cancel_requested(str(item_id) for item_id in subtree_ids)
         await self.db.commit()
         cancel_run_tasks(str(item_id) for item_id in subtree_ids)
 
+        for member_run_id, group_id in cancelled_members:
+            await self.record_child_terminal(
+                run_id=member_run_id,
+                orchestration_group_id=group_id,
+                status=RunStatus.cancelled,
+            )
+
         return {
             "run_id": str(run_id),
             "cancelled_count": changed,
@@ -511,6 +656,24 @@ class OrchestrationKernelService:
 
         raise ValueError("target_agent_id is required")
 
+    async def _resolve_targets(
+        self,
+        *,
+        organization_id: UUID,
+        target_agent_ids: list[UUID | None],
+    ) -> list[Agent]:
+        if any(target_agent_id is None for target_agent_id in target_agent_ids):
+            raise ValueError("target_agent_id is required")
+        rows = await self.db.execute(select(Agent).where(Agent.id.in_(set(target_agent_ids))))
+        agents = {agent.id: agent for agent in rows.scalars().all()}
+        resolved: list[Agent] = []
+        for target_agent_id in target_agent_ids:
+            target = agents.get(target_agent_id)
+            if target is None or target.organization_id != organization_id:
+                raise ValueError("Target agent not found")
+            resolved.append(target)
+        return resolved
+
     @staticmethod
     def _caller_effective_scopes(run: AgentRun) -> list[str]:
         input_params = run.input_params if isinstance(run.input_params, dict) else {}
@@ -597,6 +760,106 @@ class OrchestrationKernelService:
             cancelled.append(str(run.id))
         return cancelled
 
+    async def _mark_parked_join_ready(self, group_id: UUID) -> bool:
+        group = await self.db.get(OrchestrationGroup, group_id, populate_existing=True)
+        if group is None or group.status != _JOIN_WAITING:
+            return False
+        mode = self._normalize_join_mode(group.join_mode) or "best_effort"
+        if mode == "best_effort" and str(group.failure_policy or "best_effort") == "fail_fast":
+            mode = "fail_fast"
+        success = int(group.success_count or 0)
+        failed = int(group.failure_count or 0)
+        total_members = int(group.member_count or 0)
+        try:
+            complete, _, _ = self._evaluate_join_outcome(
+                mode=mode,
+                quorum_threshold=group.quorum_threshold,
+                success=success,
+                failed=failed,
+                running=max(0, total_members - success - failed),
+                total_members=total_members,
+            )
+        except ValueError:
+            # Let the orchestrator's own join surface the configuration error.
+            complete = True
+        if not complete:
+            return False
+        return await self._claim_join_transition(group_id, from_status=_JOIN_WAITING, to_status=_JOIN_READY)
+
+    async def _dispatch_join_resume(self, group_id: UUID) -> bool:
+        group = await self.db.get(OrchestrationGroup, group_id, populate_existing=True)
+        if group is None or group.status != _JOIN_READY:
+            return False
+        orchestrator = await self.db.get(AgentRun, group.orchestrator_run_id, populate_existing=True)
+        if orchestrator is None or orchestrator.status != RunStatus.paused:
+            # Still committing its pause; resume_ready_joins picks the group up then.
+            return False
+        if not await self._claim_join_transition(group_id, from_status=_JOIN_READY, to_status=_JOIN_RESUMED):
+            return False
+        await AgentExecutorService(db=self.db).resume_run(
+            orchestrator.id,
+            {ORCHESTRATION_JOIN_RESUME_KEY: {"orchestration_group_id": str(group_id)}},
+        )
+        return True
+
+    async def _claim_join_transition(self, group_id: UUID, *, from_status: str, to_status: str) -> bool:
+        claimed = await self.db.execute(
+            update(OrchestrationGroup)
+            .where(OrchestrationGroup.id == group_id, OrchestrationGroup.status == from_status)
+            .values(status=to_status)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return bool(claimed.rowcount)
+
+    @staticmethod
+    def _evaluate_join_outcome(
+        *,
+        mode: str,
+        quorum_threshold: int | None,
+        success: int,
+        failed: int,
+        running: int,
+        total_members: int,
+    ) -> tuple[bool, str, str | None]:
+        complete = False
+        outcome = "running"
+        cancellation_reason: str | None = None
+
+        if mode == "first_success":
+            if success >= 1:
+                complete = True
+                outcome = "completed"
+                cancellation_reason = "join_first_success"
+            elif running == 0:
+                complete = True
+                outcome = "failed"
+        elif mode == "quorum":
+            if not quorum_threshold or quorum_threshold < 1:
+                raise ValueError("quorum_threshold is required for quorum mode")
+            if quorum_threshold > total_members:
+                raise ValueError("quorum_threshold cannot exceed group size")
+            if success >= quorum_threshold:
+                complete = True
+                outcome = "completed"
+                cancellation_reason = "join_quorum_reached"
+            elif success + running < quorum_threshold:
+                complete = True
+                outcome = "failed"
+        elif mode == "fail_fast":
+            if failed > 0:
+                complete = True
+                outcome = "failed"
+                cancellation_reason = "join_fail_fast"
+            elif running == 0:
+                complete = True
+                outcome = "completed" if failed == 0 else "failed"
+        else:
+            if running == 0:
+                complete = True
+                outcome = "completed" if failed == 0 else "completed_with_errors"
+        return complete, outcome, cancellation_reason
+
     @staticmethod
     def _normalize_join_mode(value: str | None) -> str | None:
         mode = str(value or "all").strip().lower()
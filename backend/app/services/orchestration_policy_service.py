@@ -89,11 +89,27 @@ class OrchestrationPolicyService:
         orchestrator_agent_id: UUID,
         target: Agent,
         policy: PolicySnapshot,
+    ) -> None:
+        await self.assert_targets_allowed(
+            organization_id=organization_id,
+            orchestrator_agent_id=orchestrator_agent_id,
+            targets=[target],
+            policy=policy,
+        )
+
+    async def assert_targets_allowed(
+        self,
+        *,
+        organization_id: UUID,
+        orchestrator_agent_id: UUID,
+        targets: list[Agent],
+        policy: PolicySnapshot,
     ) -> None:
         if policy.enforce_published_only:
-            target_status = target.status.value if hasattr(target.status, "value") else str(target.status)
-            if target_status != AgentStatus.published.value:
-                raise OrchestrationPolicyError("Target agent is not published")
+            for target in targets:
+                target_status = target.status.value if hasattr(target.status, "value") else str(target.status)
+                if target_status != AgentStatus.published.value:
+                    raise OrchestrationPolicyError("Target agent is not published")
 
         allowlist_res = await self.db.execute(
             select(OrchestratorTargetAllowlist).where(
@@ -106,14 +122,10 @@ class OrchestrationPolicyService:
         if not allowlist:
             raise OrchestrationPolicyError("Orchestrator has no target allowlist entries")
 
-        target_id = target.id
-
-        allowed = any(
-            (entry.target_agent_id and entry.target_agent_id == target_id)
-            for entry in allowlist
-        )
-        if not allowed:
-            raise OrchestrationPolicyError("Target agent is not allowlisted for this orchestrator")
+        allowed_ids = {entry.target_agent_id for entry in allowlist if entry.target_agent_id}
+        for target in targets:
+            if target.id not in allowed_ids:
+                raise OrchestrationPolicyError("Target agent is not allowlisted for this orchestrator")
 
     def assert_scope_subset(self, *, scope_subset: list[str], policy: PolicySnapshot, effective_scopes: list[str]) -> None:
         requested = set(scope_subset or [])
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+from datetime import datetime
+import logging
+import os
+import random
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import insert
+
+from app.core.env_loader import env_float, env_int, running_under_pytest
+from app.db.postgres.models.published_app_analytics import (
+    PublishedAppAnalyticsEvent,
+    PublishedAppAnalyticsEventType,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def analytics_buffering_enabled() -> bool:
+    raw = os.getenv("PUBLISHED_APP_ANALYTICS_BUFFERED", "0" if running_under_pytest() else "1")
+    return str(raw).strip().lower() in {"1", "true", "yes", "on"}
+
+
+class PublishedAppAnalyticsBuffer:
+    """Bounded in-process buffer that batches analytics event inserts off the request path.
+
+    `emit` appends rows to a deque and returns immediately. A writer task on the event
+    loop flushes them as one multi-row insert per batch when `batch_size` rows are
+    pending or every `flush_interval_seconds`. Under pressure, rows past the high-water
+    mark are sampled (bootstrap views only; visit starts drive visit counts) and rows
+    past capacity are dropped; both are counted and reported in `stats()`.
+
+    It also remembers recent visits recorded by this process, so a visit still waiting
+    in the buffer is reused instead of being started twice.
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int | None = None,
+        batch_size: int | None = None,
+        flush_interval_seconds: float | None = None,
+        high_water_ratio: float | None = None,
+        overload_sample_rate: float | None = None,
+        recent_visit_capacity: int | None = None,
+    ) -> None:
+        self._capacity = max(1, capacity or env_int("PUBLISHED_APP_ANALYTICS_BUFFER_SIZE", 10000))
+        self._batch_size = max(1, batch_size or env_int("PUBLISHED_APP_ANALYTICS_BATCH_SIZE", 500))
+        self._flush_interval_seconds = max(
+            0.01,
+            flush_interval_seconds
+            if flush_interval_seconds is not None
+            else env_float("PUBLISHED_APP_ANALYTICS_FLUSH_INTERVAL_SECONDS", 1.0),
+        )
+        ratio = high_water_ratio if high_water_ratio is not None else env_float("PUBLISHED_APP_ANALYTICS_HIGH_WATER_RATIO", 0.8)
+        self._high_water = max(1, int(self._capacity * min(max(ratio, 0.0), 1.0)))
+        sample_rate = (
+            overload_sample_rate
+            if overload_sample_rate is not None
+            else env_float("PUBLISHED_APP_ANALYTICS_OVERLOAD_SAMPLE_RATE", 0.1)
+        )
+        self._overload_sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self._recent_visit_capacity = max(
+            1,
+            recent_visit_capacity or env_int("PUBLISHED_APP_ANALYTICS_RECENT_VISITS", 50000),
+        )
+        self._buffer: deque[dict[str, Any]] = deque()
+        self._recent_visits: OrderedDict[tuple[str, str], tuple[str, datetime]] = OrderedDict()
+        self._wakeup: asyncio.Event | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._writer: asyncio.Task[None] | None = None
+        self._writer_loop: asyncio.AbstractEventLoop | None = None
+        self._closing = False
+        self._accepted = 0
+        self._sampled_out = 0
+        self._dropped = 0
+        self._failed = 0
+        self._written = 0
+        self._batches = 0
+        self._reported_lost = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def stats(self) -> dict[str, Any]:
+        offered = self._accepted + self._sampled_out + self._dropped
+        lost = self._sampled_out + self._dropped + self._failed
+        return {
+            "pending": len(self._buffer),
+            "accepted": self._accepted,
+            "written": self._written,
+            "batches": self._batches,
+            "sampled_out": self._sampled_out,
+            "dropped": self._dropped,
+            "failed": self._failed,
+            "drop_rate": (lost / offered) if offered else 0.0,
+        }
+
+    def _admit(self, row: dict[str, Any]) -> bool:
+        depth = len(self._buffer)
+        if depth >= self._capacity:
+            self._dropped += 1
+            return False
+        if (
+            depth >= self._high_water
+            and row.get("event_type") == PublishedAppAnalyticsEventType.bootstrap_view
+            and random.random() >= self._overload_sample_rate
+        ):
+            self._sampled_out += 1
+            return False
+        return True
+
+    def emit(self, rows: list[dict[str, Any]]) -> int:
+        """Queue event rows (column values for `PublishedAppAnalyticsEvent`); returns how many were kept."""
+        kept = 0
+        for row in rows:
+            if not self._admit(row):
+                continue
+            self._buffer.append(row)
+            self._accepted += 1
+            kept += 1
+        if kept:
+            self._ensure_writer()
+            if len(self._buffer) >= self._batch_size and self._wakeup is not None:
+                self._wakeup.set()
+        return kept
+
+    def remember_visit(self, *, app_id: UUID, visitor_key: str, visit_key: str, started_at: datetime) -> None:
+        key = (str(app_id), visitor_key)
+        self._recent_visits[key] = (visit_key, started_at)
+        self._recent_visits.move_to_end(key)
+        while len(self._recent_visits) > self._recent_visit_capacity:
+            self._recent_visits.popitem(last=False)
+
+    def recent_visit(self, *, app_id: UUID, visitor_key: str, since: datetime) -> str | None:
+        entry = self._recent_visits.get((str(app_id), visitor_key))
+        if entry is None or entry[1] < since:
+            return None
+        return entry[0]
+
+    def _ensure_writer(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._writer is not None and not self._writer.done() and self._writer_loop is loop:
+            return
+        # Loop-bound primitives are recreated when the buffer is first used on a new loop.
+        self._writer_loop = loop
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._writer = loop.create_task(self._run(), name="published-app-analytics-writer")
+
+    async def _run(self) -> None:
+        wakeup = self._wakeup
+        assert wakeup is not None
+        while not self._closing:
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=self._flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.warning("Published app analytics flush failed", exc_info=True)
+
+    async def flush(self) -> int:
+        """Write everything buffered so far; returns the number of rows written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            written = 0
+            while self._buffer:
+                batch: list[dict[str, Any]] = []
+                try:
+                    while len(batch) < self._batch_size:
+                        batch.append(self._buffer.popleft())
+                except IndexError:
+                    pass
+                written += await self._write_batch(batch)
+            lost = self._sampled_out + self._dropped + self._failed
+            if lost > self._reported_lost:
+                logger.warning(
+                    "Published app analytics buffer shed %d events (drop rate %.4f)",
+                    lost - self._reported_lost,
+                    self.stats()["drop_rate"],
+                )
+                self._reported_lost = lost
+            return written
+
+    async def _write_batch(self, batch: list[dict[str, Any]]) -> int:
+        from app.db.postgres.engine import sessionmaker
+
+        try:
+            async with sessionmaker() as db:
+                await db.execute(insert(PublishedAppAnalyticsEvent), batch)
+                await db.commit()
+        except Exception:
+            # Analytics must never surface errors into app serving; the batch is counted as lost.
+            self._failed += len(batch)
+            logger.warning("Failed to write %d published app analytics events", len(batch), exc_info=True)
+            return 0
+        self._written += len(batch)
+        self._batches += 1
+        return len(batch)
+
+    async def aclose(self) -> None:
+        """Stop the writer and flush what is left (application shutdown)."""
+        writer = self._writer
+        self._writer = None
+        if writer is not None and not writer.done():
+            # Let an in-flight batch finish rather than cancelling it mid-insert.
+            self._closing = True
+            if self._wakeup is not None:
+                self._wakeup.set()
+            try:
+                await asyncio.wait_for(writer, timeout=max(5.0, self._flush_interval_seconds * 2))
+            except (asyncio.TimeoutError, Exception):
+                writer.cancel()
+            finally:
+                self._closing = False
+        await self.flush()
+
+
+_ANALYTICS_BUFFER = PublishedAppAnalyticsBuffer()
+
+
+def get_published_app_analytics_buffer() -> PublishedAppAnalyticsBuffer:
+    return _ANALYTICS_BUFFER
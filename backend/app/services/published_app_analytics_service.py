@@ -2,51 +2,38 @@ from __future__ import annotations
 
 import hashlib
 import os
-from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from uuid import UUID, uuid4
 
 from fastapi import Request, Response
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.postgres.models.agents import AgentRun
-from app.db.postgres.models.agent_threads import AgentThread, AgentThreadSurface
 from app.db.postgres.models.published_app_analytics import (
     PublishedAppAnalyticsEvent,
     PublishedAppAnalyticsEventType,
     PublishedAppAnalyticsSurface,
 )
-from app.services.model_accounting import billable_total_tokens
 from app.db.postgres.models.published_apps import PublishedApp, PublishedAppAccount, PublishedAppSession
+from app.services.published_app_analytics_buffer import (
+    analytics_buffering_enabled,
+    get_published_app_analytics_buffer,
+)
+from app.services.stats_rollup_service import PUBLISHED_APP_METRICS, SUBJECT_PUBLISHED_APP, StatsRollupService
 
 
 VISITOR_COOKIE_NAME = (os.getenv("PUBLISHED_APP_VISITOR_COOKIE_NAME") or "published_app_visitor").strip() or "published_app_visitor"
 VISIT_COOKIE_NAME = (os.getenv("PUBLISHED_APP_VISIT_COOKIE_NAME") or "published_app_visit").strip() or "published_app_visit"
 VISIT_WINDOW_MINUTES = max(1, int((os.getenv("PUBLISHED_APP_VISIT_WINDOW_MINUTES") or "30").strip() or "30"))
 VISITOR_COOKIE_MAX_AGE_SECONDS = max(86400, int((os.getenv("PUBLISHED_APP_VISITOR_COOKIE_MAX_AGE_SECONDS") or str(60 * 60 * 24 * 365)).strip() or str(60 * 60 * 24 * 365)))
-CODING_AGENT_SURFACE = "published_app_coding_agent"
 
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _date_label(value: datetime) -> str:
-    normalized = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
-    return normalized.date().isoformat()
-
-
-def _is_truthy_flag(value: Any) -> bool:
-    if isinstance(value, bool):
-        return value
-    if isinstance(value, str):
-        return value.strip().lower() in {"1", "true", "yes", "on"}
-    return bool(value)
-
-
 @dataclass(slots=True)
 class PublishedAppStatsSummary:
     app_id: str
@@ -141,24 +128,42 @@ class PublishedAppAnalyticsService:
 
         now = _utc_now()
         visit_window_start = now - timedelta(minutes=VISIT_WINDOW_MINUTES)
-        latest_visit_result = await self.db.execute(
-            select(PublishedAppAnalyticsEvent)
-            .where(
-                and_(
-                    PublishedAppAnalyticsEvent.published_app_id == app.id,
-                    PublishedAppAnalyticsEvent.visitor_key == visitor_key,
-                    PublishedAppAnalyticsEvent.event_type == PublishedAppAnalyticsEventType.visit_started,
-                    PublishedAppAnalyticsEvent.occurred_at >= visit_window_start,
-                )
-            )
-            .order_by(PublishedAppAnalyticsEvent.occurred_at.desc())
-            .limit(1)
+        buffer = get_published_app_analytics_buffer() if analytics_buffering_enabled() else None
+        buffered_visit_key = (
+            buffer.recent_visit(app_id=app.id, visitor_key=visitor_key, since=visit_window_start)
+            if buffer is not None
+            else None
         )
-        latest_visit = latest_visit_result.scalar_one_or_none()
-        if latest_visit is not None:
-            visit_key = latest_visit.visit_key
+        start_visit = False
+        if buffered_visit_key is not None:
+            visit_key = buffered_visit_key
         else:
-            visit_key = uuid4().hex
+            latest_visit_result = await self.db.execute(
+                select(PublishedAppAnalyticsEvent)
+                .where(
+                    and_(
+                        PublishedAppAnalyticsEvent.published_app_id == app.id,
+                        PublishedAppAnalyticsEvent.visitor_key == visitor_key,
+                        PublishedAppAnalyticsEvent.event_type == PublishedAppAnalyticsEventType.visit_started,
+                        PublishedAppAnalyticsEvent.occurred_at >= visit_window_start,
+                    )
+                )
+                .order_by(PublishedAppAnalyticsEvent.occurred_at.desc())
+                .limit(1)
+            )
+            latest_visit = latest_visit_result.scalar_one_or_none()
+            if latest_visit is not None:
+                visit_key = latest_visit.visit_key
+                if buffer is not None:
+                    buffer.remember_visit(
+                        app_id=app.id,
+                        visitor_key=visitor_key,
+                        visit_key=visit_key,
+                        started_at=latest_visit.occurred_at,
+                    )
+            else:
+                visit_key = uuid4().hex
+                start_visit = True
 
         metadata = {
             "approximate_visitor": approximate,
@@ -179,20 +184,20 @@ class PublishedAppAnalyticsService:
             metadata_=metadata,
             occurred_at=now,
         )
-        self.db.add(
-            PublishedAppAnalyticsEvent(
-                event_type=PublishedAppAnalyticsEventType.bootstrap_view,
-                **common,
-            )
-        )
-        if latest_visit is None:
-            self.db.add(
-                PublishedAppAnalyticsEvent(
-                    event_type=PublishedAppAnalyticsEventType.visit_started,
-                    **common,
-                )
-            )
-        await self.db.commit()
+        rows = [dict(event_type=PublishedAppAnalyticsEventType.bootstrap_view, **common)]
+        if start_visit:
+            rows.append(dict(event_type=PublishedAppAnalyticsEventType.visit_started, **common))
+        if buffer is not None:
+            # Written by the buffer's background flush; serving does not wait on the insert.
+            buffer.emit(rows[:1])
+            # Only reuse the visit if its start row was queued; a dropped start would
+            # leave later bootstraps attached to a visit that was never counted.
+            if start_visit and buffer.emit(rows[1:]):
+                buffer.remember_visit(app_id=app.id, visitor_key=visitor_key, visit_key=visit_key, started_at=now)
+        else:
+            for row in rows:
+                self.db.add(PublishedAppAnalyticsEvent(**row))
+            await self.db.commit()
         self._set_tracking_cookies(
             request=request,
             response=response,
@@ -216,10 +221,35 @@ class PublishedAppAnalyticsService:
             return []
 
         app_ids = [app.id for app in apps]
-        analytics_events = list(
-            (
+        totals = await StatsRollupService(self.db).load_totals(
+            organization_id=organization_id,
+            start=start,
+            end=end,
+            subject_kind=SUBJECT_PUBLISHED_APP,
+            metrics=PUBLISHED_APP_METRICS,
+            subject_ids=app_ids,
+        )
+        account_counts = {
+            str(published_app_id): int(count or 0)
+            for published_app_id, count in (
                 await self.db.execute(
-                    select(PublishedAppAnalyticsEvent).where(
+                    select(PublishedAppAccount.published_app_id, func.count(PublishedAppAccount.id))
+                    .where(PublishedAppAccount.published_app_id.in_(app_ids))
+                    .group_by(PublishedAppAccount.published_app_id)
+                )
+            ).all()
+        }
+        # Distinct visitors do not add up across buckets, so they are counted from raw events
+        # (an index-only scan on ix_published_app_analytics_app_occurred_visitor).
+        visitor_counts = {
+            str(published_app_id): int(count or 0)
+            for published_app_id, count in (
+                await self.db.execute(
+                    select(
+                        PublishedAppAnalyticsEvent.published_app_id,
+                        func.count(func.distinct(PublishedAppAnalyticsEvent.visitor_key)),
+                    )
+                    .where(
                         and_(
                             PublishedAppAnalyticsEvent.organization_id == organization_id,
                             PublishedAppAnalyticsEvent.published_app_id.in_(app_ids),
@@ -228,60 +258,26 @@ class PublishedAppAnalyticsService:
                             PublishedAppAnalyticsEvent.surface != PublishedAppAnalyticsSurface.preview_runtime,
                         )
                     )
+                    .group_by(PublishedAppAnalyticsEvent.published_app_id)
                 )
-            ).scalars().all()
-        )
-        run_rows = list(
-            (
-                await self.db.execute(
-                    select(AgentRun).where(
-                        and_(
-                            AgentRun.organization_id == organization_id,
-                            AgentRun.published_app_id.in_(app_ids),
-                            AgentRun.created_at >= start,
-                            AgentRun.created_at <= end,
-                            or_(AgentRun.surface.is_(None), AgentRun.surface != CODING_AGENT_SURFACE),
-                        )
-                    )
-                )
-            ).scalars().all()
-        )
-        thread_rows = list(
-            (
-                await self.db.execute(
-                    select(AgentThread).where(
-                        and_(
-                            AgentThread.organization_id == organization_id,
-                            AgentThread.published_app_id.in_(app_ids),
-                            AgentThread.created_at >= start,
-                            AgentThread.created_at <= end,
-                            AgentThread.app_account_id.is_not(None),
-                            AgentThread.surface != AgentThreadSurface.preview_runtime,
-                        )
-                    )
-                )
-            ).scalars().all()
-        )
-        app_accounts = list(
-            (
-                await self.db.execute(
-                    select(PublishedAppAccount).where(PublishedAppAccount.published_app_id.in_(app_ids))
-                )
-            ).scalars().all()
-        )
-        active_sessions = list(
-            (
+            ).all()
+        }
+        session_counts = {
+            str(published_app_id): int(count or 0)
+            for published_app_id, count in (
                 await self.db.execute(
-                    select(PublishedAppSession).where(
+                    select(PublishedAppSession.published_app_id, func.count(PublishedAppSession.id))
+                    .where(
                         and_(
                             PublishedAppSession.published_app_id.in_(app_ids),
                             PublishedAppSession.revoked_at.is_(None),
                             PublishedAppSession.expires_at > _utc_now(),
                         )
                     )
+                    .group_by(PublishedAppSession.published_app_id)
                 )
-            ).scalars().all()
-        )
+            ).all()
+        }
 
         range_dates = []
         cursor = start.date()
@@ -290,93 +286,35 @@ class PublishedAppAnalyticsService:
             range_dates.append(cursor.isoformat())
             cursor += timedelta(days=1)
 
-        analytics_by_app: dict[str, list[PublishedAppAnalyticsEvent]] = defaultdict(list)
-        for event in analytics_events:
-            analytics_by_app[str(event.published_app_id)].append(event)
-
-        runs_by_app: dict[str, list[AgentRun]] = defaultdict(list)
-        for run in run_rows:
-            preview_flag = _is_truthy_flag(((run.input_params or {}).get("context") or {}).get("published_app_preview"))
-            if preview_flag:
-                continue
-            runs_by_app[str(run.published_app_id)].append(run)
-
-        threads_by_app: dict[str, list[AgentThread]] = defaultdict(list)
-        for thread in thread_rows:
-            threads_by_app[str(thread.published_app_id)].append(thread)
-
-        account_counts: dict[str, int] = defaultdict(int)
-        for account in app_accounts:
-            account_counts[str(account.published_app_id)] += 1
-
-        session_counts: dict[str, int] = defaultdict(int)
-        for session in active_sessions:
-            session_counts[str(session.published_app_id)] += 1
+        def _series(data_map: dict[str, float]) -> list[dict[str, Any]]:
+            return [{"date": date_key, "value": float(data_map.get(date_key, 0))} for date_key in range_dates]
 
         summaries: list[PublishedAppStatsSummary] = []
         for app in apps:
             app_key = str(app.id)
-            app_events = analytics_by_app.get(app_key, [])
-            app_runs = runs_by_app.get(app_key, [])
-            app_threads = threads_by_app.get(app_key, [])
-
-            visit_dates: dict[str, int] = defaultdict(int)
-            run_dates: dict[str, int] = defaultdict(int)
-            token_dates: dict[str, int] = defaultdict(int)
-            visit_surface_breakdown: dict[str, int] = defaultdict(int)
-            visit_auth_state_breakdown: dict[str, int] = defaultdict(int)
-
-            visits = 0
-            unique_visitors: set[str] = set()
-            approximate = False
-            for event in app_events:
-                if event.visitor_key:
-                    unique_visitors.add(str(event.visitor_key))
-                event_date = _date_label(event.occurred_at)
-                if event.event_type == PublishedAppAnalyticsEventType.visit_started:
-                    visits += 1
-                    visit_dates[event_date] += 1
-                    visit_surface_breakdown[str(getattr(event.surface, "value", event.surface))] += 1
-                    auth_state = str((event.metadata_ or {}).get("auth_state") or ("authenticated" if event.app_account_id else "anonymous"))
-                    visit_auth_state_breakdown[auth_state] += 1
-                if bool((event.metadata_ or {}).get("approximate_visitor")):
-                    approximate = True
-
-            agent_runs = 0
-            failed_runs = 0
-            tokens = 0
-            for run in app_runs:
-                agent_runs += 1
-                if str(getattr(run.status, "value", run.status)) == "failed":
-                    failed_runs += 1
-                run_tokens = billable_total_tokens(run)
-                tokens += run_tokens
-                date_key = _date_label(run.created_at)
-                run_dates[date_key] += 1
-                token_dates[date_key] += run_tokens
-
-            def _series(data_map: dict[str, int]) -> list[dict[str, Any]]:
-                return [{"date": date_key, "value": float(data_map.get(date_key, 0))} for date_key in range_dates]
-
             summaries.append(
                 PublishedAppStatsSummary(
                     app_id=app_key,
                     start_date=range_dates[0],
                     end_date=range_dates[-1],
-                    approximate=approximate,
-                    visits=visits,
-                    unique_visitors=len(unique_visitors),
-                    agent_runs=agent_runs,
-                    failed_runs=failed_runs,
-                    tokens=tokens,
-                    threads=len(app_threads),
+                    approximate=totals.total("app_approximate_events", subject_id=app.id) > 0,
+                    visits=int(totals.total("app_visits_by_surface", subject_id=app.id)),
+                    unique_visitors=visitor_counts.get(app_key, 0),
+                    agent_runs=int(totals.total("app_runs", subject_id=app.id)),
+                    failed_runs=int(totals.total("app_runs_failed", subject_id=app.id)),
+                    tokens=int(totals.total("app_tokens", subject_id=app.id)),
+                    threads=int(totals.total("app_threads", subject_id=app.id)),
                     app_accounts=account_counts.get(app_key, 0),
                     active_sessions=session_counts.get(app_key, 0),
-                    visits_by_day=_series(visit_dates),
-                    runs_by_day=_series(run_dates),
-                    tokens_by_day=_series(token_dates),
-                    visit_surface_breakdown=dict(visit_surface_breakdown),
-                    visit_auth_state_breakdown=dict(visit_auth_state_breakdown),
+                    visits_by_day=_series(totals.by_day("app_visits_by_surface", subject_id=app.id)),
+                    runs_by_day=_series(totals.by_day("app_runs", subject_id=app.id)),
+                    tokens_by_day=_series(totals.by_day("app_tokens", subject_id=app.id)),
+                    visit_surface_breakdown={
+                        key: int(value) for key, value in totals.by_dimension("app_visits_by_surface", subject_id=app.id).items()
+                    },
+                    visit_auth_state_breakdown={
+                        key: int(value) for key, value in totals.by_dimension("app_visits_by_auth_state", subject_id=app.id).items()
+                    },
                 )
             )
 
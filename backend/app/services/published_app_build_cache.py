@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+from uuid import uuid4
+
+from app.core.env_loader import env_int
+from app.services.published_app_draft_dev_runtime import PublishedAppDraftDevRuntimeService
+from app.services.published_app_live_preview import build_live_preview_workspace_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of cached entries changes so stale entries are ignored.
+_CACHE_LAYOUT_VERSION = "v1"
+# Tool caches written into node_modules during a build; never shared between builds.
+_NODE_MODULES_VOLATILE_DIRS = frozenset({".vite", ".cache", ".vite-temp"})
+
+
+def _link_or_copy(source: str, destination: str) -> None:
+    # Hardlinks make a restore O(file count) instead of O(bytes); fall back to a
+    # real copy across filesystems or where links are not permitted.
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def link_tree(source: Path, destination: Path, *, ignore_dirs: frozenset[str] = frozenset()) -> None:
+    def _ignore(directory: str, names: list[str]) -> set[str]:
+        return {name for name in names if name in ignore_dirs}
+
+    shutil.copytree(
+        source,
+        destination,
+        symlinks=True,
+        copy_function=_link_or_copy,
+        ignore=_ignore if ignore_dirs else None,
+    )
+
+
+class PublishedAppBuildCache:
+    """Worker-local cache for published app builds.
+
+    `node_modules/<dependency_hash>` holds installed dependencies keyed by
+    package.json + lockfiles, and `dist/<source_fingerprint>` holds build output
+    keyed by the full source tree. Entries are published with an atomic rename and
+    restored by hardlinking, so concurrent builds never see a partial entry.
+    """
+
+    def __init__(self, root: Path, *, max_dependency_entries: int = 8, max_output_entries: int = 32):
+        self.root = Path(root)
+        self.max_dependency_entries = max(1, int(max_dependency_entries))
+        self.max_output_entries = max(1, int(max_output_entries))
+
+    @classmethod
+    def from_env(cls) -> Optional["PublishedAppBuildCache"]:
+        raw_enabled = (os.getenv("APPS_BUILD_CACHE_ENABLED") or "1").strip().lower()
+        if raw_enabled not in {"1", "true", "yes", "on"}:
+            return None
+        root = (os.getenv("APPS_BUILD_CACHE_DIR") or "").strip() or os.path.join(
+            tempfile.gettempdir(),
+            "talmudpedia-apps-build-cache",
+        )
+        return cls(
+            Path(root),
+            max_dependency_entries=env_int("APPS_BUILD_CACHE_MAX_DEPENDENCY_ENTRIES", 8),
+            max_output_entries=env_int("APPS_BUILD_CACHE_MAX_OUTPUT_ENTRIES", 32),
+        )
+
+    @staticmethod
+    def dependency_key(files: Dict[str, str]) -> str:
+        return PublishedAppDraftDevRuntimeService._dependency_hash(files)
+
+    @staticmethod
+    def output_key(*, entry_file: str, files: Dict[str, str]) -> str:
+        return build_live_preview_workspace_fingerprint(entry_file=entry_file, files=files)
+
+    def _dependency_dir(self, key: str) -> Path:
+        return self.root / _CACHE_LAYOUT_VERSION / "node_modules" / key
+
+    def _output_dir(self, key: str) -> Path:
+        return self.root / _CACHE_LAYOUT_VERSION / "dist" / key
+
+    def restore_node_modules(self, key: str, project_dir: Path) -> bool:
+        cached = self._dependency_dir(key) / "node_modules"
+        if not cached.is_dir():
+            return False
+        target = project_dir / "node_modules"
+        if target.exists():
+            shutil.rmtree(target)
+        try:
+            link_tree(cached, target)
+        except Exception:
+            logger.warning("build cache node_modules restore failed", exc_info=True)
+            shutil.rmtree(target, ignore_errors=True)
+            return False
+        self._touch(cached.parent)
+        return True
+
+    def store_node_modules(self, key: str, project_dir: Path) -> bool:
+        source = project_dir / "node_modules"
+        if not source.is_dir():
+            return False
+        stored = self._publish(
+            self._dependency_dir(key),
+            lambda staging: link_tree(source, staging / "node_modules", ignore_dirs=_NODE_MODULES_VOLATILE_DIRS),
+        )
+        if stored:
+            self._evict(self._dependency_dir(key).parent, keep=self.max_dependency_entries)
+        return stored
+
+    def lookup_output(self, key: str) -> Optional[Path]:
+        cached = self._output_dir(key) / "dist"
+        if not cached.is_dir():
+            return None
+        self._touch(cached.parent)
+        return cached
+
+    def store_output(self, key: str, dist_dir: Path) -> bool:
+        stored = self._publish(
+            self._output_dir(key),
+            lambda staging: link_tree(dist_dir, staging / "dist"),
+        )
+        if stored:
+            self._evict(self._output_dir(key).parent, keep=self.max_output_entries)
+        return stored
+
+    def _publish(self, entry_dir: Path, populate) -> bool:
+        if entry_dir.exists():
+            return False
+        entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging = entry_dir.parent / f".{entry_dir.name}.{uuid4().hex}.tmp"
+        try:
+            staging.mkdir()
+            populate(staging)
+            os.rename(staging, entry_dir)
+            return True
+        except OSError:
+            # Another worker published the same key first, or the cache volume is unavailable.
+            logger.debug("build cache publish skipped for %s", entry_dir, exc_info=True)
+            return False
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+    @staticmethod
+    def _touch(entry_dir: Path) -> None:
+        try:
+            os.utime(entry_dir)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _evict(parent: Path, *, keep: int) -> None:
+        try:
+            entries = [path for path in parent.iterdir() if path.is_dir() and not path.name.startswith(".")]
+        except OSError:
+            return
+        if len(entries) <= keep:
+            return
+        entries.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+        for stale in entries[keep:]:
+            shutil.rmtree(stale, ignore_errors=True)
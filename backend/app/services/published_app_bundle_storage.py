@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import mimetypes
 import os
-from dataclasses import dataclass
+import tempfile
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 from pathlib import PurePosixPath
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
+from app.services.storage_streaming import (
+    MULTIPART_PART_SIZE,
+    STREAM_CHUNK_SIZE,
+    ByteRange,
+    iter_bytes,
+)
+
 
 class PublishedAppBundleStorageError(Exception):
     pass
@@ -32,6 +42,83 @@ class PublishedAppBundleStorageConfig:
     allow_local_fallback: bool = False
 
 
+@dataclass
+class PublishedAppBundleAssetStream:
+    content_type: str
+    total_size: int
+    byte_range: Optional[ByteRange]
+    _open_chunks: Callable[[], Iterator[bytes]] = field(repr=False)
+    _close: Optional[Callable[[], None]] = field(default=None, repr=False)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        payload: bytes,
+        content_type: str,
+        *,
+        byte_range: Optional[ByteRange] = None,
+    ) -> "PublishedAppBundleAssetStream":
+        body = payload if byte_range is None else payload[byte_range.start:byte_range.end + 1]
+        return cls(
+            content_type=content_type,
+            total_size=len(payload),
+            byte_range=byte_range,
+            _open_chunks=lambda: iter_bytes(body),
+        )
+
+    @property
+    def content_length(self) -> int:
+        return self.byte_range.length if self.byte_range is not None else self.total_size
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        return self._open_chunks()
+
+    def read(self) -> bytes:
+        return b"".join(self.iter_chunks())
+
+    def close(self) -> None:
+        """Release the underlying body when the stream is discarded without being iterated."""
+        if self._close is not None:
+            self._close()
+
+
+_SHARED_S3_CLIENTS: dict[tuple[Any, ...], Any] = {}
+_SHARED_S3_CLIENTS_LOCK = threading.Lock()
+
+
+def _shared_s3_client(config: PublishedAppBundleStorageConfig) -> Any:
+    """Return one pooled boto3 client per endpoint/credential set for the whole process."""
+    key = (config.region, config.endpoint, config.access_key, config.secret_key)
+    with _SHARED_S3_CLIENTS_LOCK:
+        client = _SHARED_S3_CLIENTS.get(key)
+        if client is not None:
+            return client
+        try:
+            import boto3
+            from botocore.config import Config as BotoConfig
+        except Exception as exc:  # pragma: no cover - import guard
+            raise PublishedAppBundleStorageError("boto3 is required for apps bundle storage") from exc
+
+        try:
+            max_pool_connections = max(1, int(os.getenv("APPS_BUNDLE_MAX_POOL_CONNECTIONS") or 32))
+        except ValueError:
+            max_pool_connections = 32
+        kwargs = {
+            "service_name": "s3",
+            "region_name": config.region,
+            "endpoint_url": config.endpoint,
+            "config": BotoConfig(max_pool_connections=max_pool_connections),
+        }
+        if config.access_key:
+            kwargs["aws_access_key_id"] = config.access_key
+        if config.secret_key:
+            kwargs["aws_secret_access_key"] = config.secret_key
+
+        client = boto3.client(**kwargs)
+        _SHARED_S3_CLIENTS[key] = client
+        return client
+
+
 class PublishedAppBundleStorage:
     def __init__(self, config: PublishedAppBundleStorageConfig):
         self._config = config
@@ -64,24 +151,8 @@ class PublishedAppBundleStorage:
         )
 
     def _get_client(self):
-        if self._client is not None:
-            return self._client
-        try:
-            import boto3
-        except Exception as exc:  # pragma: no cover - import guard
-            raise PublishedAppBundleStorageError("boto3 is required for apps bundle storage") from exc
-
-        kwargs = {
-            "service_name": "s3",
-            "region_name": self._config.region,
-            "endpoint_url": self._config.endpoint,
-        }
-        if self._config.access_key:
-            kwargs["aws_access_key_id"] = self._config.access_key
-        if self._config.secret_key:
-            kwargs["aws_secret_access_key"] = self._config.secret_key
-
-        self._client = boto3.client(**kwargs)
+        if self._client is None:
+            self._client = _shared_s3_client(self._config)
         return self._client
 
     @staticmethod
@@ -144,6 +215,55 @@ class PublishedAppBundleStorage:
             raise PublishedAppBundleAssetNotFound(f"Asset not found: {key}")
         return path.read_bytes()
 
+    def _write_local_asset_stream(self, *, key: str, chunks: Iterable[bytes]) -> str:
+        path = self._local_asset_path(key=key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", delete=False) as handle:
+            temp_path = Path(handle.name)
+            try:
+                for chunk in chunks:
+                    if chunk:
+                        handle.write(chunk)
+            except BaseException:
+                handle.close()
+                temp_path.unlink(missing_ok=True)
+                raise
+        os.replace(temp_path, path)
+        return key
+
+    def _stat_local_asset(self, *, key: str, asset_path: str) -> Tuple[int, str]:
+        path = self._local_asset_path(key=key)
+        if not path.exists() or not path.is_file():
+            raise PublishedAppBundleAssetNotFound(f"Asset not found: {key}")
+        content_type = mimetypes.guess_type(PurePosixPath(asset_path).name)[0] or "application/octet-stream"
+        return path.stat().st_size, content_type
+
+    def _open_local_asset(self, *, key: str, asset_path: str, byte_range: Optional[ByteRange]) -> PublishedAppBundleAssetStream:
+        path = self._local_asset_path(key=key)
+        if not path.exists() or not path.is_file():
+            raise PublishedAppBundleAssetNotFound(f"Asset not found: {key}")
+        total_size = path.stat().st_size
+        start = byte_range.start if byte_range is not None else 0
+        length = byte_range.length if byte_range is not None else total_size
+
+        def _open_chunks() -> Iterator[bytes]:
+            with path.open("rb") as handle:
+                handle.seek(start)
+                remaining = length
+                while remaining > 0:
+                    chunk = handle.read(min(STREAM_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        return
+                    remaining -= len(chunk)
+                    yield chunk
+
+        return PublishedAppBundleAssetStream(
+            content_type=mimetypes.guess_type(PurePosixPath(asset_path).name)[0] or "application/octet-stream",
+            total_size=total_size,
+            byte_range=byte_range,
+            _open_chunks=_open_chunks,
+        )
+
     def _copy_local_prefix(self, *, source_prefix: str, destination_prefix: str) -> int:
         source_root = self._local_asset_path(key=f"{self._normalize_prefix(source_prefix)}/__placeholder__").parent
         destination_root = self._local_asset_path(key=f"{self._normalize_prefix(destination_prefix)}/__placeholder__").parent
@@ -226,6 +346,34 @@ class PublishedAppBundleStorage:
 
         return copied
 
+    def copy_asset(self, *, source_prefix: str, destination_prefix: str, asset_path: str) -> str:
+        """Server-side copy of one asset between dist prefixes (no download/upload round trip)."""
+        source_key = self.build_asset_key(dist_storage_prefix=source_prefix, asset_path=asset_path)
+        destination_key = self.build_asset_key(dist_storage_prefix=destination_prefix, asset_path=asset_path)
+        if self._prefer_local_fallback():
+            return self._write_local_asset_bytes(key=destination_key, payload=self._read_local_asset_bytes(key=source_key))
+        try:
+            client = self._get_client()
+        except PublishedAppBundleStorageError:
+            if self._config.allow_local_fallback and self._config.local_dir:
+                return self._write_local_asset_bytes(
+                    key=destination_key,
+                    payload=self._read_local_asset_bytes(key=source_key),
+                )
+            raise
+        try:
+            client.copy_object(
+                Bucket=self._config.bucket,
+                Key=destination_key,
+                CopySource={"Bucket": self._config.bucket, "Key": source_key},
+                MetadataDirective="COPY",
+            )
+        except Exception as exc:
+            raise PublishedAppBundleStorageError(
+                f"Failed to copy artifact `{source_key}` to `{destination_key}`: {exc}"
+            ) from exc
+        return destination_key
+
     def write_asset_bytes(
         self,
         *,
@@ -261,6 +409,23 @@ class PublishedAppBundleStorage:
             raise PublishedAppBundleStorageError(f"Failed to upload asset `{asset_path}`: {exc}") from exc
         return key
 
+    def delete_asset_bytes(self, *, dist_storage_prefix: str, asset_path: str) -> None:
+        key = self.build_asset_key(dist_storage_prefix=dist_storage_prefix, asset_path=asset_path)
+        if self._prefer_local_fallback():
+            self._local_asset_path(key=key).unlink(missing_ok=True)
+            return
+        try:
+            client = self._get_client()
+        except PublishedAppBundleStorageError as exc:
+            if self._config.allow_local_fallback and self._config.local_dir:
+                self._local_asset_path(key=key).unlink(missing_ok=True)
+                return
+            raise exc
+        try:
+            client.delete_object(Bucket=self._config.bucket, Key=key)
+        except Exception as exc:
+            raise PublishedAppBundleStorageError(f"Failed to delete asset `{asset_path}`: {exc}") from exc
+
     def read_asset_bytes(self, *, dist_storage_prefix: str, asset_path: str) -> Tuple[bytes, str]:
         key = self.build_asset_key(dist_storage_prefix=dist_storage_prefix, asset_path=asset_path)
         if self._prefer_local_fallback():
@@ -303,3 +468,208 @@ class PublishedAppBundleStorage:
             guess, _ = mimetypes.guess_type(PurePosixPath(asset_path).name)
             content_type = guess or "application/octet-stream"
         return payload, content_type
+
+    def stat_asset(self, *, dist_storage_prefix: str, asset_path: str) -> Tuple[int, str]:
+        """Size and content type of an asset without reading its body (HEAD on S3)."""
+        key = self.build_asset_key(dist_storage_prefix=dist_storage_prefix, asset_path=asset_path)
+        local_fallback = bool(self._config.allow_local_fallback and self._config.local_dir)
+        if self._prefer_local_fallback():
+            return self._stat_local_asset(key=key, asset_path=asset_path)
+        try:
+            client = self._get_client()
+        except PublishedAppBundleStorageError:
+            if local_fallback:
+                return self._stat_local_asset(key=key, asset_path=asset_path)
+            raise
+        try:
+            response = client.head_object(Bucket=self._config.bucket, Key=key)
+        except Exception as exc:
+            error_message = str(exc)
+            if local_fallback:
+                try:
+                    return self._stat_local_asset(key=key, asset_path=asset_path)
+                except PublishedAppBundleAssetNotFound:
+                    pass
+            if "NoSuchKey" in error_message or "404" in error_message or "Not Found" in error_message:
+                raise PublishedAppBundleAssetNotFound(f"Asset not found: {asset_path}") from exc
+            raise PublishedAppBundleStorageError(f"Failed to stat asset `{asset_path}`: {exc}") from exc
+        content_type = (response.get("ContentType") or "").strip()
+        if not content_type:
+            content_type = mimetypes.guess_type(PurePosixPath(asset_path).name)[0] or "application/octet-stream"
+        return int(response.get("ContentLength") or 0), content_type
+
+    def open_asset(
+        self,
+        *,
+        dist_storage_prefix: str,
+        asset_path: str,
+        byte_range: Optional[ByteRange] = None,
+    ) -> PublishedAppBundleAssetStream:
+        """Open an asset for chunked reads without buffering the whole object."""
+        key = self.build_asset_key(dist_storage_prefix=dist_storage_prefix, asset_path=asset_path)
+        local_fallback = bool(self._config.allow_local_fallback and self._config.local_dir)
+        if self._prefer_local_fallback():
+            return self._open_local_asset(key=key, asset_path=asset_path, byte_range=byte_range)
+        try:
+            client = self._get_client()
+        except PublishedAppBundleStorageError:
+            if local_fallback:
+                return self._open_local_asset(key=key, asset_path=asset_path, byte_range=byte_range)
+            raise
+        kwargs = {"Bucket": self._config.bucket, "Key": key}
+        if byte_range is not None:
+            kwargs["Range"] = f"bytes={byte_range.start}-{byte_range.end}"
+        try:
+            response = client.get_object(**kwargs)
+        except Exception as exc:
+            error_message = str(exc)
+            if local_fallback:
+                try:
+                    return self._open_local_asset(key=key, asset_path=asset_path, byte_range=byte_range)
+                except PublishedAppBundleAssetNotFound:
+                    pass
+            if "NoSuchKey" in error_message or "404" in error_message:
+                raise PublishedAppBundleAssetNotFound(f"Asset not found: {asset_path}") from exc
+            raise PublishedAppBundleStorageError(f"Failed to fetch asset `{asset_path}`: {exc}") from exc
+
+        body = response.get("Body")
+        if body is None:
+            raise PublishedAppBundleAssetNotFound(f"Asset not found: {asset_path}")
+        total_size = int(response.get("ContentLength") or 0)
+        content_range = str(response.get("ContentRange") or "")
+        if "/" in content_range:
+            try:
+                total_size = int(content_range.rsplit("/", 1)[1])
+            except ValueError:
+                pass
+        content_type = (response.get("ContentType") or "").strip()
+        if not content_type:
+            content_type = mimetypes.guess_type(PurePosixPath(asset_path).name)[0] or "application/octet-stream"
+
+        def _open_chunks() -> Iterator[bytes]:
+            try:
+                yield from body.iter_chunks(chunk_size=STREAM_CHUNK_SIZE)
+            finally:
+                body.close()
+
+        return PublishedAppBundleAssetStream(
+            content_type=content_type,
+            total_size=total_size,
+            byte_range=byte_range,
+            _open_chunks=_open_chunks,
+            _close=body.close,
+        )
+
+    def write_asset_stream(
+        self,
+        *,
+        dist_storage_prefix: str,
+        asset_path: str,
+        chunks: Iterable[bytes],
+        content_type: Optional[str] = None,
+        cache_control: Optional[str] = None,
+    ) -> str:
+        """Upload an asset from a chunk iterator, using S3 multipart uploads for large bodies."""
+        key = self.build_asset_key(dist_storage_prefix=dist_storage_prefix, asset_path=asset_path)
+        if self._prefer_local_fallback():
+            return self._write_local_asset_stream(key=key, chunks=chunks)
+        try:
+            client = self._get_client()
+        except PublishedAppBundleStorageError as exc:
+            if self._config.allow_local_fallback and self._config.local_dir:
+                return self._write_local_asset_stream(key=key, chunks=chunks)
+            raise exc
+        resolved_content_type = content_type or mimetypes.guess_type(PurePosixPath(asset_path).name)[0] or "application/octet-stream"
+        object_kwargs = {"Bucket": self._config.bucket, "Key": key, "ContentType": resolved_content_type}
+        if cache_control:
+            object_kwargs["CacheControl"] = cache_control
+
+        iterator = iter(chunks)
+        buffer = bytearray()
+        for chunk in iterator:
+            buffer.extend(chunk)
+            if len(buffer) >= MULTIPART_PART_SIZE:
+                break
+        else:
+            try:
+                client.put_object(Body=bytes(buffer), **object_kwargs)
+            except Exception as exc:
+                raise PublishedAppBundleStorageError(f"Failed to upload asset `{asset_path}`: {exc}") from exc
+            return key
+
+        try:
+            upload_id = client.create_multipart_upload(**object_kwargs)["UploadId"]
+        except Exception as exc:
+            raise PublishedAppBundleStorageError(f"Failed to start upload for asset `{asset_path}`: {exc}") from exc
+        parts: list[dict[str, Any]] = []
+        try:
+            for chunk in iterator:
+                buffer.extend(chunk)
+                while len(buffer) >= MULTIPART_PART_SIZE:
+                    part = bytes(buffer[:MULTIPART_PART_SIZE])
+                    del buffer[:MULTIPART_PART_SIZE]
+                    parts.append(self._upload_part(client, key=key, upload_id=upload_id, number=len(parts) + 1, body=part))
+            if buffer or not parts:
+                parts.append(self._upload_part(client, key=key, upload_id=upload_id, number=len(parts) + 1, body=bytes(buffer)))
+            client.complete_multipart_upload(
+                Bucket=self._config.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception as exc:
+            try:
+                client.abort_multipart_upload(Bucket=self._config.bucket, Key=key, UploadId=upload_id)
+            except Exception:
+                pass
+            raise PublishedAppBundleStorageError(f"Failed to upload asset `{asset_path}`: {exc}") from exc
+        return key
+
+    def _upload_part(self, client: Any, *, key: str, upload_id: str, number: int, body: bytes) -> dict[str, Any]:
+        response = client.upload_part(
+            Bucket=self._config.bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=body,
+        )
+        return {"PartNumber": number, "ETag": response["ETag"]}
+
+    async def aopen_asset(
+        self,
+        *,
+        dist_storage_prefix: str,
+        asset_path: str,
+        byte_range: Optional[ByteRange] = None,
+    ) -> PublishedAppBundleAssetStream:
+        return await asyncio.to_thread(
+            self.open_asset,
+            dist_storage_prefix=dist_storage_prefix,
+            asset_path=asset_path,
+            byte_range=byte_range,
+        )
+
+    async def aread_asset_bytes(self, *, dist_storage_prefix: str, asset_path: str) -> Tuple[bytes, str]:
+        return await asyncio.to_thread(
+            self.read_asset_bytes,
+            dist_storage_prefix=dist_storage_prefix,
+            asset_path=asset_path,
+        )
+
+    async def awrite_asset_bytes(
+        self,
+        *,
+        dist_storage_prefix: str,
+        asset_path: str,
+        payload: bytes,
+        content_type: Optional[str] = None,
+        cache_control: Optional[str] = None,
+    ) -> str:
+        return await asyncio.to_thread(
+            self.write_asset_bytes,
+            dist_storage_prefix=dist_storage_prefix,
+            asset_path=asset_path,
+            payload=payload,
+            content_type=content_type,
+            cache_control=cache_control,
+        )
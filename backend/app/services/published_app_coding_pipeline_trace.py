@@ -1,15 +1,13 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-import json
 import os
-import threading
 from typing import Any
 
 from app.services.apps_builder_trace import apps_builder_trace
+from app.services.trace_sink import get_trace_sink
 
 _DEFAULT_TRACE_FILE = "/tmp/talmudpedia-coding-agent-pipeline-trace.jsonl"
-_WRITE_LOCK = threading.Lock()
 
 
 def pipeline_trace_enabled() -> bool:
@@ -46,15 +44,4 @@ def pipeline_trace(event: str, *, pipeline: str, **fields: Any) -> None:
         **fields,
     }
 
-    try:
-        rendered = json.dumps(payload, sort_keys=True, default=str)
-    except Exception:
-        rendered = str(payload)
-
-    try:
-        with _WRITE_LOCK:
-            with open(pipeline_trace_file_path(), "a", encoding="utf-8") as handle:
-                handle.write(rendered + "\n")
-    except Exception:
-        # Logging must never impact run execution.
-        pass
+    get_trace_sink().emit(pipeline_trace_file_path(), payload)
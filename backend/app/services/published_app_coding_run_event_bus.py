@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import suppress
+from dataclasses import dataclass, field
+import json
+import logging
+import os
+from typing import Any
+import uuid
+
+import redis.asyncio as redis
+
+from app.core.env_loader import env_int
+
+logger = logging.getLogger(__name__)
+
+
+def event_bus_backend() -> str:
+    raw = (os.getenv("APPS_CODING_AGENT_MONITOR_EVENT_BUS") or "").strip().lower()
+    if raw in {"redis", "local"}:
+        return raw
+    return "redis" if (os.getenv("REDIS_URL") or "").strip() else "local"
+
+
+def _envelope_seq(envelope: dict[str, Any]) -> int:
+    try:
+        return int(envelope.get("seq") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass
+class _RunChannel:
+    replay: deque[dict[str, Any]]
+    subscribers: set[asyncio.Queue] = field(default_factory=set)
+    last_seq: int = 0
+    remote_subscribed: bool = False
+
+
+class CodingRunEventBus:
+    """Fan-out of coding run monitor envelopes to every subscriber of a run.
+
+    Each run keeps a bounded replay ring so late joiners see recent events. With the
+    redis backend the monitor leader also publishes each envelope on a per-run channel
+    and appends it to a capped replay list, so followers and SSE streams in other
+    processes are fed without polling the database.
+    """
+
+    CHANNEL_PREFIX = "apps:coding-run:events:"
+    REPLAY_KEY_PREFIX = "apps:coding-run:replay:"
+
+    def __init__(
+        self,
+        *,
+        backend: str | None = None,
+        redis_url: str | None = None,
+        replay_size: int | None = None,
+        max_runs: int | None = None,
+        replay_ttl_seconds: int | None = None,
+        redis_client: Any | None = None,
+    ) -> None:
+        self._backend = backend or event_bus_backend()
+        self._redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self._replay_size = max(1, replay_size or env_int("APPS_CODING_AGENT_MONITOR_REPLAY_BUFFER_SIZE", 512))
+        self._max_runs = max(1, max_runs or env_int("APPS_CODING_AGENT_MONITOR_EVENT_BUS_MAX_RUNS", 1024))
+        self._replay_ttl_seconds = max(
+            60,
+            replay_ttl_seconds or env_int("APPS_CODING_AGENT_MONITOR_REPLAY_TTL_SECONDS", 3600),
+        )
+        self._node_id = uuid.uuid4().hex
+        self._channels: OrderedDict[str, _RunChannel] = OrderedDict()
+        self._redis: Any | None = redis_client
+        self._pubsub: Any | None = None
+        self._listener: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def cross_process(self) -> bool:
+        return self._backend == "redis"
+
+    def last_seq(self, run_id: Any) -> int:
+        channel = self._channels.get(str(run_id))
+        return channel.last_seq if channel is not None else 0
+
+    def subscriber_count(self, run_id: Any) -> int:
+        channel = self._channels.get(str(run_id))
+        return len(channel.subscribers) if channel is not None else 0
+
+    async def publish(self, run_id: Any, envelope: dict[str, Any]) -> None:
+        run_key = str(run_id)
+        self._deliver(run_key, envelope)
+        if not self.cross_process:
+            return
+        try:
+            client = self._client()
+            message = json.dumps({"origin": self._node_id, "envelope": envelope}, default=str)
+            replay_key = f"{self.REPLAY_KEY_PREFIX}{run_key}"
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.publish(f"{self.CHANNEL_PREFIX}{run_key}", message)
+                pipe.rpush(replay_key, message)
+                pipe.ltrim(replay_key, -self._replay_size, -1)
+                pipe.expire(replay_key, self._replay_ttl_seconds)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("CODING_AGENT_EVENT_BUS publish_failed run_id=%s error=%s", run_key, exc)
+
+    async def subscribe(self, run_id: Any, *, after_seq: int = 0) -> asyncio.Queue:
+        """Register a subscriber queue, pre-filled with buffered envelopes newer than `after_seq`."""
+        run_key = str(run_id)
+        channel = self._channel(run_key)
+        if self.cross_process and not channel.remote_subscribed:
+            await self._attach_remote(run_key, channel)
+        # Keep subscriber queues unbounded so assistant deltas are never dropped
+        # under transient plan/tool event bursts.
+        queue: asyncio.Queue = asyncio.Queue()
+        for envelope in channel.replay:
+            if _envelope_seq(envelope) > after_seq:
+                queue.put_nowait(dict(envelope))
+        channel.subscribers.add(queue)
+        return queue
+
+    async def unsubscribe(self, run_id: Any, queue: asyncio.Queue) -> None:
+        run_key = str(run_id)
+        channel = self._channels.get(run_key)
+        if channel is None:
+            return
+        channel.subscribers.discard(queue)
+        if not channel.subscribers and channel.remote_subscribed:
+            await self._detach_remote(run_key, channel)
+
+    async def close_run(self, run_id: Any) -> None:
+        """Signal end-of-stream to local subscribers and drop the run's replay ring."""
+        run_key = str(run_id)
+        channel = self._channels.pop(run_key, None)
+        if channel is None:
+            return
+        for queue in list(channel.subscribers):
+            with suppress(Exception):
+                queue.put_nowait(None)
+        channel.subscribers.clear()
+        if channel.remote_subscribed:
+            await self._detach_remote(run_key, channel)
+
+    async def aclose(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None and not listener.done():
+            listener.cancel()
+            with suppress(BaseException):
+                await listener
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            with suppress(Exception):
+                await pubsub.aclose()
+        client, self._redis = self._redis, None
+        if client is not None:
+            with suppress(Exception):
+                await client.aclose()
+        self._loop = None
+
+    def reset(self) -> None:
+        self._channels.clear()
+        self._pubsub = None
+        self._listener = None
+        self._loop = None
+
+    def _channel(self, run_key: str) -> _RunChannel:
+        channel = self._channels.get(run_key)
+        if channel is None:
+            channel = _RunChannel(replay=deque(maxlen=self._replay_size))
+            self._channels[run_key] = channel
+            self._evict()
+        self._channels.move_to_end(run_key)
+        return channel
+
+    def _evict(self) -> None:
+        if len(self._channels) <= self._max_runs:
+            return
+        for run_key in [key for key, channel in self._channels.items() if not channel.subscribers]:
+            if len(self._channels) <= self._max_runs:
+                break
+            self._channels.pop(run_key, None)
+
+    def _deliver(self, run_key: str, envelope: dict[str, Any], *, remote: bool = False) -> None:
+        channel = self._channels.get(run_key) if remote else self._channel(run_key)
+        if channel is None:
+            return
+        seq = _envelope_seq(envelope)
+        if remote and seq and seq <= channel.last_seq:
+            return
+        channel.last_seq = max(channel.last_seq, seq)
+        channel.replay.append(dict(envelope))
+        for queue in list(channel.subscribers):
+            try:
+                queue.put_nowait(dict(envelope))
+            except Exception as exc:
+                logger.debug("CODING_AGENT_EVENT_BUS queue_put_failed run_id=%s error=%s", run_key, exc)
+
+    def _client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Redis connections are bound to the loop that opened them.
+            self._pubsub = None
+            self._listener = None
+            if self._loop is not None:
+                self._redis = None
+            self._loop = loop
+        if self._redis is None:
+            self._redis = redis.from_url(self._redis_url, decode_responses=True)
+        return self._redis
+
+    async def _attach_remote(self, run_key: str, channel: _RunChannel) -> None:
+        try:
+            client = self._client()
+            if self._pubsub is None:
+                self._pubsub = client.pubsub()
+            await self._pubsub.subscribe(f"{self.CHANNEL_PREFIX}{run_key}")
+            channel.remote_subscribed = True
+            if self._listener is None or self._listener.done():
+                self._listener = asyncio.create_task(self._listen(self._pubsub))
+            # Subscribe before reading the replay list so nothing published in
+            # between is missed; duplicates are dropped by seq.
+            raw_items = await client.lrange(f"{self.REPLAY_KEY_PREFIX}{run_key}", 0, -1)
+        except Exception as exc:
+            logger.warning("CODING_AGENT_EVENT_BUS subscribe_failed run_id=%s error=%s", run_key, exc)
+            return
+        known = {_envelope_seq(item) for item in channel.replay}
+        merged = list(channel.replay)
+        for raw in raw_items or []:
+            envelope = self._decode(raw)
+            if envelope is None:
+                continue
+            seq = _envelope_seq(envelope)
+            if seq and seq in known:
+                continue
+            known.add(seq)
+            merged.append(envelope)
+        merged.sort(key=_envelope_seq)
+        channel.replay.clear()
+        channel.replay.extend(merged)
+        channel.last_seq = max([channel.last_seq, *(_envelope_seq(item) for item in merged)])
+
+    async def _detach_remote(self, run_key: str, channel: _RunChannel) -> None:
+        channel.remote_subscribed = False
+        pubsub = self._pubsub
+        if pubsub is None:
+            return
+        with suppress(Exception):
+            await pubsub.unsubscribe(f"{self.CHANNEL_PREFIX}{run_key}")
+
+    async def _listen(self, pubsub: Any) -> None:
+        while True:
+            if not pubsub.subscribed:
+                await asyncio.sleep(0.5)
+                continue
+            try:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("CODING_AGENT_EVENT_BUS listener_failed error=%s", exc)
+                # Subscribers fall back to their database recovery probe until the
+                # next subscribe re-attaches.
+                for channel in self._channels.values():
+                    channel.remote_subscribed = False
+                if self._pubsub is pubsub:
+                    self._pubsub = None
+                return
+            if message is None:
+                continue
+            self._on_message(message)
+
+    def _on_message(self, message: dict[str, Any]) -> None:
+        channel_name = str(message.get("channel") or "")
+        if not channel_name.startswith(self.CHANNEL_PREFIX):
+            return
+        try:
+            body = json.loads(message.get("data") or "")
+        except (TypeError, ValueError):
+            return
+        if not isinstance(body, dict) or body.get("origin") == self._node_id:
+            return
+        envelope = body.get("envelope")
+        if isinstance(envelope, dict):
+            self._deliver(channel_name[len(self.CHANNEL_PREFIX):], envelope, remote=True)
+
+    @staticmethod
+    def _decode(raw: Any) -> dict[str, Any] | None:
+        try:
+            body = json.loads(raw)
+        except (TypeError, ValueError):
+            return None
+        envelope = body.get("envelope") if isinstance(body, dict) else None
+        return envelope if isinstance(envelope, dict) else None
+
+
+_CODING_RUN_EVENT_BUS = CodingRunEventBus()
+
+
+def get_coding_run_event_bus() -> CodingRunEventBus:
+    return _CODING_RUN_EVENT_BUS
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import asyncio
 from contextlib import suppress
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime, timezone
 import logging
 import json
@@ -20,6 +20,7 @@ from app.db.postgres.models.published_apps import PublishedApp, PublishedAppRevi
 from app.api.routers.published_apps_admin_files import _filter_builder_snapshot_files
 from app.services.apps_builder_trace import apps_builder_trace
 from app.services.published_app_coding_agent_runtime import PublishedAppCodingAgentRuntimeService
+from app.services.published_app_coding_run_event_bus import get_coding_run_event_bus
 from app.services.published_app_draft_dev_runtime import PublishedAppDraftDevRuntimeService
 from app.services.published_app_draft_revision_materializer import (
     PublishedAppDraftRevisionMaterializerError,
@@ -33,6 +34,7 @@ from app.services.published_app_coding_run_monitor_config import (
     monitor_inactivity_timeout_seconds,
     monitor_max_runtime_seconds,
     monitor_poll_interval_seconds,
+    monitor_recovery_probe_interval_seconds,
     monitor_status_probe_interval_seconds,
     monitor_trace,
 )
@@ -40,6 +42,8 @@ from app.services.published_app_coding_run_monitor_config import (
 logger = logging.getLogger(__name__)
 
 _TERMINAL_EVENTS = {"run.completed", "run.failed", "run.cancelled", "run.paused"}
+# With the process-local bus, a leader in another process is only visible through the run row.
+_LOCAL_BUS_RECOVERY_PROBE_SECONDS = 2.0
 _TERMINAL_RUN_STATUSES = {
     RunStatus.completed.value,
     RunStatus.failed.value,
@@ -52,7 +56,6 @@ _TERMINAL_RUN_STATUSES = {
 class _MonitorState:
     run_id: str
     task: asyncio.Task
-    subscribers: set[asyncio.Queue] = field(default_factory=set)
     next_seq: int = 1
 
 
@@ -65,6 +68,7 @@ class PublishedAppCodingRunMonitor:
     _monitor_poll_interval_seconds = staticmethod(monitor_poll_interval_seconds)
     _monitor_max_runtime_seconds = staticmethod(monitor_max_runtime_seconds)
     _monitor_status_probe_interval_seconds = staticmethod(monitor_status_probe_interval_seconds)
+    _monitor_recovery_probe_interval_seconds = staticmethod(monitor_recovery_probe_interval_seconds)
     _monitor_force_terminal_on_inactivity = staticmethod(monitor_force_terminal_on_inactivity)
     _monitor_force_terminal_on_stream_end_without_terminal = staticmethod(
         monitor_force_terminal_on_stream_end_without_terminal
@@ -439,26 +443,28 @@ class PublishedAppCodingRunMonitor:
     async def _emit_to_subscribers(cls, *, run_id: UUID, payload: dict[str, Any]) -> None:
         run_key = str(run_id)
         envelope = dict(payload)
+        bus = get_coding_run_event_bus()
         async with cls._monitors_lock:
             state = cls._monitors.get(run_key)
+            seq_value = envelope.get("seq")
+            try:
+                seq = int(seq_value)
+            except Exception:
+                seq = 0
+            if seq <= 0:
+                # Continue after anything already relayed on the bus so a follower's
+                # recovery envelope never reuses a seq the leader has published.
+                seq = max(int(state.next_seq or 1) if state is not None else 1, bus.last_seq(run_key) + 1)
+            envelope["seq"] = seq
             if state is not None:
-                seq_value = envelope.get("seq")
-                try:
-                    seq = int(seq_value)
-                except Exception:
-                    seq = 0
-                if seq <= 0:
-                    seq = int(state.next_seq or 1)
-                envelope["seq"] = seq
                 state.next_seq = max(int(state.next_seq or 1), seq + 1)
-            subscribers = list(state.subscribers) if state is not None else []
         event_name = str(envelope.get("event") or "").strip()
         if event_name and event_name != "assistant.delta":
             cls._trace(
                 "monitor.emit",
                 run_id=run_key,
                 run_event=event_name,
-                subscriber_count=len(subscribers),
+                subscriber_count=bus.subscriber_count(run_key),
             )
             if event_name in _TERMINAL_EVENTS:
                 run_payload = envelope.get("payload") if isinstance(envelope.get("payload"), dict) else {}
@@ -470,29 +476,11 @@ class PublishedAppCodingRunMonitor:
                     result_revision_id=run_payload.get("result_revision_id"),
                     error=run_payload.get("error"),
                 )
-        for queue in subscribers:
-            try:
-                queue.put_nowait(dict(envelope))
-            except Exception as exc:
-                cls._trace(
-                    "monitor.emit_queue_put_failed",
-                    run_id=str(run_id),
-                    run_event=event_name,
-                    error=str(exc),
-                )
+        await bus.publish(run_key, envelope)
 
     @classmethod
     async def _close_subscribers(cls, *, run_id: UUID) -> None:
-        async with cls._monitors_lock:
-            state = cls._monitors.get(str(run_id))
-            subscribers = list(state.subscribers) if state is not None else []
-            if state is not None:
-                state.subscribers.clear()
-        for queue in subscribers:
-            try:
-                queue.put_nowait(None)
-            except Exception:
-                pass
+        await get_coding_run_event_bus().close_run(run_id)
 
     async def ensure_monitor(self, *, app_id: UUID, run_id: UUID) -> _MonitorState | None:
         run = await self.db.get(AgentRun, run_id)
@@ -917,33 +905,23 @@ class PublishedAppCodingRunMonitor:
             yield envelope
             return
 
-        # Keep subscriber queue unbounded so assistant deltas are never dropped
-        # under transient plan/tool event bursts.
-        queue: asyncio.Queue = asyncio.Queue()
-        attached = False
-        async with self.__class__._monitors_lock:
-            current = self.__class__._monitors.get(str(run_id))
-            if current is not None:
-                current.subscribers.add(queue)
-                attached = True
-                self.__class__._trace(
-                    "monitor.subscriber_attached",
-                    run_id=str(run_id),
-                    app_id=str(app_id),
-                    subscriber_count=len(current.subscribers),
-                )
-
-        if not attached:
-            self.__class__._trace(
-                "monitor.subscriber_attach_miss",
-                run_id=str(run_id),
-                app_id=str(app_id),
-            )
+        # Late joiners are replayed the run's buffered envelopes; the database is
+        # only re-read when the bus has been quiet for a full recovery interval.
+        bus = get_coding_run_event_bus()
+        queue = await bus.subscribe(run_id)
+        self.__class__._trace(
+            "monitor.subscriber_attached",
+            run_id=str(run_id),
+            app_id=str(app_id),
+            subscriber_count=bus.subscriber_count(run_id),
+            replayed=queue.qsize(),
+        )
+        recovery_probe_seconds = self.__class__._stream_recovery_probe_seconds(bus)
 
         try:
             while True:
                 try:
-                    payload = await asyncio.wait_for(queue.get(), timeout=2.0)
+                    payload = await asyncio.wait_for(queue.get(), timeout=recovery_probe_seconds)
                 except asyncio.TimeoutError:
                     refreshed = await _load_run_fresh()
                     if refreshed is None:
@@ -970,16 +948,19 @@ class PublishedAppCodingRunMonitor:
                 if str(payload.get("event") or "") in _TERMINAL_EVENTS:
                     break
         finally:
-            async with self.__class__._monitors_lock:
-                current = self.__class__._monitors.get(str(run_id))
-                if current is not None:
-                    current.subscribers.discard(queue)
-                    self.__class__._trace(
-                        "monitor.subscriber_detached",
-                        run_id=str(run_id),
-                        app_id=str(app_id),
-                        subscriber_count=len(current.subscribers),
-                    )
+            await bus.unsubscribe(run_id, queue)
+            self.__class__._trace(
+                "monitor.subscriber_detached",
+                run_id=str(run_id),
+                app_id=str(app_id),
+                subscriber_count=bus.subscriber_count(run_id),
+            )
+
+    @classmethod
+    def _stream_recovery_probe_seconds(cls, bus: Any) -> float:
+        if not bus.cross_process:
+            return _LOCAL_BUS_RECOVERY_PROBE_SECONDS
+        return cls._monitor_recovery_probe_interval_seconds()
 
     @classmethod
     async def _runner_main(cls, *, app_id: UUID, run_id: UUID) -> None:
@@ -1002,43 +983,77 @@ class PublishedAppCodingRunMonitor:
                         inactivity_timeout_seconds=follower_timeout_seconds
                     )
                     follower_deadline = time.monotonic() + follower_timeout_seconds
-                    while time.monotonic() < follower_deadline:
-                        result = await db.execute(
-                            select(AgentRun)
-                            .where(AgentRun.id == run_id)
-                            .execution_options(populate_existing=True)
+                    # The leader's envelopes reach local subscribers over the event bus.
+                    # The follower only watches for the terminal one and reads the run
+                    # row when the bus stays quiet (or cannot cross processes at all).
+                    bus = get_coding_run_event_bus()
+                    if bus.cross_process:
+                        follower_poll_seconds = max(
+                            follower_poll_seconds,
+                            cls._monitor_recovery_probe_interval_seconds(),
                         )
-                        follower_run = result.scalar_one_or_none()
-                        if follower_run is None:
-                            break
-                        follower_status = (
-                            follower_run.status.value
-                            if hasattr(follower_run.status, "value")
-                            else str(follower_run.status)
-                        )
-                        if follower_status in _TERMINAL_RUN_STATUSES:
-                            cls._trace(
-                                "monitor.follower_terminal_observed",
-                                run_id=str(run_id),
-                                app_id=str(app_id),
-                                status=follower_status,
-                            )
-                            diagnostics: list[dict[str, Any]] = []
-                            if follower_status == RunStatus.failed.value:
-                                diagnostics = [{"message": follower_run.error_message or "run failed"}]
-                            await cls._emit_to_subscribers(
-                                run_id=run_id,
-                                payload=cls._envelope(
-                                    event=cls._terminal_event_for_status(follower_status),
-                                    run_id=run_id,
-                                    app_id=app_id,
-                                    stage="run",
-                                    payload=runtime.serialize_run(follower_run),
-                                    diagnostics=diagnostics,
-                                ),
-                            )
-                            break
-                        await asyncio.sleep(follower_poll_seconds)
+                    follower_queue = await bus.subscribe(run_id, after_seq=bus.last_seq(run_id))
+                    probe_due = True
+                    try:
+                        while time.monotonic() < follower_deadline:
+                            if probe_due:
+                                result = await db.execute(
+                                    select(AgentRun)
+                                    .where(AgentRun.id == run_id)
+                                    .execution_options(populate_existing=True)
+                                )
+                                follower_run = result.scalar_one_or_none()
+                                if follower_run is None:
+                                    break
+                                follower_status = (
+                                    follower_run.status.value
+                                    if hasattr(follower_run.status, "value")
+                                    else str(follower_run.status)
+                                )
+                                if follower_status in _TERMINAL_RUN_STATUSES:
+                                    cls._trace(
+                                        "monitor.follower_terminal_observed",
+                                        run_id=str(run_id),
+                                        app_id=str(app_id),
+                                        status=follower_status,
+                                    )
+                                    diagnostics: list[dict[str, Any]] = []
+                                    if follower_status == RunStatus.failed.value:
+                                        diagnostics = [{"message": follower_run.error_message or "run failed"}]
+                                    await cls._emit_to_subscribers(
+                                        run_id=run_id,
+                                        payload=cls._envelope(
+                                            event=cls._terminal_event_for_status(follower_status),
+                                            run_id=run_id,
+                                            app_id=app_id,
+                                            stage="run",
+                                            payload=runtime.serialize_run(follower_run),
+                                            diagnostics=diagnostics,
+                                        ),
+                                    )
+                                    break
+                            remaining_seconds = follower_deadline - time.monotonic()
+                            try:
+                                relayed = await asyncio.wait_for(
+                                    follower_queue.get(),
+                                    timeout=max(0.0, min(follower_poll_seconds, remaining_seconds)),
+                                )
+                            except asyncio.TimeoutError:
+                                probe_due = True
+                                continue
+                            probe_due = False
+                            if relayed is None:
+                                break
+                            if str(relayed.get("event") or "") in _TERMINAL_EVENTS:
+                                cls._trace(
+                                    "monitor.follower_terminal_relayed",
+                                    run_id=str(run_id),
+                                    app_id=str(app_id),
+                                    run_event=str(relayed.get("event") or ""),
+                                )
+                                break
+                    finally:
+                        await bus.unsubscribe(run_id, follower_queue)
                     cls._trace(
                         "monitor.follower_exit",
                         run_id=str(run_id),
@@ -66,3 +66,12 @@ def monitor_force_terminal_on_inactivity() -> bool:
 def monitor_force_terminal_on_stream_end_without_terminal() -> bool:
     raw = (os.getenv("APPS_CODING_AGENT_MONITOR_FORCE_TERMINAL_ON_STREAM_END_WITHOUT_TERMINAL") or "").strip().lower()
     return raw in {"1", "true", "yes", "on"}
+
+
+def monitor_recovery_probe_interval_seconds() -> float:
+    raw = (os.getenv("APPS_CODING_AGENT_MONITOR_RECOVERY_PROBE_INTERVAL_SECONDS") or "").strip()
+    try:
+        parsed = float(raw) if raw else 15.0
+    except Exception:
+        parsed = 15.0
+    return max(1.0, min(parsed, 120.0))
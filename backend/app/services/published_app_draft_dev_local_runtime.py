@@ -18,6 +18,8 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 
 from app.services.published_app_draft_dev_patching import apply_unified_patch_transaction, hash_text
+from app.services.published_app_draft_dev_sync_manifest import normalize_sync_files, workspace_manifest_digest
+from app.services.published_app_draft_dev_workspace_index import WorkspaceCodeIndex, scan_workspace_tree
 from app.services.published_app_builder_snapshot_filter import is_builder_snapshot_artifact_path
 
 
@@ -58,10 +60,21 @@ class _SessionProcess:
     revision_seq: int = 1
 
 
+@dataclass
+class _SyncedFile:
+    sha256: str
+    mtime_ns: int
+    size: int
+
+
 class LocalDraftDevRuntimeError(Exception):
     pass
 
 
+class LocalDraftDevRuntimeSyncConflictError(LocalDraftDevRuntimeError):
+    pass
+
+
 class LocalDraftDevRuntimeManager:
     def __init__(self) -> None:
         root_dir = (os.getenv("APPS_DRAFT_DEV_LOCAL_ROOT_DIR") or "/tmp/talmudpedia-draft-dev").strip()
@@ -71,6 +84,13 @@ class LocalDraftDevRuntimeManager:
         self._host = (os.getenv("APPS_DRAFT_DEV_HOST") or "127.0.0.1").strip()
         self._state: Dict[str, _SessionProcess] = {}
         self._lock = asyncio.Lock()
+        # Index queries run under a per-session lock so one sandbox's search does not
+        # serialize every other sandbox behind the manager-wide lock.
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._workspace_indexes: Dict[str, WorkspaceCodeIndex] = {}
+        # Per workspace directory: path -> (sha256, mtime, size) as of the last sync, so
+        # unchanged files are skipped without re-reading and deltas can be verified.
+        self._sync_manifests: Dict[str, Dict[str, _SyncedFile]] = {}
         self._bootstrapped = False
 
     def bootstrap(self) -> None:
@@ -113,6 +133,7 @@ class LocalDraftDevRuntimeManager:
                     "status": "running",
                     "workspace_path": str(current.project_dir),
                     "revision_token": self._current_revision_token(current),
+                    "manifest_digest": self._sync_manifest_digest(project_dir),
                 }
             if current:
                 await self._stop_session_locked(session_id)
@@ -135,22 +156,46 @@ class LocalDraftDevRuntimeManager:
                 "status": "running",
                 "workspace_path": str(project_dir),
                 "revision_token": "sandbox-seq-1",
+                "manifest_digest": self._sync_manifest_digest(project_dir),
             }
 
     async def sync_session(
         self,
         *,
         sandbox_id: str,
-        files: Dict[str, str],
+        files: Dict[str, str] | None = None,
         dependency_hash: str,
         install_dependencies: bool,
+        base_manifest_digest: str | None = None,
+        changed_files: Dict[str, str] | None = None,
+        deleted_paths: list[str] | None = None,
     ) -> Dict[str, str]:
+        """Sync the live workspace to the builder's file map.
+
+        Pass either the full `files` map, or a delta (`changed_files`/`deleted_paths`)
+        against the manifest identified by `base_manifest_digest`. A delta raises
+        `LocalDraftDevRuntimeSyncConflictError` when the workspace no longer matches
+        that manifest; the caller should then resend the full map.
+        """
         async with self._lock:
             state = self._state.get(sandbox_id)
             if state is None or state.process.poll() is not None:
                 raise LocalDraftDevRuntimeError("Draft dev sandbox is not running")
 
-            await self._sync_files_locked(state.project_dir, files)
+            if base_manifest_digest:
+                applied = await self._apply_sync_delta_locked(
+                    state.project_dir,
+                    base_manifest_digest=base_manifest_digest,
+                    changed_files=changed_files or {},
+                    deleted_paths=deleted_paths or [],
+                )
+                for path, content in applied["written"].items():
+                    self._index_record_write_locked(sandbox_id, path, content)
+                for path in applied["deleted"]:
+                    self._index_record_delete_locked(sandbox_id, path)
+            else:
+                await self._sync_files_locked(state.project_dir, files or {})
+                self._index_apply_snapshot_locked(sandbox_id, files or {})
 
             if install_dependencies or dependency_hash != state.dependency_hash:
                 await self._run_install_locked(state.project_dir)
@@ -180,6 +225,7 @@ class LocalDraftDevRuntimeManager:
                 "sandbox_id": sandbox_id,
                 "revision_token": self._current_revision_token(state),
                 "preview_upstream_url": self._preview_upstream_url(state.port),
+                "manifest_digest": self._sync_manifest_digest(state.project_dir),
             }
 
     async def heartbeat_session(self, *, sandbox_id: str) -> Dict[str, str]:
@@ -309,28 +355,19 @@ class LocalDraftDevRuntimeManager:
     async def search_code(self, *, sandbox_id: str, query: str, max_results: int = 30) -> Dict[str, object]:
         async with self._lock:
             state = self._require_running_session_locked(sandbox_id)
-            needle = (query or "").strip().lower()
-            if not needle:
-                return {"sandbox_id": sandbox_id, "query": query, "matches": []}
-            matches: list[dict[str, object]] = []
-            for rel_path in self._collect_project_files(state.project_dir):
-                source = (state.project_dir / rel_path).read_text(encoding="utf-8", errors="replace")
-                for line_no, line in enumerate(source.splitlines(), start=1):
-                    if needle in line.lower():
-                        matches.append({"path": rel_path, "line": line_no, "preview": line[:220]})
-                        if len(matches) >= max(1, int(max_results)):
-                            return {
-                                "sandbox_id": sandbox_id,
-                                "query": query,
-                                "matches": matches,
-                                "revision_token": self._current_revision_token(state),
-                            }
-            return {
-                "sandbox_id": sandbox_id,
-                "query": query,
-                "matches": matches,
-                "revision_token": self._current_revision_token(state),
-            }
+            index = self._workspace_index_locked(state)
+        needle = (query or "").strip().lower()
+        if not needle:
+            return {"sandbox_id": sandbox_id, "query": query, "matches": []}
+        async with self._session_lock(sandbox_id):
+            await asyncio.to_thread(index.refresh)
+            matches = await asyncio.to_thread(index.search, needle, max_results=max(1, int(max_results)))
+        return {
+            "sandbox_id": sandbox_id,
+            "query": query,
+            "matches": matches,
+            "revision_token": self._current_revision_token(state),
+        }
 
     async def workspace_index(
         self,
@@ -342,45 +379,24 @@ class LocalDraftDevRuntimeManager:
     ) -> Dict[str, object]:
         async with self._lock:
             state = self._require_running_session_locked(sandbox_id)
-            limit_value = max(1, int(limit))
-            query_text = (query or "").strip().lower()
-            rows: list[dict[str, object]] = []
-            total_size = 0
-            for rel_path in self._collect_project_files(state.project_dir):
-                source = (state.project_dir / rel_path).read_text(encoding="utf-8", errors="replace")
-                size_bytes = len(source.encode("utf-8"))
-                total_size += size_bytes
-                symbols = self._extract_symbol_outline(source, rel_path, max_symbols_per_file=max_symbols_per_file)
-                language = self._detect_language(rel_path)
-                score = 0
-                if query_text:
-                    if query_text in rel_path.lower():
-                        score += 4
-                    if query_text in source.lower():
-                        score += 2
-                    if any(query_text in str(item.get("name", "")).lower() for item in symbols):
-                        score += 3
-                    if score <= 0:
-                        continue
-                rows.append(
-                    {
-                        "path": rel_path,
-                        "size_bytes": size_bytes,
-                        "sha256": hash_text(source),
-                        "language": language,
-                        "symbol_outline": symbols,
-                        "score": score,
-                    }
-                )
-            rows.sort(key=lambda item: (-int(item.get("score", 0)), str(item.get("path", ""))))
-            return {
-                "sandbox_id": sandbox_id,
-                "query": query,
-                "total_files": len(rows),
-                "total_size_bytes": total_size,
-                "files": rows[:limit_value],
-                "revision_token": self._current_revision_token(state),
-            }
+            index = self._workspace_index_locked(state)
+        limit_value = max(1, int(limit))
+        async with self._session_lock(sandbox_id):
+            await asyncio.to_thread(index.refresh)
+            rows, total_size = await asyncio.to_thread(
+                index.rows,
+                query=query,
+                max_symbols_per_file=max_symbols_per_file,
+            )
+        rows.sort(key=lambda item: (-int(item.get("score", 0)), str(item.get("path", ""))))
+        return {
+            "sandbox_id": sandbox_id,
+            "query": query,
+            "total_files": len(rows),
+            "total_size_bytes": total_size,
+            "files": rows[:limit_value],
+            "revision_token": self._current_revision_token(state),
+        }
 
     async def write_file(self, *, sandbox_id: str, path: str, content: str) -> Dict[str, object]:
         async with self._lock:
@@ -388,7 +404,9 @@ class LocalDraftDevRuntimeManager:
             normalized = self._normalize_runtime_path(path)
             target = state.project_dir / normalized
             target.parent.mkdir(parents=True, exist_ok=True)
-            target.write_text(content if isinstance(content, str) else str(content), encoding="utf-8")
+            text = content if isinstance(content, str) else str(content)
+            target.write_text(text, encoding="utf-8")
+            self._index_record_write_locked(sandbox_id, normalized, text)
             revision_token = self._bump_revision_token(state)
             return {"sandbox_id": sandbox_id, "path": normalized, "status": "written", "revision_token": revision_token}
 
@@ -400,6 +418,7 @@ class LocalDraftDevRuntimeManager:
             if target.exists() and target.is_file():
                 target.unlink(missing_ok=True)
                 self._prune_empty_dirs(target.parent, state.project_dir)
+                self._index_record_delete_locked(sandbox_id, normalized)
                 revision_token = self._bump_revision_token(state)
             else:
                 revision_token = self._current_revision_token(state)
@@ -419,6 +438,9 @@ class LocalDraftDevRuntimeManager:
             target.parent.mkdir(parents=True, exist_ok=True)
             source.replace(target)
             self._prune_empty_dirs(source.parent, state.project_dir)
+            self._index_record_delete_locked(sandbox_id, src)
+            if sandbox_id in self._workspace_indexes:
+                self._index_record_write_locked(sandbox_id, dst, target.read_text(encoding="utf-8", errors="replace"))
             revision_token = self._bump_revision_token(state)
             return {
                 "sandbox_id": sandbox_id,
@@ -483,13 +505,16 @@ class LocalDraftDevRuntimeManager:
             for path_value, content in writes.items():
                 target = state.project_dir / str(path_value)
                 target.parent.mkdir(parents=True, exist_ok=True)
-                target.write_text(content if isinstance(content, str) else str(content), encoding="utf-8")
+                text = content if isinstance(content, str) else str(content)
+                target.write_text(text, encoding="utf-8")
+                self._index_record_write_locked(sandbox_id, str(path_value), text)
                 has_changes = True
             for path_value in deletes:
                 target = state.project_dir / str(path_value)
                 if target.exists() and target.is_file():
                     target.unlink(missing_ok=True)
                     self._prune_empty_dirs(target.parent, state.project_dir)
+                    self._index_record_delete_locked(sandbox_id, str(path_value))
                     has_changes = True
 
             response = {key: value for key, value in result.items() if key not in {"writes", "deletes"}}
@@ -568,6 +593,7 @@ class LocalDraftDevRuntimeManager:
                 raise LocalDraftDevRuntimeError("Stage workspace is not prepared")
             stage_files = self._collect_workspace_files_from_root(stage_workspace)
             await self._sync_files_locked(state.project_dir, stage_files)
+            self._index_apply_snapshot_locked(sandbox_id, stage_files)
             return {
                 "sandbox_id": sandbox_id,
                 "live_workspace_path": str(state.project_dir),
@@ -1004,6 +1030,40 @@ class LocalDraftDevRuntimeManager:
             raise LocalDraftDevRuntimeError("Draft dev sandbox is not running")
         return state
 
+    def _session_lock(self, sandbox_id: str) -> asyncio.Lock:
+        lock = self._session_locks.get(sandbox_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[sandbox_id] = lock
+        return lock
+
+    def _workspace_index_locked(self, state: _SessionProcess) -> WorkspaceCodeIndex:
+        index = self._workspace_indexes.get(state.sandbox_id)
+        if index is None or index.project_dir != str(state.project_dir):
+            index = WorkspaceCodeIndex(
+                project_dir=str(state.project_dir),
+                is_ignored=self._is_runtime_ignored_artifact_path,
+                detect_language=self._detect_language,
+                extract_symbol_outline=self._extract_symbol_outline,
+            )
+            self._workspace_indexes[state.sandbox_id] = index
+        return index
+
+    def _index_record_write_locked(self, sandbox_id: str, path: str, content: str) -> None:
+        index = self._workspace_indexes.get(sandbox_id)
+        if index is not None:
+            index.record_write(path, content)
+
+    def _index_record_delete_locked(self, sandbox_id: str, path: str) -> None:
+        index = self._workspace_indexes.get(sandbox_id)
+        if index is not None:
+            index.record_delete(path)
+
+    def _index_apply_snapshot_locked(self, sandbox_id: str, files: Dict[str, str]) -> None:
+        index = self._workspace_indexes.get(sandbox_id)
+        if index is not None:
+            index.apply_snapshot(files)
+
     def _prune_empty_dirs(self, start_dir: Path, root_dir: Path) -> None:
         current = start_dir
         while current != root_dir and current.exists():
@@ -1015,8 +1075,11 @@ class LocalDraftDevRuntimeManager:
 
     async def _stop_session_locked(self, sandbox_id: str) -> None:
         state = self._state.pop(sandbox_id, None)
+        self._workspace_indexes.pop(sandbox_id, None)
+        self._session_locks.pop(sandbox_id, None)
         if state is None:
             return
+        self._sync_manifests.pop(str(state.project_dir), None)
         await self._stop_process_locked(state.process)
         self._clear_process_metadata(state.project_dir)
 
@@ -1110,38 +1173,115 @@ class LocalDraftDevRuntimeManager:
             )
 
     async def _sync_files_locked(self, project_dir: Path, files: Dict[str, str]) -> None:
-        normalized: Dict[str, str] = {}
-        for path, content in (files or {}).items():
-            clean = (path or "").replace("\\", "/").strip().lstrip("/")
-            if not clean or ".." in clean.split("/"):
-                continue
-            normalized[clean] = content if isinstance(content, str) else str(content)
+        normalized = normalize_sync_files(files)
+        previous = self._sync_manifests.get(str(project_dir)) or {}
+        existing_files, existing_dirs = scan_workspace_tree(str(project_dir), self._is_runtime_ignored_artifact_path)
 
-        for existing in sorted(project_dir.rglob("*"), reverse=True):
-            relative = existing.relative_to(project_dir).as_posix()
-            if self._is_runtime_ignored_artifact_path(relative):
-                continue
-            if existing.is_file() and relative not in normalized:
-                existing.unlink(missing_ok=True)
-            elif existing.is_dir() and relative and not any(
-                item.startswith(relative + "/") for item in normalized.keys()
-            ):
-                try:
-                    existing.rmdir()
-                except OSError:
-                    pass
+        for relative in existing_files:
+            if relative not in normalized:
+                (project_dir / relative).unlink(missing_ok=True)
 
+        manifest: Dict[str, _SyncedFile] = {}
         for path, content in normalized.items():
-            target = project_dir / path
-            if target.exists() and target.is_file():
+            content_hash = hash_text(content)
+            stat = existing_files.get(path)
+            if stat is not None:
+                recorded = previous.get(path)
+                unchanged_on_disk = (
+                    recorded is not None
+                    and recorded.mtime_ns == stat.st_mtime_ns
+                    and recorded.size == stat.st_size
+                )
+                if unchanged_on_disk and recorded.sha256 == content_hash:
+                    manifest[path] = recorded
+                    continue
+                if not unchanged_on_disk:
+                    try:
+                        if (project_dir / path).read_text(encoding="utf-8") == content:
+                            manifest[path] = _SyncedFile(content_hash, stat.st_mtime_ns, stat.st_size)
+                            continue
+                    except Exception:
+                        # Fall through to rewrite if we cannot read as UTF-8.
+                        pass
+            manifest[path] = self._write_synced_file(project_dir, path, content, content_hash)
+
+        keep_dirs = {path.rsplit("/", 1)[0] for path in normalized if "/" in path}
+        for path in list(keep_dirs):
+            while "/" in path:
+                path = path.rsplit("/", 1)[0]
+                keep_dirs.add(path)
+        self._prune_dirs(project_dir, [item for item in existing_dirs if item not in keep_dirs])
+        self._sync_manifests[str(project_dir)] = manifest
+
+    async def _apply_sync_delta_locked(
+        self,
+        project_dir: Path,
+        *,
+        base_manifest_digest: str,
+        changed_files: Dict[str, str],
+        deleted_paths: list[str],
+    ) -> Dict[str, Any]:
+        previous = self._sync_manifests.get(str(project_dir))
+        if previous is None or self._sync_manifest_digest(project_dir) != base_manifest_digest:
+            raise LocalDraftDevRuntimeSyncConflictError("Workspace manifest is out of date; full sync required")
+        existing_files, _ = scan_workspace_tree(str(project_dir), self._is_runtime_ignored_artifact_path)
+        tracked = {path: recorded for path, recorded in previous.items() if not self._is_runtime_ignored_artifact_path(path)}
+        drifted = set(existing_files) ^ set(tracked)
+        drifted.update(
+            path
+            for path, recorded in tracked.items()
+            if path in existing_files
+            and (
+                recorded.mtime_ns != existing_files[path].st_mtime_ns
+                or recorded.size != existing_files[path].st_size
+            )
+        )
+        if drifted:
+            raise LocalDraftDevRuntimeSyncConflictError(
+                f"Workspace changed outside sync ({len(drifted)} paths); full sync required"
+            )
+
+        manifest = dict(previous)
+        written = normalize_sync_files(changed_files)
+        deleted = [path for path in normalize_sync_files({path: "" for path in deleted_paths}) if path not in written]
+        for path in deleted:
+            (project_dir / path).unlink(missing_ok=True)
+            manifest.pop(path, None)
+        for path, content in written.items():
+            manifest[path] = self._write_synced_file(project_dir, path, content, hash_text(content))
+        self._prune_dirs(project_dir, {path.rsplit("/", 1)[0] for path in deleted if "/" in path})
+        self._sync_manifests[str(project_dir)] = manifest
+        return {"written": written, "deleted": deleted}
+
+    @staticmethod
+    def _write_synced_file(project_dir: Path, path: str, content: str, content_hash: str) -> _SyncedFile:
+        target = project_dir / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding="utf-8")
+        stat = target.stat()
+        return _SyncedFile(content_hash, stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _prune_dirs(project_dir: Path, candidates: set[str] | list[str]) -> None:
+        # Deepest first so emptied children let their parents be removed in the same pass.
+        pending = set(candidates)
+        for relative in sorted(candidates, key=lambda item: item.count("/"), reverse=True):
+            if relative not in pending:
+                continue
+            current = project_dir / relative
+            while current != project_dir:
                 try:
-                    if target.read_text(encoding="utf-8") == content:
-                        continue
-                except Exception:
-                    # Fall through to rewrite if we cannot read as UTF-8.
-                    pass
-            target.parent.mkdir(parents=True, exist_ok=True)
-            target.write_text(content, encoding="utf-8")
+                    current.rmdir()
+                except OSError:
+                    break
+                pending.discard(current.relative_to(project_dir).as_posix())
+                current = current.parent
+
+    def _sync_manifest_digest(self, project_dir: Path) -> str | None:
+        manifest = self._sync_manifests.get(str(project_dir))
+        if manifest is None:
+            return None
+        return workspace_manifest_digest({path: entry.sha256 for path, entry in manifest.items()})
 
     @staticmethod
     def _publish_dependency_manifests_match(*, live_workspace: Path, publish_workspace: Path) -> tuple[bool, str]:
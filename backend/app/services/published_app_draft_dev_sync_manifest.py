@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Any, Dict, Mapping, Optional
+
+from app.services.published_app_draft_dev_patching import hash_text
+
+
+def normalize_sync_files(files: Mapping[str, Any] | None) -> Dict[str, str]:
+    normalized: Dict[str, str] = {}
+    for path, content in (files or {}).items():
+        clean = str(path or "").replace("\\", "/").strip().lstrip("/")
+        if not clean or ".." in clean.split("/"):
+            continue
+        normalized[clean] = content if isinstance(content, str) else str(content)
+    return normalized
+
+
+def build_workspace_manifest(files: Mapping[str, Any] | None) -> Dict[str, str]:
+    return {path: hash_text(content) for path, content in normalize_sync_files(files).items()}
+
+
+def workspace_manifest_digest(manifest: Mapping[str, str]) -> str:
+    digest = sha256()
+    for path in sorted(manifest):
+        digest.update(path.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(str(manifest[path]).encode("ascii", errors="replace"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class WorkspaceSyncDelta:
+    """Changes needed to move a workspace from one path->sha256 manifest to another.
+
+    `base_digest` is None for a full sync (no prior manifest known); otherwise the
+    receiver must hold exactly that manifest before applying `changed`/`deleted`.
+    """
+
+    base_digest: Optional[str]
+    digest: str
+    manifest: Dict[str, str]
+    changed: Dict[str, str]
+    deleted: list[str]
+
+    @property
+    def is_full(self) -> bool:
+        return self.base_digest is None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.changed and not self.deleted
+
+    def as_payload(self) -> Dict[str, Any]:
+        return {
+            "base_manifest_digest": self.base_digest,
+            "manifest_digest": self.digest,
+            "changed_files": dict(self.changed),
+            "changed_hashes": {path: self.manifest[path] for path in self.changed},
+            "deleted_paths": list(self.deleted),
+        }
+
+
+def compute_workspace_sync_delta(
+    previous_manifest: Mapping[str, str] | None,
+    files: Mapping[str, Any] | None,
+) -> WorkspaceSyncDelta:
+    normalized = normalize_sync_files(files)
+    manifest = {path: hash_text(content) for path, content in normalized.items()}
+    digest = workspace_manifest_digest(manifest)
+    if previous_manifest is None:
+        return WorkspaceSyncDelta(
+            base_digest=None,
+            digest=digest,
+            manifest=manifest,
+            changed=normalized,
+            deleted=[],
+        )
+    changed = {path: normalized[path] for path, value in manifest.items() if previous_manifest.get(path) != value}
+    deleted = sorted(path for path in previous_manifest if path not in manifest)
+    return WorkspaceSyncDelta(
+        base_digest=workspace_manifest_digest(previous_manifest),
+        digest=digest,
+        manifest=manifest,
+        changed=changed,
+        deleted=deleted,
+    )
+
+
+class WorkspaceSyncManifestStore:
+    """Process-wide record of the manifest each remote workspace was last synced to.
+
+    Sandbox backend objects are rebuilt per runtime client, so the record lives at
+    module level. It is only an optimization: receivers verify `base_digest` (or the
+    file hashes themselves) and a mismatch falls back to a full sync.
+    """
+
+    def __init__(self, *, max_entries: int = 512) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._manifests: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        manifest = self._manifests.get(key)
+        if manifest is not None:
+            self._manifests.move_to_end(key)
+        return manifest
+
+    def plan(self, key: str, files: Mapping[str, Any] | None) -> WorkspaceSyncDelta:
+        return compute_workspace_sync_delta(self.get(key), files)
+
+    def commit(self, key: str, manifest: Mapping[str, str]) -> None:
+        self._manifests[key] = dict(manifest)
+        self._manifests.move_to_end(key)
+        while len(self._manifests) > self._max_entries:
+            self._manifests.popitem(last=False)
+
+    def forget(self, key: str) -> None:
+        self._manifests.pop(key, None)
+
+    def clear(self) -> None:
+        self._manifests.clear()
+
+
+_WORKSPACE_SYNC_MANIFESTS = WorkspaceSyncManifestStore()
+
+
+def get_workspace_sync_manifest_store() -> WorkspaceSyncManifestStore:
+    return _WORKSPACE_SYNC_MANIFESTS
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from app.services.published_app_draft_dev_patching import hash_text
+from app.services.published_app_draft_dev_sync_manifest import normalize_sync_files
+
+
+# Files larger than this are kept in the index but not trigram-indexed; they are
+# always treated as search candidates instead.
+_TRIGRAM_MAX_FILE_BYTES = 512 * 1024
+# Symbol outlines are cached up to this many entries per file and sliced per request.
+_OUTLINE_CACHE_LIMIT = 256
+
+
+def _trigrams(text: str) -> frozenset[str]:
+    return frozenset(text[idx : idx + 3] for idx in range(len(text) - 2))
+
+
+def scan_workspace_tree(
+    root: str,
+    is_ignored: Callable[[str], bool],
+) -> tuple[Dict[str, os.stat_result], list[str]]:
+    """Stat every non-ignored file under `root`, pruning ignored trees (node_modules, dist, ...).
+
+    Returns workspace-relative file paths mapped to their stat results, plus the
+    relative paths of every directory visited.
+    """
+    files: Dict[str, os.stat_result] = {}
+    dirs: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        rel_dir = "" if rel_dir == "." else rel_dir
+        if rel_dir:
+            dirs.append(rel_dir)
+        dirnames[:] = [
+            name for name in dirnames if not is_ignored(f"{rel_dir}/{name}/" if rel_dir else f"{name}/")
+        ]
+        for name in filenames:
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if is_ignored(rel_path):
+                continue
+            try:
+                files[rel_path] = os.stat(os.path.join(dirpath, name))
+            except OSError:
+                continue
+    return files, dirs
+
+
+def _path_sort_key(path: str) -> list[str]:
+    # Matches the ordering of `sorted(Path.rglob(...))` used by the file listing helpers.
+    return path.split("/")
+
+
+@dataclass
+class _IndexedFile:
+    path: str
+    mtime_ns: int
+    stat_size: int
+    source: str
+    lowered: str
+    sha256: str
+    size_bytes: int
+    language: str
+    trigrams: Optional[frozenset[str]]
+    outline: Optional[list[dict[str, object]]] = None
+    outline_limit: int = 0
+
+
+@dataclass
+class WorkspaceCodeIndex:
+    """Incremental in-memory index of one draft dev workspace.
+
+    Entries are keyed by workspace-relative path and revalidated by (mtime_ns, size)
+    on each `refresh`, so only files changed since the last query are re-read. Writes
+    that go through the runtime manager update entries directly. Substring search
+    narrows candidates with a trigram posting map before scanning lines.
+    """
+
+    project_dir: str
+    is_ignored: Callable[[str], bool]
+    detect_language: Callable[[str], str]
+    extract_symbol_outline: Callable[..., list[dict[str, object]]]
+    _files: Dict[str, _IndexedFile] = field(default_factory=dict)
+    _postings: Dict[str, set[str]] = field(default_factory=dict)
+    _unindexed: set[str] = field(default_factory=set)
+    _sorted_paths: Optional[list[str]] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def refresh(self) -> None:
+        with self._lock:
+            seen: set[str] = set()
+            files, _ = scan_workspace_tree(self.project_dir, self.is_ignored)
+            for rel_path, stat in files.items():
+                seen.add(rel_path)
+                current = self._files.get(rel_path)
+                if current is not None and current.mtime_ns == stat.st_mtime_ns and current.stat_size == stat.st_size:
+                    continue
+                try:
+                    source = self._read(rel_path)
+                except OSError:
+                    seen.discard(rel_path)
+                    continue
+                self._store_locked(rel_path, source, mtime_ns=stat.st_mtime_ns, stat_size=stat.st_size)
+            for stale in [path for path in self._files if path not in seen]:
+                self._remove_locked(stale)
+
+    def record_write(self, rel_path: str, content: str) -> None:
+        with self._lock:
+            if self.is_ignored(rel_path):
+                return
+            try:
+                stat = os.stat(os.path.join(self.project_dir, rel_path))
+            except OSError:
+                self._remove_locked(rel_path)
+                return
+            self._store_locked(rel_path, content, mtime_ns=stat.st_mtime_ns, stat_size=stat.st_size)
+
+    def record_delete(self, rel_path: str) -> None:
+        with self._lock:
+            self._remove_locked(rel_path)
+
+    def apply_snapshot(self, files: Dict[str, str]) -> None:
+        """Bring the index in line with a full workspace sync without re-reading disk."""
+        with self._lock:
+            keep: set[str] = set()
+            for rel_path, text in normalize_sync_files(files).items():
+                if self.is_ignored(rel_path):
+                    continue
+                keep.add(rel_path)
+                try:
+                    stat = os.stat(os.path.join(self.project_dir, rel_path))
+                except OSError:
+                    continue
+                current = self._files.get(rel_path)
+                if current is not None and current.sha256 == hash_text(text):
+                    current.mtime_ns = stat.st_mtime_ns
+                    current.stat_size = stat.st_size
+                    continue
+                self._store_locked(rel_path, text, mtime_ns=stat.st_mtime_ns, stat_size=stat.st_size)
+            for stale in [path for path in self._files if path not in keep]:
+                self._remove_locked(stale)
+
+    def search(self, query: str, *, max_results: int) -> list[dict[str, object]]:
+        needle = (query or "").strip().lower()
+        limit = max(1, int(max_results))
+        matches: list[dict[str, object]] = []
+        if not needle:
+            return matches
+        with self._lock:
+            for entry in self._candidates_locked(needle):
+                if needle not in entry.lowered:
+                    continue
+                for line_no, (line, lowered_line) in enumerate(
+                    zip(entry.source.splitlines(), entry.lowered.splitlines()),
+                    start=1,
+                ):
+                    if needle in lowered_line:
+                        matches.append({"path": entry.path, "line": line_no, "preview": line[:220]})
+                        if len(matches) >= limit:
+                            return matches
+        return matches
+
+    def rows(self, *, query: str | None, max_symbols_per_file: int) -> tuple[list[dict[str, object]], int]:
+        query_text = (query or "").strip().lower()
+        symbol_limit = max(1, int(max_symbols_per_file))
+        rows: list[dict[str, object]] = []
+        total_size = 0
+        with self._lock:
+            for path in self._sorted_paths_locked():
+                entry = self._files[path]
+                total_size += entry.size_bytes
+                symbols = self._outline_locked(entry, symbol_limit)
+                score = 0
+                if query_text:
+                    if query_text in entry.path.lower():
+                        score += 4
+                    if query_text in entry.lowered:
+                        score += 2
+                    if any(query_text in str(item.get("name", "")).lower() for item in symbols):
+                        score += 3
+                    if score <= 0:
+                        continue
+                rows.append(
+                    {
+                        "path": entry.path,
+                        "size_bytes": entry.size_bytes,
+                        "sha256": entry.sha256,
+                        "language": entry.language,
+                        "symbol_outline": symbols,
+                        "score": score,
+                    }
+                )
+        return rows, total_size
+
+    def _read(self, rel_path: str) -> str:
+        with open(os.path.join(self.project_dir, rel_path), "r", encoding="utf-8", errors="replace") as handle:
+            return handle.read()
+
+    def _candidates_locked(self, needle: str) -> list[_IndexedFile]:
+        if len(needle) < 3:
+            return [self._files[path] for path in self._sorted_paths_locked()]
+        postings = sorted(
+            (self._postings.get(gram, set()) for gram in _trigrams(needle)),
+            key=len,
+        )
+        candidates = set(postings[0]).intersection(*postings[1:]) if postings else set()
+        candidates |= self._unindexed
+        return [self._files[path] for path in sorted(candidates, key=_path_sort_key) if path in self._files]
+
+    def _sorted_paths_locked(self) -> list[str]:
+        if self._sorted_paths is None:
+            self._sorted_paths = sorted(self._files, key=_path_sort_key)
+        return self._sorted_paths
+
+    def _outline_locked(self, entry: _IndexedFile, symbol_limit: int) -> list[dict[str, object]]:
+        if entry.outline is None or (symbol_limit > entry.outline_limit and len(entry.outline) >= entry.outline_limit):
+            entry.outline_limit = max(_OUTLINE_CACHE_LIMIT, symbol_limit)
+            entry.outline = self.extract_symbol_outline(
+                entry.source,
+                entry.path,
+                max_symbols_per_file=entry.outline_limit,
+            )
+        return entry.outline[:symbol_limit]
+
+    def _store_locked(self, rel_path: str, source: str, *, mtime_ns: int, stat_size: int) -> None:
+        self._remove_locked(rel_path)
+        lowered = source.lower()
+        encoded_size = len(source.encode("utf-8"))
+        trigrams = _trigrams(lowered) if encoded_size <= _TRIGRAM_MAX_FILE_BYTES else None
+        self._files[rel_path] = _IndexedFile(
+            path=rel_path,
+            mtime_ns=mtime_ns,
+            stat_size=stat_size,
+            source=source,
+            lowered=lowered,
+            sha256=hash_text(source),
+            size_bytes=encoded_size,
+            language=self.detect_language(rel_path),
+            trigrams=trigrams,
+        )
+        if trigrams is None:
+            self._unindexed.add(rel_path)
+        else:
+            for gram in trigrams:
+                self._postings.setdefault(gram, set()).add(rel_path)
+        self._sorted_paths = None
+
+    def _remove_locked(self, rel_path: str) -> None:
+        entry = self._files.pop(rel_path, None)
+        if entry is None:
+            return
+        self._unindexed.discard(rel_path)
+        for gram in entry.trigrams or ():
+            bucket = self._postings.get(gram)
+            if bucket is None:
+                continue
+            bucket.discard(rel_path)
+            if not bucket:
+                del self._postings[gram]
+        self._sorted_paths = None
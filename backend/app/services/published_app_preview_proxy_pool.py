@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import bisect
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from app.core.env_loader import env_float, env_int
+from app.services.http_client_pool import HttpClientPool
+
+
+class PreviewUpstreamClientPool(HttpClientPool):
+    """Keep-alive HTTP clients for preview sandboxes, one per upstream origin.
+
+    A Vite dev page fires hundreds of module requests at the same sandbox; reusing
+    one client per origin keeps those on warm connections instead of paying a
+    TCP/TLS handshake per asset.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_clients: int | None = None,
+        max_connections: int | None = None,
+        keepalive_expiry_seconds: float | None = None,
+        timeout_seconds: float = 60.0,
+    ) -> None:
+        super().__init__(
+            max_clients=max_clients or env_int("APPS_BUILDER_PREVIEW_PROXY_MAX_UPSTREAMS", 64),
+            max_connections=max_connections or env_int("APPS_BUILDER_PREVIEW_PROXY_MAX_CONNECTIONS", 64),
+            keepalive_expiry_seconds=(
+                keepalive_expiry_seconds
+                if keepalive_expiry_seconds is not None
+                else env_float("APPS_BUILDER_PREVIEW_PROXY_KEEPALIVE_SECONDS", 30.0)
+            ),
+            default_timeout_seconds=timeout_seconds,
+            env_prefix="APPS_BUILDER_PREVIEW_PROXY_POOL",
+        )
+
+
+@dataclass
+class CachedPreviewTarget:
+    session: Any
+    payload: dict[str, Any]
+    target: dict[str, str]
+    expires_at: float
+
+
+class PreviewTargetCache:
+    """Short-lived cache of resolved preview sessions and upstream targets, keyed by preview token."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float | None = None,
+        max_entries: int = 2048,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else env_float("APPS_BUILDER_PREVIEW_TARGET_CACHE_TTL_SECONDS", 5.0)
+        )
+        self._max_entries = max(1, max_entries)
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedPreviewTarget] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0
+
+    def get(self, token: str) -> CachedPreviewTarget | None:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock():
+            self._entries.pop(token, None)
+            return None
+        return entry
+
+    def put(
+        self,
+        token: str,
+        *,
+        session: Any,
+        payload: dict[str, Any],
+        target: dict[str, str],
+    ) -> None:
+        if not self.enabled:
+            return
+        now = self._clock()
+        expires_at = now + self._ttl_seconds
+        token_exp = payload.get("exp")
+        if isinstance(token_exp, (int, float)):
+            # Never serve a cached entry past the token's own expiry.
+            expires_at = min(expires_at, now + max(0.0, float(token_exp) - time.time()))
+        self._entries[token] = CachedPreviewTarget(
+            session=session,
+            payload=payload,
+            target=target,
+            expires_at=expires_at,
+        )
+        self._entries.move_to_end(token)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_session(self, session_id: str) -> None:
+        normalized = str(session_id)
+        for token in [key for key, entry in self._entries.items() if str(entry.session.id) == normalized]:
+            self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_LATENCY_BUCKETS_MS = (5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0)
+
+
+@dataclass
+class _HistogramSeries:
+    counts: list[int] = field(default_factory=lambda: [0] * (len(_LATENCY_BUCKETS_MS) + 1))
+    total: int = 0
+    sum_ms: float = 0.0
+
+
+class PreviewLatencyHistograms:
+    """Fixed-bucket latency histograms per preview request kind."""
+
+    def __init__(
+        self,
+        *,
+        report_interval_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._series: dict[str, _HistogramSeries] = {}
+        self._report_interval_seconds = (
+            report_interval_seconds
+            if report_interval_seconds is not None
+            else env_float("APPS_BUILDER_PREVIEW_LATENCY_REPORT_INTERVAL_SECONDS", 60.0)
+        )
+        self._clock = clock
+        self._last_reported_at = clock()
+
+    def observe(self, request_kind: str, duration_ms: float) -> None:
+        series = self._series.setdefault(str(request_kind or "other"), _HistogramSeries())
+        series.counts[bisect.bisect_left(_LATENCY_BUCKETS_MS, duration_ms)] += 1
+        series.total += 1
+        series.sum_ms += float(duration_ms)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        result: dict[str, dict[str, Any]] = {}
+        for kind, series in self._series.items():
+            buckets: dict[str, int] = {}
+            cumulative = 0
+            for bound, count in zip((*_LATENCY_BUCKETS_MS, float("inf")), series.counts):
+                cumulative += count
+                buckets["+Inf" if bound == float("inf") else f"{bound:g}"] = cumulative
+            result[kind] = {
+                "count": series.total,
+                "sum_ms": round(series.sum_ms, 3),
+                "buckets": buckets,
+            }
+        return result
+
+    def take_due_report(self) -> dict[str, dict[str, Any]] | None:
+        """Return a snapshot at most once per report interval, so callers can trace it periodically."""
+        if not self._series:
+            return None
+        now = self._clock()
+        if now - self._last_reported_at < self._report_interval_seconds:
+            return None
+        self._last_reported_at = now
+        return self.snapshot()
+
+    def reset(self) -> None:
+        self._series.clear()
+        self._last_reported_at = self._clock()
+
+
+_PREVIEW_UPSTREAM_CLIENT_POOL = PreviewUpstreamClientPool()
+_PREVIEW_TARGET_CACHE = PreviewTargetCache()
+_PREVIEW_LATENCY_HISTOGRAMS = PreviewLatencyHistograms()
+
+
+def get_preview_upstream_client_pool() -> PreviewUpstreamClientPool:
+    return _PREVIEW_UPSTREAM_CLIENT_POOL
+
+
+def get_preview_target_cache() -> PreviewTargetCache:
+    return _PREVIEW_TARGET_CACHE
+
+
+def get_preview_latency_histograms() -> PreviewLatencyHistograms:
+    return _PREVIEW_LATENCY_HISTOGRAMS
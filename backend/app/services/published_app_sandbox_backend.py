@@ -15,6 +15,10 @@ class PublishedAppSandboxBackendError(Exception):
     pass
 
 
+class PublishedAppSandboxSyncConflictError(PublishedAppSandboxBackendError):
+    """The sandbox rejected a delta sync because its workspace manifest moved on."""
+
+
 @dataclass(frozen=True)
 class PublishedAppSandboxBackendConfig:
     backend: Optional[str]
@@ -5,10 +5,17 @@ from urllib.parse import urlparse
 
 import httpx
 
+from app.services.http_client_pool import get_http_client_pool
+from app.services.published_app_draft_dev_sync_manifest import (
+    build_workspace_manifest,
+    get_workspace_sync_manifest_store,
+    workspace_manifest_digest,
+)
 from app.services.published_app_sandbox_backend import (
     PublishedAppOpenCodeEndpoint,
     PublishedAppSandboxBackend,
     PublishedAppSandboxBackendError,
+    PublishedAppSandboxSyncConflictError,
 )
 
 
@@ -61,7 +68,7 @@ class ControllerSandboxBackend(PublishedAppSandboxBackend):
         url = f"{self.config.controller_url.rstrip('/')}{path}"
         timeout = httpx.Timeout(timeout_seconds or self.config.request_timeout_seconds)
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with get_http_client_pool().client(url, timeout=timeout) as client:
                 response = await client.request(
                     method,
                     url,
@@ -71,6 +78,11 @@ class ControllerSandboxBackend(PublishedAppSandboxBackend):
         except Exception as exc:
             detail = str(exc).strip() or exc.__class__.__name__
             raise PublishedAppSandboxBackendError(f"Sandbox controller request failed: {detail}") from exc
+        if response.status_code == 409:
+            detail = response.text.strip() or response.reason_phrase
+            raise PublishedAppSandboxSyncConflictError(
+                f"Sandbox controller request failed ({response.status_code}): {detail}"
+            )
         if response.status_code >= 400:
             detail = response.text.strip() or response.reason_phrase
             raise PublishedAppSandboxBackendError(
@@ -142,8 +154,34 @@ class ControllerSandboxBackend(PublishedAppSandboxBackend):
             preview_url,
             base_path=preview_base_path,
         )
+        manifest = build_workspace_manifest(files)
+        self._record_synced_manifest(
+            result["sandbox_id"],
+            manifest=manifest,
+            manifest_digest=workspace_manifest_digest(manifest),
+            acknowledged_digest=response.get("manifest_digest"),
+        )
         return result
 
+    @staticmethod
+    def _manifest_key(sandbox_id: str) -> str:
+        return f"controller:{sandbox_id}"
+
+    def _record_synced_manifest(
+        self,
+        sandbox_id: str,
+        *,
+        manifest: Dict[str, str],
+        manifest_digest: str,
+        acknowledged_digest: Any,
+    ) -> None:
+        # Controllers that predate delta sync do not echo a digest; keep sending full maps to them.
+        store = get_workspace_sync_manifest_store()
+        if str(acknowledged_digest or "") == manifest_digest:
+            store.commit(self._manifest_key(sandbox_id), manifest)
+        else:
+            store.forget(self._manifest_key(sandbox_id))
+
     async def sync_session(
         self,
         *,
@@ -160,7 +198,6 @@ class ControllerSandboxBackend(PublishedAppSandboxBackend):
     ) -> Dict[str, Any]:
         payload = {
             "entry_file": entry_file,
-            "files": files,
             "idle_timeout_seconds": idle_timeout_seconds,
             "dependency_hash": dependency_hash,
             "install_dependencies": install_dependencies,
@@ -171,11 +208,33 @@ class ControllerSandboxBackend(PublishedAppSandboxBackend):
             "APPS_DRAFT_DEV_CONTROLLER_SYNC_TIMEOUT_SECONDS",
             max(float(self.config.request_timeout_seconds), 90.0),
         )
-        response = await self._request(
-            "PATCH",
-            f"/sessions/{sandbox_id}/sync",
-            json_payload=payload,
-            timeout_seconds=sync_timeout_seconds,
+        delta = get_workspace_sync_manifest_store().plan(self._manifest_key(sandbox_id), files)
+        response: Dict[str, Any] | None = None
+        if not delta.is_full:
+            delta_payload = delta.as_payload()
+            delta_payload.pop("changed_hashes", None)
+            delta_payload.pop("manifest_digest", None)
+            try:
+                response = await self._request(
+                    "PATCH",
+                    f"/sessions/{sandbox_id}/sync",
+                    json_payload={**payload, **delta_payload},
+                    timeout_seconds=sync_timeout_seconds,
+                )
+            except PublishedAppSandboxSyncConflictError:
+                get_workspace_sync_manifest_store().forget(self._manifest_key(sandbox_id))
+        if response is None:
+            response = await self._request(
+                "PATCH",
+                f"/sessions/{sandbox_id}/sync",
+                json_payload={**payload, "files": files},
+                timeout_seconds=sync_timeout_seconds,
+            )
+        self._record_synced_manifest(
+            sandbox_id,
+            manifest=delta.manifest,
+            manifest_digest=delta.digest,
+            acknowledged_digest=response.get("manifest_digest"),
         )
         return {
             "status": str(response.get("status") or "running"),
@@ -196,6 +255,7 @@ class ControllerSandboxBackend(PublishedAppSandboxBackend):
         }
 
     async def stop_session(self, *, sandbox_id: str) -> Dict[str, Any]:
+        get_workspace_sync_manifest_store().forget(self._manifest_key(sandbox_id))
         response = await self._request("POST", f"/sessions/{sandbox_id}/stop", json_payload={})
         return {
             "status": str(response.get("status") or "stopped"),
@@ -15,6 +15,7 @@ from urllib.parse import urlencode
 import httpx
 
 from app.services.apps_builder_trace import apps_builder_trace
+from app.services.http_client_pool import get_http_client_pool
 from app.services.opencode_server_launch import build_official_opencode_bootstrap_command
 from app.services.published_app_live_preview import (
     LIVE_PREVIEW_MODE,
@@ -33,6 +34,10 @@ from app.services.published_app_builder_snapshot_filter import (
     BUILDER_SNAPSHOT_IGNORED_FILE_NAMES,
     BUILDER_SNAPSHOT_IGNORED_SUFFIXES,
 )
+from app.services.published_app_draft_dev_sync_manifest import (
+    get_workspace_sync_manifest_store,
+    normalize_sync_files,
+)
 from app.services.published_app_sandbox_backend import (
     PublishedAppOpenCodeEndpoint,
     PublishedAppSandboxBackend,
@@ -286,7 +291,7 @@ class SpriteSandboxBackend(PublishedAppSandboxBackend):
         last_exc: Exception | None = None
         for attempt in range(1, _SPRITE_REQUEST_MAX_ATTEMPTS + 1):
             try:
-                async with httpx.AsyncClient(timeout=timeout) as client:
+                async with get_http_client_pool().client(url, timeout=timeout) as client:
                     response = await client.request(
                         method,
                         url,
@@ -889,9 +894,60 @@ print(json.dumps({{"status": "ok"}}, sort_keys=True))
         )
 
     async def _sync_files_to_workspace(self, *, sprite_name: str, workspace_path: str, files: Dict[str, str]) -> dict[str, Any]:
-        encoded = base64.b64encode(json.dumps(files, ensure_ascii=True, sort_keys=True).encode("utf-8")).decode("ascii")
+        # Only files whose sha256 changed since the last sync to this workspace are
+        # shipped; the rest are sent as expected hashes and verified inside the sprite.
+        # Paths that drifted there (e.g. edited by the coding agent) are resent once.
+        store = get_workspace_sync_manifest_store()
+        manifest_key = f"sprite:{sprite_name}:{workspace_path}"
+        delta = store.plan(manifest_key, files)
+        normalized = normalize_sync_files(files)
+        expected = {path: digest for path, digest in delta.manifest.items() if path not in delta.changed}
+        result = await self._run_sync_script(
+            sprite_name=sprite_name,
+            workspace_path=workspace_path,
+            files=delta.changed,
+            expected=expected,
+        )
+        drifted = {path for path in result.get("drifted") or [] if path in normalized}
+        if drifted:
+            retry = await self._run_sync_script(
+                sprite_name=sprite_name,
+                workspace_path=workspace_path,
+                files={path: normalized[path] for path in sorted(drifted)},
+                expected={path: digest for path, digest in delta.manifest.items() if path not in drifted},
+            )
+            result = {
+                "revision_token": retry["revision_token"],
+                "wrote_count": result["wrote_count"] + retry["wrote_count"],
+                "skipped_count": result["skipped_count"] + retry["skipped_count"],
+                "deleted_count": result["deleted_count"] + retry["deleted_count"],
+                "drifted": retry.get("drifted") or [],
+            }
+        if result.get("drifted"):
+            store.forget(manifest_key)
+        else:
+            store.commit(manifest_key, delta.manifest)
+        return {
+            "revision_token": result["revision_token"],
+            "wrote_count": result["wrote_count"],
+            "skipped_count": result["skipped_count"] + len(expected) - len(drifted),
+            "deleted_count": result["deleted_count"],
+        }
+
+    async def _run_sync_script(
+        self,
+        *,
+        sprite_name: str,
+        workspace_path: str,
+        files: Dict[str, str],
+        expected: Dict[str, str],
+    ) -> dict[str, Any]:
+        encoded = base64.b64encode(
+            json.dumps({"files": files, "expected": expected}, ensure_ascii=True, sort_keys=True).encode("utf-8")
+        ).decode("ascii")
         script = f"""
 import base64
+import hashlib
 import json
 import os
 import pathlib
@@ -903,7 +959,8 @@ managed = set()
 wrote_count = 0
 skipped_count = 0
 deleted_count = 0
-for rel_path, content in payload.items():
+drifted = []
+for rel_path, content in payload["files"].items():
     rel = str(rel_path or "").replace("\\\\", "/").lstrip("/")
     if not rel:
         continue
@@ -921,26 +978,39 @@ for rel_path, content in payload.items():
     target.write_text(rendered, encoding="utf-8")
     wrote_count += 1
 
+for rel_path, digest in payload["expected"].items():
+    rel = str(rel_path or "").replace("\\\\", "/").lstrip("/")
+    if not rel:
+        continue
+    managed.add(rel)
+    try:
+        actual = hashlib.sha256((workspace / rel).read_bytes()).hexdigest()
+    except OSError:
+        actual = None
+    if actual != digest:
+        drifted.append(rel)
+
 ignore_prefixes = tuple(
     prefix for prefix in {json.dumps(":".join(_SYNC_IGNORE_PREFIXES))}.split(":") if prefix
 )
-for existing in sorted(workspace.rglob("*")):
-    if not existing.is_file():
-        continue
-    rel = existing.relative_to(workspace).as_posix()
-    if rel in managed:
-        continue
-    if any(rel.startswith(prefix) for prefix in ignore_prefixes):
-        continue
-    existing.unlink(missing_ok=True)
-    deleted_count += 1
-    parent = existing.parent
-    while parent != workspace and parent.exists():
-        try:
-            parent.rmdir()
-        except OSError:
-            break
-        parent = parent.parent
+for dirpath, dirnames, filenames in os.walk(workspace, topdown=True):
+    rel_dir = pathlib.Path(dirpath).relative_to(workspace).as_posix()
+    rel_dir = "" if rel_dir == "." else rel_dir + "/"
+    dirnames[:] = [name for name in dirnames if not (rel_dir + name + "/").startswith(ignore_prefixes)]
+    for name in sorted(filenames):
+        rel = rel_dir + name
+        if rel in managed or rel.startswith(ignore_prefixes):
+            continue
+        existing = workspace / rel
+        existing.unlink(missing_ok=True)
+        deleted_count += 1
+        parent = existing.parent
+        while parent != workspace and parent.exists():
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
 
 revision_path = workspace / {json.dumps(_REVISION_FILE)}
 revision_path.parent.mkdir(parents=True, exist_ok=True)
@@ -955,6 +1025,7 @@ print(json.dumps({{
     "wrote_count": wrote_count,
     "skipped_count": skipped_count,
     "deleted_count": deleted_count,
+    "drifted": sorted(drifted),
 }}, sort_keys=True))
 """.strip()
         output, _ = await self._exec_with_stdin(
@@ -976,6 +1047,7 @@ print(json.dumps({{
             "wrote_count": max(0, int(normalized.get("wrote_count") or 0)),
             "skipped_count": max(0, int(normalized.get("skipped_count") or 0)),
             "deleted_count": max(0, int(normalized.get("deleted_count") or 0)),
+            "drifted": [str(item) for item in normalized.get("drifted") or []],
         }
 
     async def _read_revision_token(self, *, sprite_name: str, workspace_path: str) -> str | None:
@@ -2,6 +2,8 @@
 import os
 import json
 import hashlib
+import importlib
+from dataclasses import asdict
 from pathlib import Path
 from datetime import datetime
 import uuid
@@ -12,6 +14,7 @@ from app.db.postgres.models.registry import (
     ModelProviderBinding,
     ModelCapabilityType,
     ModelProviderType,
+    RegistrySeedState,
     set_tool_management_metadata,
     ToolRegistry,
     ToolDefinitionScope,
@@ -49,6 +52,15 @@ _build_platform_domain_tool_schema = build_platform_domain_tool_schema
 
 DEFAULT_PLATFORM_ARCHITECT_MODEL_SYSTEM_KEY = "grok-4-1-fast-reasoning"
 PLATFORM_ARCHITECT_AGENT_SYSTEM_KEY = "platform_architect"
+STARTUP_SEED_STATE_NAME = "startup_registry"
+
+# Modules whose inline definitions (schemas, specs, tool payloads) shape what the
+# startup seeders write; a change to any of them must invalidate the fingerprint.
+_STARTUP_SEED_DEFINITION_MODULES = (
+    "app.services.registry_seeding",
+    "app.services.builtin_tools",
+    "app.services.file_space_tools",
+)
 
 
 def _system_row_key(prefix: str, key: str) -> str:
@@ -68,6 +80,60 @@ async def _acquire_registry_seed_lock(db, *, scope: str = "tool_registry") -> No
     key = int.from_bytes(digest[:8], "big") & 0x7FFFFFFFFFFFFFFF
     await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": key})
 
+def _global_models_seed_path() -> str:
+    # Use relative path from this file
+    base_dir = os.path.dirname(os.path.dirname(__file__)) # back to app/
+    return os.path.join(base_dir, "db", "postgres", "seeds", "models.json")
+
+
+def compute_startup_seed_fingerprint() -> str:
+    """
+    Content hash of every definition the startup seeders apply: the model seed file,
+    Platform SDK sources, built-in template specs and the modules that inline the rest.
+    """
+    digest = hashlib.sha256()
+
+    def _feed(label: str, payload: bytes) -> None:
+        digest.update(label.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(hashlib.sha256(payload).digest())
+
+    models_path = Path(_global_models_seed_path())
+    _feed("models.json", models_path.read_bytes() if models_path.exists() else b"")
+    for source_file in _load_platform_sdk_source_files():
+        _feed(source_file["path"], source_file["content"].encode("utf-8"))
+    _feed("builtin_tools_v1", b"1" if is_builtin_tools_v1_enabled() else b"0")
+    _feed(
+        "builtin_template_specs",
+        json.dumps([asdict(spec) for spec in BUILTIN_TEMPLATE_SPECS], sort_keys=True, default=str).encode("utf-8"),
+    )
+    for module_name in _STARTUP_SEED_DEFINITION_MODULES:
+        module_file = getattr(importlib.import_module(module_name), "__file__", None)
+        _feed(module_name, Path(module_file).read_bytes() if module_file else b"")
+    return digest.hexdigest()
+
+
+async def startup_seed_fingerprint_matches(db, fingerprint: str) -> bool:
+    try:
+        stored = await db.scalar(
+            select(RegistrySeedState.fingerprint).where(RegistrySeedState.seed_name == STARTUP_SEED_STATE_NAME)
+        )
+    except Exception:
+        # Seed state table not migrated yet; fall back to a full seeding pass.
+        await db.rollback()
+        return False
+    return stored == fingerprint
+
+
+async def record_startup_seed_fingerprint(db, fingerprint: str) -> None:
+    state = await db.get(RegistrySeedState, STARTUP_SEED_STATE_NAME)
+    if state is None:
+        db.add(RegistrySeedState(seed_name=STARTUP_SEED_STATE_NAME, fingerprint=fingerprint))
+    else:
+        state.fingerprint = fingerprint
+    await db.commit()
+
+
 async def seed_global_models(db):
     """
     Seeds global models from a JSON file.
@@ -80,10 +146,8 @@ async def seed_global_models(db):
         )
     )
 
-    # Use relative path from this file
-    base_dir = os.path.dirname(os.path.dirname(__file__)) # back to app/
-    json_path = os.path.join(base_dir, "db", "postgres", "seeds", "models.json")
-    
+    json_path = _global_models_seed_path()
+
     if not os.path.exists(json_path):
         print(f"Seed file not found at {json_path}")
         return
@@ -12,7 +12,7 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.db.postgres.models import KnowledgeStore, RetrievalPolicy
+from app.db.postgres.models import KnowledgeStore, RetrievalPolicy, StorageBackend
 from app.rag.adapters import create_adapter, SearchResult, VectorBackendAdapter
 from app.services.model_resolver import ModelResolver
 from app.services.credentials_service import CredentialsService
@@ -20,6 +20,12 @@ from app.db.postgres.models.registry import IntegrationCredentialCategory
 from app.services.resource_policy_service import ResourcePolicyAccessDenied, ResourcePolicySnapshot
 
 
+# pgvector's default hnsw.ef_search; an HNSW scan never returns more rows than this.
+_PGVECTOR_DEFAULT_EF_SEARCH = 40
+# Filtered HNSW scans discard candidates after the graph walk, so widen the beam.
+_FILTERED_EF_SEARCH_MULTIPLIER = 4
+
+
 class RetrievalResult(BaseModel):
     """A result from the retrieval service."""
     id: str
@@ -74,6 +80,61 @@ class RetrievalService:
             return namespace
         config = store.backend_config or {}
         return config.get("namespace")
+
+    @staticmethod
+    def _resolve_search_params(
+        store: KnowledgeStore,
+        policy: RetrievalPolicy,
+        *,
+        fetch_k: int,
+        filters: Optional[Dict[str, Any]],
+        override: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Query-time ANN settings for a store and retrieval policy.
+
+        Read from `backend_config.search_params` (`ef_search`, `probes`, `iterative_scan`),
+        with optional per-policy overrides under `search_params.policies.<policy>` and
+        then the caller's override. For pgvector, `ef_search` is raised to at least the
+        number of candidates the policy fetches (more when filters are applied), since
+        HNSW cannot return more rows than its search beam.
+        """
+        if store.backend != StorageBackend.PGVECTOR:
+            return dict(override) if override else None
+        config = (store.backend_config or {}).get("search_params")
+        config = config if isinstance(config, dict) else {}
+        params = {key: value for key, value in config.items() if key != "policies"}
+        policy_overrides = config.get("policies")
+        if isinstance(policy_overrides, dict):
+            policy_params = policy_overrides.get(policy.value)
+            if isinstance(policy_params, dict):
+                params.update(policy_params)
+        if override:
+            params.update(override)
+
+        try:
+            ef_search = int(params.get("ef_search") or _PGVECTOR_DEFAULT_EF_SEARCH)
+        except (TypeError, ValueError):
+            ef_search = _PGVECTOR_DEFAULT_EF_SEARCH
+        floor = fetch_k * (_FILTERED_EF_SEARCH_MULTIPLIER if filters else 1)
+        if floor > ef_search:
+            ef_search = floor
+        if ef_search != _PGVECTOR_DEFAULT_EF_SEARCH or "ef_search" in params:
+            params["ef_search"] = ef_search
+        return params or None
+
+    @staticmethod
+    async def _adapter_query(
+        adapter: VectorBackendAdapter,
+        query_vector: List[float],
+        top_k: int,
+        filters: Optional[Dict],
+        namespace: Optional[str],
+        search_params: Optional[Dict[str, Any]],
+    ) -> List[SearchResult]:
+        if search_params:
+            return await adapter.query(query_vector, top_k, filters, namespace, search_params=search_params)
+        return await adapter.query(query_vector, top_k, filters, namespace)
     
     async def _embed_query(
         self,
@@ -100,6 +161,7 @@ class RetrievalService:
         policy_override: Optional[RetrievalPolicy] = None,
         namespace: Optional[str] = None,
         policy_snapshot: ResourcePolicySnapshot | None = None,
+        search_params: Optional[Dict[str, Any]] = None,
     ) -> List[RetrievalResult]:
         """
         Query a Knowledge Store for relevant documents.
@@ -111,6 +173,7 @@ class RetrievalService:
             filters: Optional metadata filters
             policy_override: Override the store's default retrieval policy
             namespace: Optional namespace within the store
+            search_params: Optional query-time ANN overrides (e.g. `ef_search`, `probes`)
             
         Returns:
             List of RetrievalResult objects
@@ -137,17 +200,34 @@ class RetrievalService:
         policy = policy_override or store.retrieval_policy
         effective_namespace = self._resolve_namespace(store, namespace)
         
+        fetch_k = top_k * 2 if policy in {RetrievalPolicy.HYBRID, RetrievalPolicy.RECENCY_BOOSTED} else top_k
+        effective_search_params = self._resolve_search_params(
+            store,
+            policy,
+            fetch_k=fetch_k,
+            filters=filters,
+            override=search_params,
+        )
+        
         # 5. Execute search based on policy
         if policy == RetrievalPolicy.SEMANTIC_ONLY:
-            results = await self._semantic_search(adapter, query_vector, top_k, filters, effective_namespace)
+            results = await self._semantic_search(
+                adapter, query_vector, top_k, filters, effective_namespace, search_params=effective_search_params
+            )
         elif policy == RetrievalPolicy.HYBRID:
-            results = await self._hybrid_search(adapter, query, query_vector, top_k, filters, effective_namespace)
+            results = await self._hybrid_search(
+                adapter, query, query_vector, top_k, filters, effective_namespace, search_params=effective_search_params
+            )
         elif policy == RetrievalPolicy.KEYWORD_ONLY:
             results = await self._keyword_search(adapter, query, top_k, filters, effective_namespace)
         elif policy == RetrievalPolicy.RECENCY_BOOSTED:
-            results = await self._recency_boosted_search(adapter, query_vector, top_k, filters, effective_namespace)
+            results = await self._recency_boosted_search(
+                adapter, query_vector, top_k, filters, effective_namespace, search_params=effective_search_params
+            )
         else:
-            results = await self._semantic_search(adapter, query_vector, top_k, filters, effective_namespace)
+            results = await self._semantic_search(
+                adapter, query_vector, top_k, filters, effective_namespace, search_params=effective_search_params
+            )
         
         # 6. Transform to RetrievalResults
         return [
@@ -167,10 +247,11 @@ class RetrievalService:
         query_vector: List[float],
         top_k: int,
         filters: Optional[Dict],
-        namespace: Optional[str]
+        namespace: Optional[str],
+        search_params: Optional[Dict[str, Any]] = None,
     ) -> List[SearchResult]:
         """Pure vector similarity search."""
-        return await adapter.query(query_vector, top_k, filters, namespace)
+        return await self._adapter_query(adapter, query_vector, top_k, filters, namespace, search_params)
     
     async def _hybrid_search(
         self,
@@ -179,7 +260,8 @@ class RetrievalService:
         query_vector: List[float],
         top_k: int,
         filters: Optional[Dict],
-        namespace: Optional[str]
+        namespace: Optional[str],
+        search_params: Optional[Dict[str, Any]] = None,
     ) -> List[SearchResult]:
         """
         Hybrid search combining semantic and keyword search.
@@ -188,7 +270,9 @@ class RetrievalService:
         Future improvement: integrate with a proper lexical index.
         """
         # Get more results for reranking
-        semantic_results = await adapter.query(query_vector, top_k * 2, filters, namespace)
+        semantic_results = await self._adapter_query(
+            adapter, query_vector, top_k * 2, filters, namespace, search_params
+        )
         
         # Simple reranking: boost results where query terms appear in text
         query_terms = set(query.lower().split())
@@ -238,14 +322,17 @@ class RetrievalService:
         query_vector: List[float],
         top_k: int,
         filters: Optional[Dict],
-        namespace: Optional[str]
+        namespace: Optional[str],
+        search_params: Optional[Dict[str, Any]] = None,
     ) -> List[SearchResult]:
         """
         Semantic search with recency boosting.
         
         Documents with more recent timestamps get a score boost.
         """
-        semantic_results = await adapter.query(query_vector, top_k * 2, filters, namespace)
+        semantic_results = await self._adapter_query(
+            adapter, query_vector, top_k * 2, filters, namespace, search_params
+        )
         
         # Apply recency boost based on 'timestamp' or 'created_at' metadata
         import time
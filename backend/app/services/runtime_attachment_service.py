@@ -1,10 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import base64
-import csv
+import functools
 import hashlib
-import io
-import json
 import mimetypes
 from dataclasses import dataclass
 from pathlib import Path
@@ -24,12 +23,12 @@ from app.db.postgres.models.runtime_attachments import (
     RuntimeAttachmentKind,
     RuntimeAttachmentStatus,
 )
+from app.services.document_extraction import extract_attachment_text, get_document_extraction_service
 from app.services.runtime_attachment_storage import RuntimeAttachmentStorage, RuntimeAttachmentStorageError
 from app.services.thread_service import ThreadService
 
 
 MAX_ATTACHMENT_BYTES = 25 * 1024 * 1024
-MAX_DOCUMENT_TEXT_CHARS = 20000
 
 IMAGE_MIME_TYPES = {
     "image/png",
@@ -338,14 +337,17 @@ class RuntimeAttachmentService:
                     attachment.status = RuntimeAttachmentStatus.processed
                 continue
 
-            payload = self.read_bytes(attachment)
             try:
                 if attachment.kind == RuntimeAttachmentKind.document:
                     if not str(attachment.extracted_text or "").strip():
-                        attachment.extracted_text = self._extract_document_text(
-                            payload=payload,
+                        # Identical uploads (same sha256) reuse the cached extraction without re-reading the file.
+                        attachment.extracted_text = await get_document_extraction_service().attachment_text(
+                            functools.partial(self._read_bytes_async, attachment),
                             mime_type=attachment.mime_type,
                             filename=attachment.filename,
+                            parser=self._extract_document_text,
+                            cache_key=attachment.sha256,
+                            byte_size=attachment.byte_size,
                         )
                         attachment.metadata_ = {
                             **dict(attachment.metadata_ or {}),
@@ -355,6 +357,8 @@ class RuntimeAttachmentService:
                         raise ValueError("Document extraction returned no text")
                 attachment.processing_error = None
                 attachment.status = RuntimeAttachmentStatus.processed
+            except HTTPException:
+                raise
             except Exception as exc:
                 attachment.status = RuntimeAttachmentStatus.failed
                 attachment.processing_error = str(exc)
@@ -368,35 +372,11 @@ class RuntimeAttachmentService:
         except RuntimeAttachmentStorageError as exc:
             raise HTTPException(status_code=500, detail=f"Attachment payload missing for '{attachment.filename}'") from exc
 
-    def _extract_document_text(self, *, payload: bytes, mime_type: str, filename: str) -> str:
-        normalized_mime = str(mime_type or "").strip().lower()
-        if normalized_mime == "application/pdf" or Path(filename).suffix.lower() == ".pdf":
-            import pypdf
-
-            reader = pypdf.PdfReader(io.BytesIO(payload))
-            pages = []
-            for page in reader.pages:
-                text = page.extract_text() or ""
-                if text.strip():
-                    pages.append(text.strip())
-            return "\n\n".join(pages)[:MAX_DOCUMENT_TEXT_CHARS].strip()
-
-        decoded = payload.decode("utf-8", errors="replace")
-        if normalized_mime == "application/json":
-            try:
-                parsed = json.loads(decoded)
-            except Exception:
-                return decoded[:MAX_DOCUMENT_TEXT_CHARS].strip()
-            return json.dumps(parsed, ensure_ascii=False, indent=2)[:MAX_DOCUMENT_TEXT_CHARS].strip()
-
-        if normalized_mime == "text/csv":
-            reader = csv.reader(io.StringIO(decoded))
-            rows = []
-            for row in reader:
-                rows.append(", ".join(cell.strip() for cell in row if str(cell).strip()))
-            return "\n".join(item for item in rows if item)[:MAX_DOCUMENT_TEXT_CHARS].strip()
-
-        return decoded[:MAX_DOCUMENT_TEXT_CHARS].strip()
+    # Runs on the document extraction pool, so it must stay a picklable module-level function.
+    _extract_document_text = staticmethod(extract_attachment_text)
+
+    async def _read_bytes_async(self, attachment: RuntimeAttachment) -> bytes:
+        return await asyncio.to_thread(self.read_bytes, attachment)
 
     async def assert_image_models_supported(self, *, model_ids: Iterable[str]) -> None:
         normalized = [str(item).strip() for item in model_ids if str(item).strip()]
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.env_loader import env_float, env_int
+from app.services.audio_segmentation import (
+    AsyncByteReader,
+    AudioSegment,
+    is_segmentable_audio,
+    iter_audio_segments,
+)
 from app.services.model_resolver import ModelResolver
-from app.services.model_runtime.interfaces import SpeechToTextResult
+from app.services.model_runtime.interfaces import SpeechToTextResult, SpeechToTextSegment
 from app.services.resource_policy_service import ResourcePolicySnapshot
 
 
@@ -40,3 +49,104 @@ class SpeechToTextService:
             attachment_id=attachment_id,
         )
         return result, execution
+
+    async def transcribe_stream(
+        self,
+        reader: AsyncByteReader,
+        *,
+        model_id: str | None = None,
+        mime_type: str | None = None,
+        filename: str | None = None,
+        language_hints: list[str] | None = None,
+        prompt: str | None = None,
+        policy_snapshot: ResourcePolicySnapshot | None = None,
+        segment_seconds: float | None = None,
+        max_concurrency: int | None = None,
+    ) -> AsyncIterator[SpeechToTextSegment]:
+        """
+        Resolve the STT model, then return an iterator of per-segment transcripts in audio order.
+
+        WAV and raw PCM input is read one time-bounded segment at a time and at most
+        `max_concurrency` segments are in flight, so memory stays flat for long recordings.
+        Other containers cannot be split without decoding and are transcribed in one call.
+        The model is resolved before this returns, so the iterator does not touch the session.
+        """
+        execution = await ModelResolver(self._db, self._organization_id).resolve_speech_to_text_execution(
+            model_id=model_id,
+            policy_snapshot=policy_snapshot,
+        )
+        provider = execution.provider_instance
+        options = {"language_hints": language_hints, "prompt": prompt}
+        if not is_segmentable_audio(mime_type, filename):
+            return self._transcribe_whole(provider, reader, mime_type=mime_type, filename=filename, **options)
+        return self._transcribe_segments(
+            provider,
+            reader,
+            mime_type=mime_type,
+            filename=filename,
+            segment_seconds=segment_seconds or env_float("STT_STREAM_SEGMENT_SECONDS", 30.0),
+            max_concurrency=max(1, max_concurrency or env_int("STT_STREAM_MAX_CONCURRENCY", 4)),
+            **options,
+        )
+
+    async def _transcribe_whole(
+        self,
+        provider: Any,
+        reader: AsyncByteReader,
+        *,
+        mime_type: str | None,
+        filename: str | None,
+        language_hints: list[str] | None,
+        prompt: str | None,
+    ) -> AsyncIterator[SpeechToTextSegment]:
+        result = await provider.transcribe(
+            await reader.read(),
+            mime_type=mime_type,
+            filename=filename,
+            language_hints=language_hints,
+            prompt=prompt,
+        )
+        yield SpeechToTextSegment(text=result.text)
+
+    async def _transcribe_segments(
+        self,
+        provider: Any,
+        reader: AsyncByteReader,
+        *,
+        mime_type: str | None,
+        filename: str | None,
+        segment_seconds: float,
+        max_concurrency: int,
+        language_hints: list[str] | None,
+        prompt: str | None,
+    ) -> AsyncIterator[SpeechToTextSegment]:
+        async def _transcribe(segment: AudioSegment) -> SpeechToTextSegment:
+            result = await provider.transcribe(
+                segment.wav_bytes,
+                mime_type="audio/wav",
+                filename=f"segment-{segment.index:05d}.wav",
+                language_hints=language_hints,
+                prompt=prompt,
+            )
+            return SpeechToTextSegment(text=result.text, start_ms=segment.start_ms, end_ms=segment.end_ms)
+
+        # Ordered window of in-flight segments: the head is always the next one to emit,
+        # and reading pauses once the window is full.
+        in_flight: deque[asyncio.Task[SpeechToTextSegment]] = deque()
+        try:
+            async for segment in iter_audio_segments(
+                reader,
+                mime_type=mime_type,
+                filename=filename,
+                segment_seconds=segment_seconds,
+            ):
+                in_flight.append(asyncio.create_task(_transcribe(segment)))
+                if len(in_flight) >= max_concurrency:
+                    yield await in_flight.popleft()
+            while in_flight:
+                yield await in_flight.popleft()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
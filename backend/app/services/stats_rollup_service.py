@@ -0,0 +1,638 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import os
+from typing import Any, Iterable
+from uuid import UUID
+
+from sqlalchemy import and_, case, delete, func, insert, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.env_loader import env_int
+from app.db.postgres.models.agent_threads import AgentThread, AgentThreadSurface
+from app.db.postgres.models.agents import AgentRun, RunStatus
+from app.db.postgres.models.published_app_analytics import (
+    PublishedAppAnalyticsEvent,
+    PublishedAppAnalyticsEventType,
+    PublishedAppAnalyticsSurface,
+)
+from app.db.postgres.models.stats_rollups import StatsRollup, StatsRollupGranularity, StatsRollupWatermark
+from app.services.model_accounting import (
+    billable_total_tokens,
+    cost_estimated_expr,
+    cost_exact_expr,
+    cost_total_expr,
+    cost_unknown_count_expr,
+    usage_estimated_expr,
+    usage_exact_expr,
+    usage_total_expr,
+    usage_unknown_count_expr,
+)
+
+
+HOURLY_ROLLUP_NAME = "stats_hourly"
+SUBJECT_AGENT = "agent"
+SUBJECT_PUBLISHED_APP = "published_app"
+CODING_AGENT_SURFACE = "published_app_coding_agent"
+
+AGENT_RUN_METRICS = (
+    "runs",
+    "runs_failed",
+    "tokens_total",
+    "tokens_exact",
+    "tokens_estimated",
+    "runs_unknown_usage",
+    "spend_total",
+    "spend_exact",
+    "spend_estimated",
+    "runs_unknown_cost",
+)
+PUBLISHED_APP_METRICS = (
+    "app_visits_by_surface",
+    "app_visits_by_auth_state",
+    "app_approximate_events",
+    "app_runs",
+    "app_runs_failed",
+    "app_tokens",
+    "app_threads",
+)
+
+# (organization_id, subject_kind, subject_id, metric, dimension, hour bucket start)
+MetricKey = tuple[UUID, str, UUID, str, str, datetime]
+
+
+def stats_rollups_enabled() -> bool:
+    raw = os.getenv("STATS_ROLLUPS_ENABLED", "1")
+    return str(raw).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def floor_hour(value: datetime) -> datetime:
+    return _as_utc(value).replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_hour(value: datetime) -> datetime:
+    floored = floor_hour(value)
+    return floored if floored == _as_utc(value) else floored + timedelta(hours=1)
+
+
+def floor_day(value: datetime) -> datetime:
+    return _as_utc(value).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def ceil_day(value: datetime) -> datetime:
+    floored = floor_day(value)
+    return floored if floored == _as_utc(value) else floored + timedelta(days=1)
+
+
+def _parse_bucket(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return floor_hour(value)
+    return floor_hour(datetime.fromisoformat(str(value)))
+
+
+def _is_truthy_flag(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    return bool(value)
+
+
+def _enum_text(value: Any) -> str:
+    return str(getattr(value, "value", value))
+
+
+@dataclass(frozen=True)
+class RollupReadPlan:
+    """How a dashboard range splits between raw scans, hourly rollups and daily rollups."""
+
+    raw_spans: tuple[tuple[datetime, datetime, bool], ...]
+    hour_spans: tuple[tuple[datetime, datetime], ...] = ()
+    day_span: tuple[datetime, datetime] | None = None
+
+
+def plan_rollup_read(
+    start: datetime,
+    end: datetime,
+    watermark: datetime | None,
+    *,
+    covered_from: datetime | None = None,
+    hourly_from: datetime | None = None,
+) -> RollupReadPlan:
+    """
+    Split the inclusive range [start, end] so only the partial leading hour and the
+    buckets past the rollup watermark are scanned raw. Whole days come from daily rows
+    and the leftover whole hours at either end from hourly rows.
+
+    Buckets before `covered_from` (older than the first backfill) have no rollups, and
+    hours before `hourly_from` have had their hourly rows pruned; both are scanned raw.
+    """
+    start = _as_utc(start)
+    end = _as_utc(end)
+    if watermark is None:
+        return RollupReadPlan(raw_spans=((start, end, True),))
+    covered_start = ceil_hour(start)
+    if covered_from is not None:
+        covered_start = max(covered_start, _as_utc(covered_from))
+    covered_end = min(floor_hour(end), floor_hour(watermark))
+    if covered_start >= covered_end:
+        return RollupReadPlan(raw_spans=((start, end, True),))
+
+    raw_spans: list[tuple[datetime, datetime, bool]] = []
+    if start < covered_start:
+        raw_spans.append((start, covered_start, False))
+    raw_spans.append((covered_end, end, True))
+
+    first_day = ceil_day(covered_start)
+    last_day = floor_day(covered_end)
+    day_span: tuple[datetime, datetime] | None = None
+    if first_day >= last_day:
+        hour_spans: tuple[tuple[datetime, datetime], ...] = ((covered_start, covered_end),)
+    else:
+        hour_spans = tuple(
+            span for span in ((covered_start, first_day), (last_day, covered_end)) if span[0] < span[1]
+        )
+        day_span = (first_day, last_day)
+
+    if hourly_from is not None:
+        hourly_from = _as_utc(hourly_from)
+        kept: list[tuple[datetime, datetime]] = []
+        for span_start, span_end in hour_spans:
+            if span_start < hourly_from:
+                raw_spans.append((span_start, min(span_end, hourly_from), False))
+            if max(span_start, hourly_from) < span_end:
+                kept.append((max(span_start, hourly_from), span_end))
+        hour_spans = tuple(kept)
+    return RollupReadPlan(raw_spans=tuple(sorted(raw_spans)), hour_spans=hour_spans, day_span=day_span)
+
+
+@dataclass
+class StatsRollupTotals:
+    """Metric values for a range, keyed by subject, dimension and UTC day."""
+
+    values: dict[str, dict[tuple[UUID, str, str], float]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(float)))
+
+    def add(self, *, metric: str, subject_id: UUID, dimension: str, bucket: datetime, value: float) -> None:
+        self.values[metric][(subject_id, dimension, _as_utc(bucket).date().isoformat())] += float(value)
+
+    def _items(self, metric: str, subject_id: UUID | None):
+        for (item_subject_id, dimension, day), value in self.values.get(metric, {}).items():
+            if subject_id is None or item_subject_id == subject_id:
+                yield dimension, day, value
+
+    def total(self, metric: str, *, subject_id: UUID | None = None) -> float:
+        return sum(value for _dimension, _day, value in self._items(metric, subject_id))
+
+    def by_day(self, metric: str, *, subject_id: UUID | None = None) -> dict[str, float]:
+        result: dict[str, float] = defaultdict(float)
+        for _dimension, day, value in self._items(metric, subject_id):
+            result[day] += value
+        return dict(result)
+
+    def by_dimension(self, metric: str, *, subject_id: UUID | None = None) -> dict[str, float]:
+        result: dict[str, float] = defaultdict(float)
+        for dimension, _day, value in self._items(metric, subject_id):
+            result[dimension] += value
+        return dict(result)
+
+
+class StatsRollupService:
+    """
+    Maintains hourly and daily metric rollups for dashboards and reads ranges back from them.
+
+    A periodic pass re-materializes recent closed hours (runs keep changing status and
+    usage after they are created) plus older hours whose runs were updated since the
+    last pass, folds completed days into daily rows, and advances a watermark. The
+    watermark row also records where coverage starts: readers use rollup rows between
+    that start and the watermark and scan raw tables for everything else.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def _hour_bucket_expr(self, column: Any) -> Any:
+        bind = self.db.get_bind()
+        if bind is not None and bind.dialect.name == "sqlite":
+            return func.strftime(literal_column("'%Y-%m-%d %H:00:00'"), column)
+        return func.date_trunc(literal_column("'hour'"), func.timezone(literal_column("'UTC'"), column))
+
+    @staticmethod
+    def _window(column: Any, start: datetime, end: datetime, end_inclusive: bool) -> Any:
+        return and_(column >= start, column <= end if end_inclusive else column < end)
+
+    async def collect_raw_metrics(
+        self,
+        *,
+        start: datetime,
+        end: datetime,
+        organization_id: UUID | None = None,
+        end_inclusive: bool = False,
+        subject_kinds: Iterable[str] = (SUBJECT_AGENT, SUBJECT_PUBLISHED_APP),
+    ) -> dict[MetricKey, float]:
+        """Aggregate raw runs, threads and analytics events in a window into hourly metric values."""
+        kinds = set(subject_kinds)
+        metrics: dict[MetricKey, float] = defaultdict(float)
+        if SUBJECT_AGENT in kinds:
+            await self._collect_agent_run_metrics(metrics, start, end, organization_id, end_inclusive)
+        if SUBJECT_PUBLISHED_APP in kinds:
+            await self._collect_published_app_run_metrics(metrics, start, end, organization_id, end_inclusive)
+            await self._collect_published_app_thread_metrics(metrics, start, end, organization_id, end_inclusive)
+            await self._collect_published_app_event_metrics(metrics, start, end, organization_id, end_inclusive)
+        return metrics
+
+    async def _collect_agent_run_metrics(
+        self,
+        metrics: dict[MetricKey, float],
+        start: datetime,
+        end: datetime,
+        organization_id: UUID | None,
+        end_inclusive: bool,
+    ) -> None:
+        bucket = self._hour_bucket_expr(AgentRun.created_at)
+        query = (
+            select(
+                AgentRun.organization_id,
+                AgentRun.agent_id,
+                bucket.label("bucket"),
+                func.count(AgentRun.id).label("runs"),
+                func.coalesce(func.sum(case((AgentRun.status == RunStatus.failed, 1), else_=0)), 0).label("runs_failed"),
+                func.coalesce(func.sum(usage_total_expr(AgentRun)), 0).label("tokens_total"),
+                func.coalesce(func.sum(usage_exact_expr(AgentRun)), 0).label("tokens_exact"),
+                func.coalesce(func.sum(usage_estimated_expr(AgentRun)), 0).label("tokens_estimated"),
+                func.coalesce(func.sum(usage_unknown_count_expr(AgentRun)), 0).label("runs_unknown_usage"),
+                func.coalesce(func.sum(cost_total_expr(AgentRun)), 0.0).label("spend_total"),
+                func.coalesce(func.sum(cost_exact_expr(AgentRun)), 0.0).label("spend_exact"),
+                func.coalesce(func.sum(cost_estimated_expr(AgentRun)), 0.0).label("spend_estimated"),
+                func.coalesce(func.sum(cost_unknown_count_expr(AgentRun)), 0).label("runs_unknown_cost"),
+            )
+            .where(self._window(AgentRun.created_at, start, end, end_inclusive))
+            .group_by(AgentRun.organization_id, AgentRun.agent_id, bucket)
+        )
+        if organization_id is not None:
+            query = query.where(AgentRun.organization_id == organization_id)
+        for row in (await self.db.execute(query)).all():
+            hour = _parse_bucket(row.bucket)
+            for metric in AGENT_RUN_METRICS:
+                value = float(getattr(row, metric) or 0)
+                if value:
+                    metrics[(row.organization_id, SUBJECT_AGENT, row.agent_id, metric, "", hour)] += value
+
+    async def _collect_published_app_run_metrics(
+        self,
+        metrics: dict[MetricKey, float],
+        start: datetime,
+        end: datetime,
+        organization_id: UUID | None,
+        end_inclusive: bool,
+    ) -> None:
+        query = select(
+            AgentRun.organization_id,
+            AgentRun.published_app_id,
+            AgentRun.created_at,
+            AgentRun.status,
+            AgentRun.total_tokens,
+            AgentRun.usage_tokens,
+            AgentRun.input_params,
+        ).where(
+            and_(
+                AgentRun.published_app_id.is_not(None),
+                self._window(AgentRun.created_at, start, end, end_inclusive),
+                or_(AgentRun.surface.is_(None), AgentRun.surface != CODING_AGENT_SURFACE),
+            )
+        )
+        if organization_id is not None:
+            query = query.where(AgentRun.organization_id == organization_id)
+        for row in (await self.db.execute(query)).all():
+            if _is_truthy_flag(((row.input_params or {}).get("context") or {}).get("published_app_preview")):
+                continue
+            hour = floor_hour(row.created_at)
+            key = (row.organization_id, SUBJECT_PUBLISHED_APP, row.published_app_id)
+            metrics[(*key, "app_runs", "", hour)] += 1
+            if _enum_text(row.status) == RunStatus.failed.value:
+                metrics[(*key, "app_runs_failed", "", hour)] += 1
+            tokens = billable_total_tokens(row)
+            if tokens:
+                metrics[(*key, "app_tokens", "", hour)] += tokens
+
+    async def _collect_published_app_thread_metrics(
+        self,
+        metrics: dict[MetricKey, float],
+        start: datetime,
+        end: datetime,
+        organization_id: UUID | None,
+        end_inclusive: bool,
+    ) -> None:
+        bucket = self._hour_bucket_expr(AgentThread.created_at)
+        query = (
+            select(
+                AgentThread.organization_id,
+                AgentThread.published_app_id,
+                bucket.label("bucket"),
+                func.count(AgentThread.id).label("threads"),
+            )
+            .where(
+                and_(
+                    AgentThread.published_app_id.is_not(None),
+                    AgentThread.app_account_id.is_not(None),
+                    AgentThread.surface != AgentThreadSurface.preview_runtime,
+                    self._window(AgentThread.created_at, start, end, end_inclusive),
+                )
+            )
+            .group_by(AgentThread.organization_id, AgentThread.published_app_id, bucket)
+        )
+        if organization_id is not None:
+            query = query.where(AgentThread.organization_id == organization_id)
+        for row in (await self.db.execute(query)).all():
+            key = (row.organization_id, SUBJECT_PUBLISHED_APP, row.published_app_id, "app_threads", "", _parse_bucket(row.bucket))
+            metrics[key] += float(row.threads or 0)
+
+    async def _collect_published_app_event_metrics(
+        self,
+        metrics: dict[MetricKey, float],
+        start: datetime,
+        end: datetime,
+        organization_id: UUID | None,
+        end_inclusive: bool,
+    ) -> None:
+        query = select(
+            PublishedAppAnalyticsEvent.organization_id,
+            PublishedAppAnalyticsEvent.published_app_id,
+            PublishedAppAnalyticsEvent.event_type,
+            PublishedAppAnalyticsEvent.surface,
+            PublishedAppAnalyticsEvent.app_account_id,
+            PublishedAppAnalyticsEvent.metadata_,
+            PublishedAppAnalyticsEvent.occurred_at,
+        ).where(
+            and_(
+                PublishedAppAnalyticsEvent.surface != PublishedAppAnalyticsSurface.preview_runtime,
+                self._window(PublishedAppAnalyticsEvent.occurred_at, start, end, end_inclusive),
+            )
+        )
+        if organization_id is not None:
+            query = query.where(PublishedAppAnalyticsEvent.organization_id == organization_id)
+        for row in (await self.db.execute(query)).all():
+            hour = floor_hour(row.occurred_at)
+            key = (row.organization_id, SUBJECT_PUBLISHED_APP, row.published_app_id)
+            metadata = row.metadata_ or {}
+            if row.event_type == PublishedAppAnalyticsEventType.visit_started:
+                auth_state = str(metadata.get("auth_state") or ("authenticated" if row.app_account_id else "anonymous"))
+                metrics[(*key, "app_visits_by_surface", _enum_text(row.surface), hour)] += 1
+                metrics[(*key, "app_visits_by_auth_state", auth_state, hour)] += 1
+            if bool(metadata.get("approximate_visitor")):
+                metrics[(*key, "app_approximate_events", "", hour)] += 1
+
+    async def get_watermark(self) -> datetime | None:
+        row = await self.db.get(StatsRollupWatermark, HOURLY_ROLLUP_NAME)
+        return _as_utc(row.rolled_up_to) if row is not None else None
+
+    async def _late_updated_hours(self, *, since: datetime, start: datetime, end: datetime) -> list[datetime]:
+        """Hours in [start, end) holding runs updated at or after `since`."""
+        bucket = self._hour_bucket_expr(AgentRun.created_at)
+        result = await self.db.execute(
+            select(bucket.label("bucket"))
+            .where(
+                and_(
+                    AgentRun.updated_at >= since,
+                    AgentRun.created_at >= start,
+                    AgentRun.created_at < end,
+                )
+            )
+            .distinct()
+        )
+        return sorted({_parse_bucket(row.bucket) for row in result.all()})
+
+    async def refresh(self, *, now: datetime | None = None) -> dict[str, Any]:
+        """Materialize closed hours since the watermark (minus the restate window) and their days."""
+        now_hour = floor_hour(now or _utc_now())
+        backfill_start = floor_day(now_hour - timedelta(days=max(1, env_int("STATS_ROLLUP_BACKFILL_DAYS", 92))))
+        retention = timedelta(days=max(1, env_int("STATS_ROLLUP_HOURLY_RETENTION_DAYS", 92)))
+        state = await self.db.get(StatsRollupWatermark, HOURLY_ROLLUP_NAME)
+        # Rows written before coverage was tracked are rebuilt from a fresh backfill.
+        covered_from = _as_utc(state.rolled_up_from) if state is not None and state.rolled_up_from is not None else None
+        hourly_from = max(covered_from or backfill_start, floor_day(now_hour - retention))
+
+        start = backfill_start
+        late_hours: list[datetime] = []
+        if covered_from is not None:
+            watermark = _as_utc(state.rolled_up_to)
+            restate = timedelta(hours=max(0, env_int("STATS_ROLLUP_RESTATE_HOURS", 24)))
+            start = max(covered_from, min(floor_hour(watermark), now_hour) - restate)
+            # Runs can finish or report usage long after they were created; restate
+            # those hours too while their hourly rows are still retained.
+            late_hours = await self._late_updated_hours(since=watermark, start=hourly_from, end=start)
+
+        hour_rows = 0
+        for hour in late_hours:
+            hour_rows += await self._materialize_hours(hour, hour + timedelta(hours=1))
+        cursor = start
+        while cursor < now_hour:
+            chunk_end = min(now_hour, floor_day(cursor) + timedelta(days=1))
+            hour_rows += await self._materialize_hours(cursor, chunk_end)
+            cursor = chunk_end
+
+        day_rows = 0
+        days = {floor_day(hour) for hour in late_hours}
+        day = floor_day(start)
+        while day + timedelta(days=1) <= now_hour:
+            days.add(day)
+            day += timedelta(days=1)
+        for day in sorted(days):
+            day_rows += await self._materialize_day(day)
+
+        await self.db.execute(
+            delete(StatsRollup).where(
+                and_(
+                    StatsRollup.granularity == StatsRollupGranularity.hour,
+                    StatsRollup.bucket_start < floor_day(now_hour - retention),
+                )
+            )
+        )
+
+        if state is None:
+            state = StatsRollupWatermark(rollup_name=HOURLY_ROLLUP_NAME, rolled_up_to=now_hour)
+            self.db.add(state)
+        state.rolled_up_to = now_hour
+        state.rolled_up_from = covered_from or backfill_start
+        state.hourly_rolled_up_from = hourly_from
+        await self.db.commit()
+        return {
+            "rolled_up_from": start.isoformat(),
+            "rolled_up_to": now_hour.isoformat(),
+            "restated_hours": len(late_hours),
+            "hour_rows": hour_rows,
+            "day_rows": day_rows,
+        }
+
+    async def _materialize_hours(self, start: datetime, end: datetime) -> int:
+        await self.db.execute(
+            delete(StatsRollup).where(
+                and_(
+                    StatsRollup.granularity == StatsRollupGranularity.hour,
+                    StatsRollup.bucket_start >= start,
+                    StatsRollup.bucket_start < end,
+                )
+            )
+        )
+        metrics = await self.collect_raw_metrics(start=start, end=end)
+        rows = [
+            {
+                "organization_id": organization_id,
+                "granularity": StatsRollupGranularity.hour,
+                "bucket_start": bucket,
+                "subject_kind": subject_kind,
+                "subject_id": subject_id,
+                "metric": metric,
+                "dimension": dimension,
+                "value": value,
+            }
+            for (organization_id, subject_kind, subject_id, metric, dimension, bucket), value in metrics.items()
+        ]
+        if rows:
+            await self.db.execute(insert(StatsRollup), rows)
+        return len(rows)
+
+    async def _materialize_day(self, day: datetime) -> int:
+        await self.db.execute(
+            delete(StatsRollup).where(
+                and_(
+                    StatsRollup.granularity == StatsRollupGranularity.day,
+                    StatsRollup.bucket_start == day,
+                )
+            )
+        )
+        result = await self.db.execute(
+            select(
+                StatsRollup.organization_id,
+                StatsRollup.subject_kind,
+                StatsRollup.subject_id,
+                StatsRollup.metric,
+                StatsRollup.dimension,
+                func.sum(StatsRollup.value).label("value"),
+            )
+            .where(
+                and_(
+                    StatsRollup.granularity == StatsRollupGranularity.hour,
+                    StatsRollup.bucket_start >= day,
+                    StatsRollup.bucket_start < day + timedelta(days=1),
+                )
+            )
+            .group_by(
+                StatsRollup.organization_id,
+                StatsRollup.subject_kind,
+                StatsRollup.subject_id,
+                StatsRollup.metric,
+                StatsRollup.dimension,
+            )
+        )
+        rows = [
+            {
+                "organization_id": row.organization_id,
+                "granularity": StatsRollupGranularity.day,
+                "bucket_start": day,
+                "subject_kind": row.subject_kind,
+                "subject_id": row.subject_id,
+                "metric": row.metric,
+                "dimension": row.dimension,
+                "value": float(row.value or 0),
+            }
+            for row in result.all()
+        ]
+        if rows:
+            await self.db.execute(insert(StatsRollup), rows)
+        return len(rows)
+
+    async def load_totals(
+        self,
+        *,
+        organization_id: UUID,
+        start: datetime,
+        end: datetime,
+        subject_kind: str,
+        metrics: Iterable[str],
+        subject_ids: Iterable[UUID] | None = None,
+    ) -> StatsRollupTotals:
+        """Read metric values for the inclusive range [start, end] from rollups plus raw edge scans."""
+        metric_names = tuple(metrics)
+        subject_filter = {UUID(str(value)) for value in subject_ids} if subject_ids is not None else None
+        state = await self.db.get(StatsRollupWatermark, HOURLY_ROLLUP_NAME) if stats_rollups_enabled() else None
+        if state is None or state.rolled_up_from is None:
+            plan = plan_rollup_read(start, end, None)
+        else:
+            plan = plan_rollup_read(
+                start,
+                end,
+                _as_utc(state.rolled_up_to),
+                covered_from=_as_utc(state.rolled_up_from),
+                hourly_from=_as_utc(state.hourly_rolled_up_from or state.rolled_up_from),
+            )
+        totals = StatsRollupTotals()
+
+        conditions = [
+            and_(
+                StatsRollup.granularity == StatsRollupGranularity.hour,
+                StatsRollup.bucket_start >= span_start,
+                StatsRollup.bucket_start < span_end,
+            )
+            for span_start, span_end in plan.hour_spans
+        ]
+        if plan.day_span is not None:
+            conditions.append(
+                and_(
+                    StatsRollup.granularity == StatsRollupGranularity.day,
+                    StatsRollup.bucket_start >= plan.day_span[0],
+                    StatsRollup.bucket_start < plan.day_span[1],
+                )
+            )
+        if conditions:
+            query = select(
+                StatsRollup.subject_id,
+                StatsRollup.metric,
+                StatsRollup.dimension,
+                StatsRollup.bucket_start,
+                StatsRollup.value,
+            ).where(
+                and_(
+                    StatsRollup.organization_id == organization_id,
+                    StatsRollup.subject_kind == subject_kind,
+                    StatsRollup.metric.in_(metric_names),
+                    or_(*conditions),
+                )
+            )
+            if subject_filter is not None:
+                query = query.where(StatsRollup.subject_id.in_(list(subject_filter)))
+            for row in (await self.db.execute(query)).all():
+                totals.add(
+                    metric=row.metric,
+                    subject_id=row.subject_id,
+                    dimension=row.dimension,
+                    bucket=row.bucket_start,
+                    value=row.value,
+                )
+
+        for span_start, span_end, end_inclusive in plan.raw_spans:
+            raw = await self.collect_raw_metrics(
+                start=span_start,
+                end=span_end,
+                organization_id=organization_id,
+                end_inclusive=end_inclusive,
+                subject_kinds=(subject_kind,),
+            )
+            for (_org_id, kind, subject_id, metric, dimension, bucket), value in raw.items():
+                if kind != subject_kind or metric not in metric_names:
+                    continue
+                if subject_filter is not None and subject_id not in subject_filter:
+                    continue
+                totals.add(metric=metric, subject_id=subject_id, dimension=dimension, bucket=bucket, value=value)
+        return totals
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Iterator
+
+
+STREAM_CHUNK_SIZE = 256 * 1024
+# Objects at or below this size are cheaper to return as a single buffered body.
+STREAMING_RESPONSE_THRESHOLD_BYTES = 1024 * 1024
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+_RANGE_PATTERN = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$", re.IGNORECASE)
+
+
+class ByteRangeNotSatisfiable(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ByteRange:
+    start: int
+    end: int  # inclusive
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start + 1
+
+    def content_range(self, total_size: int) -> str:
+        return f"bytes {self.start}-{self.end}/{total_size}"
+
+
+def parse_byte_range(header: str | None, total_size: int) -> ByteRange | None:
+    """Parse a single-range `Range` header; multi-range requests fall back to a full body."""
+    raw = str(header or "").strip()
+    if not raw or "," in raw:
+        return None
+    match = _RANGE_PATTERN.match(raw)
+    if match is None:
+        return None
+    start_raw, end_raw = match.group(1), match.group(2)
+    if not start_raw and not end_raw:
+        return None
+    if total_size <= 0:
+        raise ByteRangeNotSatisfiable("range requested on empty object")
+    if not start_raw:
+        suffix_length = int(end_raw)
+        if suffix_length <= 0:
+            raise ByteRangeNotSatisfiable("empty suffix range")
+        return ByteRange(start=max(0, total_size - suffix_length), end=total_size - 1)
+    start = int(start_raw)
+    end = int(end_raw) if end_raw else total_size - 1
+    if start >= total_size or end < start:
+        raise ByteRangeNotSatisfiable(f"range {start}-{end} is outside 0-{total_size - 1}")
+    return ByteRange(start=start, end=min(end, total_size - 1))
+
+
+def iter_bytes(payload: bytes, *, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    for offset in range(0, len(payload), chunk_size):
+        yield payload[offset:offset + chunk_size]
+
+
+async def aiter_in_thread(factory: Callable[[], Iterator[bytes]]) -> AsyncIterator[bytes]:
+    """Drive a blocking chunk iterator from worker threads so the event loop never waits on I/O."""
+    iterator = await asyncio.to_thread(factory)
+    sentinel = object()
+    try:
+        while True:
+            chunk = await asyncio.to_thread(next, iterator, sentinel)
+            if chunk is sentinel:
+                return
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if callable(close):
+            await asyncio.to_thread(close)
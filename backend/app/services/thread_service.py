@@ -431,22 +431,9 @@ class ThreadService:
         ).limit(safe_limit + 1)
 
         turn_rows = list((await self.db.execute(turn_query)).scalars().all())
-        has_more = len(turn_rows) > safe_limit
-        paged_turns = turn_rows[:safe_limit]
-        paged_turns.sort(key=self._turn_sort_key)
-        next_before_turn_index = None
-        if has_more and paged_turns:
-            next_before_turn_index = int(paged_turns[0].turn_index or 0)
-
-        set_committed_value(thread, "turns", paged_turns)
-        return ThreadTurnPageResult(
-            thread=thread,
-            page=ThreadTurnPage(
-                turns=paged_turns,
-                has_more=has_more,
-                next_before_turn_index=next_before_turn_index,
-            ),
-        )
+        page = self._build_turn_page(turn_rows=turn_rows, limit=safe_limit)
+        set_committed_value(thread, "turns", page.turns)
+        return ThreadTurnPageResult(thread=thread, page=page)
 
     async def build_subthread_tree(
         self,
@@ -458,13 +445,19 @@ class ThreadService:
         child_limit: int,
     ) -> ThreadSubtreeNode:
         await self._ensure_thread_lineage(root_thread)
-        return await self._build_subtree_node(
+        root_node = ThreadSubtreeNode(
             thread=root_thread,
             page=root_page,
+            children=[],
+            has_children=False,
+        )
+        await self._load_subtree_levels(
+            root_node=root_node,
             remaining_depth=max(0, int(depth)),
             turn_limit=max(1, int(turn_limit)),
             child_limit=max(1, int(child_limit)),
         )
+        return root_node
 
     async def delete_threads(self, *, organization_id: UUID, project_id: UUID | None, thread_ids: list[UUID]) -> int:
         if not thread_ids:
@@ -556,7 +549,8 @@ class ThreadService:
             lineage_depth=int(parent_thread.lineage_depth or 0) + 1,
         )
 
-    async def _ensure_thread_lineage(self, thread: AgentThread) -> None:
+    @staticmethod
+    def _stamp_default_lineage(thread: AgentThread) -> bool:
         changed = False
         if thread.root_thread_id is None:
             thread.root_thread_id = thread.id
@@ -564,6 +558,16 @@ class ThreadService:
         if thread.lineage_depth is None:
             thread.lineage_depth = 0
             changed = True
+        return changed
+
+    async def _ensure_thread_lineage(self, thread: AgentThread) -> None:
+        if self._stamp_default_lineage(thread):
+            await self.db.flush()
+
+    async def _ensure_threads_lineage(self, threads: list[AgentThread]) -> None:
+        changed = False
+        for thread in threads:
+            changed = self._stamp_default_lineage(thread) or changed
         if changed:
             await self.db.flush()
 
@@ -579,101 +583,177 @@ class ThreadService:
         if str(thread_root_id) != str(lineage_context.root_thread_id):
             raise ThreadAccessError("Thread lineage mismatch")
 
-    async def _build_subtree_node(
+    async def _load_subtree_levels(
         self,
         *,
-        thread: AgentThread,
-        page: ThreadTurnPage,
+        root_node: ThreadSubtreeNode,
         remaining_depth: int,
         turn_limit: int,
         child_limit: int,
-    ) -> ThreadSubtreeNode:
-        child_threads = await self._load_direct_child_threads(
-            organization_id=thread.organization_id,
-            project_id=thread.project_id,
-            parent_thread_id=thread.id,
-            child_limit=child_limit,
-        )
-        children: list[ThreadSubtreeNode] = []
-        if remaining_depth > 0:
-            for child_thread in child_threads:
-                child_page = await self._get_thread_turn_page_for_thread(
-                    thread=child_thread,
-                    limit=turn_limit,
+    ) -> None:
+        # Walk the spawn tree one depth at a time so each level costs a fixed
+        # number of queries regardless of how wide the fan-out is.
+        organization_id = root_node.thread.organization_id
+        project_id = root_node.thread.project_id
+        frontier = [root_node]
+        while frontier:
+            parent_ids = [node.thread.id for node in frontier]
+            if remaining_depth <= 0:
+                parents_with_children = await self._load_parent_ids_with_children(
+                    organization_id=organization_id,
+                    project_id=project_id,
+                    parent_thread_ids=parent_ids,
                 )
-                children.append(
-                    await self._build_subtree_node(
+                for node in frontier:
+                    node.has_children = node.thread.id in parents_with_children
+                return
+
+            children_by_parent = await self._load_direct_child_threads(
+                organization_id=organization_id,
+                project_id=project_id,
+                parent_thread_ids=parent_ids,
+                child_limit=child_limit,
+            )
+            child_threads = [child for node in frontier for child in children_by_parent.get(node.thread.id, [])]
+            pages = await self._get_thread_turn_pages_for_threads(
+                thread_ids=[child.id for child in child_threads],
+                limit=turn_limit,
+            )
+            next_frontier: list[ThreadSubtreeNode] = []
+            for node in frontier:
+                node_children = children_by_parent.get(node.thread.id, [])
+                node.has_children = bool(node_children)
+                for child_thread in node_children:
+                    child_node = ThreadSubtreeNode(
                         thread=child_thread,
-                        page=child_page,
-                        remaining_depth=remaining_depth - 1,
-                        turn_limit=turn_limit,
-                        child_limit=child_limit,
+                        page=pages[child_thread.id],
+                        children=[],
+                        has_children=False,
                     )
-                )
-        return ThreadSubtreeNode(
-            thread=thread,
-            page=page,
-            children=children,
-            has_children=bool(child_threads),
-        )
+                    node.children.append(child_node)
+                    next_frontier.append(child_node)
+            frontier = next_frontier
+            remaining_depth -= 1
 
     async def _load_direct_child_threads(
         self,
         *,
         organization_id: UUID,
         project_id: UUID | None,
-        parent_thread_id: UUID,
+        parent_thread_ids: list[UUID],
         child_limit: int,
-    ) -> list[AgentThread]:
+    ) -> dict[UUID, list[AgentThread]]:
+        if not parent_thread_ids:
+            return {}
+        ranked = (
+            select(
+                AgentThread.id.label("thread_id"),
+                func.row_number()
+                .over(
+                    partition_by=AgentThread.parent_thread_id,
+                    order_by=(
+                        AgentThread.last_activity_at.desc().nullslast(),
+                        AgentThread.updated_at.desc(),
+                        AgentThread.created_at.desc(),
+                    ),
+                )
+                .label("child_rank"),
+            )
+            .where(
+                AgentThread.organization_id == organization_id,
+                AgentThread.project_id == project_id,
+                AgentThread.parent_thread_id.in_(parent_thread_ids),
+            )
+            .subquery()
+        )
         rows = (
             await self.db.execute(
                 select(AgentThread)
+                .join(ranked, AgentThread.id == ranked.c.thread_id)
+                .where(ranked.c.child_rank <= max(1, int(child_limit)))
+                .options(selectinload(AgentThread.agent))
+                .order_by(ranked.c.child_rank)
+            )
+        ).scalars().all()
+        items = list(rows)
+        await self._ensure_threads_lineage(items)
+        children_by_parent: dict[UUID, list[AgentThread]] = defaultdict(list)
+        for item in items:
+            children_by_parent[item.parent_thread_id].append(item)
+        return children_by_parent
+
+    async def _load_parent_ids_with_children(
+        self,
+        *,
+        organization_id: UUID,
+        project_id: UUID | None,
+        parent_thread_ids: list[UUID],
+    ) -> set[UUID]:
+        if not parent_thread_ids:
+            return set()
+        rows = (
+            await self.db.execute(
+                select(AgentThread.parent_thread_id)
                 .where(
                     AgentThread.organization_id == organization_id,
                     AgentThread.project_id == project_id,
-                    AgentThread.parent_thread_id == parent_thread_id,
+                    AgentThread.parent_thread_id.in_(parent_thread_ids),
                 )
-                .options(selectinload(AgentThread.agent))
-                .order_by(
-                    AgentThread.last_activity_at.desc().nullslast(),
-                    AgentThread.updated_at.desc(),
-                    AgentThread.created_at.desc(),
-                )
-                .limit(max(1, int(child_limit)))
+                .distinct()
             )
         ).scalars().all()
-        items = list(rows)
-        for item in items:
-            await self._ensure_thread_lineage(item)
-        return items
+        return {UUID(str(item)) for item in rows if item is not None}
 
-    async def _get_thread_turn_page_for_thread(
+    async def _get_thread_turn_pages_for_threads(
         self,
         *,
-        thread: AgentThread,
+        thread_ids: list[UUID],
         limit: int,
-        before_turn_index: int | None = None,
-    ) -> ThreadTurnPage:
+    ) -> dict[UUID, ThreadTurnPage]:
+        if not thread_ids:
+            return {}
         safe_limit = max(1, int(limit))
-        turn_query = (
-            select(AgentThreadTurn)
-            .where(AgentThreadTurn.thread_id == thread.id)
-            .options(
-                joinedload(AgentThreadTurn.run),
-                selectinload(AgentThreadTurn.attachment_links).selectinload(AgentThreadTurnAttachment.attachment),
+        ranked = (
+            select(
+                AgentThreadTurn.id.label("turn_id"),
+                func.row_number()
+                .over(
+                    partition_by=AgentThreadTurn.thread_id,
+                    order_by=(
+                        desc(AgentThreadTurn.turn_index),
+                        desc(AgentThreadTurn.created_at),
+                        desc(AgentThreadTurn.completed_at),
+                        desc(AgentThreadTurn.id),
+                    ),
+                )
+                .label("turn_rank"),
             )
+            .where(AgentThreadTurn.thread_id.in_(thread_ids))
+            .subquery()
         )
-        if before_turn_index is not None:
-            turn_query = turn_query.where(AgentThreadTurn.turn_index < int(before_turn_index))
-        turn_query = turn_query.order_by(
-            desc(AgentThreadTurn.turn_index),
-            desc(AgentThreadTurn.created_at),
-            desc(AgentThreadTurn.completed_at),
-            desc(AgentThreadTurn.id),
-        ).limit(safe_limit + 1)
-        turn_rows = list((await self.db.execute(turn_query)).scalars().all())
-        has_more = len(turn_rows) > safe_limit
-        paged_turns = turn_rows[:safe_limit]
+        turn_rows = (
+            await self.db.execute(
+                select(AgentThreadTurn)
+                .join(ranked, AgentThreadTurn.id == ranked.c.turn_id)
+                .where(ranked.c.turn_rank <= safe_limit + 1)
+                .options(
+                    joinedload(AgentThreadTurn.run),
+                    selectinload(AgentThreadTurn.attachment_links).selectinload(AgentThreadTurnAttachment.attachment),
+                )
+                .order_by(ranked.c.turn_rank)
+            )
+        ).scalars().all()
+        turns_by_thread: dict[UUID, list[AgentThreadTurn]] = defaultdict(list)
+        for turn in turn_rows:
+            turns_by_thread[turn.thread_id].append(turn)
+        return {
+            thread_id: self._build_turn_page(turn_rows=turns_by_thread.get(thread_id, []), limit=safe_limit)
+            for thread_id in thread_ids
+        }
+
+    def _build_turn_page(self, *, turn_rows: list[AgentThreadTurn], limit: int) -> ThreadTurnPage:
+        has_more = len(turn_rows) > limit
+        paged_turns = list(turn_rows[:limit])
         paged_turns.sort(key=self._turn_sort_key)
         next_before_turn_index = None
         if has_more and paged_turns:
@@ -1,18 +1,306 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+import hashlib
 import json
+import logging
+import math
 import os
+import threading
+import time
 from typing import Any
 
 import tiktoken
 from anthropic import AsyncAnthropic
 from google import genai
 
+from app.core.env_loader import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+# Model-id prefix -> tiktoken encoding. Longer prefixes must come before shorter ones.
+_FAMILY_ENCODINGS: tuple[tuple[str, str], ...] = (
+    ("chatgpt-4o", "o200k_base"),
+    ("gpt-4o", "o200k_base"),
+    ("gpt-4.1", "o200k_base"),
+    ("gpt-4.5", "o200k_base"),
+    ("gpt-5", "o200k_base"),
+    ("gpt-oss", "o200k_base"),
+    ("o1", "o200k_base"),
+    ("o3", "o200k_base"),
+    ("o4", "o200k_base"),
+    ("gpt-4", "cl100k_base"),
+    ("gpt-3.5", "cl100k_base"),
+    ("text-embedding", "cl100k_base"),
+    ("claude", "cl100k_base"),
+    ("gemini", "o200k_base"),
+    ("grok", "o200k_base"),
+)
+
+_PROVIDER_ENCODINGS = {
+    "openai": "o200k_base",
+    "azure": "o200k_base",
+    "anthropic": "cl100k_base",
+    "google": "o200k_base",
+    "gemini": "o200k_base",
+    "xai": "o200k_base",
+}
+
+# Providers whose tokenizer is not the local encoding count somewhat more tokens than
+# the estimate; these factors scale the local count and are refined by calibration.
+_DEFAULT_CORRECTION_FACTORS = {
+    "openai": 1.0,
+    "azure": 1.0,
+    "anthropic": 1.2,
+    "google": 1.05,
+    "gemini": 1.05,
+    "xai": 1.05,
+}
+_UNKNOWN_PROVIDER_CORRECTION_FACTOR = 1.1
+
+_REMOTE_COUNT_PROVIDERS = {"google", "gemini", "anthropic"}
+_MESSAGE_OVERHEAD_TOKENS = 3
+_REPLY_PRIMING_TOKENS = 3
+_CALIBRATION_SMOOTHING = 0.3
+_CALIBRATION_FACTOR_BOUNDS = (0.5, 3.0)
+
+
+def provider_calibration_enabled() -> bool:
+    raw = os.getenv("TOKEN_COUNTER_PROVIDER_CALIBRATION", "0")
+    return str(raw).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _correction_factor_overrides() -> dict[str, float]:
+    raw = str(os.getenv("TOKEN_COUNTER_CORRECTION_FACTORS") or "").strip()
+    if not raw:
+        return {}
+    try:
+        parsed = json.loads(raw)
+    except ValueError:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+    overrides: dict[str, float] = {}
+    for key, value in parsed.items():
+        try:
+            overrides[str(key).strip().lower()] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return overrides
+
+
+def _bare_model_id(model: str | None) -> str:
+    normalized = str(model or "").strip().lower()
+    if "/" in normalized:
+        normalized = normalized.rsplit("/", 1)[-1]
+    return normalized
+
+
+class TokenizerRegistry:
+    """Resolves and memoizes the local encoder for a provider/model pair.
+
+    Encodings are loaded once per process. A failed load (unknown model, BPE file not
+    reachable) is remembered too, so later calls go straight to the character estimate
+    instead of retrying the download on every request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._encodings: dict[str, Any | None] = {}
+        self._model_encodings: dict[tuple[str, str], tuple[str, Any | None]] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._encodings.clear()
+            self._model_encodings.clear()
+
+    @staticmethod
+    def encoding_name_for(provider: str, model: str | None) -> str | None:
+        bare = _bare_model_id(model)
+        for prefix, encoding_name in _FAMILY_ENCODINGS:
+            if bare.startswith(prefix):
+                return encoding_name
+        return None
+
+    def resolve(self, provider: str, model: str | None) -> tuple[str, Any | None]:
+        """Return `(encoding_key, encoding)`; `encoding` is None when no local tokenizer is usable."""
+        key = (provider, str(model or ""))
+        cached = self._model_encodings.get(key)
+        if cached is not None:
+            return cached
+        resolved = self._resolve_uncached(provider, model)
+        with self._lock:
+            self._model_encodings[key] = resolved
+        return resolved
+
+    def _resolve_uncached(self, provider: str, model: str | None) -> tuple[str, Any | None]:
+        family_encoding = self.encoding_name_for(provider, model)
+        if family_encoding:
+            encoding = self._load(family_encoding)
+            if encoding is not None:
+                return family_encoding, encoding
+        if model:
+            try:
+                encoding = tiktoken.encoding_for_model(model)
+            except Exception:
+                encoding = None
+            if encoding is not None:
+                return f"model:{getattr(encoding, 'name', model)}", encoding
+        fallback_encoding = _PROVIDER_ENCODINGS.get(provider) or (
+            (os.getenv("TOKEN_COUNTER_TIKTOKEN_FALLBACK_ENCODING") or "cl100k_base").strip() or "cl100k_base"
+        )
+        encoding = self._load(fallback_encoding)
+        if encoding is not None:
+            return fallback_encoding, encoding
+        return "chars", None
+
+    def _load(self, encoding_name: str) -> Any | None:
+        if encoding_name in self._encodings:
+            return self._encodings[encoding_name]
+        try:
+            encoding = tiktoken.get_encoding(encoding_name)
+        except Exception:
+            logger.warning("Tokenizer encoding %s is unavailable; using character estimates", encoding_name)
+            encoding = None
+        with self._lock:
+            self._encodings[encoding_name] = encoding
+        return encoding
+
+
+class TokenCountCache:
+    """LRU of raw token counts keyed by a hash of (encoding, prompt part).
+
+    Each message, the system prompt, each tool and the extra context are counted and
+    cached separately, so a growing conversation only pays for its newest messages.
+    """
+
+    def __init__(self, capacity: int | None = None) -> None:
+        self._capacity = max(1, capacity or env_int("TOKEN_COUNTER_CACHE_SIZE", 20000))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @staticmethod
+    def key(encoding_key: str, kind: str, payload: str) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(encoding_key.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(kind.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(payload.encode("utf-8", "surrogatepass"))
+        return digest.digest()
+
+    def get(self, key: bytes) -> int | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: int) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+
+
+class TokenCountCalibration:
+    """Per provider/model correction factors learned from provider count-token APIs."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._factors: dict[tuple[str, str], float] = {}
+        self._last_calibrated: dict[tuple[str, str], float] = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._factors.clear()
+            self._last_calibrated.clear()
+
+    def factor(self, provider: str, model: str | None) -> float:
+        learned = self._factors.get((provider, str(model or "")))
+        if learned is not None:
+            return learned
+        overrides = _correction_factor_overrides()
+        if provider in overrides:
+            return overrides[provider]
+        return _DEFAULT_CORRECTION_FACTORS.get(provider, _UNKNOWN_PROVIDER_CORRECTION_FACTOR)
+
+    def due(self, provider: str, model: str | None, *, now: float | None = None) -> bool:
+        interval = env_float("TOKEN_COUNTER_CALIBRATION_INTERVAL_SECONDS", 300.0)
+        last = self._last_calibrated.get((provider, str(model or "")))
+        current = time.monotonic() if now is None else now
+        return last is None or current - last >= interval
+
+    def claim(self, provider: str, model: str | None, *, now: float | None = None) -> bool:
+        """Record a calibration attempt if one is due; the attempt counts whether or not it succeeds."""
+        current = time.monotonic() if now is None else now
+        with self._lock:
+            if not self.due(provider, model, now=current):
+                return False
+            self._last_calibrated[(provider, str(model or ""))] = current
+            return True
+
+    def observe(self, provider: str, model: str | None, *, local_tokens: int, remote_tokens: int) -> None:
+        key = (provider, str(model or ""))
+        if local_tokens <= 0 or remote_tokens <= 0:
+            return
+        with self._lock:
+            low, high = _CALIBRATION_FACTOR_BOUNDS
+            observed = min(max(remote_tokens / local_tokens, low), high)
+            previous = self._factors.get(key)
+            self._factors[key] = (
+                observed
+                if previous is None
+                else previous + _CALIBRATION_SMOOTHING * (observed - previous)
+            )
+
+
+_TOKENIZER_REGISTRY = TokenizerRegistry()
+_TOKEN_COUNT_CACHE = TokenCountCache()
+_TOKEN_COUNT_CALIBRATION = TokenCountCalibration()
+
+
+def get_tokenizer_registry() -> TokenizerRegistry:
+    return _TOKENIZER_REGISTRY
+
+
+def get_token_count_cache() -> TokenCountCache:
+    return _TOKEN_COUNT_CACHE
+
+
+def get_token_count_calibration() -> TokenCountCalibration:
+    return _TOKEN_COUNT_CALIBRATION
+
 
 class TokenCounterService:
+    """Counts prompt tokens locally; provider count-token APIs are an optional calibration path.
+
+    The local count sums memoized per-part tokenizer counts and scales them by the
+    provider's correction factor. With `TOKEN_COUNTER_PROVIDER_CALIBRATION` enabled, a
+    provider with a count API is queried at most once per calibration interval per
+    model, including when the call fails or no API key is configured; its answer is returned and folded into that model's correction factor.
+    """
+
     def __init__(self) -> None:
-        self._tokenizer_model_fallback = (os.getenv("TOKEN_COUNTER_TIKTOKEN_FALLBACK_MODEL") or "gpt-4o").strip() or "gpt-4o"
-        self._tokenizer_encoding_fallback = (os.getenv("TOKEN_COUNTER_TIKTOKEN_FALLBACK_ENCODING") or "cl100k_base").strip() or "cl100k_base"
+        self._registry = get_tokenizer_registry()
+        self._cache = get_token_count_cache()
+        self._calibration = get_token_count_calibration()
+        self._char_divisor = max(1, env_int("TOKEN_COUNTER_CHAR_ESTIMATE_DIVISOR", 4))
 
     async def count_input_tokens(
         self,
@@ -25,20 +313,85 @@ class TokenCounterService:
         normalized_provider = str(provider or "").strip().lower()
         normalized_model = str(provider_model_id or "").strip() or None
 
-        if normalized_provider in {"google", "gemini"} and normalized_model:
-            counted = await self._count_google(model=normalized_model, snapshot=snapshot, api_key=api_key)
-            if counted is not None:
-                return counted, "provider_count_api"
+        local_tokens, local_source = self.count_local_raw(
+            provider=normalized_provider,
+            provider_model_id=normalized_model,
+            snapshot=snapshot,
+        )
 
-        if normalized_provider == "anthropic" and normalized_model:
-            counted = await self._count_anthropic(model=normalized_model, snapshot=snapshot, api_key=api_key)
+        if (
+            normalized_model
+            and normalized_provider in _REMOTE_COUNT_PROVIDERS
+            and provider_calibration_enabled()
+            and self._calibration.claim(normalized_provider, normalized_model)
+        ):
+            if normalized_provider == "anthropic":
+                counted = await self._count_anthropic(model=normalized_model, snapshot=snapshot, api_key=api_key)
+            else:
+                counted = await self._count_google(model=normalized_model, snapshot=snapshot, api_key=api_key)
             if counted is not None:
+                self._calibration.observe(
+                    normalized_provider,
+                    normalized_model,
+                    local_tokens=local_tokens or 0,
+                    remote_tokens=counted,
+                )
                 return counted, "provider_count_api"
 
-        counted = self._count_with_tiktoken(model=normalized_model, snapshot=snapshot)
-        if counted is not None:
-            return counted, "tokenizer_estimate"
-        return None, "unknown"
+        if local_tokens is None:
+            return None, "unknown"
+        factor = self._calibration.factor(normalized_provider, normalized_model)
+        return int(math.ceil(local_tokens * factor)), local_source
+
+    def count_local_raw(
+        self,
+        *,
+        provider: str,
+        provider_model_id: str | None,
+        snapshot: dict[str, Any],
+    ) -> tuple[int | None, str]:
+        """Uncorrected local count of a prompt snapshot and its source label."""
+        encoding_key, encoding = self._registry.resolve(provider, provider_model_id)
+        source = "tokenizer_estimate" if encoding is not None else "estimated"
+        if encoding is None:
+            encoding_key = f"chars/{self._char_divisor}"
+
+        total = 0
+        try:
+            system_prompt = str(snapshot.get("system_prompt") or "")
+            if system_prompt:
+                total += self._count_part(encoding_key, encoding, "system", system_prompt) + _MESSAGE_OVERHEAD_TOKENS
+            for message in snapshot.get("messages") or []:
+                total += self._count_part(
+                    encoding_key, encoding, "message", self._serialize_message_for_tokenizer(message)
+                ) + _MESSAGE_OVERHEAD_TOKENS
+            for tool in snapshot.get("tools") or []:
+                total += self._count_part(encoding_key, encoding, "tool", self._serialize_for_tokenizer(tool))
+            extra_context = snapshot.get("extra_context")
+            if extra_context:
+                total += self._count_part(
+                    encoding_key, encoding, "context", self._serialize_for_tokenizer(extra_context)
+                )
+        except Exception:
+            logger.debug("Local token count failed", exc_info=True)
+            return None, "unknown"
+        return total + _REPLY_PRIMING_TOKENS, source
+
+    def _count_part(self, encoding_key: str, encoding: Any | None, kind: str, text: str) -> int:
+        if not text:
+            return 0
+        key = self._cache.key(encoding_key, kind, text)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        if encoding is None:
+            counted = int(math.ceil(len(text) / self._char_divisor))
+        else:
+            # `encode_ordinary` treats special-token markers in user text as plain text.
+            encode = getattr(encoding, "encode_ordinary", None) or encoding.encode
+            counted = len(encode(text))
+        self._cache.put(key, counted)
+        return counted
 
     async def _count_google(self, *, model: str, snapshot: dict[str, Any], api_key: str | None) -> int | None:
         key = str(api_key or os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY") or "").strip()
@@ -82,26 +435,24 @@ class TokenCounterService:
         except Exception:
             return None
 
-    def _count_with_tiktoken(self, *, model: str | None, snapshot: dict[str, Any]) -> int | None:
-        try:
-            encoding = tiktoken.encoding_for_model(model or self._tokenizer_model_fallback)
-        except Exception:
-            try:
-                encoding = tiktoken.get_encoding(self._tokenizer_encoding_fallback)
-            except Exception:
-                return None
-        rendered = self._serialize_for_tokenizer(snapshot)
-        try:
-            return len(encoding.encode(rendered))
-        except Exception:
-            return None
-
     @staticmethod
-    def _serialize_for_tokenizer(snapshot: dict[str, Any]) -> str:
+    def _serialize_for_tokenizer(value: Any) -> str:
+        if isinstance(value, str):
+            return value
         try:
-            return json.dumps(snapshot, ensure_ascii=False, sort_keys=True, default=str)
+            return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
         except Exception:
-            return str(snapshot)
+            return str(value)
+
+    @classmethod
+    def _serialize_message_for_tokenizer(cls, message: Any) -> str:
+        if not isinstance(message, dict):
+            return cls._content_to_text(message)
+        parts = [str(message.get("role") or ""), cls._content_to_text(message.get("content"))]
+        extras = {key: value for key, value in message.items() if key not in {"role", "content"} and value}
+        if extras:
+            parts.append(cls._serialize_for_tokenizer(extras))
+        return "\n".join(parts)
 
     @staticmethod
     def _google_contents(snapshot: dict[str, Any], *, include_system_prompt: bool = False) -> list[dict[str, Any]]:
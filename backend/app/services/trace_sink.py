@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import atexit
+from collections import deque
+import json
+import logging
+import os
+import threading
+from typing import Any
+
+from app.core.env_loader import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+
+def render_trace_line(payload: Any) -> str:
+    try:
+        return json.dumps(payload, sort_keys=True, default=str)
+    except Exception:
+        return str(payload)
+
+
+class TraceSink:
+    """Buffered JSONL writer shared by the debug trace streams.
+
+    `emit` renders the JSON line and appends it to an in-memory deque (atomic under
+    the GIL, so no lock on the hot path). Rendering up front snapshots the payload,
+    so callers may keep mutating it. A daemon thread drains the deque in batches and
+    appends to the target files with size-based rotation. When the buffer is full new
+    records are dropped and counted instead of blocking the caller.
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int | None = None,
+        batch_size: int | None = None,
+        flush_interval_seconds: float | None = None,
+        max_file_bytes: int | None = None,
+        backup_count: int | None = None,
+    ) -> None:
+        self._capacity = max(1, capacity or env_int("TRACE_SINK_BUFFER_SIZE", 20000))
+        self._batch_size = max(1, batch_size or env_int("TRACE_SINK_BATCH_SIZE", 500))
+        self._flush_interval_seconds = max(
+            0.01,
+            flush_interval_seconds
+            if flush_interval_seconds is not None
+            else env_float("TRACE_SINK_FLUSH_INTERVAL_SECONDS", 0.5),
+        )
+        self._max_file_bytes = (
+            max_file_bytes if max_file_bytes is not None else env_int("TRACE_SINK_MAX_FILE_BYTES", 64 * 1024 * 1024)
+        )
+        self._backup_count = max(0, backup_count if backup_count is not None else env_int("TRACE_SINK_BACKUP_COUNT", 3))
+        self._buffer: deque[tuple[str, str]] = deque()
+        self._wakeup = threading.Event()
+        self._drain_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._writer_pid: int | None = None
+        self._dropped = 0
+        self._reported_dropped = 0
+        self._written = 0
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def written(self) -> int:
+        return self._written
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def emit(self, path: str, payload: Any) -> bool:
+        if len(self._buffer) >= self._capacity:
+            self._dropped += 1
+            return False
+        try:
+            line = render_trace_line(payload)
+        except Exception:
+            # Tracing must never surface errors into the code that emitted it.
+            logger.debug("Trace sink could not render event for %s", path, exc_info=True)
+            return False
+        self._buffer.append((path, line))
+        if self._writer_pid != os.getpid():
+            self._start_writer()
+        if len(self._buffer) >= self._batch_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> None:
+        """Synchronously write everything buffered so far (tests, shutdown)."""
+        with self._drain_lock:
+            self._drain()
+
+    def _start_writer(self) -> None:
+        with self._start_lock:
+            pid = os.getpid()
+            if self._writer_pid == pid:
+                return
+            # A forked worker inherits the buffer but not the parent's writer thread.
+            self._writer_pid = pid
+            self._wakeup = threading.Event()
+            self._drain_lock = threading.Lock()
+            threading.Thread(target=self._run, name="trace-sink-writer", daemon=True).start()
+
+    def _run(self) -> None:
+        wakeup = self._wakeup
+        while True:
+            wakeup.wait(self._flush_interval_seconds)
+            wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.debug("Trace sink flush failed", exc_info=True)
+
+    def _drain(self) -> None:
+        while self._buffer:
+            batch: list[tuple[str, str]] = []
+            try:
+                while len(batch) < self._batch_size:
+                    batch.append(self._buffer.popleft())
+            except IndexError:
+                pass
+            self._write_batch(batch)
+        dropped = self._dropped
+        if dropped > self._reported_dropped:
+            logger.warning("Trace sink buffer full; dropped %d trace events", dropped - self._reported_dropped)
+            self._reported_dropped = dropped
+
+    def _write_batch(self, batch: list[tuple[str, str]]) -> None:
+        lines_by_path: dict[str, list[str]] = {}
+        for path, line in batch:
+            lines_by_path.setdefault(path, []).append(line)
+        for path, lines in lines_by_path.items():
+            data = "\n".join(lines) + "\n"
+            try:
+                self._rotate_if_needed(path, incoming_bytes=len(data))
+                with open(path, "a", encoding="utf-8") as handle:
+                    handle.write(data)
+                self._written += len(lines)
+            except Exception:
+                # Tracing must never surface errors into the code that emitted it.
+                logger.debug("Trace sink write failed for %s", path, exc_info=True)
+
+    def _rotate_if_needed(self, path: str, *, incoming_bytes: int) -> None:
+        if self._max_file_bytes <= 0:
+            return
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        if size + incoming_bytes <= self._max_file_bytes:
+            return
+        if self._backup_count == 0:
+            os.remove(path)
+            return
+        for index in range(self._backup_count - 1, 0, -1):
+            source = f"{path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{path}.{index + 1}")
+        os.replace(path, f"{path}.1")
+
+
+_TRACE_SINK = TraceSink()
+atexit.register(_TRACE_SINK.flush)
+
+
+def get_trace_sink() -> TraceSink:
+    return _TRACE_SINK
+
+
+def flush_trace_sink() -> None:
+    _TRACE_SINK.flush()
@@ -17,6 +17,8 @@ def _is_truthy(raw: str | None) -> bool:
 _quota_beat_enabled = _is_truthy(os.getenv("QUOTA_WORKERS_BEAT_ENABLED", "1"))
 _expire_interval_seconds = int(os.getenv("QUOTA_EXPIRE_SWEEP_INTERVAL_SECONDS", "300"))
 _reconcile_interval_seconds = int(os.getenv("QUOTA_RECONCILE_INTERVAL_SECONDS", "1800"))
+_join_sweep_interval_seconds = int(os.getenv("ORCHESTRATION_JOIN_SWEEP_INTERVAL_SECONDS", "30"))
+_stats_rollup_interval_seconds = int(os.getenv("STATS_ROLLUP_INTERVAL_SECONDS", "300"))
 _task_always_eager = _is_truthy(os.getenv("CELERY_TASK_ALWAYS_EAGER", "1" if running_under_pytest() else "0"))
 _beat_schedule = {}
 if _quota_beat_enabled:
@@ -30,6 +32,14 @@ if _quota_beat_enabled:
             "schedule": max(300, _reconcile_interval_seconds),
         },
     }
+_beat_schedule["orchestration-resume-timed-out-joins"] = {
+    "task": "app.workers.tasks.resume_timed_out_orchestration_joins_task",
+    "schedule": max(5, _join_sweep_interval_seconds),
+}
+_beat_schedule["stats-rollups-refresh"] = {
+    "task": "app.workers.tasks.refresh_stats_rollups_task",
+    "schedule": max(60, _stats_rollup_interval_seconds),
+}
 
 celery_app = Celery(
     "rag_workers",
@@ -74,6 +84,8 @@ celery_app.conf.update(
         "app.workers.tasks.reap_published_app_draft_dev_sessions_task": {"queue": "default"},
         "app.workers.tasks.expire_usage_quota_reservations_task": {"queue": "default"},
         "app.workers.tasks.reconcile_usage_quota_counters_task": {"queue": "default"},
+        "app.workers.tasks.resume_timed_out_orchestration_joins_task": {"queue": "default"},
+        "app.workers.tasks.refresh_stats_rollups_task": {"queue": "default"},
     },
 
     beat_schedule=_beat_schedule,
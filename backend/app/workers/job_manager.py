@@ -1,6 +1,7 @@
 import os
 import json
-from typing import Optional, Dict, Any, List
+import time
+from typing import Optional, Dict, Any, List, Callable
 from datetime import datetime
 from enum import Enum
 import asyncio
@@ -32,98 +33,219 @@ class JobProgress(BaseModel):
     percent_complete: float = 0.0
 
 
+_PROGRESS_FIELDS = frozenset(JobProgress.model_fields)
+_COUNTER_FIELDS = frozenset(
+    {"total_documents", "processed_documents", "total_chunks", "upserted_chunks", "failed_chunks"}
+)
+_TERMINAL_STATUSES = frozenset({JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED})
+
+PROGRESS_PUBLISH_INTERVAL_SECONDS = float(os.getenv("RAG_JOB_PROGRESS_INTERVAL_SECONDS", "0.25"))
+
+
 class JobManager:
-    
+
     _redis: Optional[redis.Redis] = None
     _pubsub_clients: Dict[str, Any] = {}
-    
+
     JOB_KEY_PREFIX = "rag:job:"
     JOB_CHANNEL_PREFIX = "rag:job:updates:"
-    JOBS_LIST_KEY = "rag:jobs:list"
-    
+    JOBS_INDEX_KEY = "rag:jobs:index"
+    LEGACY_JOBS_LIST_KEY = "rag:jobs:list"
+    MAX_INDEXED_JOBS = 1000
+
     def __init__(self, redis_url: str = None):
         self._redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
-    
+
     async def _get_redis(self) -> redis.Redis:
         if JobManager._redis is None:
             JobManager._redis = redis.from_url(self._redis_url, decode_responses=True)
         return JobManager._redis
-    
+
     def _job_key(self, job_id: str) -> str:
         return f"{self.JOB_KEY_PREFIX}{job_id}"
-    
+
     def _channel_key(self, job_id: str) -> str:
         return f"{self.JOB_CHANNEL_PREFIX}{job_id}"
-    
+
+    @staticmethod
+    def _encode_fields(fields: Dict[str, Any]) -> tuple[Dict[str, str], List[str]]:
+        mapping: Dict[str, str] = {}
+        cleared: List[str] = []
+        for name, value in fields.items():
+            if name not in _PROGRESS_FIELDS:
+                raise ValueError(f"Unknown job progress field: {name}")
+            if value is None:
+                cleared.append(name)
+            elif isinstance(value, Enum):
+                mapping[name] = str(value.value)
+            else:
+                mapping[name] = str(value)
+        return mapping, cleared
+
+    @staticmethod
+    def _is_legacy(raw: Dict[str, str]) -> bool:
+        # Jobs written before progress moved to per-field hashes keep one JSON "data" field.
+        return "job_id" not in raw and bool(raw.get("data"))
+
+    @staticmethod
+    def _with_percent(progress: JobProgress) -> JobProgress:
+        if progress.total_documents > 0:
+            progress.percent_complete = min(
+                100.0,
+                (progress.processed_documents / progress.total_documents) * 100
+            )
+        return progress
+
+    @classmethod
+    def _decode_progress(cls, raw: Dict[str, str]) -> Optional[JobProgress]:
+        if not raw:
+            return None
+        if cls._is_legacy(raw):
+            return JobProgress(**json.loads(raw["data"]))
+        if "job_id" not in raw:
+            return None
+        return cls._with_percent(
+            JobProgress(**{name: value for name, value in raw.items() if name in _PROGRESS_FIELDS})
+        )
+
+    async def _migrate_legacy_progress(
+        self,
+        r: redis.Redis,
+        key: str,
+        raw: Dict[str, str],
+        *,
+        fields: Dict[str, Any],
+        increments: Dict[str, int],
+    ) -> JobProgress:
+        """Apply an update to a legacy JSON job and rewrite it as a per-field hash."""
+        progress_dict = json.loads(raw["data"])
+        progress_dict.update(fields)
+        for name, amount in increments.items():
+            # HINCRBY started from zero on the legacy hash; the base count lives in the JSON.
+            progress_dict[name] = int(progress_dict.get(name) or 0) + int(amount)
+        progress = self._with_percent(JobProgress(**progress_dict))
+        mapping, cleared = self._encode_fields(progress.model_dump())
+
+        async with r.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=mapping)
+            pipe.hdel(key, "data", *cleared)
+            await pipe.execute()
+        return progress
+
     async def create_job(self, job_id: str, index_name: str, source_type: str, **kwargs) -> JobProgress:
         r = await self._get_redis()
-        
+
         progress = JobProgress(
             job_id=job_id,
             status=JobStatus.PENDING,
             current_stage="queued",
             **kwargs
         )
-        
-        await r.hset(self._job_key(job_id), mapping={
-            "data": progress.model_dump_json(),
-            "index_name": index_name,
-            "source_type": source_type,
-            "created_at": datetime.utcnow().isoformat()
-        })
-        
-        await r.lpush(self.JOBS_LIST_KEY, job_id)
-        await r.ltrim(self.JOBS_LIST_KEY, 0, 999)
-        
+        mapping, _ = self._encode_fields(progress.model_dump(exclude_none=True))
+
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.hset(self._job_key(job_id), mapping={
+                **mapping,
+                "index_name": index_name,
+                "source_type": source_type,
+                "created_at": datetime.utcnow().isoformat()
+            })
+            pipe.zadd(self.JOBS_INDEX_KEY, {job_id: time.time()})
+            pipe.zremrangebyrank(self.JOBS_INDEX_KEY, 0, -(self.MAX_INDEXED_JOBS + 1))
+            await pipe.execute()
+
         return progress
-    
-    async def update_progress(self, job_id: str, **updates) -> Optional[JobProgress]:
+
+    async def apply_progress(
+        self,
+        job_id: str,
+        *,
+        fields: Optional[Dict[str, Any]] = None,
+        increments: Optional[Dict[str, int]] = None,
+        publish: bool = True,
+    ) -> Optional[JobProgress]:
+        """Write field updates and counter increments in one pipeline, then publish the result."""
         r = await self._get_redis()
         key = self._job_key(job_id)
-        
-        data = await r.hget(key, "data")
-        if not data:
-            return None
-        
-        progress_dict = json.loads(data)
-        progress_dict.update(updates)
-        
-        if progress_dict.get("total_documents", 0) > 0:
-            progress_dict["percent_complete"] = min(
-                100.0,
-                (progress_dict.get("processed_documents", 0) / progress_dict["total_documents"]) * 100
+        mapping, cleared = self._encode_fields(fields or {})
+        for name in increments or {}:
+            if name not in _COUNTER_FIELDS:
+                raise ValueError(f"Job progress field is not a counter: {name}")
+
+        async with r.pipeline(transaction=True) as pipe:
+            if mapping:
+                pipe.hset(key, mapping=mapping)
+            if cleared:
+                pipe.hdel(key, *cleared)
+            for name, amount in (increments or {}).items():
+                pipe.hincrby(key, name, int(amount))
+            pipe.hgetall(key)
+            results = await pipe.execute()
+
+        raw = results[-1] or {}
+        if self._is_legacy(raw):
+            progress = await self._migrate_legacy_progress(
+                r, key, raw, fields=fields or {}, increments=increments or {}
             )
-        
-        progress = JobProgress(**progress_dict)
-        await r.hset(key, "data", progress.model_dump_json())
-        
-        await r.publish(self._channel_key(job_id), progress.model_dump_json())
-        await r.publish(f"{self.JOB_CHANNEL_PREFIX}all", progress.model_dump_json())
-        
+        else:
+            progress = self._decode_progress(raw)
+        if progress is None:
+            if raw and set(raw) <= set(mapping) | set(increments or {}):
+                # The writes above created a hash for a job that was never registered.
+                await r.delete(key)
+            return None
+
+        if publish:
+            payload = progress.model_dump_json()
+            async with r.pipeline(transaction=False) as pipe:
+                pipe.publish(self._channel_key(job_id), payload)
+                pipe.publish(f"{self.JOB_CHANNEL_PREFIX}all", payload)
+                await pipe.execute()
         return progress
-    
+
+    async def update_progress(self, job_id: str, **updates) -> Optional[JobProgress]:
+        return await self.apply_progress(job_id, fields=updates)
+
+    async def increment_progress(self, job_id: str, **increments: int) -> Optional[JobProgress]:
+        return await self.apply_progress(job_id, increments=increments)
+
+    def progress_reporter(
+        self,
+        job_id: str,
+        *,
+        interval_seconds: float = PROGRESS_PUBLISH_INTERVAL_SECONDS,
+    ) -> "JobProgressReporter":
+        return JobProgressReporter(self, job_id, interval_seconds=interval_seconds)
+
     async def get_progress(self, job_id: str) -> Optional[JobProgress]:
         r = await self._get_redis()
-        data = await r.hget(self._job_key(job_id), "data")
-        
-        if not data:
-            return None
-        
-        return JobProgress(**json.loads(data))
-    
+        return self._decode_progress(await r.hgetall(self._job_key(job_id)))
+
     async def list_jobs(self, limit: int = 50) -> List[JobProgress]:
         r = await self._get_redis()
-        
-        job_ids = await r.lrange(self.JOBS_LIST_KEY, 0, limit - 1)
-        
+
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.zrevrange(self.JOBS_INDEX_KEY, 0, limit - 1)
+            # Jobs created before the sorted-set index are only in the legacy list, newest first.
+            pipe.lrange(self.LEGACY_JOBS_LIST_KEY, 0, limit - 1)
+            indexed_ids, legacy_ids = await pipe.execute()
+        job_ids = list(dict.fromkeys([*indexed_ids, *legacy_ids]))[:limit]
+        if not job_ids:
+            return []
+
+        async with r.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hgetall(self._job_key(job_id))
+            rows = await pipe.execute()
+
         jobs = []
-        for job_id in job_ids:
-            progress = await self.get_progress(job_id)
+        for raw in rows:
+            progress = self._decode_progress(raw)
             if progress:
                 jobs.append(progress)
-        
+
         return jobs
-    
+
     async def mark_started(self, job_id: str) -> Optional[JobProgress]:
         return await self.update_progress(
             job_id,
@@ -131,7 +253,7 @@ class JobManager:
             current_stage="starting",
             started_at=datetime.utcnow().isoformat()
         )
-    
+
     async def mark_completed(self, job_id: str, **stats) -> Optional[JobProgress]:
         return await self.update_progress(
             job_id,
@@ -141,7 +263,7 @@ class JobManager:
             percent_complete=100.0,
             **stats
         )
-    
+
     async def mark_failed(self, job_id: str, error_message: str) -> Optional[JobProgress]:
         return await self.update_progress(
             job_id,
@@ -150,13 +272,13 @@ class JobManager:
             error_message=error_message,
             completed_at=datetime.utcnow().isoformat()
         )
-    
+
     async def subscribe_to_job(self, job_id: str):
         r = await self._get_redis()
         pubsub = r.pubsub()
         await pubsub.subscribe(self._channel_key(job_id))
         return pubsub
-    
+
     async def subscribe_to_all_jobs(self):
         r = await self._get_redis()
         pubsub = r.pubsub()
@@ -164,4 +286,68 @@ class JobManager:
         return pubsub
 
 
+class JobProgressReporter:
+    """Buffers per-item progress from hot loops and flushes it at a fixed cadence.
+
+    Counter increments and field updates accumulate in memory; at most one
+    pipelined write and publish happens per interval. Stage and status changes
+    flush immediately so subscribers never miss a transition.
+    """
+
+    def __init__(
+        self,
+        manager: JobManager,
+        job_id: str,
+        *,
+        interval_seconds: float = PROGRESS_PUBLISH_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._manager = manager
+        self._job_id = job_id
+        self._interval = max(0.0, float(interval_seconds))
+        self._clock = clock
+        self._fields: Dict[str, Any] = {}
+        self._increments: Dict[str, int] = {}
+        self._flushed_fields: Dict[str, Any] = {}
+        self._last_flush_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._fields or self._increments)
+
+    async def update(self, **fields) -> None:
+        force = any(
+            name in fields and fields[name] != self._fields.get(name, self._flushed_fields.get(name))
+            for name in ("status", "current_stage")
+        )
+        self._fields.update(fields)
+        await self._maybe_flush(force=force or fields.get("status") in _TERMINAL_STATUSES)
+
+    async def increment(self, **increments: int) -> None:
+        for name, amount in increments.items():
+            self._increments[name] = self._increments.get(name, 0) + int(amount)
+        await self._maybe_flush(force=False)
+
+    async def flush(self) -> Optional[JobProgress]:
+        async with self._lock:
+            if not self.has_pending:
+                return None
+            fields, increments = self._fields, self._increments
+            self._fields, self._increments = {}, {}
+            self._flushed_fields.update(fields)
+            self._last_flush_at = self._clock()
+            return await self._manager.apply_progress(
+                self._job_id,
+                fields=fields,
+                increments=increments,
+            )
+
+    async def _maybe_flush(self, *, force: bool) -> None:
+        now = self._clock()
+        due = self._last_flush_at is None or now - self._last_flush_at >= self._interval
+        if force or due:
+            await self.flush()
+
+
 job_manager = JobManager()
@@ -91,6 +91,134 @@ def _build_dist_manifest(dist_dir: Path) -> Dict[str, Any]:
     }
 
 
+def _dist_asset_cache_control(relative_path: str) -> str:
+    if relative_path.endswith(".html"):
+        return "no-store"
+    return "public, max-age=31536000, immutable"
+
+
+async def _upload_dist_dir(
+    storage: Any,
+    *,
+    dist_dir: Path,
+    dist_storage_prefix: str,
+    dist_manifest: Dict[str, Any],
+    previous_dist_storage_prefix: Optional[str] = None,
+    previous_dist_manifest: Optional[Dict[str, Any]] = None,
+) -> Dict[str, int]:
+    """Write every manifest asset under `dist_storage_prefix`, several at a time.
+
+    Assets whose path and sha256 match the previous build are copied server-side
+    from its prefix instead of being uploaded again.
+    """
+    previous_hashes: Dict[str, str] = {}
+    if previous_dist_storage_prefix and isinstance(previous_dist_manifest, dict):
+        for asset in previous_dist_manifest.get("assets") or []:
+            if isinstance(asset, dict) and asset.get("path") and asset.get("sha256"):
+                previous_hashes[str(asset["path"])] = str(asset["sha256"])
+
+    def _write_asset(asset: Dict[str, Any]) -> str:
+        relative_path = str(asset["path"])
+        if previous_hashes.get(relative_path) == asset.get("sha256"):
+            try:
+                storage.copy_asset(
+                    source_prefix=previous_dist_storage_prefix,
+                    destination_prefix=dist_storage_prefix,
+                    asset_path=relative_path,
+                )
+                return "copied"
+            except Exception as exc:
+                logger.warning(
+                    "dist asset copy failed; uploading instead",
+                    extra={"asset_path": relative_path, "error": str(exc)},
+                )
+        storage.write_asset_bytes(
+            dist_storage_prefix=dist_storage_prefix,
+            asset_path=relative_path,
+            payload=(dist_dir / relative_path).read_bytes(),
+            content_type=asset.get("content_type") or "application/octet-stream",
+            cache_control=_dist_asset_cache_control(relative_path),
+        )
+        return "uploaded"
+
+    concurrency = max(1, int(os.getenv("APPS_BUILD_UPLOAD_CONCURRENCY", "8")))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _write_limited(asset: Dict[str, Any]) -> str:
+        async with semaphore:
+            return await asyncio.to_thread(_write_asset, asset)
+
+    outcomes = await asyncio.gather(*(_write_limited(asset) for asset in dist_manifest.get("assets") or []))
+    copied = sum(1 for outcome in outcomes if outcome == "copied")
+    return {"uploaded": len(outcomes) - copied, "copied": copied}
+
+
+async def _build_project_dist(
+    project_dir: Path,
+    *,
+    source_files: Dict[str, str],
+    entry_file: str,
+    install_command: List[str],
+    install_timeout_seconds: int,
+    build_timeout_seconds: int,
+) -> tuple[Path, Dict[str, str]]:
+    """Install and build the project, reusing cached `node_modules` and build output when possible.
+
+    Returns the dist directory (inside `project_dir`, or the cache on an output hit)
+    and a summary of which caches were used.
+    """
+    from app.services.published_app_build_cache import PublishedAppBuildCache
+
+    cache = PublishedAppBuildCache.from_env()
+    cache_summary = {"output": "disabled", "dependencies": "disabled"}
+    output_key = ""
+    if cache is not None:
+        output_key = cache.output_key(entry_file=entry_file, files=source_files)
+        cached_dist = await asyncio.to_thread(cache.lookup_output, output_key)
+        if cached_dist is not None:
+            cache_summary.update({"output": "hit", "dependencies": "skipped"})
+            return cached_dist, cache_summary
+        cache_summary["output"] = "miss"
+
+    _materialize_project_files(project_dir, source_files)
+
+    dependency_key = ""
+    restored = False
+    if cache is not None:
+        dependency_key = cache.dependency_key(source_files)
+        restored = await asyncio.to_thread(cache.restore_node_modules, dependency_key, project_dir)
+        cache_summary["dependencies"] = "hit" if restored else "miss"
+    if not restored:
+        install_code, install_stdout, install_stderr = await _run_subprocess(
+            install_command,
+            cwd=project_dir,
+            timeout_seconds=install_timeout_seconds,
+        )
+        if install_code != 0:
+            raise RuntimeError(
+                f"`{' '.join(install_command[:2])}` failed with exit code {install_code}\n{install_stderr or install_stdout}"
+            )
+        if cache is not None:
+            await asyncio.to_thread(cache.store_node_modules, dependency_key, project_dir)
+
+    npm_build_code, npm_build_stdout, npm_build_stderr = await _run_subprocess(
+        ["npm", "run", "build"],
+        cwd=project_dir,
+        timeout_seconds=build_timeout_seconds,
+    )
+    if npm_build_code != 0:
+        raise RuntimeError(
+            f"`npm run build` failed with exit code {npm_build_code}\n{npm_build_stderr or npm_build_stdout}"
+        )
+
+    dist_dir = project_dir / "dist"
+    if not dist_dir.exists() or not dist_dir.is_dir():
+        raise RuntimeError("Build succeeded but dist directory was not produced")
+    if cache is not None:
+        await asyncio.to_thread(cache.store_output, output_key, dist_dir)
+    return dist_dir, cache_summary
+
+
 def _apps_base_domain() -> str:
     return os.getenv("APPS_BASE_DOMAIN", "apps.localhost")
 
@@ -216,6 +344,7 @@ def ingest_documents_task(
                 total_documents=len(documents)
             )
             
+            reporter = job_manager.progress_reporter(job_id)
             all_chunks = []
             for i, doc in enumerate(documents):
                 doc_id = doc.get("id", f"doc_{i}")
@@ -225,15 +354,12 @@ def ingest_documents_task(
                 chunks = chunker.chunk(text, doc_id, metadata)
                 all_chunks.extend(chunks)
                 
-                await job_manager.update_progress(
-                    job_id,
-                    current_stage="chunking",
+                await reporter.update(
                     processed_documents=i + 1,
                     total_chunks=len(all_chunks)
                 )
             
-            await job_manager.update_progress(
-                job_id,
+            await reporter.update(
                 current_stage="embedding",
                 total_chunks=len(all_chunks)
             )
@@ -248,10 +374,7 @@ def ingest_documents_task(
                 
                 embeddings = await embedding.embed_batch(texts)
                 
-                await job_manager.update_progress(
-                    job_id,
-                    current_stage="upserting"
-                )
+                await reporter.update(current_stage="upserting")
                 
                 vector_docs = []
                 for chunk, emb in zip(batch, embeddings):
@@ -276,12 +399,12 @@ def ingest_documents_task(
                     )
                     successful_upserts += count
                 
-                await job_manager.update_progress(
-                    job_id,
+                await reporter.update(
                     upserted_chunks=successful_upserts,
                     failed_chunks=failed_upserts
                 )
             
+            await reporter.flush()
             await job_manager.mark_completed(
                 job_id,
                 total_documents=len(documents),
@@ -374,20 +497,18 @@ def ingest_from_loader_task(
                 total_documents=len(raw_documents)
             )
             
+            reporter = job_manager.progress_reporter(job_id)
             all_chunks = []
             for i, doc in enumerate(raw_documents):
                 chunks = chunker.chunk(doc.content, doc.id, doc.metadata)
                 all_chunks.extend(chunks)
                 
-                await job_manager.update_progress(
-                    job_id,
-                    current_stage="chunking",
+                await reporter.update(
                     processed_documents=i + 1,
                     total_chunks=len(all_chunks)
                 )
             
-            await job_manager.update_progress(
-                job_id,
+            await reporter.update(
                 current_stage="embedding",
                 total_chunks=len(all_chunks)
             )
@@ -402,10 +523,7 @@ def ingest_from_loader_task(
                 
                 embeddings = await embedding.embed_batch(texts)
                 
-                await job_manager.update_progress(
-                    job_id,
-                    current_stage="upserting"
-                )
+                await reporter.update(current_stage="upserting")
                 
                 vector_docs = []
                 for chunk, emb in zip(batch, embeddings):
@@ -430,12 +548,12 @@ def ingest_from_loader_task(
                     )
                     successful_upserts += count
                 
-                await job_manager.update_progress(
-                    job_id,
+                await reporter.update(
                     upserted_chunks=successful_upserts,
                     failed_chunks=failed_upserts
                 )
             
+            await reporter.flush()
             await job_manager.mark_completed(
                 job_id,
                 total_documents=len(raw_documents),
@@ -492,6 +610,8 @@ def build_published_app_revision_task(
         requested_seq = 0
         source_files: Dict[str, str] = {}
         project_entry_file = "src/main.tsx"
+        previous_dist_storage_prefix: Optional[str] = None
+        previous_dist_manifest: Optional[Dict[str, Any]] = None
         now = datetime.now(timezone.utc)
 
         async with sessionmaker() as db:
@@ -521,6 +641,22 @@ def build_published_app_revision_task(
                 ),
             )
             project_entry_file = revision.entry_file or "src/main.tsx"
+            previous_result = await db.execute(
+                select(PublishedAppRevision.dist_storage_prefix, PublishedAppRevision.dist_manifest)
+                .where(
+                    and_(
+                        PublishedAppRevision.published_app_id == app_uuid,
+                        PublishedAppRevision.id != revision_uuid,
+                        PublishedAppRevision.build_status == PublishedAppRevisionBuildStatus.succeeded,
+                        PublishedAppRevision.dist_storage_prefix.is_not(None),
+                    )
+                )
+                .order_by(PublishedAppRevision.build_finished_at.desc().nulls_last())
+                .limit(1)
+            )
+            previous_row = previous_result.first()
+            if previous_row is not None:
+                previous_dist_storage_prefix, previous_dist_manifest = previous_row
             revision.build_status = PublishedAppRevisionBuildStatus.running
             revision.build_started_at = now
             revision.build_finished_at = None
@@ -540,34 +676,15 @@ def build_published_app_revision_task(
 
             with tempfile.TemporaryDirectory(prefix=f"apps-build-{revision_id[:8]}-") as temp_dir:
                 project_dir = Path(temp_dir)
-                _materialize_project_files(project_dir, source_files)
-
-                has_lockfile = (project_dir / "package-lock.json").exists()
-                install_command = ["npm", "ci"] if has_lockfile else ["npm", "install", "--no-audit", "--no-fund"]
-                install_code, install_stdout, install_stderr = await _run_subprocess(
-                    install_command,
-                    cwd=project_dir,
-                    timeout_seconds=npm_ci_timeout,
+                has_lockfile = "package-lock.json" in source_files
+                dist_dir, build_cache_summary = await _build_project_dist(
+                    project_dir,
+                    source_files=source_files,
+                    entry_file=project_entry_file,
+                    install_command=["npm", "ci"] if has_lockfile else ["npm", "install", "--no-audit", "--no-fund"],
+                    install_timeout_seconds=npm_ci_timeout,
+                    build_timeout_seconds=npm_build_timeout,
                 )
-                if install_code != 0:
-                    install_name = "npm ci" if has_lockfile else "npm install"
-                    raise RuntimeError(
-                        f"`{install_name}` failed with exit code {install_code}\n{install_stderr or install_stdout}"
-                    )
-
-                npm_build_code, npm_build_stdout, npm_build_stderr = await _run_subprocess(
-                    ["npm", "run", "build"],
-                    cwd=project_dir,
-                    timeout_seconds=npm_build_timeout,
-                )
-                if npm_build_code != 0:
-                    raise RuntimeError(
-                        f"`npm run build` failed with exit code {npm_build_code}\n{npm_build_stderr or npm_build_stdout}"
-                    )
-
-                dist_dir = project_dir / "dist"
-                if not dist_dir.exists() or not dist_dir.is_dir():
-                    raise RuntimeError("Build succeeded but dist directory was not produced")
 
                 dist_manifest = _build_dist_manifest(dist_dir)
                 if str(project_entry_file).strip() and str(project_entry_file).endswith(".tsx"):
@@ -580,24 +697,17 @@ def build_published_app_revision_task(
                     revision_id=str(revision_id),
                 )
 
-                uploaded = 0
-                for file_path in sorted(dist_dir.rglob("*")):
-                    if not file_path.is_file():
-                        continue
-                    relative_path = file_path.relative_to(dist_dir).as_posix()
-                    cache_control = "public, max-age=31536000, immutable"
-                    if relative_path.endswith(".html"):
-                        cache_control = "no-store"
-                    storage.write_asset_bytes(
-                        dist_storage_prefix=dist_storage_prefix,
-                        asset_path=relative_path,
-                        payload=file_path.read_bytes(),
-                        content_type=mimetypes.guess_type(file_path.name)[0] or "application/octet-stream",
-                        cache_control=cache_control,
-                    )
-                    uploaded += 1
-
-                dist_manifest["uploaded_assets"] = uploaded
+                upload_summary = await _upload_dist_dir(
+                    storage,
+                    dist_dir=dist_dir,
+                    dist_storage_prefix=dist_storage_prefix,
+                    dist_manifest=dist_manifest,
+                    previous_dist_storage_prefix=previous_dist_storage_prefix,
+                    previous_dist_manifest=previous_dist_manifest,
+                )
+                dist_manifest["uploaded_assets"] = upload_summary["uploaded"] + upload_summary["copied"]
+                dist_manifest["copied_assets"] = upload_summary["copied"]
+                dist_manifest["build_cache"] = build_cache_summary
 
         except Exception as exc:
             failure_message = _truncate_error(str(exc) or repr(exc))
@@ -961,6 +1071,8 @@ def publish_published_app_task(
         published_revision_uuid = uuid4()
         dist_storage_prefix: Optional[str] = None
         dist_manifest: Optional[Dict[str, Any]] = None
+        previous_dist_storage_prefix: Optional[str] = None
+        previous_dist_manifest: Optional[Dict[str, Any]] = None
         build_started_at = datetime.now(timezone.utc)
         build_finished_at: Optional[datetime] = None
 
@@ -1025,6 +1137,9 @@ def publish_published_app_task(
                 ),
             )
             source_entry_file = source_revision.entry_file or "src/main.tsx"
+            if source_revision.build_status == PublishedAppRevisionBuildStatus.succeeded:
+                previous_dist_storage_prefix = source_revision.dist_storage_prefix
+                previous_dist_manifest = source_revision.dist_manifest
             app_uuid = app.id
             organization_uuid = app.organization_id
             public_id = app.public_id
@@ -1054,31 +1169,14 @@ def publish_published_app_task(
 
                 with tempfile.TemporaryDirectory(prefix=f"apps-publish-{job_id[:8]}-") as temp_dir:
                     project_dir = Path(temp_dir)
-                    _materialize_project_files(project_dir, source_files)
-
-                    install_code, install_stdout, install_stderr = await _run_subprocess(
-                        ["npm", "install", "--no-audit", "--no-fund"],
-                        cwd=project_dir,
-                        timeout_seconds=npm_install_timeout,
-                    )
-                    if install_code != 0:
-                        raise RuntimeError(
-                            f"`npm install` failed with exit code {install_code}\n{install_stderr or install_stdout}"
-                        )
-
-                    npm_build_code, npm_build_stdout, npm_build_stderr = await _run_subprocess(
-                        ["npm", "run", "build"],
-                        cwd=project_dir,
-                        timeout_seconds=npm_build_timeout,
+                    dist_dir, build_cache_summary = await _build_project_dist(
+                        project_dir,
+                        source_files=source_files,
+                        entry_file=source_entry_file,
+                        install_command=["npm", "install", "--no-audit", "--no-fund"],
+                        install_timeout_seconds=npm_install_timeout,
+                        build_timeout_seconds=npm_build_timeout,
                     )
-                    if npm_build_code != 0:
-                        raise RuntimeError(
-                            f"`npm run build` failed with exit code {npm_build_code}\n{npm_build_stderr or npm_build_stdout}"
-                        )
-
-                    dist_dir = project_dir / "dist"
-                    if not dist_dir.exists() or not dist_dir.is_dir():
-                        raise RuntimeError("Build succeeded but dist directory was not produced")
 
                     dist_manifest = _build_dist_manifest(dist_dir)
                     if str(source_entry_file).strip() and str(source_entry_file).endswith(".tsx"):
@@ -1091,23 +1189,17 @@ def publish_published_app_task(
                         revision_id=str(published_revision_uuid),
                     )
 
-                    uploaded = 0
-                    for file_path in sorted(dist_dir.rglob("*")):
-                        if not file_path.is_file():
-                            continue
-                        relative_path = file_path.relative_to(dist_dir).as_posix()
-                        cache_control = "public, max-age=31536000, immutable"
-                        if relative_path.endswith(".html"):
-                            cache_control = "no-store"
-                        storage.write_asset_bytes(
-                            dist_storage_prefix=dist_storage_prefix,
-                            asset_path=relative_path,
-                            payload=file_path.read_bytes(),
-                            content_type=mimetypes.guess_type(file_path.name)[0] or "application/octet-stream",
-                            cache_control=cache_control,
-                        )
-                        uploaded += 1
-                    dist_manifest["uploaded_assets"] = uploaded
+                    upload_summary = await _upload_dist_dir(
+                        storage,
+                        dist_dir=dist_dir,
+                        dist_storage_prefix=dist_storage_prefix,
+                        dist_manifest=dist_manifest,
+                        previous_dist_storage_prefix=previous_dist_storage_prefix,
+                        previous_dist_manifest=previous_dist_manifest,
+                    )
+                    dist_manifest["uploaded_assets"] = upload_summary["uploaded"] + upload_summary["copied"]
+                    dist_manifest["copied_assets"] = upload_summary["copied"]
+                    dist_manifest["build_cache"] = build_cache_summary
                     build_finished_at = datetime.now(timezone.utc)
 
         except Exception as exc:
@@ -1300,3 +1392,29 @@ def reconcile_usage_quota_counters_task():
         return {"status": "ok", "reconciled_scopes": reconciled}
 
     return run_async(_run())
+
+
+@celery_app.task(name="app.workers.tasks.resume_timed_out_orchestration_joins_task")
+def resume_timed_out_orchestration_joins_task():
+    async def _run():
+        from app.db.postgres.engine import sessionmaker
+        from app.services.orchestration_kernel_service import OrchestrationKernelService
+
+        async with sessionmaker() as db:
+            resumed = await OrchestrationKernelService(db).resume_timed_out_joins()
+        return {"status": "ok", "resumed_orchestrators": resumed}
+
+    return run_async(_run())
+
+
+@celery_app.task(name="app.workers.tasks.refresh_stats_rollups_task")
+def refresh_stats_rollups_task():
+    async def _run():
+        from app.db.postgres.engine import sessionmaker
+        from app.services.stats_rollup_service import StatsRollupService
+
+        async with sessionmaker() as db:
+            result = await StatsRollupService(db).refresh()
+        return {"status": "ok", **result}
+
+    return run_async(_run())
@@ -0,0 +1,188 @@
+"""
+SQLite-backed checkpoint store for Sefaria ingestion.
+
+Replaces the whole-file JSON rewrites of ingestion_log.json / ingestion_errors.json.
+Each worker process opens its own connection; WAL mode lets readers proceed while
+one writer commits, and every mutation is a single short transaction.
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+
+DEFAULT_CHECKPOINT_DB = Path(__file__).parent / "ingestion_checkpoints.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_segments (
+    index_title TEXT NOT NULL,
+    segment_ref TEXT NOT NULL,
+    PRIMARY KEY (index_title, segment_ref)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS book_progress (
+    index_title TEXT PRIMARY KEY,
+    last_reference TEXT
+);
+
+CREATE TABLE IF NOT EXISTS ingestion_errors (
+    index_title TEXT NOT NULL,
+    segment_ref TEXT NOT NULL,
+    error_type TEXT NOT NULL,
+    error_message TEXT,
+    endpoint TEXT,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (index_title, segment_ref)
+);
+
+CREATE TABLE IF NOT EXISTS checkpoint_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class CheckpointStore:
+    def __init__(self, db_path: Optional[Path] = None, busy_timeout_seconds: float = 30.0):
+        self.db_path = Path(db_path or DEFAULT_CHECKPOINT_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: we open transactions explicitly so each batch is one commit.
+        self._conn = sqlite3.connect(str(self.db_path), timeout=busy_timeout_seconds, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_seconds * 1000)}")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, statements):
+        # BEGIN IMMEDIATE takes the write lock up front, so concurrent processes
+        # queue on busy_timeout instead of failing mid-transaction.
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                if params and isinstance(params, list):
+                    self._conn.executemany(sql, params)
+                else:
+                    self._conn.execute(sql, params or ())
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def load_segments(self, index_title: str) -> Set[str]:
+        rows = self._conn.execute(
+            "SELECT segment_ref FROM ingested_segments WHERE index_title = ?",
+            (index_title,),
+        )
+        return {row[0] for row in rows}
+
+    def count_segments(self, index_title: str) -> int:
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM ingested_segments WHERE index_title = ?",
+            (index_title,),
+        ).fetchone()
+        return int(row[0])
+
+    def get_last_reference(self, index_title: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT last_reference FROM book_progress WHERE index_title = ?",
+            (index_title,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def mark_segments(self, index_title: str, segment_refs: Iterable[str], last_reference: Optional[str] = None):
+        """Record a batch of ingested segments (and optionally the resume point) in one commit."""
+        statements = []
+        rows = [(index_title, ref) for ref in segment_refs]
+        if rows:
+            statements.append((
+                "INSERT OR IGNORE INTO ingested_segments (index_title, segment_ref) VALUES (?, ?)",
+                rows,
+            ))
+        if last_reference:
+            statements.append((
+                "INSERT INTO book_progress (index_title, last_reference) VALUES (?, ?) "
+                "ON CONFLICT(index_title) DO UPDATE SET last_reference = excluded.last_reference",
+                (index_title, last_reference),
+            ))
+        if statements:
+            self._write(statements)
+
+    def record_error(
+        self,
+        index_title: str,
+        segment_ref: str,
+        error_type: str,
+        error_message: str,
+        endpoint: Optional[str] = None,
+    ):
+        self._write([(
+            "INSERT INTO ingestion_errors "
+            "(index_title, segment_ref, error_type, error_message, endpoint, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(index_title, segment_ref) DO UPDATE SET "
+            "error_type = excluded.error_type, error_message = excluded.error_message, "
+            "endpoint = excluded.endpoint, timestamp = excluded.timestamp",
+            (index_title, segment_ref, error_type, error_message, endpoint, time.strftime("%Y-%m-%d %H:%M:%S")),
+        )])
+
+    def import_legacy_json(self, log_file: Optional[Path] = None, error_log_file: Optional[Path] = None) -> bool:
+        """One-time import of the old JSON logs. Returns True if an import happened."""
+        row = self._conn.execute("SELECT value FROM checkpoint_meta WHERE key = 'legacy_json_imported'").fetchone()
+        if row:
+            return False
+
+        statements = []
+        if log_file and Path(log_file).exists():
+            with open(log_file, 'r') as f:
+                legacy_log = json.load(f)
+            for index_title, entry in legacy_log.items():
+                refs = entry.get("ingested_segments") or []
+                if refs:
+                    statements.append((
+                        "INSERT OR IGNORE INTO ingested_segments (index_title, segment_ref) VALUES (?, ?)",
+                        [(index_title, ref) for ref in refs],
+                    ))
+                if entry.get("last_reference"):
+                    statements.append((
+                        "INSERT OR REPLACE INTO book_progress (index_title, last_reference) VALUES (?, ?)",
+                        (index_title, entry["last_reference"]),
+                    ))
+        if error_log_file and Path(error_log_file).exists():
+            with open(error_log_file, 'r') as f:
+                legacy_errors = json.load(f)
+            rows = [
+                (
+                    index_title,
+                    error.get("segment_ref") or "unknown",
+                    error.get("error_type") or "unknown",
+                    error.get("error_message"),
+                    error.get("endpoint"),
+                    error.get("timestamp") or time.strftime("%Y-%m-%d %H:%M:%S"),
+                )
+                for index_title, errors in legacy_errors.items()
+                for error in errors
+            ]
+            if rows:
+                statements.append((
+                    "INSERT OR REPLACE INTO ingestion_errors "
+                    "(index_title, segment_ref, error_type, error_message, endpoint, timestamp) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                ))
+        statements.append((
+            "INSERT OR REPLACE INTO checkpoint_meta (key, value) VALUES ('legacy_json_imported', ?)",
+            (time.strftime("%Y-%m-%d %H:%M:%S"),),
+        ))
+        self._write(statements)
+        return True
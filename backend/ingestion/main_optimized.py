@@ -7,12 +7,12 @@ from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from dotenv import load_dotenv
 from async_sefaria_client import AsyncSefariaClient
+from checkpoint_store import CheckpointStore
 from chunker import Chunker
 from vector_store import VectorStore
 from elasticsearch import Elasticsearch
 from elasticsearch.helpers import bulk
 from typing import Optional, Set, Dict, List, Any
-from multiprocessing import Manager
 
 load_dotenv(Path(__file__).parent.parent / ".env")
 
@@ -119,24 +119,14 @@ class AsyncTextIngester:
     
     def __init__(
         self, 
-        log_file: Optional[Path] = None, 
-        error_log_file: Optional[Path] = None, 
+        checkpoint_db: Optional[Path] = None,
         tree_file: Optional[Path] = None,
-        shared_log: Optional[Dict] = None,
-        shared_error_log: Optional[Dict] = None
     ):
-        self.log_file = log_file or Path(__file__).parent / "ingestion_log.json"
-        self.error_log_file = error_log_file or Path(__file__).parent / "ingestion_errors.json"
         self.tree_file = tree_file or Path(__file__).parent.parent / "sefaria_tree.json"
         self.tree_navigator = TreeNavigator(tree_file=self.tree_file)
         
-        # Use shared dictionaries for multiprocessing
-        self.shared_log = shared_log
-        self.shared_error_log = shared_error_log
-        
-        # Load logs
-        self.ingestion_log: Dict[str, Dict] = self._load_log()
-        self.error_log: Dict[str, List[Dict]] = self._load_error_log()
+        # Each process opens its own connection; SQLite WAL serializes writers safely.
+        self.checkpoints = CheckpointStore(checkpoint_db)
     
     def _get_he_title(self, index_title: str, index_meta: Optional[Dict] = None) -> Optional[str]:
         if index_meta and index_meta.get("heTitle"):
@@ -149,116 +139,20 @@ class AsyncTextIngester:
         
         return None
     
-    def _load_log(self) -> Dict[str, Dict]:
-        if self.shared_log is not None:
-            return dict(self.shared_log)
-        
-        if self.log_file.exists():
-            try:
-                with open(self.log_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Warning: Could not load ingestion log: {e}")
-                return {}
-        return {}
-    
-    def _save_log(self):
-        try:
-            # Update shared log if available
-            if self.shared_log is not None:
-                self.shared_log.update(self.ingestion_log)
-            
-            # Also save to file
-            current_log = {}
-            if self.log_file.exists():
-                try:
-                    with open(self.log_file, 'r') as f:
-                        current_log = json.load(f)
-                except Exception:
-                    pass
-            
-            current_log.update(self.ingestion_log)
-            
-            with open(self.log_file, 'w') as f:
-                json.dump(current_log, f, indent=2)
-        except Exception as e:
-            print(f"Warning: Could not save ingestion log: {e}")
-    
-    def _reload_log(self):
-        if self.shared_log is not None:
-            self.ingestion_log.update(dict(self.shared_log))
-        elif self.log_file.exists():
-            try:
-                with open(self.log_file, 'r') as f:
-                    self.ingestion_log = json.load(f)
-            except Exception as e:
-                print(f"Warning: Could not reload ingestion log: {e}")
-    
-    def _load_error_log(self) -> Dict[str, List[Dict]]:
-        if self.shared_error_log is not None:
-            return dict(self.shared_error_log)
-        
-        if self.error_log_file.exists():
-            try:
-                with open(self.error_log_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Warning: Could not load error log: {e}")
-                return {}
-        return {}
-    
-    def _save_error_log(self):
+    def _log_error(self, index_title: str, segment_ref: str, error_type: str, error_message: str, endpoint: Optional[str] = None):
         try:
-            if self.shared_error_log is not None:
-                self.shared_error_log.update(self.error_log)
-            
-            with open(self.error_log_file, 'w') as f:
-                json.dump(self.error_log, f, indent=2)
+            self.checkpoints.record_error(index_title, segment_ref, error_type, error_message, endpoint)
         except Exception as e:
-            print(f"Warning: Could not save error log: {e}")
-    
-    def _log_error(self, index_title: str, segment_ref: str, error_type: str, error_message: str, endpoint: Optional[str] = None):
-        if index_title not in self.error_log:
-            self.error_log[index_title] = []
-        
-        error_entry = {
-            "segment_ref": segment_ref,
-            "error_type": error_type,
-            "error_message": error_message,
-            "endpoint": endpoint,
-            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        existing = next((e for e in self.error_log[index_title] if e.get("segment_ref") == segment_ref), None)
-        if existing:
-            existing.update(error_entry)
-        else:
-            self.error_log[index_title].append(error_entry)
-        
-        self._save_error_log()
+            print(f"Warning: Could not record ingestion error: {e}")
     
     def _get_ingested_segments(self, index_title: str) -> Set[str]:
-        self._reload_log()
-        if index_title not in self.ingestion_log:
-            self.ingestion_log[index_title] = {"ingested_segments": []}
-        return set(self.ingestion_log[index_title].get("ingested_segments", []))
+        return self.checkpoints.load_segments(index_title)
     
-    def _mark_segment_ingested(self, index_title: str, segment_ref: str):
-        if index_title not in self.ingestion_log:
-            self.ingestion_log[index_title] = {"ingested_segments": []}
-        if segment_ref not in self.ingestion_log[index_title]["ingested_segments"]:
-            self.ingestion_log[index_title]["ingested_segments"].append(segment_ref)
-    
-    def _update_last_reference(self, index_title: str, reference: str):
-        if index_title not in self.ingestion_log:
-            self.ingestion_log[index_title] = {"ingested_segments": []}
-        self.ingestion_log[index_title]["last_reference"] = reference
+    def _mark_segments_ingested(self, index_title: str, segment_refs: Set[str], last_reference: Optional[str] = None):
+        self.checkpoints.mark_segments(index_title, segment_refs, last_reference=last_reference)
     
     def _get_last_reference(self, index_title: str) -> Optional[str]:
-        self._reload_log()
-        if index_title in self.ingestion_log:
-            return self.ingestion_log[index_title].get("last_reference")
-        return None
+        return self.checkpoints.get_last_reference(index_title)
     
     def detect_starting_reference(self, index_title: str, index_meta: dict) -> Optional[str]:
         categories = index_meta.get("categories", [])
@@ -443,11 +337,8 @@ class AsyncTextIngester:
                     print(f"[{index_title}] Upserting batch {i // upsert_batch_size + 1} ({len(batch_chunks)} chunks)...")
                     try:
                         vector_store.upsert_chunks(batch_chunks)
-                        for segment_ref in batch_segment_refs:
-                            self._mark_segment_ingested(index_title, segment_ref)
-                        if last_processed_ref:
-                            self._update_last_reference(index_title, last_processed_ref)
-                        self._save_log()
+                        self._mark_segments_ingested(index_title, batch_segment_refs, last_reference=last_processed_ref)
+                        ingested_segments.update(batch_segment_refs)
                         total_upserted += len(batch_chunks)
                         print(f"[{index_title}] Successfully upserted batch {i // upsert_batch_size + 1}")
                     except Exception as e:
@@ -491,18 +382,16 @@ class AsyncTextIngester:
 
 def process_book_async(
     book: str, 
-    log_file: Optional[Path], 
-    error_log_file: Optional[Path], 
+    checkpoint_db: Optional[Path], 
     tree_file: Optional[Path], 
     limit: int, 
     resume: bool,
-    shared_log: Optional[Dict] = None,
-    shared_error_log: Optional[Dict] = None
 ) -> Dict[str, Any]:
     """
     Process a single book using async I/O.
     This function will be called in a separate process.
     """
+    ingester = None
     try:
         print(f"[PROCESS] Starting ingestion for: {book}")
         
@@ -510,13 +399,7 @@ def process_book_async(
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         
-        ingester = AsyncTextIngester(
-            log_file=log_file, 
-            error_log_file=error_log_file, 
-            tree_file=tree_file,
-            shared_log=shared_log,
-            shared_error_log=shared_error_log
-        )
+        ingester = AsyncTextIngester(checkpoint_db=checkpoint_db, tree_file=tree_file)
         
         loop.run_until_complete(ingester.ingest_index(book, limit, resume=resume))
         loop.close()
@@ -525,7 +408,12 @@ def process_book_async(
         return {"book": book, "status": "success"}
     except Exception as e:
         print(f"[PROCESS] Error processing book {book}: {e}")
+        if ingester is not None:
+            ingester._log_error(book, "N/A", "book_processing_error", str(e), None)
         return {"book": book, "status": "error", "error": str(e)}
+    finally:
+        if ingester is not None:
+            ingester.checkpoints.close()
 
 
 def main():
@@ -533,16 +421,23 @@ def main():
     parser.add_argument("--titles", nargs='+', default=["Halakhah"], help="Category or book titles from tree to ingest")
     parser.add_argument("--limit", type=int, default=999999, help="Limit number of segments to process per index")
     parser.add_argument("--no-resume", action="store_true", help="Don't resume from previous ingestion")
-    parser.add_argument("--log-file", type=str, default=None, help="Path to ingestion log file")
-    parser.add_argument("--error-log-file", type=str, default=None, help="Path to error log file")
+    parser.add_argument("--checkpoint-db", type=str, default=None, help="Path to the SQLite checkpoint store (default: ingestion_checkpoints.db)")
+    parser.add_argument("--log-file", type=str, default=None, help="Legacy JSON ingestion log to import once into the checkpoint store")
+    parser.add_argument("--error-log-file", type=str, default=None, help="Legacy JSON error log to import once into the checkpoint store")
     parser.add_argument("--tree-file", type=str, default=None, help="Path to sefaria_tree.json file")
     parser.add_argument("--max-workers", type=int, default=10, help="Maximum number of parallel processes (default: 10)")
     args = parser.parse_args()
 
-    log_file = Path(args.log_file) if args.log_file else None
-    error_log_file = Path(args.error_log_file) if args.error_log_file else None
+    checkpoint_db = Path(args.checkpoint_db) if args.checkpoint_db else None
+    log_file = Path(args.log_file) if args.log_file else Path(__file__).parent / "ingestion_log.json"
+    error_log_file = Path(args.error_log_file) if args.error_log_file else Path(__file__).parent / "ingestion_errors.json"
     tree_file = Path(args.tree_file) if args.tree_file else None
     
+    with CheckpointStore(checkpoint_db) as checkpoints:
+        if checkpoints.import_legacy_json(log_file, error_log_file):
+            print(f"Imported legacy JSON logs into checkpoint store: {checkpoints.db_path}")
+        checkpoint_db = checkpoints.db_path
+    
     navigator = TreeNavigator(tree_file=tree_file)
 
     all_books = []
@@ -558,13 +453,7 @@ def main():
     print(f"Found {len(all_books)} unique books to ingest from {len(args.titles)} title(s).")
     print(f"Books: {', '.join(all_books[:10])}{'...' if len(all_books) > 10 else ''}")
     print(f"Processing with {args.max_workers} parallel PROCESSES (each with async I/O)...")
-    if error_log_file:
-        print(f"Error log will be saved to: {error_log_file}")
-
-    # Use multiprocessing Manager for shared state
-    manager = Manager()
-    shared_log = manager.dict()
-    shared_error_log = manager.dict()
+    print(f"Checkpoints and errors are stored in: {checkpoint_db}")
 
     results = []
     start_time = time.time()
@@ -575,13 +464,10 @@ def main():
             executor.submit(
                 process_book_async, 
                 book, 
-                log_file, 
-                error_log_file, 
+                checkpoint_db, 
                 tree_file, 
                 args.limit, 
                 not args.no_resume,
-                shared_log,
-                shared_error_log
             ): book 
             for book in all_books
         }
@@ -24,7 +24,6 @@ from app.core.env_loader import load_backend_env, running_under_pytest
 load_backend_env(override=not running_under_pytest())
 
 from app.db.connection import MongoDatabase
-from vector_store import VectorStore
 
 logger = logging.getLogger("backend.startup")
 _INFRA_BOOTSTRAPPED = False
@@ -788,29 +787,36 @@ async def lifespan(app: FastAPI):
     """Bootstraps shared services for the FastAPI lifecycle."""
     _bootstrap_local_infra_once()
     _validate_sandbox_backend_env()
+    # Import the lazily registered routers on a worker thread while startup continues,
+    # so neither the first request nor concurrent health probes pay for it.
+    router_loader.warm_up()
 
     await MongoDatabase.connect()
-    app.state.vector_store = VectorStore()
+    # The vector store client is built on first search (see app.api.routers.search);
+    # constructing it here imports the GenAI/Pinecone SDKs and lists indexes on every boot.
+    app.state.vector_store = None
     
     # Pre-load library for instant menu speed (if ENABLE_FULL_LIBRARY_CACHE is true)
     from app.api.routers.library import preload_library_cache
     asyncio.create_task(preload_library_cache())
 
-    print("VectorStore initialized successfully.")
-    
     # Global Model Registry Seeding
     from app.db.postgres.engine import sessionmaker as AsyncSessionLocal
     from app.services.registry_seeding import (
+        compute_startup_seed_fingerprint,
+        record_startup_seed_fingerprint,
         seed_global_models,
         seed_platform_sdk_tool,
         seed_builtin_tool_templates,
         seed_file_space_tools,
+        startup_seed_fingerprint_matches,
     )
     seed_timeout_seconds = float(os.getenv("STARTUP_SEED_TIMEOUT_SECONDS", "8"))
 
-    async def _safe_seed(seed_name: str, seed_coro, db_session) -> None:
+    async def _safe_seed(seed_name: str, seed_coro, db_session) -> bool:
         try:
             await asyncio.wait_for(seed_coro(db_session), timeout=seed_timeout_seconds)
+            return True
         except asyncio.TimeoutError:
             logger.warning(
                 "Skipping %s during startup due timeout after %.1fs",
@@ -827,12 +833,34 @@ async def lifespan(app: FastAPI):
                 await db_session.rollback()
             except Exception:
                 pass
+        return False
 
-    async with AsyncSessionLocal() as db:
-        await _safe_seed("global model registry bootstrap", seed_global_models, db)
-        await _safe_seed("platform sdk tool bootstrap", seed_platform_sdk_tool, db)
-        await _safe_seed("builtin tool templates bootstrap", seed_builtin_tool_templates, db)
-        await _safe_seed("file space tools bootstrap", seed_file_space_tools, db)
+    if _is_truthy(os.getenv("STARTUP_SEED_SKIP", "0")):
+        logger.info("Skipping startup registry seeding (STARTUP_SEED_SKIP is set)")
+    else:
+        seed_fingerprint = compute_startup_seed_fingerprint()
+        async with AsyncSessionLocal() as db:
+            if not _is_truthy(os.getenv("STARTUP_SEED_FORCE", "0")) and await startup_seed_fingerprint_matches(
+                db, seed_fingerprint
+            ):
+                logger.info("Startup registry seeds unchanged (fingerprint %s); skipping", seed_fingerprint[:12])
+            else:
+                seeded = [
+                    await _safe_seed("global model registry bootstrap", seed_global_models, db),
+                    await _safe_seed("platform sdk tool bootstrap", seed_platform_sdk_tool, db),
+                    await _safe_seed("builtin tool templates bootstrap", seed_builtin_tool_templates, db),
+                    await _safe_seed("file space tools bootstrap", seed_file_space_tools, db),
+                ]
+                # Only a fully applied pass is recorded, so a timed-out seed is retried next boot.
+                if all(seeded):
+                    try:
+                        await record_startup_seed_fingerprint(db, seed_fingerprint)
+                    except Exception as exc:
+                        logger.warning("Failed to record startup seed fingerprint: %s", exc)
+                        try:
+                            await db.rollback()
+                        except Exception:
+                            pass
     
     # Start LiveKit worker in separate process if credentials are configured
     # worker_process = None
@@ -863,6 +891,56 @@ async def lifespan(app: FastAPI):
         # Cleanup failures should not block shutdown.
         pass
 
+    try:
+        from app.services.published_app_preview_proxy_pool import get_preview_upstream_client_pool
+
+        await get_preview_upstream_client_pool().aclose()
+    except Exception:
+        pass
+
+    try:
+        from app.services.http_client_pool import get_http_client_pool, get_streaming_http_client_pool
+
+        await get_http_client_pool().aclose()
+        await get_streaming_http_client_pool().aclose()
+    except Exception:
+        pass
+
+    try:
+        from app.services.published_app_coding_run_event_bus import get_coding_run_event_bus
+
+        await get_coding_run_event_bus().aclose()
+    except Exception:
+        pass
+
+    try:
+        from app.services.published_app_analytics_buffer import get_published_app_analytics_buffer
+
+        await get_published_app_analytics_buffer().aclose()
+    except Exception:
+        pass
+
+    try:
+        from app.services.chunking_service import get_chunking_service
+
+        await asyncio.to_thread(get_chunking_service().shutdown)
+    except Exception:
+        pass
+
+    try:
+        from app.services.document_extraction import get_document_extraction_service
+
+        await asyncio.to_thread(get_document_extraction_service().shutdown)
+    except Exception:
+        pass
+
+    try:
+        from app.services.trace_sink import flush_trace_sink
+
+        flush_trace_sink()
+    except Exception:
+        pass
+
     _stop_local_pgvector_if_needed()
     _stop_local_crawl4ai_if_needed()
     _stop_local_opencode_if_needed()
@@ -941,85 +1019,57 @@ app.add_middleware(PublishedAppsCORSMiddleware)
 # Registered after CORS so it runs first for app-host requests.
 app.add_middleware(PublishedAppsHostRuntimeMiddleware)
 
-from app.api.routers import auth, general, search, stt, texts, library, admin, tts, workos_webhooks
-from app.api.routers.agents import router as agents_router
-from app.api.routers import agent_run_logs as agent_run_logs_router
-from app.api.routers import agent_graph_mutations as agent_graph_mutations_router
-from app.api.routers import org_units as org_units_router
-from app.api.routers import audit as audit_router
-from app.api.routers import rag_pipelines as rag_pipelines_router
-from app.api.routers import rag_graph_mutations as rag_graph_mutations_router
-from app.api.routers import rag_operator_contracts as rag_operator_contracts_router
-from app.api.routers import models as models_router
-from app.api.routers import resource_policies as resource_policies_router
-from app.api.routers import prompts as prompts_router
-from app.api.routers import tools as tools_router
-from app.api.routers import mcp as mcp_router
-from app.api.routers import artifacts as artifacts_router
-from app.api.routers import artifact_runs as artifact_runs_router
-from app.api.routers import artifact_coding_agent as artifact_coding_agent_router
-from app.api.routers import agent_tool_exports as agent_tool_exports_router
-from app.api.routers import stats as stats_router
-from app.api.routers import settings as settings_router
-from app.api.routers import settings_governance as settings_governance_router
-from app.api.routers import orchestration_internal as orchestration_internal_router
-from app.api.routers import organization_api_keys as organization_api_keys_router
-from app.api.routers import published_apps_admin as published_apps_admin_router
-from app.api.routers import published_apps_external_runtime as published_apps_external_runtime_router
-from app.api.routers import embedded_agents_public as embedded_agents_public_router
-from app.api.routers import published_apps_public as published_apps_public_router
-from app.api.routers import published_apps_host_runtime as published_apps_host_runtime_router
-from app.api.routers import published_apps_builder_preview_proxy as published_apps_builder_preview_proxy_router
-from app.api.routers import sandbox_controller_dev_shim as sandbox_controller_dev_shim_router
-from app.api.routers import files as files_router
-from app.api.routers import organizations as organizations_router
-app.include_router(auth.router, prefix="/auth", tags=["auth"])
-app.include_router(workos_webhooks.router)
-app.include_router(agents_router)
-app.include_router(agent_tool_exports_router.router)
-app.include_router(agent_run_logs_router.router)
-app.include_router(agent_graph_mutations_router.router)
-app.include_router(admin.router, prefix="/admin", tags=["admin"])
-app.include_router(rag_pipelines_router.router, prefix="/admin/pipelines", tags=["rag-pipelines"])
-app.include_router(rag_graph_mutations_router.router, prefix="/admin/pipelines", tags=["rag-pipelines"])
-app.include_router(rag_operator_contracts_router.router, prefix="/admin/pipelines", tags=["rag-pipelines"])
-app.include_router(artifacts_router.router, tags=["artifacts"])
-app.include_router(artifact_runs_router.router, tags=["artifacts"])
-app.include_router(artifact_coding_agent_router.router, tags=["artifacts"])
-app.include_router(stats_router.router, prefix="/admin", tags=["stats"])
-app.include_router(settings_router.router, prefix="/admin/settings", tags=["settings"])
-app.include_router(settings_governance_router.router)
-app.include_router(resource_policies_router.router)
-app.include_router(organization_api_keys_router.router)
-app.include_router(orchestration_internal_router.router)
-app.include_router(published_apps_admin_router.router)
-app.include_router(published_apps_external_runtime_router.router)
-app.include_router(embedded_agents_public_router.router)
-app.include_router(published_apps_public_router.router)
-app.include_router(published_apps_host_runtime_router.router)
-app.include_router(published_apps_builder_preview_proxy_router.router)
-app.include_router(sandbox_controller_dev_shim_router.router)
-app.include_router(files_router.router)
-from app.api.routers import knowledge_stores as knowledge_stores_router
-app.include_router(knowledge_stores_router.router, prefix="/admin/knowledge-stores", tags=["knowledge-stores"])
-
-app.include_router(models_router.router, tags=["models"])
-app.include_router(prompts_router.router, tags=["prompts"])
-app.include_router(tools_router.router, tags=["tools"])
-app.include_router(mcp_router.router)
-app.include_router(organizations_router.router)
-app.include_router(org_units_router.router, prefix="/api", tags=["org-units"])
-app.include_router(audit_router.router, prefix="/api", tags=["audit"])
-app.include_router(library.router, prefix="/api/library", tags=["library"])
-app.include_router(general.router, tags=["general"])
-app.include_router(search.router, tags=["search"])
-app.include_router(stt.router, prefix="/stt", tags=["stt"])
-app.include_router(texts.router, tags=["texts"])
-app.include_router(tts.router, prefix="/tts", tags=["tts"])
-
-from app.api.routers import voice_ws, rag_ws
-app.include_router(voice_ws.router, prefix="/api/voice", tags=["voice"])
-app.include_router(rag_ws.router, prefix="/admin/rag/ws", tags=["rag-websocket"])
+# Router modules pull in most of the platform (agent runtime, model SDKs, builders), so
+# they are imported on a background thread started by the lifespan rather than at app
+# import; API_LAZY_ROUTERS=0 restores eager registration. Order matters: it is the route matching order.
+from app.api.lazy_routers import LazyRouterSpec, include_routers
+
+API_ROUTERS = (
+    LazyRouterSpec("app.api.routers.auth", prefix="/auth", tags=("auth",)),
+    LazyRouterSpec("app.api.routers.workos_webhooks"),
+    LazyRouterSpec("app.api.routers.agents"),
+    LazyRouterSpec("app.api.routers.agent_tool_exports"),
+    LazyRouterSpec("app.api.routers.agent_run_logs"),
+    LazyRouterSpec("app.api.routers.agent_graph_mutations"),
+    LazyRouterSpec("app.api.routers.admin", prefix="/admin", tags=("admin",)),
+    LazyRouterSpec("app.api.routers.rag_pipelines", prefix="/admin/pipelines", tags=("rag-pipelines",)),
+    LazyRouterSpec("app.api.routers.rag_graph_mutations", prefix="/admin/pipelines", tags=("rag-pipelines",)),
+    LazyRouterSpec("app.api.routers.rag_operator_contracts", prefix="/admin/pipelines", tags=("rag-pipelines",)),
+    LazyRouterSpec("app.api.routers.artifacts", tags=("artifacts",)),
+    LazyRouterSpec("app.api.routers.artifact_runs", tags=("artifacts",)),
+    LazyRouterSpec("app.api.routers.artifact_coding_agent", tags=("artifacts",)),
+    LazyRouterSpec("app.api.routers.stats", prefix="/admin", tags=("stats",)),
+    LazyRouterSpec("app.api.routers.settings", prefix="/admin/settings", tags=("settings",)),
+    LazyRouterSpec("app.api.routers.settings_governance"),
+    LazyRouterSpec("app.api.routers.resource_policies"),
+    LazyRouterSpec("app.api.routers.organization_api_keys"),
+    LazyRouterSpec("app.api.routers.orchestration_internal"),
+    LazyRouterSpec("app.api.routers.published_apps_admin"),
+    LazyRouterSpec("app.api.routers.published_apps_external_runtime"),
+    LazyRouterSpec("app.api.routers.embedded_agents_public"),
+    LazyRouterSpec("app.api.routers.published_apps_public"),
+    LazyRouterSpec("app.api.routers.published_apps_host_runtime"),
+    LazyRouterSpec("app.api.routers.published_apps_builder_preview_proxy"),
+    LazyRouterSpec("app.api.routers.sandbox_controller_dev_shim"),
+    LazyRouterSpec("app.api.routers.files"),
+    LazyRouterSpec("app.api.routers.knowledge_stores", prefix="/admin/knowledge-stores", tags=("knowledge-stores",)),
+    LazyRouterSpec("app.api.routers.models", tags=("models",)),
+    LazyRouterSpec("app.api.routers.prompts", tags=("prompts",)),
+    LazyRouterSpec("app.api.routers.tools", tags=("tools",)),
+    LazyRouterSpec("app.api.routers.mcp"),
+    LazyRouterSpec("app.api.routers.organizations"),
+    LazyRouterSpec("app.api.routers.org_units", prefix="/api", tags=("org-units",)),
+    LazyRouterSpec("app.api.routers.audit", prefix="/api", tags=("audit",)),
+    LazyRouterSpec("app.api.routers.library", prefix="/api/library", tags=("library",)),
+    LazyRouterSpec("app.api.routers.general", tags=("general",)),
+    LazyRouterSpec("app.api.routers.search", tags=("search",)),
+    LazyRouterSpec("app.api.routers.stt", prefix="/stt", tags=("stt",)),
+    LazyRouterSpec("app.api.routers.texts", tags=("texts",)),
+    LazyRouterSpec("app.api.routers.tts", prefix="/tts", tags=("tts",)),
+    LazyRouterSpec("app.api.routers.voice_ws", prefix="/api/voice", tags=("voice",)),
+    LazyRouterSpec("app.api.routers.rag_ws", prefix="/admin/rag/ws", tags=("rag-websocket",)),
+)
+router_loader = include_routers(app, API_ROUTERS)
 
 @app.get("/health")
 def health_check():
@@ -0,0 +1,127 @@
+"""
+Measure chunking throughput on a synthetic corpus across worker-process counts.
+
+Each worker count chunks the same corpus through `ChunkingService`; 1 worker is the
+in-process (thread) path. Speedup is relative to 1 worker and should grow close to
+linearly with the number of physical cores.
+
+Usage:
+    python scripts/benchmark_chunking.py [--documents 400] [--sentences 400] [--workers 1,2,4,8]
+    python scripts/benchmark_chunking.py --offline-encoding   # byte-level stand-in encoder, no BPE download
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+_WORDS = (
+    "mishnah gemara halakhah commentary tractate argument tradition question answer "
+    "source ruling opinion dispute text study reading teacher student law custom"
+).split()
+
+
+def _corpus(documents: int, sentences: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(documents):
+        text = " ".join(
+            " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 24))).capitalize() + "."
+            for _ in range(sentences)
+        )
+        corpus.append({"id": f"doc-{index}", "text": text, "metadata": {"position": index}})
+    return corpus
+
+
+def _install_offline_encoding(encoding_name: str) -> None:
+    import tiktoken
+    import tiktoken.registry
+
+    tiktoken.registry.ENCODINGS[encoding_name] = tiktoken.Encoding(
+        name=encoding_name,
+        pat_str=r"\S+|\s+",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+
+
+async def _run(workers: int, config, corpus: list[dict], start_method: str) -> tuple[float, int]:
+    from app.services.chunking_service import ChunkingService
+
+    service = ChunkingService(max_workers=workers, min_parallel_chars=0, start_method=start_method)
+    try:
+        # Warm the pool (process start + encoder load) outside the timed run.
+        await service.chunk_documents(config, corpus[: max(2, workers * 2)])
+        started = time.perf_counter()
+        chunks = await service.chunk_documents(config, corpus)
+        return time.perf_counter() - started, len(chunks)
+    finally:
+        service.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=400)
+    parser.add_argument("--sentences", type=int, default=400)
+    parser.add_argument("--workers", default="")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--offline-encoding", action="store_true")
+    args = parser.parse_args()
+
+    from app.rag.factory import ChunkerConfig, ChunkerType
+
+    cpu_count = os.cpu_count() or 1
+    if args.workers:
+        worker_counts = [int(value) for value in args.workers.split(",") if value.strip()]
+    else:
+        worker_counts = sorted({1, *[n for n in (2, 4, 8, 16) if n <= cpu_count], cpu_count})
+
+    start_method = "spawn"
+    if args.offline_encoding:
+        # Forked workers inherit the stand-in encoder registered in this process.
+        _install_offline_encoding("cl100k_base")
+        start_method = "fork"
+
+    config = ChunkerConfig(strategy=ChunkerType.TOKEN_BASED)
+    corpus = _corpus(args.documents, args.sentences, args.seed)
+    total_chars = sum(len(doc["text"]) for doc in corpus)
+
+    results = []
+    baseline: float | None = None
+    for workers in worker_counts:
+        elapsed, chunk_count = asyncio.run(_run(workers, config, corpus, start_method))
+        baseline = baseline or elapsed
+        results.append(
+            {
+                "workers": workers,
+                "seconds": round(elapsed, 3),
+                "chunks": chunk_count,
+                "mb_per_second": round(total_chars / elapsed / 1_000_000, 2),
+                "speedup": round(baseline / elapsed, 2),
+            }
+        )
+
+    print(
+        json.dumps(
+            {
+                "cpu_count": cpu_count,
+                "documents": len(corpus),
+                "characters": total_chars,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Compare RecursiveChunker's single-pass token index against encoding every candidate split.
+
+The baseline encodes each split, overlap candidate and chunk with tiktoken, as the
+chunker did before `TokenOffsetIndex`. Both runs must produce identical chunks.
+
+Texts are Sefaria exports (JSON with a nested "text" array, or plain text files).
+Without --input a synthetic book-length text is generated.
+
+Usage:
+    python scripts/benchmark_recursive_chunker.py --input Genesis.json --input Berakhot.json
+    python scripts/benchmark_recursive_chunker.py [--paragraphs 4000] [--chunk-size 1000] [--chunk-overlap 200]
+    python scripts/benchmark_recursive_chunker.py --offline-encoding   # cl100k split pattern, byte-level ranks
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+_CL100K_PATTERN = (
+    r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}+|\p{N}{1,3}| ?[^\s\p{L}\p{N}]++[\r\n]*|\s*[\r\n]|\s+(?!\S)|\s+"""
+)
+_WORDS = (
+    "mishnah gemara halakhah commentary tractate argument tradition question answer source ruling "
+    "opinion dispute text study reading teacher student law custom rabbi said taught "
+    "משנה גמרא הלכה אמר רבי תנא שמע מינה"
+).split()
+
+
+def _flatten(value) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [line for item in value for line in _flatten(item)]
+    return []
+
+
+def _load(path: Path) -> str:
+    raw = path.read_text(encoding="utf-8")
+    if path.suffix.lower() != ".json":
+        return raw
+    payload = json.loads(raw)
+    versions = payload.get("versions") if isinstance(payload, dict) else None
+    if isinstance(versions, list) and versions:
+        payload = versions[0]
+    return "\n\n".join(line for line in _flatten(payload.get("text") if isinstance(payload, dict) else payload) if line)
+
+
+def _synthetic_book(paragraphs: int, seed: int) -> str:
+    rng = random.Random(seed)
+    blocks = []
+    for _ in range(paragraphs):
+        sentences = [
+            " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 30))).capitalize() + rng.choice([".", "?", ";", ":"])
+            for _ in range(rng.randint(2, 12))
+        ]
+        blocks.append(" ".join(sentences))
+    return "\n\n".join(blocks)
+
+
+def _install_offline_encoding(encoding_name: str) -> None:
+    import tiktoken
+    import tiktoken.registry
+
+    tiktoken.registry.ENCODINGS[encoding_name] = tiktoken.Encoding(
+        name=encoding_name,
+        pat_str=_CL100K_PATTERN,
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", action="append", default=[])
+    parser.add_argument("--paragraphs", type=int, default=4000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--chunk-overlap", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--offline-encoding", action="store_true")
+    args = parser.parse_args()
+
+    if args.offline_encoding:
+        _install_offline_encoding("cl100k_base")
+
+    from app.rag.providers.chunker import recursive
+    from app.rag.providers.chunker.recursive import RecursiveChunker
+
+    class _PerSplitEncodingIndex:
+        """Encodes every requested span, like the chunker did before the token index."""
+
+        def __init__(self, encoding, text: str) -> None:
+            self._encoding = encoding
+            self._text = text
+
+        def count(self, start: int, end: int) -> int:
+            return len(self._encoding.encode(self._text[start:end]))
+
+    def _run(index_cls, text: str, name: str) -> tuple[float, list[dict]]:
+        original = recursive.TokenOffsetIndex
+        recursive.TokenOffsetIndex = index_cls
+        try:
+            chunker = RecursiveChunker(chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+            started = time.perf_counter()
+            chunks = [item.model_dump() for item in chunker.chunk(text, doc_id=name)]
+            return time.perf_counter() - started, chunks
+        finally:
+            recursive.TokenOffsetIndex = original
+
+    if args.input:
+        texts = {Path(path).name: _load(Path(path)) for path in args.input}
+    else:
+        texts = {"synthetic": _synthetic_book(args.paragraphs, args.seed)}
+
+    results = []
+    for name, text in texts.items():
+        timings = {}
+        outputs = {}
+        for label, index_cls in (("per_split_encoding", _PerSplitEncodingIndex), ("token_index", recursive.TokenOffsetIndex)):
+            timings[label], outputs[label] = _run(index_cls, text, name)
+        results.append(
+            {
+                "text": name,
+                "characters": len(text),
+                "chunks": len(outputs["token_index"]),
+                "identical": outputs["token_index"] == outputs["per_split_encoding"],
+                "per_split_encoding_seconds": round(timings["per_split_encoding"], 3),
+                "token_index_seconds": round(timings["token_index"], 3),
+                "speedup": round(timings["per_split_encoding"] / max(timings["token_index"], 1e-9), 2),
+            }
+        )
+
+    print(json.dumps({"chunk_size": args.chunk_size, "chunk_overlap": args.chunk_overlap, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
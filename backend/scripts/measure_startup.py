@@ -0,0 +1,101 @@
+"""
+Measure API cold-start cost with eager vs lazy router loading.
+
+Each sample runs in a fresh interpreter so import caches do not carry over:
+- import: time to import `main` (what uvicorn pays before serving anything)
+- first request: time to import and mount the deferred routers (the lifespan starts this
+  on a worker thread; requests that arrive earlier wait for it without blocking the loop)
+- total: import + first request
+
+Usage:
+    python scripts/measure_startup.py [--runs 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+_PROBE = r"""
+import json
+import time
+
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.router_loader.load()
+loaded = time.perf_counter()
+
+from app.services.registry_seeding import compute_startup_seed_fingerprint
+
+fingerprint_started = time.perf_counter()
+compute_startup_seed_fingerprint()
+fingerprint_done = time.perf_counter()
+
+print(json.dumps({
+    "import": imported - started,
+    "first_request": loaded - imported,
+    "fingerprint": fingerprint_done - fingerprint_started,
+    "routes": len(main.app.routes),
+}))
+"""
+
+
+def _sample(lazy: bool) -> dict[str, float]:
+    env = dict(os.environ)
+    env["API_LAZY_ROUTERS"] = "1" if lazy else "0"
+    env.setdefault("SECRET_KEY", "startup-benchmark")
+    completed = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", _PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _median(samples: list[dict[str, float]], key: str) -> float:
+    return statistics.median(sample[key] for sample in samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    for label, lazy in (("eager", False), ("lazy", True)):
+        samples = [_sample(lazy) for _ in range(max(1, args.runs))]
+        results[label] = {
+            "import": _median(samples, "import"),
+            "first_request": _median(samples, "first_request"),
+            "fingerprint": _median(samples, "fingerprint"),
+            "routes": samples[-1]["routes"],
+        }
+
+    print(f"{'mode':<8}{'import (s)':>12}{'first req (s)':>15}{'total (s)':>12}{'routes':>8}")
+    for label, row in results.items():
+        total = row["import"] + row["first_request"]
+        print(f"{label:<8}{row['import']:>12.3f}{row['first_request']:>15.3f}{total:>12.3f}{row['routes']:>8}")
+
+    eager_import = results["eager"]["import"]
+    lazy_import = results["lazy"]["import"]
+    if eager_import > 0:
+        print(
+            f"\nImport-to-ready improvement: {eager_import - lazy_import:.3f}s "
+            f"({(1 - lazy_import / eager_import) * 100:.1f}% faster)"
+        )
+    print(f"Seed fingerprint check: {results['lazy']['fingerprint'] * 1000:.1f}ms per boot")
+
+
+if __name__ == "__main__":
+    main()
@@ -575,3 +575,117 @@ async def test_get_thread_turn_page_allows_org_scoped_read_for_project_thread(db
     assert page_result is not None
     assert page_result.thread.id == thread.id
     assert len(page_result.page.turns) == 1
+
+
+@pytest.mark.asyncio
+async def test_build_subthread_tree_loads_levels_with_child_and_turn_limits(db_session):
+    tenant, user, agent = await _seed_thread_context(db_session)
+    root = AgentThread(
+        organization_id=tenant.id,
+        user_id=user.id,
+        agent_id=agent.id,
+        surface=AgentThreadSurface.internal,
+        title="Root",
+    )
+    db_session.add(root)
+    await db_session.flush()
+
+    base_time = datetime(2026, 3, 16, 12, 0, tzinfo=timezone.utc)
+    children: list[AgentThread] = []
+    for child_index in range(3):
+        child = AgentThread(
+            organization_id=tenant.id,
+            user_id=user.id,
+            agent_id=agent.id,
+            surface=AgentThreadSurface.internal,
+            title=f"Child {child_index}",
+            root_thread_id=root.id,
+            parent_thread_id=root.id,
+            lineage_depth=1,
+            last_activity_at=base_time + timedelta(minutes=child_index),
+        )
+        db_session.add(child)
+        children.append(child)
+    await db_session.flush()
+
+    grandchildren: list[AgentThread] = []
+    for child in children:
+        grandchild = AgentThread(
+            organization_id=tenant.id,
+            user_id=user.id,
+            agent_id=agent.id,
+            surface=AgentThreadSurface.internal,
+            title=f"Grandchild of {child.title}",
+            parent_thread_id=child.id,
+        )
+        db_session.add(grandchild)
+        grandchildren.append(grandchild)
+    await db_session.flush()
+
+    for child in children:
+        for turn_index in range(3):
+            run = AgentRun(
+                organization_id=tenant.id,
+                agent_id=agent.id,
+                user_id=user.id,
+                initiator_user_id=user.id,
+                thread_id=child.id,
+                input_params={"input": f"{child.title}-{turn_index}"},
+            )
+            db_session.add(run)
+            await db_session.flush()
+            db_session.add(
+                AgentThreadTurn(
+                    thread_id=child.id,
+                    run_id=run.id,
+                    turn_index=turn_index,
+                    user_input_text=f"{child.title}-{turn_index}",
+                )
+            )
+    await db_session.commit()
+
+    service = ThreadService(db_session)
+    page_result = await service.get_thread_turn_page(
+        organization_id=tenant.id,
+        thread_id=root.id,
+        limit=20,
+    )
+    assert page_result is not None
+
+    tree = await service.build_subthread_tree(
+        root_thread=page_result.thread,
+        root_page=page_result.page,
+        depth=1,
+        turn_limit=2,
+        child_limit=2,
+    )
+
+    assert tree.has_children is True
+    assert [node.thread.title for node in tree.children] == ["Child 2", "Child 1"]
+    for node in tree.children:
+        assert node.has_children is True
+        assert node.children == []
+        assert [turn.user_input_text for turn in node.page.turns] == [
+            f"{node.thread.title}-1",
+            f"{node.thread.title}-2",
+        ]
+        assert node.page.has_more is True
+        assert node.page.next_before_turn_index == 1
+
+    deep_tree = await service.build_subthread_tree(
+        root_thread=page_result.thread,
+        root_page=page_result.page,
+        depth=2,
+        turn_limit=5,
+        child_limit=5,
+    )
+
+    assert len(deep_tree.children) == 3
+    for node in deep_tree.children:
+        assert len(node.children) == 1
+        grandchild_node = node.children[0]
+        assert grandchild_node.thread.title == f"Grandchild of {node.thread.title}"
+        assert grandchild_node.thread.root_thread_id == grandchild_node.thread.id
+        assert grandchild_node.thread.lineage_depth == 0
+        assert grandchild_node.page.turns == []
+        assert grandchild_node.has_children is False
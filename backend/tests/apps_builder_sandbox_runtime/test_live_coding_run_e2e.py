@@ -15,6 +15,7 @@ import pytest
 from sqlalchemy import select
 
 from app.services.apps_builder_trace import apps_builder_trace_file_path
+from app.services.trace_sink import flush_trace_sink
 from app.db.postgres.models.published_apps import PublishedApp
 from tests.published_apps._helpers import admin_headers, seed_admin_tenant_and_agent
 
@@ -404,6 +405,7 @@ async def _observe_pipeline(
 
 
 def _filter_trace_lines(*, app_id: str, run_id: str) -> list[str]:
+    flush_trace_sink()
     trace_path = Path(apps_builder_trace_file_path())
     if not trace_path.exists():
         return []
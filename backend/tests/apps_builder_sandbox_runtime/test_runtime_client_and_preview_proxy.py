@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import gzip
 from datetime import datetime, timezone
 from types import SimpleNamespace
 from urllib.parse import parse_qs, urlparse
@@ -12,6 +13,7 @@ from app.api.routers import published_apps_builder_preview_proxy as preview_prox
 from app.api.routers.published_apps_preview_auth import PREVIEW_COOKIE_NAME, create_preview_token
 from app.db.postgres.models.agent_threads import AgentThreadSurface
 from app.services import published_app_draft_dev_runtime_client as runtime_client_module
+from app.services import published_app_preview_proxy_pool as preview_proxy_pool
 from app.services.published_app_auth_service import PublishedAppAuthRateLimitError
 from app.services.published_app_draft_dev_runtime_client import (
     PublishedAppDraftDevRuntimeClient,
@@ -70,6 +72,50 @@ class _FakeResponse:
         self.status_code = status_code
         self.headers = headers or {}
         self.content = content
+        self.closed = False
+
+    async def aread(self) -> bytes:
+        return self.content
+
+    async def aiter_raw(self):
+        for start in range(0, len(self.content), 4):
+            yield self.content[start : start + 4]
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class _FakePreviewUpstreamClient:
+    """Stands in for the pooled httpx client; subclasses implement ``request``."""
+
+    instances: list["_FakePreviewUpstreamClient"] = []
+
+    def __init__(self, *args, **kwargs):
+        _ = args, kwargs
+        type(self).instances.append(self)
+
+    def build_request(self, method, url, headers=None, content=None):
+        return SimpleNamespace(method=method, url=url, headers=headers, content=content)
+
+    async def send(self, request, stream=False):
+        assert stream is True
+        content = request.content
+        if content is not None and not isinstance(content, bytes):
+            content = b"".join([chunk async for chunk in content])
+        return await self.request(request.method, request.url, headers=request.headers, content=content)
+
+    async def aclose(self):
+        return None
+
+
+@pytest.fixture(autouse=True)
+def _reset_preview_proxy_pool():
+    preview_proxy_pool.get_preview_target_cache().clear()
+    preview_proxy_pool.get_preview_upstream_client_pool()._clients.clear()
+    preview_proxy_pool.get_preview_latency_histograms().reset()
+    yield
+    preview_proxy_pool.get_preview_target_cache().clear()
+    preview_proxy_pool.get_preview_upstream_client_pool()._clients.clear()
 
 
 @pytest.mark.asyncio
@@ -185,7 +231,7 @@ async def test_builder_preview_proxy_accepts_valid_token_and_forwards_sprite_aut
 
     captured: dict[str, object] = {}
 
-    class _FakeAsyncClient:
+    class _FakeAsyncClient(_FakePreviewUpstreamClient):
         def __init__(self, *args, **kwargs):
             _ = args, kwargs
 
@@ -258,7 +304,7 @@ async def test_builder_preview_proxy_ignores_stale_preview_cookie_when_query_tok
             }
         )
 
-    class _FakeAsyncClient:
+    class _FakeAsyncClient(_FakePreviewUpstreamClient):
         def __init__(self, *args, **kwargs):
             _ = args, kwargs
 
@@ -385,7 +431,7 @@ async def test_builder_preview_proxy_requires_query_token_even_when_preview_cook
             }
         )
 
-    class _FakeAsyncClient:
+    class _FakeAsyncClient(_FakePreviewUpstreamClient):
         def __init__(self, *args, **kwargs):
             _ = args, kwargs
 
@@ -463,7 +509,7 @@ async def test_builder_preview_proxy_injects_runtime_context_and_static_route_br
             }
         )
 
-    class _FakeAsyncClient:
+    class _FakeAsyncClient(_FakePreviewUpstreamClient):
         def __init__(self, *args, **kwargs):
             _ = args, kwargs
 
@@ -551,7 +597,7 @@ async def test_builder_preview_proxy_rewrites_js_and_css_asset_references_with_r
         ),
     }
 
-    class _FakeAsyncClient:
+    class _FakeAsyncClient(_FakePreviewUpstreamClient):
         def __init__(self, *args, **kwargs):
             _ = args, kwargs
 
@@ -630,7 +676,7 @@ async def test_builder_preview_proxy_passthroughs_static_assets(monkeypatch: pyt
 
     captured: dict[str, object] = {}
 
-    class _FakeAsyncClient:
+    class _FakeAsyncClient(_FakePreviewUpstreamClient):
         def __init__(self, *args, **kwargs):
             _ = args, kwargs
 
@@ -662,6 +708,153 @@ async def test_builder_preview_proxy_passthroughs_static_assets(monkeypatch: pyt
     assert response.text == "console.log('ok')"
 
 
+@pytest.mark.asyncio
+async def test_builder_preview_proxy_reuses_pooled_client_and_cached_target_for_assets(
+    monkeypatch: pytest.MonkeyPatch,
+    client,
+):
+    loaded_session_ids: list[str] = []
+    upstream_responses: list[_FakeResponse] = []
+    created_clients: list[object] = []
+    asset_bytes = gzip.compress(b"PNGBYTES")
+
+    async def _fake_load_session(*, db, session_id):
+        _ = db
+        loaded_session_ids.append(str(session_id))
+        return _fake_session(
+            {
+                "preview": {
+                    "upstream_base_url": "https://sprite-host.example",
+                    "base_path": "/public/apps-builder/draft-dev/sessions/session-1/preview/",
+                    "upstream_path": "/",
+                }
+            }
+        )
+
+    class _FakeAsyncClient(_FakePreviewUpstreamClient):
+        def __init__(self, *args, **kwargs):
+            _ = args
+            assert kwargs["limits"] is not None
+            created_clients.append(self)
+
+        async def request(self, method, url, headers=None, content=None):
+            _ = method, url, headers, content
+            upstream = _FakeResponse(
+                headers={
+                    "content-type": "image/png",
+                    "content-encoding": "gzip",
+                    "content-length": str(len(asset_bytes)),
+                },
+                content=asset_bytes,
+            )
+            upstream_responses.append(upstream)
+            return upstream
+
+    monkeypatch.setattr(preview_proxy_router, "_load_session", _fake_load_session)
+    monkeypatch.setattr(preview_proxy_router.httpx, "AsyncClient", _FakeAsyncClient)
+    preview_token = _preview_token()
+
+    for asset in ("logo.png", "hero.png", "icon.png"):
+        response = await client.get(
+            f"/public/apps-builder/draft-dev/sessions/session-1/preview/assets/{asset}?runtime_token={preview_token}",
+            headers={"accept-encoding": "identity"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-length"] == str(len(asset_bytes))
+        assert response.content == b"PNGBYTES"
+
+    assert loaded_session_ids == ["session-1"]
+    assert len(created_clients) == 1
+    assert len(upstream_responses) == 3
+    assert all(upstream.closed for upstream in upstream_responses)
+    histograms = preview_proxy_pool.get_preview_latency_histograms().snapshot()
+    assert histograms["asset"]["count"] == 3
+    assert histograms["asset"]["buckets"]["+Inf"] == 3
+
+
+@pytest.mark.asyncio
+async def test_builder_preview_proxy_refresh_reloads_session_and_drops_stale_pooled_client(
+    monkeypatch: pytest.MonkeyPatch,
+    client,
+):
+    upstream_base_urls = ["https://stale-host.example", "https://fresh-host.example", "https://fresh-host.example"]
+    requested_urls: list[str] = []
+    closed_clients: list[object] = []
+
+    async def _fake_load_session(*, db, session_id):
+        _ = db, session_id
+        return _fake_session(
+            {
+                "preview": {
+                    "upstream_base_url": upstream_base_urls.pop(0),
+                    "base_path": "/public/apps-builder/draft-dev/sessions/session-1/preview/",
+                    "upstream_path": "/",
+                }
+            }
+        )
+
+    class _FakeAsyncClient(_FakePreviewUpstreamClient):
+        async def request(self, method, url, headers=None, content=None):
+            _ = method, headers, content
+            requested_urls.append(url)
+            if url.startswith("https://stale-host.example"):
+                raise preview_proxy_router.httpx.ConnectError("connection refused")
+            return _FakeResponse(headers={"content-type": "application/json"}, content=b"{}")
+
+        async def aclose(self):
+            closed_clients.append(self)
+
+    async def _fake_touch_preview_session_activity(**kwargs):
+        _ = kwargs
+
+    monkeypatch.setattr(preview_proxy_router, "_load_session", _fake_load_session)
+    monkeypatch.setattr(preview_proxy_router, "_touch_preview_session_activity", _fake_touch_preview_session_activity)
+    monkeypatch.setattr(preview_proxy_router.httpx, "AsyncClient", _FakeAsyncClient)
+    preview_token = _preview_token()
+
+    response = await client.get(
+        f"/public/apps-builder/draft-dev/sessions/session-1/preview/api/data.json?runtime_token={preview_token}",
+    )
+    assert response.status_code == 200
+    assert requested_urls == [
+        "https://stale-host.example/api/data.json",
+        "https://fresh-host.example/api/data.json",
+    ]
+    assert len(closed_clients) == 1
+    assert preview_proxy_pool.get_preview_target_cache().get(preview_token) is None
+
+    response = await client.get(
+        f"/public/apps-builder/draft-dev/sessions/session-1/preview/api/data.json?runtime_token={preview_token}",
+    )
+    assert response.status_code == 200
+    assert requested_urls[-1] == "https://fresh-host.example/api/data.json"
+    assert upstream_base_urls == []
+
+
+def test_preview_target_cache_expires_entries_and_honors_token_expiry():
+    now = [100.0]
+    cache = preview_proxy_pool.PreviewTargetCache(ttl_seconds=5.0, clock=lambda: now[0])
+    session = _fake_session()
+
+    cache.put("token-a", session=session, payload={}, target={"upstream_base_url": "https://a"})
+    cache.put(
+        "token-b",
+        session=session,
+        payload={"exp": datetime.now(timezone.utc).timestamp() - 1},
+        target={"upstream_base_url": "https://b"},
+    )
+
+    assert cache.get("token-a") is not None
+    assert cache.get("token-b") is None
+    now[0] = 105.0
+    assert cache.get("token-a") is None
+
+    cache.put("token-c", session=session, payload={}, target={})
+    cache.invalidate_session("session-1")
+    assert cache.get("token-c") is None
+
+
 @pytest.mark.asyncio
 async def test_builder_preview_proxy_uses_query_token_session_when_asset_route_has_stale_session_id(
     monkeypatch: pytest.MonkeyPatch,
@@ -685,7 +878,7 @@ async def test_builder_preview_proxy_uses_query_token_session_when_asset_route_h
 
     captured: dict[str, object] = {}
 
-    class _FakeAsyncClient:
+    class _FakeAsyncClient(_FakePreviewUpstreamClient):
         def __init__(self, *args, **kwargs):
             _ = args, kwargs
 
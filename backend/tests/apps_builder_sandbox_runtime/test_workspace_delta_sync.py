@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import dataclasses
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from app.services.published_app_draft_dev_sync_manifest import (
+    build_workspace_manifest,
+    get_workspace_sync_manifest_store,
+    workspace_manifest_digest,
+)
+from app.services.published_app_sandbox_backend import PublishedAppSandboxSyncConflictError
+from app.services.published_app_sandbox_backend_controller import ControllerSandboxBackend
+from app.services.published_app_sandbox_backend_factory import (
+    build_published_app_sandbox_backend,
+    load_published_app_sandbox_backend_config,
+)
+from app.services.published_app_sandbox_backend_sprite import SpriteSandboxBackend
+
+
+@pytest.fixture(autouse=True)
+def _reset_sync_manifests(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("APPS_SANDBOX_BACKEND", "sprite")
+    monkeypatch.setenv("APPS_SPRITE_API_TOKEN", "sprite-token")
+    get_workspace_sync_manifest_store().clear()
+    yield
+    get_workspace_sync_manifest_store().clear()
+
+
+def _controller_backend() -> ControllerSandboxBackend:
+    config = dataclasses.replace(
+        load_published_app_sandbox_backend_config(),
+        backend="controller",
+        controller_url="http://controller.invalid",
+    )
+    backend = build_published_app_sandbox_backend(config)
+    assert isinstance(backend, ControllerSandboxBackend)
+    return backend
+
+
+async def _controller_sync(backend: ControllerSandboxBackend, files: dict[str, str]):
+    return await backend.sync_session(
+        sandbox_id="sandbox-1",
+        app_id="app-1",
+        app_public_id="public-1",
+        agent_id="agent-1",
+        entry_file="src/main.tsx",
+        files=files,
+        idle_timeout_seconds=180,
+        dependency_hash="dep-hash",
+        install_dependencies=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_controller_sync_sends_deltas_once_controller_acknowledges_manifest(monkeypatch: pytest.MonkeyPatch):
+    backend = _controller_backend()
+    payloads: list[dict] = []
+    server_manifest: dict[str, str] = {}
+    reject_next_delta = {"value": False}
+
+    async def _fake_request(method, path, *, json_payload=None, timeout_seconds=None):
+        _ = method, path, timeout_seconds
+        payloads.append(json_payload)
+        if "files" in json_payload:
+            server_manifest.clear()
+            server_manifest.update(json_payload["files"])
+        else:
+            if reject_next_delta["value"]:
+                reject_next_delta["value"] = False
+                raise PublishedAppSandboxSyncConflictError("manifest moved")
+            for path in json_payload["deleted_paths"]:
+                server_manifest.pop(path, None)
+            server_manifest.update(json_payload["changed_files"])
+        return {"status": "running", "manifest_digest": workspace_manifest_digest(build_workspace_manifest(server_manifest))}
+
+    monkeypatch.setattr(backend, "_request", _fake_request)
+
+    await _controller_sync(backend, {"src/main.tsx": "v1", "src/a.ts": "a"})
+    assert "files" in payloads[-1]
+
+    await _controller_sync(backend, {"src/main.tsx": "v2", "src/a.ts": "a"})
+    assert "files" not in payloads[-1]
+    assert payloads[-1]["changed_files"] == {"src/main.tsx": "v2"}
+    assert payloads[-1]["deleted_paths"] == []
+
+    reject_next_delta["value"] = True
+    await _controller_sync(backend, {"src/main.tsx": "v3"})
+    assert payloads[-2]["deleted_paths"] == ["src/a.ts"]
+    assert payloads[-1]["files"] == {"src/main.tsx": "v3"}
+    assert server_manifest == {"src/main.tsx": "v3"}
+
+
+@pytest.mark.asyncio
+async def test_controller_sync_keeps_full_payloads_for_controllers_without_manifest_support(monkeypatch: pytest.MonkeyPatch):
+    backend = _controller_backend()
+    payloads: list[dict] = []
+
+    async def _fake_request(method, path, *, json_payload=None, timeout_seconds=None):
+        _ = method, path, timeout_seconds
+        payloads.append(json_payload)
+        return {"status": "running"}
+
+    monkeypatch.setattr(backend, "_request", _fake_request)
+
+    await _controller_sync(backend, {"src/main.tsx": "v1"})
+    await _controller_sync(backend, {"src/main.tsx": "v2"})
+
+    assert [payload["files"] for payload in payloads] == [{"src/main.tsx": "v1"}, {"src/main.tsx": "v2"}]
+
+
+@pytest.mark.asyncio
+async def test_sprite_sync_ships_only_changed_files_and_resends_drifted_paths(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+):
+    backend = build_published_app_sandbox_backend(load_published_app_sandbox_backend_config())
+    assert isinstance(backend, SpriteSandboxBackend)
+    shipped: list[dict[str, str]] = []
+    original_run_sync_script = backend._run_sync_script
+
+    async def _recording_run_sync_script(*, sprite_name, workspace_path, files, expected):
+        shipped.append(dict(files))
+        return await original_run_sync_script(
+            sprite_name=sprite_name,
+            workspace_path=workspace_path,
+            files=files,
+            expected=expected,
+        )
+
+    async def _local_exec_with_stdin(*, sprite_name, command, stdin_text, timeout_seconds=180, max_output_bytes=12000, **_):
+        _ = sprite_name, max_output_bytes
+        completed = subprocess.run(command, input=stdin_text, capture_output=True, text=True, timeout=timeout_seconds)
+        assert completed.returncode == 0, completed.stderr
+        return completed.stdout, 0
+
+    monkeypatch.setattr(backend, "_run_sync_script", _recording_run_sync_script)
+    monkeypatch.setattr(backend, "_exec_with_stdin", _local_exec_with_stdin)
+    workspace = tmp_path / "workspace"
+    (workspace / "node_modules" / "dep").mkdir(parents=True)
+    (workspace / "node_modules" / "dep" / "index.js").write_text("dep", encoding="utf-8")
+
+    async def _sync(files: dict[str, str]):
+        return await backend._sync_files_to_workspace(  # noqa: SLF001
+            sprite_name="sprite-1",
+            workspace_path=str(workspace),
+            files=files,
+        )
+
+    first = await _sync({"src/main.tsx": "v1", "src/a.ts": "a", "src/old/b.ts": "b"})
+    assert shipped == [{"src/main.tsx": "v1", "src/a.ts": "a", "src/old/b.ts": "b"}]
+    assert first["wrote_count"] == 3
+
+    shipped.clear()
+    (workspace / "src" / "a.ts").write_text("edited in sprite", encoding="utf-8")
+    second = await _sync({"src/main.tsx": "v2", "src/a.ts": "a"})
+
+    assert shipped == [{"src/main.tsx": "v2"}, {"src/a.ts": "a"}]
+    assert second["wrote_count"] == 2
+    assert second["deleted_count"] == 1
+    assert (workspace / "src" / "a.ts").read_text(encoding="utf-8") == "a"
+    assert (workspace / "src" / "main.tsx").read_text(encoding="utf-8") == "v2"
+    assert not (workspace / "src" / "old").exists()
+    assert (workspace / "node_modules" / "dep" / "index.js").exists()
+
+    shipped.clear()
+    third = await _sync({"src/main.tsx": "v2", "src/a.ts": "a"})
+    assert shipped == [{}]
+    assert third["wrote_count"] == 0
+    assert third["revision_token"] == second["revision_token"]
@@ -4,6 +4,7 @@ import json
 
 from app.services.apps_builder_trace import apps_builder_trace
 from app.services.published_app_coding_pipeline_trace import pipeline_trace
+from app.services.trace_sink import TraceSink, flush_trace_sink
 
 
 def _read_lines(path):
@@ -25,6 +26,7 @@ def test_apps_builder_trace_writes_jsonl(monkeypatch, tmp_path):
         app_id="app-1",
         session_id="session-1",
     )
+    flush_trace_sink()
 
     events = _read_lines(trace_path)
     assert len(events) == 1
@@ -49,6 +51,7 @@ def test_pipeline_trace_is_mirrored_to_apps_builder_trace(monkeypatch, tmp_path)
         app_id="app-1",
         run_id="run-1",
     )
+    flush_trace_sink()
 
     shared_events = _read_lines(shared_trace_path)
     legacy_events = _read_lines(legacy_trace_path)
@@ -59,3 +62,66 @@ def test_pipeline_trace_is_mirrored_to_apps_builder_trace(monkeypatch, tmp_path)
     assert len(legacy_events) == 1
     assert legacy_events[0]["event"] == "runtime.create_run.started"
     assert legacy_events[0]["pipeline"] == "runtime"
+
+
+def test_apps_builder_trace_applies_event_and_domain_sample_rates(monkeypatch, tmp_path):
+    trace_path = tmp_path / "apps-builder-trace.jsonl"
+    monkeypatch.setenv("APPS_BUILDER_TRACE_ENABLED", "1")
+    monkeypatch.setenv("APPS_BUILDER_TRACE_FILE", str(trace_path))
+    monkeypatch.setenv(
+        "APPS_BUILDER_TRACE_SAMPLE_RATES",
+        "preview.proxy=0,preview.proxy.failed=1",
+    )
+
+    for _ in range(5):
+        apps_builder_trace("preview.proxy.completed", domain="preview.proxy")
+    apps_builder_trace("preview.proxy.failed", domain="preview.proxy")
+    apps_builder_trace("sandbox.start.requested", domain="sandbox.sprite")
+    flush_trace_sink()
+
+    assert [event["event"] for event in _read_lines(trace_path)] == [
+        "preview.proxy.failed",
+        "sandbox.start.requested",
+    ]
+
+
+def test_trace_sink_batches_rotates_and_counts_drops(tmp_path):
+    trace_path = tmp_path / "sink.jsonl"
+    sink = TraceSink(capacity=3, batch_size=1, flush_interval_seconds=60, max_file_bytes=40, backup_count=2)
+
+    for index in range(5):
+        sink.emit(str(trace_path), {"index": index, "padding": "x" * 8})
+
+    assert sink.pending == 3
+    assert sink.dropped == 2
+    sink.flush()
+    assert sink.pending == 0
+    assert sink.written == 3
+
+    written = []
+    for path in (tmp_path / "sink.jsonl.2", tmp_path / "sink.jsonl.1", trace_path):
+        written.extend(event["index"] for event in _read_lines(path))
+    assert written == [0, 1, 2]
+
+
+def test_trace_sink_snapshots_payloads_and_skips_unrenderable_ones(tmp_path):
+    trace_path = tmp_path / "sink.jsonl"
+    sink = TraceSink(capacity=10, batch_size=10, flush_interval_seconds=60)
+
+    class _Unrenderable:
+        def __str__(self):
+            raise RuntimeError("cannot render")
+
+        __repr__ = __str__
+
+    payload = {"event": "first", "items": [1]}
+    assert sink.emit(str(trace_path), payload)
+    payload["event"] = "mutated"
+    payload["items"].append(2)
+    payload["late"] = object()
+    assert not sink.emit(str(trace_path), {"event": "broken", "value": _Unrenderable()})
+    assert sink.emit(str(trace_path), {"event": "second"})
+
+    sink.flush()
+    assert _read_lines(trace_path) == [{"event": "first", "items": [1]}, {"event": "second"}]
+    assert sink.written == 2
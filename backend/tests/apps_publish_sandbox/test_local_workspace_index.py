@@ -0,0 +1,125 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.services.published_app_draft_dev_local_runtime import (
+    LocalDraftDevRuntimeManager,
+    _SessionProcess,
+)
+
+
+class _DummyProcess:
+    def poll(self):
+        return None
+
+
+def _write_text(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def _manager_with_session(project_dir: Path, sandbox_id: str = "sandbox-1") -> LocalDraftDevRuntimeManager:
+    manager = LocalDraftDevRuntimeManager()
+    manager._state[sandbox_id] = _SessionProcess(  # noqa: SLF001
+        sandbox_id=sandbox_id,
+        project_dir=project_dir,
+        port=5173,
+        process=_DummyProcess(),  # type: ignore[arg-type]
+        dependency_hash="dep-hash",
+        revision_seq=1,
+    )
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_search_code_uses_incremental_index_and_skips_ignored_trees(tmp_path: Path) -> None:
+    project_dir = tmp_path / "sandbox"
+    _write_text(project_dir / "src" / "App.tsx", "export function App() {\n  return <Greeting />;\n}\n")
+    _write_text(project_dir / "src" / "Greeting.tsx", "export const Greeting = () => <p>Hello</p>;\n")
+    _write_text(project_dir / "node_modules" / "dep" / "index.js", "const Greeting = 1;\n")
+    _write_text(project_dir / "dist" / "app.js", "Greeting\n")
+    manager = _manager_with_session(project_dir)
+
+    result = await manager.search_code(sandbox_id="sandbox-1", query="greeting")
+    assert [(item["path"], item["line"]) for item in result["matches"]] == [
+        ("src/App.tsx", 2),
+        ("src/Greeting.tsx", 1),
+    ]
+
+    await manager.write_file(sandbox_id="sandbox-1", path="src/Footer.tsx", content="// greeting footer\n")
+    await manager.delete_file(sandbox_id="sandbox-1", path="src/App.tsx")
+    _write_text(project_dir / "src" / "External.ts", "// written by another tool: GREETING\n")
+
+    result = await manager.search_code(sandbox_id="sandbox-1", query="Greeting", max_results=10)
+    assert [item["path"] for item in result["matches"]] == [
+        "src/External.ts",
+        "src/Footer.tsx",
+        "src/Greeting.tsx",
+    ]
+    assert result["revision_token"] == "sandbox-seq-3"
+
+    short = await manager.search_code(sandbox_id="sandbox-1", query="p>", max_results=1)
+    assert short["matches"] == [{"path": "src/Greeting.tsx", "line": 1, "preview": "export const Greeting = () => <p>Hello</p>;"}]
+
+
+@pytest.mark.asyncio
+async def test_workspace_index_caches_entries_and_tracks_patches_and_sync(tmp_path: Path) -> None:
+    project_dir = tmp_path / "sandbox"
+    _write_text(project_dir / "src" / "main.ts", "export function boot() {}\nexport function run() {}\n")
+    _write_text(project_dir / "package.json", '{"name":"demo"}')
+    manager = _manager_with_session(project_dir)
+
+    first = await manager.workspace_index(sandbox_id="sandbox-1", max_symbols_per_file=1)
+    assert [row["path"] for row in first["files"]] == ["package.json", "src/main.ts"]
+    main_row = first["files"][1]
+    assert main_row["symbol_outline"] == [{"name": "boot", "kind": "function", "line": 1}]
+    assert main_row["language"] == "typescript"
+
+    patch = "\n".join(
+        [
+            "--- a/src/main.ts",
+            "+++ b/src/main.ts",
+            "@@ -1,2 +1,2 @@",
+            " export function boot() {}",
+            "-export function run() {}",
+            "+export function launch() {}",
+            "",
+        ]
+    )
+    patched = await manager.apply_patch(sandbox_id="sandbox-1", patch=patch)
+    assert patched["ok"] is True
+
+    queried = await manager.workspace_index(sandbox_id="sandbox-1", query="launch")
+    assert [row["path"] for row in queried["files"]] == ["src/main.ts"]
+    assert queried["files"][0]["score"] == 5
+    assert [item["name"] for item in queried["files"][0]["symbol_outline"]] == ["boot", "launch"]
+
+    await manager.sync_session(
+        sandbox_id="sandbox-1",
+        files={"src/other.ts": "export class Other {}\n"},
+        dependency_hash="dep-hash",
+        install_dependencies=False,
+    )
+    synced = await manager.workspace_index(sandbox_id="sandbox-1")
+    assert [row["path"] for row in synced["files"]] == ["src/other.ts"]
+    assert synced["files"][0]["symbol_outline"] == [{"name": "Other", "kind": "class", "line": 1}]
+
+
+@pytest.mark.asyncio
+async def test_in_flight_index_query_does_not_block_other_manager_calls(tmp_path: Path) -> None:
+    project_dir = tmp_path / "sandbox"
+    _write_text(project_dir / "src" / "main.ts", "const needle = 1;\n")
+    manager = _manager_with_session(project_dir)
+
+    async with manager._session_lock("sandbox-1"):  # noqa: SLF001
+        pending = asyncio.create_task(manager.search_code(sandbox_id="sandbox-1", query="needle"))
+        await asyncio.sleep(0)
+        written = await asyncio.wait_for(
+            manager.write_file(sandbox_id="sandbox-1", path="src/extra.ts", content="const needle = 2;\n"),
+            timeout=2,
+        )
+        assert written["status"] == "written"
+        assert not pending.done()
+    result = await pending
+    assert [item["path"] for item in result["matches"]] == ["src/extra.ts", "src/main.ts"]
@@ -0,0 +1,116 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from app.services.published_app_draft_dev_local_runtime import (
+    LocalDraftDevRuntimeManager,
+    LocalDraftDevRuntimeSyncConflictError,
+    _SessionProcess,
+)
+from app.services.published_app_draft_dev_sync_manifest import compute_workspace_sync_delta, build_workspace_manifest
+
+
+class _DummyProcess:
+    def poll(self):
+        return None
+
+
+def _write_text(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def _manager_with_session(project_dir: Path) -> LocalDraftDevRuntimeManager:
+    manager = LocalDraftDevRuntimeManager()
+    project_dir.mkdir(parents=True, exist_ok=True)
+    manager._state["sandbox-1"] = _SessionProcess(  # noqa: SLF001
+        sandbox_id="sandbox-1",
+        project_dir=project_dir,
+        port=5173,
+        process=_DummyProcess(),  # type: ignore[arg-type]
+        dependency_hash="dep-hash",
+        revision_seq=1,
+    )
+    return manager
+
+
+async def _sync(manager: LocalDraftDevRuntimeManager, **kwargs):
+    return await manager.sync_session(
+        sandbox_id="sandbox-1",
+        dependency_hash="dep-hash",
+        install_dependencies=False,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_full_sync_skips_unchanged_files_and_prunes_removed_dirs(tmp_path: Path) -> None:
+    project_dir = tmp_path / "sandbox"
+    manager = _manager_with_session(project_dir)
+    _write_text(project_dir / "node_modules" / "dep" / "index.js", "module.exports = 1;")
+    files = {
+        "src/main.ts": "export const a = 1;\n",
+        "src/old/legacy.ts": "export const legacy = true;\n",
+    }
+
+    first = await _sync(manager, files=files)
+    assert first["manifest_digest"] == compute_workspace_sync_delta(None, files).digest
+    main_file = project_dir / "src" / "main.ts"
+    os.utime(main_file, ns=(1_000_000_000, 1_000_000_000))
+    manager._sync_manifests[str(project_dir)]["src/main.ts"].mtime_ns = 1_000_000_000  # noqa: SLF001
+
+    await _sync(manager, files={"src/main.ts": files["src/main.ts"], "src/new.ts": "export {};\n"})
+
+    assert main_file.stat().st_mtime_ns == 1_000_000_000
+    assert not (project_dir / "src" / "old").exists()
+    assert (project_dir / "src" / "new.ts").read_text(encoding="utf-8") == "export {};\n"
+    assert (project_dir / "node_modules" / "dep" / "index.js").exists()
+
+
+@pytest.mark.asyncio
+async def test_delta_sync_applies_changes_against_matching_manifest(tmp_path: Path) -> None:
+    project_dir = tmp_path / "sandbox"
+    manager = _manager_with_session(project_dir)
+    files = {"src/main.ts": "v1\n", "src/util/helpers.ts": "helpers\n", "index.html": "<div></div>\n"}
+    await _sync(manager, files=files)
+
+    next_files = {"src/main.ts": "v2\n", "index.html": "<div></div>\n"}
+    delta = compute_workspace_sync_delta(build_workspace_manifest(files), next_files)
+    result = await _sync(
+        manager,
+        base_manifest_digest=delta.base_digest,
+        changed_files=delta.changed,
+        deleted_paths=delta.deleted,
+    )
+
+    assert delta.changed == {"src/main.ts": "v2\n"}
+    assert delta.deleted == ["src/util/helpers.ts"]
+    assert result["manifest_digest"] == delta.digest
+    assert (project_dir / "src" / "main.ts").read_text(encoding="utf-8") == "v2\n"
+    assert not (project_dir / "src" / "util").exists()
+
+
+@pytest.mark.asyncio
+async def test_delta_sync_rejects_stale_base_or_out_of_band_edits(tmp_path: Path) -> None:
+    project_dir = tmp_path / "sandbox"
+    manager = _manager_with_session(project_dir)
+    files = {"src/main.ts": "v1\n"}
+    await _sync(manager, files=files)
+    delta = compute_workspace_sync_delta(build_workspace_manifest(files), {"src/main.ts": "v2\n"})
+
+    with pytest.raises(LocalDraftDevRuntimeSyncConflictError):
+        await _sync(manager, base_manifest_digest="stale", changed_files=delta.changed, deleted_paths=[])
+
+    _write_text(project_dir / "src" / "agent.ts", "created by the coding agent\n")
+    with pytest.raises(LocalDraftDevRuntimeSyncConflictError):
+        await _sync(
+            manager,
+            base_manifest_digest=delta.base_digest,
+            changed_files=delta.changed,
+            deleted_paths=delta.deleted,
+        )
+    assert (project_dir / "src" / "main.ts").read_text(encoding="utf-8") == "v1\n"
+
+    await _sync(manager, files={"src/main.ts": "v2\n"})
+    assert not (project_dir / "src" / "agent.ts").exists()
@@ -0,0 +1,131 @@
+from pathlib import Path
+
+import pytest
+
+from app.workers import tasks as worker_tasks
+
+
+def _source_files(app_source: str) -> dict[str, str]:
+    return {
+        "package.json": '{"name":"demo","scripts":{"build":"vite build"}}',
+        "package-lock.json": '{"lockfileVersion":3}',
+        "src/main.tsx": app_source,
+    }
+
+
+def _install_fake_npm(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    commands: list[str] = []
+
+    async def _fake_run_subprocess(command, *, cwd: Path, timeout_seconds: int):
+        _ = timeout_seconds
+        commands.append(" ".join(command))
+        if command[:2] == ["npm", "ci"]:
+            (cwd / "node_modules" / "dep").mkdir(parents=True)
+            (cwd / "node_modules" / "dep" / "index.js").write_text("module.exports = 1;", encoding="utf-8")
+        elif command == ["npm", "run", "build"]:
+            assert (cwd / "node_modules" / "dep" / "index.js").exists()
+            (cwd / "node_modules" / ".vite").mkdir(exist_ok=True)
+            (cwd / "dist" / "assets").mkdir(parents=True)
+            (cwd / "dist" / "index.html").write_text("<html></html>", encoding="utf-8")
+            source = (cwd / "src" / "main.tsx").read_text(encoding="utf-8")
+            (cwd / "dist" / "assets" / "app.js").write_text(source, encoding="utf-8")
+        return 0, "", ""
+
+    monkeypatch.setattr(worker_tasks, "_run_subprocess", _fake_run_subprocess)
+    return commands
+
+
+async def _build(tmp_path: Path, name: str, files: dict[str, str]):
+    project_dir = tmp_path / name
+    project_dir.mkdir()
+    return await worker_tasks._build_project_dist(  # noqa: SLF001
+        project_dir,
+        source_files=files,
+        entry_file="src/main.tsx",
+        install_command=["npm", "ci"],
+        install_timeout_seconds=30,
+        build_timeout_seconds=30,
+    )
+
+
+@pytest.mark.asyncio
+async def test_build_reuses_cached_node_modules_and_build_output(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("APPS_BUILD_CACHE_ENABLED", "1")
+    monkeypatch.setenv("APPS_BUILD_CACHE_DIR", str(tmp_path / "cache"))
+    commands = _install_fake_npm(monkeypatch)
+
+    first_dist, first_summary = await _build(tmp_path, "first", _source_files("export default 1;"))
+    assert commands == ["npm ci", "npm run build"]
+    assert first_summary == {"output": "miss", "dependencies": "miss"}
+    assert (first_dist / "assets" / "app.js").read_text(encoding="utf-8") == "export default 1;"
+
+    commands.clear()
+    cached_dist, cached_summary = await _build(tmp_path, "second", _source_files("export default 1;"))
+    assert commands == []
+    assert cached_summary == {"output": "hit", "dependencies": "skipped"}
+    assert (cached_dist / "assets" / "app.js").read_text(encoding="utf-8") == "export default 1;"
+
+    commands.clear()
+    changed_dist, changed_summary = await _build(tmp_path, "third", _source_files("export default 2;"))
+    assert commands == ["npm run build"]
+    assert changed_summary == {"output": "miss", "dependencies": "hit"}
+    assert (changed_dist / "assets" / "app.js").read_text(encoding="utf-8") == "export default 2;"
+    cached_modules = list((tmp_path / "cache").rglob("node_modules"))
+    assert cached_modules and not (cached_modules[0] / ".vite").exists()
+
+
+@pytest.mark.asyncio
+async def test_build_cache_can_be_disabled(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("APPS_BUILD_CACHE_ENABLED", "0")
+    monkeypatch.setenv("APPS_BUILD_CACHE_DIR", str(tmp_path / "cache"))
+    commands = _install_fake_npm(monkeypatch)
+
+    await _build(tmp_path, "first", _source_files("export default 1;"))
+    _, summary = await _build(tmp_path, "second", _source_files("export default 1;"))
+
+    assert commands == ["npm ci", "npm run build", "npm ci", "npm run build"]
+    assert summary == {"output": "disabled", "dependencies": "disabled"}
+    assert not (tmp_path / "cache").exists()
+
+
+@pytest.mark.asyncio
+async def test_upload_dist_dir_copies_unchanged_assets_and_uploads_the_rest(tmp_path: Path) -> None:
+    dist_dir = tmp_path / "dist"
+    (dist_dir / "assets").mkdir(parents=True)
+    (dist_dir / "index.html").write_text("<html>v2</html>", encoding="utf-8")
+    (dist_dir / "assets" / "vendor.js").write_text("vendor", encoding="utf-8")
+    (dist_dir / "assets" / "app.js").write_text("app v2", encoding="utf-8")
+    manifest = worker_tasks._build_dist_manifest(dist_dir)  # noqa: SLF001
+    vendor_sha = next(asset["sha256"] for asset in manifest["assets"] if asset["path"] == "assets/vendor.js")
+
+    class _FakeStorage:
+        def __init__(self) -> None:
+            self.copied: list[tuple[str, str, str]] = []
+            self.written: dict[str, tuple[bytes, str]] = {}
+
+        def copy_asset(self, *, source_prefix, destination_prefix, asset_path):
+            self.copied.append((source_prefix, destination_prefix, asset_path))
+
+        def write_asset_bytes(self, *, dist_storage_prefix, asset_path, payload, content_type=None, cache_control=None):
+            _ = dist_storage_prefix, content_type
+            self.written[asset_path] = (payload, cache_control)
+
+    storage = _FakeStorage()
+    summary = await worker_tasks._upload_dist_dir(  # noqa: SLF001
+        storage,
+        dist_dir=dist_dir,
+        dist_storage_prefix="apps/new",
+        dist_manifest=manifest,
+        previous_dist_storage_prefix="apps/old",
+        previous_dist_manifest={
+            "assets": [
+                {"path": "assets/vendor.js", "sha256": vendor_sha},
+                {"path": "assets/app.js", "sha256": "stale"},
+            ]
+        },
+    )
+
+    assert summary == {"uploaded": 2, "copied": 1}
+    assert storage.copied == [("apps/old", "apps/new", "assets/vendor.js")]
+    assert storage.written["assets/app.js"] == (b"app v2", "public, max-age=31536000, immutable")
+    assert storage.written["index.html"] == (b"<html>v2</html>", "no-store")
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.services.published_app_coding_run_event_bus import CodingRunEventBus, get_coding_run_event_bus
+from app.services.published_app_coding_run_monitor import PublishedAppCodingRunMonitor
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis"):
+        self._redis = redis
+        self._ops: list[tuple[str, tuple]] = []
+
+    async def __aenter__(self) -> "_FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    def publish(self, *args):
+        self._ops.append(("publish", args))
+
+    def rpush(self, *args):
+        self._ops.append(("rpush", args))
+
+    def ltrim(self, *args):
+        self._ops.append(("ltrim", args))
+
+    def expire(self, *args):
+        self._ops.append(("expire", args))
+
+    async def execute(self) -> None:
+        for name, args in self._ops:
+            getattr(self._redis, name)(*args)
+
+
+class _FakePubSub:
+    def __init__(self, redis: "_FakeRedis"):
+        self._redis = redis
+        self.channels: set[str] = set()
+        self.messages: asyncio.Queue = asyncio.Queue()
+        redis.pubsubs.append(self)
+
+    @property
+    def subscribed(self) -> bool:
+        return bool(self.channels)
+
+    async def subscribe(self, channel: str) -> None:
+        self.channels.add(channel)
+
+    async def unsubscribe(self, channel: str) -> None:
+        self.channels.discard(channel)
+
+    async def get_message(self, ignore_subscribe_messages: bool = False, timeout: float = 0.0):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self) -> None:
+        return None
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.lists: dict[str, list[str]] = {}
+        self.pubsubs: list[_FakePubSub] = []
+
+    def pipeline(self, transaction: bool = True) -> _FakePipeline:
+        return _FakePipeline(self)
+
+    def pubsub(self) -> _FakePubSub:
+        return _FakePubSub(self)
+
+    def publish(self, channel: str, message: str) -> None:
+        for pubsub in self.pubsubs:
+            if channel in pubsub.channels:
+                pubsub.messages.put_nowait({"type": "message", "channel": channel, "data": message})
+
+    def rpush(self, key: str, message: str) -> None:
+        self.lists.setdefault(key, []).append(message)
+
+    def ltrim(self, key: str, start: int, end: int) -> None:
+        items = self.lists.get(key, [])
+        self.lists[key] = items[start:] if end == -1 else items[start : end + 1]
+
+    def expire(self, key: str, seconds: int) -> None:
+        return None
+
+    async def lrange(self, key: str, start: int, end: int) -> list[str]:
+        return list(self.lists.get(key, []))
+
+    async def aclose(self) -> None:
+        return None
+
+
+def _envelope(seq: int, event: str = "assistant.delta") -> dict:
+    return {"event": event, "seq": seq, "payload": {"content": str(seq)}}
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+@pytest.mark.asyncio
+async def test_local_bus_fans_out_and_replays_bounded_ring_to_late_joiners():
+    bus = CodingRunEventBus(backend="local", replay_size=3)
+    early = await bus.subscribe("run-1")
+    for seq in range(1, 6):
+        await bus.publish("run-1", _envelope(seq))
+
+    late = await bus.subscribe("run-1")
+    resumed = await bus.subscribe("run-1", after_seq=4)
+
+    assert [item["seq"] for item in _drain(early)] == [1, 2, 3, 4, 5]
+    assert [item["seq"] for item in _drain(late)] == [3, 4, 5]
+    assert [item["seq"] for item in _drain(resumed)] == [5]
+    assert bus.last_seq("run-1") == 5
+    assert bus.subscriber_count("run-1") == 3
+
+    await bus.close_run("run-1")
+    assert early.get_nowait() is None
+    assert bus.last_seq("run-1") == 0
+    assert bus.subscriber_count("run-1") == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_bus_relays_leader_envelopes_to_other_processes_with_replay():
+    redis = _FakeRedis()
+    leader = CodingRunEventBus(backend="redis", redis_client=redis)
+    follower = CodingRunEventBus(backend="redis", redis_client=redis)
+    try:
+        await leader.publish("run-1", _envelope(1))
+        await leader.publish("run-1", _envelope(2))
+
+        queue = await follower.subscribe("run-1")
+        assert [item["seq"] for item in _drain(queue)] == [1, 2]
+
+        await leader.publish("run-1", _envelope(3, event="run.completed"))
+        relayed = await asyncio.wait_for(queue.get(), timeout=1.0)
+        assert relayed["seq"] == 3
+        assert relayed["event"] == "run.completed"
+
+        # Leader-side subscribers are fed locally and never see their own echo.
+        leader_queue = await leader.subscribe("run-1")
+        assert [item["seq"] for item in _drain(leader_queue)] == [1, 2, 3]
+        await asyncio.sleep(0.05)
+        assert leader_queue.empty()
+
+        # A duplicate of an already relayed seq is dropped.
+        redis.publish(
+            f"{CodingRunEventBus.CHANNEL_PREFIX}run-1",
+            '{"origin": "other", "envelope": {"event": "run.completed", "seq": 3}}',
+        )
+        await asyncio.sleep(0.05)
+        assert queue.empty()
+    finally:
+        await leader.aclose()
+        await follower.aclose()
+
+
+@pytest.mark.asyncio
+async def test_monitor_emit_continues_seq_after_bus_and_reaches_bus_subscribers():
+    bus = get_coding_run_event_bus()
+    run_id = uuid4()
+    try:
+        await bus.publish(run_id, _envelope(7))
+        queue = await bus.subscribe(run_id, after_seq=7)
+
+        await PublishedAppCodingRunMonitor._emit_to_subscribers(
+            run_id=run_id,
+            payload={"event": "run.completed", "payload": {}},
+        )
+        await PublishedAppCodingRunMonitor._close_subscribers(run_id=run_id)
+
+        emitted = queue.get_nowait()
+        assert emitted["event"] == "run.completed"
+        assert emitted["seq"] == 8
+        assert queue.get_nowait() is None
+    finally:
+        await bus.close_run(run_id)
+
+
+def test_stream_recovery_probe_keeps_short_interval_for_local_bus(monkeypatch):
+    monkeypatch.delenv("APPS_CODING_AGENT_MONITOR_RECOVERY_PROBE_INTERVAL_SECONDS", raising=False)
+
+    local_bus = CodingRunEventBus(backend="local")
+    redis_bus = CodingRunEventBus(backend="redis", redis_client=_FakeRedis())
+
+    assert PublishedAppCodingRunMonitor._stream_recovery_probe_seconds(local_bus) == 2.0
+    assert PublishedAppCodingRunMonitor._stream_recovery_probe_seconds(redis_bus) == 15.0
@@ -3,11 +3,37 @@ import pytest
 from app.services.context_window_service import ContextWindowService
 from app.services.model_limits_service import ModelLimitsService
 from app.services.prompt_snapshot_service import PromptSnapshotService
-from app.services.token_counter_service import TokenCounterService
+from app.services.token_counter_service import (
+    TokenCounterService,
+    get_token_count_cache,
+    get_token_count_calibration,
+    get_tokenizer_registry,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_token_counter_state():
+    get_tokenizer_registry().reset()
+    get_token_count_cache().clear()
+    get_token_count_calibration().clear()
+    yield
+    get_tokenizer_registry().reset()
+    get_token_count_cache().clear()
+    get_token_count_calibration().clear()
+
+
+class _WordEncoding:
+    def __init__(self):
+        self.encoded: list[str] = []
+
+    def encode(self, value):
+        self.encoded.append(value)
+        return value.split()
 
 
 @pytest.mark.asyncio
 async def test_google_token_counter_uses_provider_count_api(monkeypatch):
+    monkeypatch.setenv("TOKEN_COUNTER_PROVIDER_CALIBRATION", "1")
     captured = {}
 
     class _FakeModels:
@@ -46,6 +72,7 @@ async def test_google_token_counter_uses_provider_count_api(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_anthropic_token_counter_uses_provider_count_api(monkeypatch):
+    monkeypatch.setenv("TOKEN_COUNTER_PROVIDER_CALIBRATION", "1")
     captured = {}
 
     class _FakeMessages:
@@ -110,6 +137,176 @@ async def test_token_counter_falls_back_to_tiktoken_without_provider_api(monkeyp
     assert source == "tokenizer_estimate"
 
 
+@pytest.mark.asyncio
+async def test_token_counter_counts_locally_without_calibration(monkeypatch):
+    monkeypatch.delenv("TOKEN_COUNTER_PROVIDER_CALIBRATION", raising=False)
+    encoding = _WordEncoding()
+    monkeypatch.setattr("app.services.token_counter_service.tiktoken.get_encoding", lambda _name: encoding)
+
+    def _unexpected_client(api_key):
+        raise AssertionError("provider count API must not be called")
+
+    monkeypatch.setattr("app.services.token_counter_service.AsyncAnthropic", _unexpected_client)
+
+    snapshot = PromptSnapshotService.build_from_langchain(
+        messages=[{"role": "user", "content": "one two three"}],
+        system_prompt=None,
+        tools=[],
+        extra_context={},
+    )
+    tokens, source = await TokenCounterService().count_input_tokens(
+        provider="anthropic",
+        provider_model_id="claude-opus-4-6",
+        snapshot=snapshot,
+        api_key="anthropic-key",
+    )
+
+    # "user\none two three" is 4 words, plus per-message overhead and reply priming.
+    raw = 4 + 3 + 3
+    assert source == "tokenizer_estimate"
+    assert tokens == 12  # ceil(raw * 1.2) for anthropic's default correction
+    assert raw < tokens
+
+
+@pytest.mark.asyncio
+async def test_token_counter_memoizes_repeated_history_prefix(monkeypatch):
+    encoding = _WordEncoding()
+    monkeypatch.setattr("app.services.token_counter_service.tiktoken.get_encoding", lambda _name: encoding)
+
+    history = [{"role": "user", "content": f"message number {index}"} for index in range(5)]
+    counter = TokenCounterService()
+    first, _ = await counter.count_input_tokens(
+        provider="openai",
+        provider_model_id="gpt-5",
+        snapshot=PromptSnapshotService.build_from_langchain(messages=history, system_prompt="Be brief"),
+    )
+    assert len(encoding.encoded) == 6
+
+    encoding.encoded.clear()
+    extended = history + [{"role": "assistant", "content": "short reply"}]
+    second, _ = await counter.count_input_tokens(
+        provider="openai",
+        provider_model_id="gpt-5",
+        snapshot=PromptSnapshotService.build_from_langchain(messages=extended, system_prompt="Be brief"),
+    )
+
+    assert encoding.encoded == ["assistant\nshort reply"]
+    assert second == first + 3 + 3
+    assert get_token_count_cache().hits >= 6
+
+
+@pytest.mark.asyncio
+async def test_token_counter_calibrates_correction_factor_from_provider(monkeypatch):
+    monkeypatch.setenv("TOKEN_COUNTER_PROVIDER_CALIBRATION", "1")
+    encoding = _WordEncoding()
+    monkeypatch.setattr("app.services.token_counter_service.tiktoken.get_encoding", lambda _name: encoding)
+    calls = []
+
+    class _FakeMessages:
+        async def count_tokens(self, **kwargs):
+            calls.append(kwargs)
+            return type("Resp", (), {"input_tokens": 20})()
+
+    class _FakeClient:
+        def __init__(self, api_key):
+            self.messages = _FakeMessages()
+
+    monkeypatch.setattr("app.services.token_counter_service.AsyncAnthropic", _FakeClient)
+
+    snapshot = PromptSnapshotService.build_from_langchain(
+        messages=[{"role": "user", "content": "one two three"}],
+    )
+    counter = TokenCounterService()
+    first = await counter.count_input_tokens(
+        provider="anthropic", provider_model_id="claude-opus-4-6", snapshot=snapshot, api_key="k"
+    )
+    second = await counter.count_input_tokens(
+        provider="anthropic", provider_model_id="claude-opus-4-6", snapshot=snapshot, api_key="k"
+    )
+
+    assert first == (20, "provider_count_api")
+    # Within the calibration interval the local count is scaled by the learned factor (20 / 10).
+    assert second == (20, "tokenizer_estimate")
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_token_counter_waits_out_the_interval_after_a_failed_provider_count(monkeypatch):
+    monkeypatch.setenv("TOKEN_COUNTER_PROVIDER_CALIBRATION", "1")
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    encoding = _WordEncoding()
+    monkeypatch.setattr("app.services.token_counter_service.tiktoken.get_encoding", lambda _name: encoding)
+    calls = []
+
+    class _FailingMessages:
+        async def count_tokens(self, **kwargs):
+            calls.append(kwargs)
+            raise RuntimeError("provider unavailable")
+
+    class _FakeClient:
+        def __init__(self, api_key):
+            self.messages = _FailingMessages()
+
+    def _unexpected_google_client(api_key):
+        raise AssertionError("google count API needs a key")
+
+    monkeypatch.setattr("app.services.token_counter_service.AsyncAnthropic", _FakeClient)
+    monkeypatch.setattr("app.services.token_counter_service.genai.Client", _unexpected_google_client)
+    counter = TokenCounterService()
+    count_google = counter._count_google
+    google_attempts = []
+
+    async def _counting_google(**kwargs):
+        google_attempts.append(kwargs["model"])
+        return await count_google(**kwargs)
+
+    monkeypatch.setattr(counter, "_count_google", _counting_google)
+
+    snapshot = PromptSnapshotService.build_from_langchain(messages=[{"role": "user", "content": "one two three"}])
+    for _ in range(3):
+        anthropic = await counter.count_input_tokens(
+            provider="anthropic", provider_model_id="claude-opus-4-6", snapshot=snapshot, api_key="k"
+        )
+        google = await counter.count_input_tokens(
+            provider="google", provider_model_id="gemini-2.5-pro", snapshot=snapshot
+        )
+        assert anthropic == (12, "tokenizer_estimate")
+        assert google[1] == "tokenizer_estimate"
+
+    # A failing or unkeyed provider is attempted once per interval, not on every request.
+    assert len(calls) == 1
+    assert google_attempts == ["gemini-2.5-pro"]
+
+
+@pytest.mark.asyncio
+async def test_token_counter_falls_back_to_char_estimate_once_encoding_is_unavailable(monkeypatch):
+    attempts = []
+
+    def _unavailable(name):
+        attempts.append(name)
+        raise ConnectionError("no network")
+
+    def _unknown_model(model):
+        raise KeyError(model)
+
+    monkeypatch.setattr("app.services.token_counter_service.tiktoken.get_encoding", _unavailable)
+    monkeypatch.setattr("app.services.token_counter_service.tiktoken.encoding_for_model", _unknown_model)
+    monkeypatch.setenv("TOKEN_COUNTER_CHAR_ESTIMATE_DIVISOR", "4")
+
+    snapshot = PromptSnapshotService.build_from_langchain(messages=[{"role": "user", "content": "x" * 35}])
+    counter = TokenCounterService()
+    for _ in range(3):
+        tokens, source = await counter.count_input_tokens(
+            provider="openai", provider_model_id="gpt-5", snapshot=snapshot
+        )
+        assert source == "estimated"
+        # "user\n" + 35 chars = 40 chars -> 10 tokens, plus overhead and priming.
+        assert tokens == 16
+
+    assert attempts == ["o200k_base"]
+
+
 @pytest.mark.asyncio
 async def test_model_limits_service_prefers_provider_model_info(monkeypatch):
     class _FakeModels:
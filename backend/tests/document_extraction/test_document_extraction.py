@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+from zipfile import ZipFile
+
+import pytest
+from openpyxl import Workbook
+
+from app.db.postgres.models.files import FileEntryType
+from app.services import file_representation_service
+from app.services.document_extraction import (
+    DocumentExtractionError,
+    DocumentExtractionLimits,
+    DocumentExtractionService,
+)
+from app.services.file_spaces.service import FileSpaceValidationError
+
+
+def _limits(**overrides) -> DocumentExtractionLimits:
+    values = {"max_bytes": 1024 * 1024, "max_pdf_pages": 50, "max_text_chars": 100_000, "timeout_seconds": 5.0}
+    values.update(overrides)
+    return DocumentExtractionLimits(**values)
+
+
+def _docx(*paragraphs: str) -> bytes:
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    buffer = io.BytesIO()
+    with ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def _xlsx(rows: int) -> bytes:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Data"
+    for index in range(rows):
+        sheet.append([index, f"row {index}"])
+    workbook.create_sheet("Other")
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def _slow_parser(payload: bytes, seconds: float) -> str:
+    time.sleep(seconds)
+    return payload.decode()
+
+
+class _Loader:
+    def __init__(self, payload: bytes) -> None:
+        self.payload = payload
+        self.calls = 0
+
+    async def __call__(self) -> bytes:
+        self.calls += 1
+        return self.payload
+
+
+@pytest.mark.asyncio
+async def test_extraction_is_cached_by_content_hash_and_skips_loading():
+    service = DocumentExtractionService(limits=_limits(), max_workers=0)
+    loader = _Loader(_docx("First paragraph", "Second paragraph"))
+
+    first = await service.docx_text(loader, cache_key="sha-1")
+    second = await service.docx_text(loader, cache_key="sha-1")
+
+    assert first == second == "First paragraph\n\nSecond paragraph"
+    assert loader.calls == 1
+    assert service.cache.hits == 1
+
+    await service.docx_text(loader, cache_key="sha-2")
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_workbook_slice_limits_rows_and_reports_missing_sheet():
+    service = DocumentExtractionService(limits=_limits(), max_workers=0)
+    payload = _xlsx(rows=30)
+
+    sliced = await service.workbook_slice(payload, sheet=None, max_rows=10, cache_key="wb")
+    assert sliced["sheet_names"] == ["Data", "Other"]
+    assert sliced["sheet"] == "Data"
+    assert len(sliced["rows"]) == 10
+    assert sliced["truncated"] is True
+
+    # Different slice parameters are cached separately.
+    missing = await service.workbook_slice(payload, sheet="Nope", max_rows=10, cache_key="wb")
+    assert missing["sheet"] is None
+    assert len(service.cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_oversized_files_are_rejected_before_loading():
+    service = DocumentExtractionService(limits=_limits(max_bytes=100), max_workers=0)
+    loader = _Loader(b"x" * 500)
+
+    with pytest.raises(DocumentExtractionError, match="too large"):
+        await service.docx_text(loader, cache_key="big", byte_size=500)
+    assert loader.calls == 0
+
+    with pytest.raises(DocumentExtractionError, match="too large"):
+        await service.docx_text(loader, cache_key="big")
+    assert loader.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_timed_out_pool_worker_is_replaced():
+    service = DocumentExtractionService(limits=_limits(timeout_seconds=0.5), max_workers=1, start_method="fork")
+    try:
+        with pytest.raises(DocumentExtractionError, match="timed out"):
+            await service.run("slow", _slow_parser, b"late", 30.0)
+        assert await service.run("slow", _slow_parser, b"ready", 0.0) == "ready"
+    finally:
+        service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_does_not_fail_other_in_flight_extractions():
+    service = DocumentExtractionService(limits=_limits(timeout_seconds=1.0), max_workers=2, start_method="fork")
+
+    async def _neighbour(payload: bytes, seconds: float) -> str:
+        # Starts while the slow parser is running, so it is still in flight when that worker is stopped.
+        await asyncio.sleep(0.5)
+        return await service.run("slow", _slow_parser, payload, seconds)
+
+    try:
+        slow, running, queued = await asyncio.gather(
+            service.run("slow", _slow_parser, b"late", 30.0),
+            _neighbour(b"running", 0.8),
+            _neighbour(b"queued", 0.2),
+            return_exceptions=True,
+        )
+        assert isinstance(slow, DocumentExtractionError) and "timed out" in str(slow)
+        assert running == "running"
+        assert queued == "queued"
+    finally:
+        service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_time_queued_behind_a_busy_worker_does_not_count_against_the_timeout():
+    service = DocumentExtractionService(limits=_limits(timeout_seconds=1.0), max_workers=1, start_method="fork")
+    try:
+        first, second = await asyncio.gather(
+            service.run("slow", _slow_parser, b"first", 0.7),
+            service.run("slow", _slow_parser, b"second", 0.7),
+            return_exceptions=True,
+        )
+        assert (first, second) == ("first", "second")
+    finally:
+        service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_workbook_representation_reuses_cached_revision_extraction(monkeypatch):
+    service = DocumentExtractionService(limits=_limits(), max_workers=0)
+    monkeypatch.setattr(file_representation_service, "get_document_extraction_service", lambda: service)
+    payload = _xlsx(rows=5)
+    entry = SimpleNamespace(id=uuid4(), path="reports/q1.xlsx", entry_type=FileEntryType.file, mime_type=None)
+    revision = SimpleNamespace(
+        id=uuid4(),
+        sha256="a" * 64,
+        byte_size=len(payload),
+        mime_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
+    reads = []
+
+    async def _read_entry(**kwargs):
+        return entry, revision
+
+    async def _read_revision_bytes(value):
+        reads.append(value)
+        return payload
+
+    file_service = SimpleNamespace(read_entry=_read_entry, read_revision_bytes=_read_revision_bytes)
+    ctx = SimpleNamespace(service=file_service, organization_id=uuid4(), project_id=uuid4(), space_id=uuid4())
+    monkeypatch.setattr(file_representation_service.FileSpaceService, "serialize_entry", staticmethod(lambda item: {}))
+    monkeypatch.setattr(file_representation_service.FileSpaceService, "serialize_revision", staticmethod(lambda item: {}))
+
+    for _ in range(2):
+        result = await file_representation_service.read_representation(
+            ctx, path=entry.path, representation="workbook", options={"max_rows": 3}
+        )
+        assert result["sheet"] == "Data"
+        assert result["rows"][0] == ["0", "row 0"]
+        assert result["truncated"] is True
+    assert len(reads) == 1
+
+    with pytest.raises(FileSpaceValidationError, match="requested sheet is not available"):
+        await file_representation_service.read_representation(
+            ctx, path=entry.path, representation="workbook", options={"sheet": "Missing"}
+        )
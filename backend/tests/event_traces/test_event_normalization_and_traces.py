@@ -45,6 +45,61 @@ async def test_event_emitter_enqueues_events():
     assert event.data["type"] == "start"
 
 
+def _drain(queue: asyncio.Queue) -> list:
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+@pytest.mark.asyncio
+async def test_event_emitter_coalesces_tokens_per_node_and_flushes_before_other_events():
+    queue: asyncio.Queue = asyncio.Queue()
+    emitter = EventEmitter(queue, run_id="run-1", token_coalesce_window_ms=10_000, token_coalesce_max_chars=8)
+
+    for token in ["He", "ll", "o"]:
+        emitter.emit_token(token, "agent_a")
+    assert queue.empty()
+
+    emitter.emit_token(" wo", "agent_b")
+    emitter.emit_token("rld!!", "agent_b")
+    emitter.emit_token("tail", "agent_b")
+    emitter.emit_tool_start("search", {"query": "x"}, node_id="agent_b")
+
+    events = _drain(queue)
+    assert [(event.event, event.name, event.data.get("content")) for event in events] == [
+        ("token", "agent_a", "Hello"),
+        ("token", "agent_b", " world!!"),
+        ("token", "agent_b", "tail"),
+        ("on_tool_start", "search", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_event_emitter_flushes_buffered_tokens_when_window_elapses():
+    queue: asyncio.Queue = asyncio.Queue()
+    emitter = EventEmitter(queue, run_id="run-1", token_coalesce_window_ms=5, token_coalesce_max_chars=0)
+
+    emitter.emit_token("a", "agent_a")
+    emitter.emit_token("b", "agent_a")
+    event = await asyncio.wait_for(queue.get(), timeout=1.0)
+
+    assert event.data == {"content": "ab"}
+    emitter.flush()
+    assert queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_event_emitter_emits_each_token_when_coalescing_disabled():
+    queue: asyncio.Queue = asyncio.Queue()
+    emitter = EventEmitter(queue, run_id="run-1", token_coalesce_window_ms=0, token_coalesce_max_chars=0)
+
+    emitter.emit_token("a", "agent_a")
+    emitter.emit_token("b", "agent_a")
+
+    assert [event.data["content"] for event in _drain(queue)] == ["a", "b"]
+
+
 @pytest.mark.asyncio
 @pytest.mark.real_db
 async def test_trace_persistence_persists_point_events_in_sequence(db_session, test_tenant_id, test_user_id, run_prefix):
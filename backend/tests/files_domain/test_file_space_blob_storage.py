@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import io
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.postgres.models.files import FileBlob, FileBlobEncoding
+from app.db.postgres.models.identity import Organization
+from app.db.postgres.models.workspace import Project, ProjectStatus
+from app.services.file_spaces.deltas import apply_text_delta, encode_text_delta
+from app.services.file_spaces.service import FileSpaceService, wait_for_blob_deletes
+from app.services.file_spaces.storage import FileSpaceStorage
+from app.services.storage_streaming import ByteRange, ByteRangeNotSatisfiable, parse_byte_range
+
+
+async def _seed_space(db_session, tmp_path, **service_kwargs):
+    tenant = Organization(name="Blob Organization", slug=f"blob-tenant-{uuid4().hex[:8]}")
+    db_session.add(tenant)
+    await db_session.flush()
+    project = Project(
+        organization_id=tenant.id,
+        name="Blob Project",
+        slug=f"blob-project-{uuid4().hex[:8]}",
+        status=ProjectStatus.active,
+        is_default=True,
+        created_by=None,
+    )
+    db_session.add(project)
+    await db_session.flush()
+    storage = FileSpaceStorage(base_dir=str(tmp_path))
+    storage._bundle_storage = None
+    service = FileSpaceService(db_session, storage=storage, **service_kwargs)
+    space = await service.create_space(
+        organization_id=tenant.id,
+        project_id=project.id,
+        name="Blobs",
+        description=None,
+        created_by=None,
+    )
+    return service, tenant, project, space
+
+
+def _stored_files(tmp_path) -> list:
+    return sorted(path for path in tmp_path.rglob("*") if path.is_file())
+
+
+def test_text_delta_round_trips_line_edits():
+    base = "line one\nline two\nline three\n"
+    target = "line zero\nline one\nline 2\nline three\nline four"
+    assert apply_text_delta(base=base, delta=encode_text_delta(base=base, target=target)) == target
+
+
+@pytest.mark.asyncio
+async def test_identical_content_is_stored_once_across_entries(db_session, tmp_path):
+    service, tenant, project, space = await _seed_space(db_session, tmp_path, text_deltas_enabled=False)
+    scope = {"organization_id": tenant.id, "project_id": project.id, "space_id": space.id}
+
+    _entry_a, revision_a = await service.write_text_file(**scope, path="a.md", content="same", user_id=None)
+    _entry_b, revision_b = await service.write_text_file(**scope, path="b.md", content="same", user_id=None)
+    _entry_a2, revision_a2 = await service.write_text_file(**scope, path="a.md", content="same", user_id=None)
+
+    assert revision_a.blob_id == revision_b.blob_id == revision_a2.blob_id
+    assert revision_a.storage_key == revision_b.storage_key
+    blob = await db_session.get(FileBlob, revision_a.blob_id)
+    await db_session.refresh(blob)
+    assert blob.ref_count == 3
+    assert len(_stored_files(tmp_path)) == 1
+
+    _entry, _revision, content = await service.read_text_file(**scope, path="b.md")
+    assert content == "same"
+
+
+@pytest.mark.asyncio
+async def test_patches_store_deltas_with_periodic_snapshots(db_session, tmp_path):
+    service, tenant, project, space = await _seed_space(
+        db_session,
+        tmp_path,
+        text_deltas_enabled=True,
+        delta_snapshot_interval=3,
+    )
+    scope = {"organization_id": tenant.id, "project_id": project.id, "space_id": space.id}
+    body = "".join(f"line {index}\n" for index in range(200))
+    await service.write_text_file(**scope, path="notes.md", content=body, user_id=None)
+
+    encodings = []
+    for index in range(4):
+        _entry, revision = await service.patch_text_file(
+            **scope,
+            path="notes.md",
+            old_text=f"line {index}\n",
+            new_text=f"edited {index}\n",
+            user_id=None,
+        )
+        blob = await db_session.get(FileBlob, revision.blob_id)
+        encodings.append((FileBlobEncoding(blob.encoding), blob.delta_depth))
+        if blob.encoding == FileBlobEncoding.text_delta:
+            assert blob.stored_size < blob.byte_size
+
+    assert encodings == [
+        (FileBlobEncoding.text_delta, 1),
+        (FileBlobEncoding.text_delta, 2),
+        (FileBlobEncoding.full, 0),
+        (FileBlobEncoding.text_delta, 1),
+    ]
+    _entry, _revision, content = await service.read_text_file(**scope, path="notes.md")
+    expected = body
+    for index in range(4):
+        expected = expected.replace(f"line {index}\n", f"edited {index}\n", 1)
+    assert content == expected
+
+
+@pytest.mark.asyncio
+async def test_archiving_space_collects_unreferenced_blobs(db_session, tmp_path):
+    service, tenant, project, space = await _seed_space(db_session, tmp_path, text_deltas_enabled=True)
+    scope = {"organization_id": tenant.id, "project_id": project.id, "space_id": space.id}
+    other = await service.create_space(
+        organization_id=tenant.id,
+        project_id=project.id,
+        name="Other",
+        description=None,
+        created_by=None,
+    )
+    body = "".join(f"row {index}\n" for index in range(100))
+    await service.write_text_file(**scope, path="doc.md", content=body, user_id=None)
+    await service.patch_text_file(**scope, path="doc.md", old_text="row 1\n", new_text="row one\n", user_id=None)
+    await service.write_text_file(
+        organization_id=tenant.id,
+        project_id=project.id,
+        space_id=other.id,
+        path="shared.md",
+        content=body,
+        user_id=None,
+    )
+
+    stored_before = len(_stored_files(tmp_path))
+    await service.archive_space(**scope)
+    await db_session.flush()
+
+    remaining = (await db_session.execute(select(FileBlob).where(FileBlob.project_id == project.id))).scalars().all()
+    assert len(remaining) == 1
+    await db_session.refresh(remaining[0])
+    assert remaining[0].ref_count == 1
+    # Bytes are only deleted once the transaction that released them commits.
+    assert len(_stored_files(tmp_path)) == stored_before
+    await db_session.commit()
+    await wait_for_blob_deletes()
+    assert len(_stored_files(tmp_path)) == 1
+
+    _entry, _revision, content = await service.read_text_file(
+        organization_id=tenant.id,
+        project_id=project.id,
+        space_id=other.id,
+        path="shared.md",
+    )
+    assert content == body
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_release_keeps_blob_bytes(db_session, tmp_path):
+    service, tenant, project, space = await _seed_space(db_session, tmp_path, text_deltas_enabled=False)
+    scope = {"organization_id": tenant.id, "project_id": project.id, "space_id": space.id}
+    await service.write_text_file(**scope, path="keep.md", content="keep me", user_id=None)
+    await db_session.commit()
+
+    await service.archive_space(**scope)
+    await db_session.flush()
+    await db_session.rollback()
+    await wait_for_blob_deletes()
+
+    assert len(_stored_files(tmp_path)) == 1
+    _entry, _revision, content = await service.read_text_file(**scope, path="keep.md")
+    assert content == "keep me"
+
+
+@pytest.mark.asyncio
+async def test_prune_revisions_keeps_delta_bases_alive(db_session, tmp_path):
+    service, tenant, project, space = await _seed_space(db_session, tmp_path, text_deltas_enabled=True)
+    scope = {"organization_id": tenant.id, "project_id": project.id, "space_id": space.id}
+    body = "".join(f"entry {index}\n" for index in range(100))
+    await service.write_text_file(**scope, path="log.md", content=body, user_id=None)
+    await service.patch_text_file(**scope, path="log.md", old_text="entry 5\n", new_text="entry five\n", user_id=None)
+
+    pruned = await service.prune_revisions(**scope, path="log.md", keep_latest=1)
+
+    assert pruned == 1
+    assert (await db_session.scalar(select(func.count()).select_from(FileBlob).where(FileBlob.project_id == project.id))) == 2
+    _entry, _revision, content = await service.read_text_file(**scope, path="log.md")
+    assert content == body.replace("entry 5\n", "entry five\n")
+
+
+@pytest.mark.asyncio
+async def test_streamed_uploads_share_blobs_and_serve_byte_ranges(db_session, tmp_path):
+    service, tenant, project, space = await _seed_space(db_session, tmp_path, text_deltas_enabled=False)
+    scope = {"organization_id": tenant.id, "project_id": project.id, "space_id": space.id}
+    payload = bytes(range(256)) * 4096
+
+    _entry, streamed = await service.upload_file_stream(
+        **scope,
+        path="media/big.bin",
+        source=io.BytesIO(payload),
+        content_type="application/octet-stream",
+        user_id=None,
+    )
+    _entry, buffered = await service.upload_file(
+        **scope,
+        path="media/copy.bin",
+        payload=payload,
+        content_type="application/octet-stream",
+        user_id=None,
+    )
+
+    assert streamed.blob_id == buffered.blob_id
+    assert streamed.byte_size == len(payload)
+    assert streamed.is_text is False
+    assert len(_stored_files(tmp_path)) == 1
+
+    stream = await service.open_revision_stream(streamed, byte_range=ByteRange(start=1000, end=300_999))
+    assert stream.total_size == len(payload)
+    assert stream.content_length == 300_000
+    assert stream.read() == payload[1000:301_000]
+    assert await service.read_revision_bytes(streamed) == payload
+
+
+def test_parse_byte_range_handles_suffix_and_unsatisfiable_ranges():
+    assert parse_byte_range("bytes=10-", 100) == ByteRange(start=10, end=99)
+    assert parse_byte_range("bytes=-5", 100) == ByteRange(start=95, end=99)
+    assert parse_byte_range("bytes=0-1,5-6", 100) is None
+    with pytest.raises(ByteRangeNotSatisfiable):
+        parse_byte_range("bytes=100-", 100)
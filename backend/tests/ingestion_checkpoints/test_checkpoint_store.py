@@ -0,0 +1,88 @@
+import json
+import sqlite3
+
+import pytest
+
+from ingestion.checkpoint_store import CheckpointStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    with CheckpointStore(tmp_path / "checkpoints.db") as checkpoints:
+        yield checkpoints
+
+
+def test_marked_segments_are_members_per_book(store):
+    store.mark_segments("Berakhot", ["Berakhot 2a:1", "Berakhot 2a:2"])
+    store.mark_segments("Berakhot", ["Berakhot 2a:2", "Berakhot 2a:3"])
+    store.mark_segments("Shabbat", ["Shabbat 2a:1"])
+
+    segments = store.load_segments("Berakhot")
+    assert "Berakhot 2a:3" in segments
+    assert "Shabbat 2a:1" not in segments
+    assert store.count_segments("Berakhot") == 3
+    assert store.load_segments("Eruvin") == set()
+
+
+def test_batch_and_resume_point_commit_together_and_persist(tmp_path):
+    db_path = tmp_path / "checkpoints.db"
+    with CheckpointStore(db_path) as writer:
+        writer.mark_segments("Berakhot", {f"Berakhot 2a:{n}" for n in range(50)}, last_reference="Berakhot 2a")
+        writer.mark_segments("Berakhot", [], last_reference="Berakhot 2b")
+
+        # A second connection (another worker process) sees the committed batch immediately.
+        with CheckpointStore(db_path) as reader:
+            assert reader.count_segments("Berakhot") == 50
+            assert reader.get_last_reference("Berakhot") == "Berakhot 2b"
+            assert reader.get_last_reference("Shabbat") is None
+
+
+def test_failed_batch_rolls_back_every_statement(store):
+    store.mark_segments("Berakhot", ["Berakhot 2a:1"], last_reference="Berakhot 2a")
+
+    with pytest.raises(sqlite3.Error):
+        store._write([
+            ("INSERT INTO ingested_segments (index_title, segment_ref) VALUES (?, ?)", [("Berakhot", "Berakhot 2b:1")]),
+            ("INSERT INTO missing_table VALUES (?)", (1,)),
+        ])
+
+    assert store.load_segments("Berakhot") == {"Berakhot 2a:1"}
+    store.mark_segments("Berakhot", ["Berakhot 2b:1"])
+    assert store.count_segments("Berakhot") == 2
+
+
+def test_errors_are_upserted_per_segment(store):
+    store.record_error("Berakhot", "Berakhot 2a:1", "text_fetch_failed", "timeout", "/v3/texts/Berakhot 2a")
+    store.record_error("Berakhot", "Berakhot 2a:1", "upsert_failed", "boom")
+
+    rows = store._conn.execute("SELECT error_type, error_message, endpoint FROM ingestion_errors").fetchall()
+    assert rows == [("upsert_failed", "boom", None)]
+
+
+def test_legacy_json_logs_are_imported_once(tmp_path, store):
+    log_file = tmp_path / "ingestion_log.json"
+    error_log_file = tmp_path / "ingestion_errors.json"
+    log_file.write_text(json.dumps({
+        "Berakhot": {"ingested_segments": ["Berakhot 2a:1", "Berakhot 2a:2"], "last_reference": "Berakhot 2a"},
+        "Shabbat": {"ingested_segments": []},
+    }))
+    error_log_file.write_text(json.dumps({
+        "Berakhot": [{"segment_ref": "Berakhot 2b:1", "error_type": "upsert_failed", "error_message": "boom"}],
+    }))
+
+    assert store.import_legacy_json(log_file, error_log_file) is True
+    assert store.load_segments("Berakhot") == {"Berakhot 2a:1", "Berakhot 2a:2"}
+    assert store.get_last_reference("Berakhot") == "Berakhot 2a"
+    assert store.get_last_reference("Shabbat") is None
+    errors = store._conn.execute("SELECT index_title, segment_ref, error_type FROM ingestion_errors").fetchall()
+    assert errors == [("Berakhot", "Berakhot 2b:1", "upsert_failed")]
+
+    # Later runs keep the store as the source of truth even if the JSON files change.
+    log_file.write_text(json.dumps({"Berakhot": {"ingested_segments": ["Berakhot 9a:1"]}}))
+    assert store.import_legacy_json(log_file, error_log_file) is False
+    assert store.count_segments("Berakhot") == 2
+
+
+def test_missing_legacy_files_still_mark_the_import_done(tmp_path, store):
+    assert store.import_legacy_json(tmp_path / "missing_log.json", None) is True
+    assert store.import_legacy_json(tmp_path / "missing_log.json", None) is False
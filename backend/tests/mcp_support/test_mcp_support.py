@@ -26,6 +26,7 @@ from app.services.mcp_service import (
     McpAuthRequiredRuntimeError,
     McpRuntimeService,
     McpService,
+    get_mcp_agent_tool_catalog_cache,
 )
 
 
@@ -145,6 +146,81 @@ async def test_mcp_runtime_lists_virtual_tools_for_applied_snapshot(db_session,
     assert tools[0].schema["input"]["properties"]["query"]["type"] == "string"
 
 
+@pytest.mark.asyncio
+async def test_mcp_runtime_caches_agent_tools_until_mount_snapshot_changes(db_session, mcp_fixture):
+    tenant = mcp_fixture["tenant"]
+    agent = mcp_fixture["agent"]
+    get_mcp_agent_tool_catalog_cache().clear()
+
+    server = McpServer(
+        organization_id=tenant.id,
+        name="Linear",
+        server_url="https://mcp.linear.app/mcp",
+        auth_mode=McpAuthMode.NONE.value,
+        tool_snapshot_version=1,
+    )
+    db_session.add(server)
+    await db_session.flush()
+    db_session.add(
+        McpDiscoveredTool(
+            organization_id=tenant.id,
+            server_id=server.id,
+            snapshot_version=1,
+            name="list_issues",
+            input_schema={"type": "object"},
+        )
+    )
+    mount = McpAgentMount(
+        organization_id=tenant.id,
+        agent_id=agent.id,
+        server_id=server.id,
+        applied_snapshot_version=1,
+        approval_policy=McpApprovalPolicy.ALWAYS_ALLOW.value,
+    )
+    db_session.add(mount)
+    await db_session.flush()
+
+    runtime = McpRuntimeService(db_session, tenant.id)
+    first = await runtime.list_agent_tools(agent_id=agent.id, user_id=None)
+
+    db_session.add(
+        McpDiscoveredTool(
+            organization_id=tenant.id,
+            server_id=server.id,
+            snapshot_version=1,
+            name="create_issue",
+            input_schema={"type": "object"},
+        )
+    )
+    await db_session.flush()
+    cached = await runtime.list_agent_tools(agent_id=agent.id, user_id=None)
+    assert [tool.mcp_tool_name for tool in first] == ["list_issues"]
+    assert [tool.mcp_tool_name for tool in cached] == ["list_issues"]
+    assert cached[0] is not first[0]
+
+    get_mcp_agent_tool_catalog_cache().invalidate_server(tenant.id, server.id)
+    refreshed = await runtime.list_agent_tools(agent_id=agent.id, user_id=None)
+    assert [tool.mcp_tool_name for tool in refreshed] == ["create_issue", "list_issues"]
+
+    server.tool_snapshot_version = 2
+    db_session.add(
+        McpDiscoveredTool(
+            organization_id=tenant.id,
+            server_id=server.id,
+            snapshot_version=2,
+            name="close_issue",
+            input_schema={"type": "object"},
+        )
+    )
+    await db_session.flush()
+    await McpService(db_session, tenant.id).update_agent_mount(mount.id, {"apply_latest_snapshot": True})
+    reapplied = await runtime.list_agent_tools(agent_id=agent.id, user_id=None)
+    assert [tool.mcp_tool_name for tool in reapplied] == ["close_issue"]
+
+    await McpService(db_session, tenant.id).update_agent_mount(mount.id, {"is_active": False})
+    assert await runtime.list_agent_tools(agent_id=agent.id, user_id=None) == []
+
+
 @pytest.mark.asyncio
 async def test_mcp_runtime_requires_user_account_for_oauth_mount(db_session, mcp_fixture):
     tenant = mcp_fixture["tenant"]
@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from uuid import UUID, uuid4
 
 import pytest
@@ -6,7 +6,7 @@ import pytest
 from app.db.postgres.models.agent_threads import AgentThread, AgentThreadSurface
 from app.db.postgres.models.agents import Agent, AgentRun, AgentStatus, RunStatus
 from app.db.postgres.models.identity import Organization, User
-from app.db.postgres.models.orchestration import OrchestratorPolicy, OrchestratorTargetAllowlist
+from app.db.postgres.models.orchestration import OrchestrationGroup, OrchestratorPolicy, OrchestratorTargetAllowlist
 from app.services.orchestration_kernel_service import OrchestrationKernelService
 
 
@@ -253,3 +253,158 @@ async def test_join_best_effort_returns_completed_with_errors(db_session):
 
     assert joined["complete"] is True
     assert joined["status"] == "completed_with_errors"
+
+
+def _record_resumes(monkeypatch) -> list[tuple[UUID, dict]]:
+    from app.agent.execution.service import AgentExecutorService
+
+    resumed: list[tuple[UUID, dict]] = []
+
+    async def _fake_resume_run(self, run_id, user_input, background=True):
+        resumed.append((run_id, user_input))
+
+    monkeypatch.setattr(AgentExecutorService, "resume_run", _fake_resume_run)
+    return resumed
+
+
+async def _finish_child(db_session, kernel, *, run_id: str, group_id: UUID, status: RunStatus) -> bool:
+    await _set_status(db_session, run_id, status)
+    await db_session.commit()
+    return await kernel.record_child_terminal(run_id=UUID(run_id), orchestration_group_id=group_id, status=status)
+
+
+@pytest.mark.asyncio
+async def test_parked_join_resumes_orchestrator_once_when_children_finish(db_session, monkeypatch):
+    resumed = _record_resumes(monkeypatch)
+    fx = await _setup_fixture(db_session)
+    kernel = OrchestrationKernelService(db_session)
+    group = await _spawn_group(db_session, root_run_id=fx["root_run"].id, target_id=fx["target"].id, count=2)
+    group_id = UUID(group["orchestration_group_id"])
+    run_ids = group["spawned_run_ids"]
+
+    parked = await kernel.join(
+        caller_run_id=fx["root_run"].id,
+        orchestration_group_id=group_id,
+        mode="all",
+        quorum_threshold=None,
+        timeout_s=60,
+        park=True,
+    )
+    assert parked["complete"] is False
+    assert parked["parked"] is True
+    fx["root_run"].status = RunStatus.paused
+    await db_session.commit()
+
+    assert await _finish_child(db_session, kernel, run_id=run_ids[0], group_id=group_id, status=RunStatus.completed) is False
+    assert resumed == []
+    assert await _finish_child(db_session, kernel, run_id=run_ids[1], group_id=group_id, status=RunStatus.failed) is True
+    assert await kernel.record_child_terminal(
+        run_id=UUID(run_ids[1]),
+        orchestration_group_id=group_id,
+        status=RunStatus.failed,
+    ) is False
+
+    assert resumed == [(fx["root_run"].id, {"orchestration_join": {"orchestration_group_id": str(group_id)}})]
+    row = await db_session.get(OrchestrationGroup, group_id, populate_existing=True)
+    assert (row.status, row.success_count, row.failure_count, row.member_count) == ("resumed", 1, 1, 2)
+
+    joined = await kernel.join(
+        caller_run_id=fx["root_run"].id,
+        orchestration_group_id=group_id,
+        mode="all",
+        quorum_threshold=None,
+        timeout_s=60,
+        park=True,
+    )
+    assert joined["complete"] is True
+    assert joined["status"] == "completed_with_errors"
+
+
+@pytest.mark.asyncio
+async def test_parked_quorum_join_ready_before_pause_resumes_after_pause(db_session, monkeypatch):
+    resumed = _record_resumes(monkeypatch)
+    fx = await _setup_fixture(db_session)
+    kernel = OrchestrationKernelService(db_session)
+    group = await _spawn_group(db_session, root_run_id=fx["root_run"].id, target_id=fx["target"].id, count=3)
+    group_id = UUID(group["orchestration_group_id"])
+    run_ids = group["spawned_run_ids"]
+
+    await kernel.join(
+        caller_run_id=fx["root_run"].id,
+        orchestration_group_id=group_id,
+        mode="quorum",
+        quorum_threshold=2,
+        timeout_s=60,
+        park=True,
+    )
+    await _finish_child(db_session, kernel, run_id=run_ids[0], group_id=group_id, status=RunStatus.completed)
+    # The orchestrator has not committed its pause yet, so the group is only flagged ready.
+    assert await _finish_child(db_session, kernel, run_id=run_ids[1], group_id=group_id, status=RunStatus.completed) is False
+    row = await db_session.get(OrchestrationGroup, group_id, populate_existing=True)
+    assert row.status == "ready"
+
+    fx["root_run"].status = RunStatus.paused
+    await db_session.commit()
+    assert await kernel.resume_ready_joins(orchestrator_run_id=fx["root_run"].id) == 1
+    assert await kernel.resume_ready_joins(orchestrator_run_id=fx["root_run"].id) == 0
+    assert len(resumed) == 1
+
+
+@pytest.mark.asyncio
+async def test_timed_out_parked_join_is_resumed_by_sweep(db_session, monkeypatch):
+    resumed = _record_resumes(monkeypatch)
+    fx = await _setup_fixture(db_session)
+    kernel = OrchestrationKernelService(db_session)
+    group = await _spawn_group(db_session, root_run_id=fx["root_run"].id, target_id=fx["target"].id, count=2)
+    group_id = UUID(group["orchestration_group_id"])
+
+    await kernel.join(
+        caller_run_id=fx["root_run"].id,
+        orchestration_group_id=group_id,
+        mode="all",
+        quorum_threshold=None,
+        timeout_s=60,
+        park=True,
+    )
+    fx["root_run"].status = RunStatus.paused
+    await db_session.commit()
+
+    assert await kernel.resume_timed_out_joins() == 0
+    later = datetime.now(timezone.utc) + timedelta(seconds=120)
+    assert await kernel.resume_timed_out_joins(now=later) == 1
+    assert [run_id for run_id, _ in resumed] == [fx["root_run"].id]
+
+
+@pytest.mark.asyncio
+async def test_join_node_suspend_mode_parks_via_interrupt(monkeypatch):
+    from app.agent.executors import orchestration as orchestration_executors
+
+    join_calls: list[dict] = []
+    interrupts: list[dict] = []
+    group_id = uuid4()
+
+    async def _fake_join(self, **kwargs):
+        join_calls.append(kwargs)
+        return {"group_id": str(group_id), "status": "running", "complete": False, "parked": kwargs["park"]}
+
+    def _fake_interrupt(value):
+        interrupts.append(value)
+        return {"orchestration_group_id": str(group_id)}
+
+    monkeypatch.setattr(OrchestrationKernelService, "join", _fake_join)
+    monkeypatch.setattr(orchestration_executors, "interrupt", _fake_interrupt)
+
+    executor = orchestration_executors.JoinNodeExecutor(None, object())
+    result = await executor.execute(
+        {},
+        {"orchestration_group_id": str(group_id), "wait_mode": "suspend"},
+        {"run_id": str(uuid4()), "node_id": "join_1"},
+    )
+
+    assert join_calls[0]["park"] is True
+    assert interrupts == [{"orchestration_group_id": str(group_id), "reason": "join_waiting"}]
+    assert result["next"] == "pending"
+
+    await executor.execute({}, {"orchestration_group_id": str(group_id)}, {"run_id": str(uuid4())})
+    assert join_calls[1]["park"] is False
+    assert len(interrupts) == 1
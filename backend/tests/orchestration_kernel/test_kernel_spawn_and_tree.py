@@ -1,11 +1,18 @@
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
+from sqlalchemy import func, select
 
+from app.agent.execution.service import AgentExecutorService
 from app.db.postgres.models.agent_threads import AgentThread, AgentThreadSurface
 from app.db.postgres.models.agents import Agent, AgentRun, AgentStatus, RunStatus
 from app.db.postgres.models.identity import Organization, User
-from app.db.postgres.models.orchestration import OrchestratorPolicy, OrchestratorTargetAllowlist
+from app.db.postgres.models.orchestration import (
+    OrchestrationGroup,
+    OrchestrationGroupMember,
+    OrchestratorPolicy,
+    OrchestratorTargetAllowlist,
+)
 from app.services.orchestration_kernel_service import OrchestrationKernelService
 
 
@@ -152,3 +159,106 @@ async def test_spawn_run_denies_non_allowlisted_target(db_session):
             idempotency_key="k-denied",
             start_background=False,
         )
+
+
+@pytest.mark.asyncio
+async def test_spawn_group_bulk_inserts_children_and_dispatches_once(db_session, monkeypatch):
+    fx = await _setup_orchestration_fixture(db_session)
+    kernel = OrchestrationKernelService(db_session)
+    dispatches: list[list[UUID]] = []
+    allowlist_checks: list[int] = []
+    original_assert_targets_allowed = kernel.policy.assert_targets_allowed
+
+    async def _record_dispatch(self, run_ids):
+        dispatches.append(list(run_ids))
+
+    async def _count_allowlist_checks(**kwargs):
+        allowlist_checks.append(len(kwargs["targets"]))
+        return await original_assert_targets_allowed(**kwargs)
+
+    monkeypatch.setattr(AgentExecutorService, "_enqueue_background_runs", _record_dispatch)
+    monkeypatch.setattr(kernel.policy, "assert_targets_allowed", _count_allowlist_checks)
+
+    async def _spawn():
+        return await kernel.spawn_group(
+            caller_run_id=fx["root_run"].id,
+            parent_node_id="fanout",
+            targets=[
+                {"target_agent_id": str(fx["target"].id), "mapped_input_payload": {"input": f"task-{idx}"}}
+                for idx in range(4)
+            ],
+            failure_policy="best_effort",
+            join_mode="all",
+            quorum_threshold=None,
+            timeout_s=30,
+            scope_subset=["agents.execute"],
+            idempotency_key_prefix="fanout-1",
+        )
+
+    first = await _spawn()
+
+    assert len(first["spawned_run_ids"]) == 4
+    assert allowlist_checks == [1]
+    assert dispatches == [[UUID(run_id) for run_id in first["spawned_run_ids"]]]
+    children = (
+        await db_session.execute(
+            select(AgentRun).where(AgentRun.parent_run_id == fx["root_run"].id).order_by(AgentRun.spawn_key)
+        )
+    ).scalars().all()
+    assert [child.spawn_key for child in children] == [f"fanout-1:{idx}" for idx in range(4)]
+    assert {child.root_run_id for child in children} == {fx["root_run"].id}
+    assert all(child.depth == 1 for child in children)
+    assert all(child.input_params["context"]["orchestration_group_id"] == first["orchestration_group_id"] for child in children)
+    members = (
+        await db_session.execute(
+            select(OrchestrationGroupMember)
+            .where(OrchestrationGroupMember.group_id == UUID(first["orchestration_group_id"]))
+            .order_by(OrchestrationGroupMember.ordinal)
+        )
+    ).scalars().all()
+    assert [str(member.run_id) for member in members] == first["spawned_run_ids"]
+
+    second = await _spawn()
+
+    assert second["spawned_run_ids"] == first["spawned_run_ids"]
+    assert dispatches[1:] == [[]]
+    child_count = await db_session.scalar(
+        select(func.count()).select_from(AgentRun).where(AgentRun.parent_run_id == fx["root_run"].id)
+    )
+    assert child_count == 4
+
+
+@pytest.mark.asyncio
+async def test_spawn_group_rejects_non_allowlisted_target_before_creating_group(db_session):
+    fx = await _setup_orchestration_fixture(db_session)
+    kernel = OrchestrationKernelService(db_session)
+    denied_target = Agent(
+        organization_id=fx["tenant"].id,
+        name="Denied",
+        slug=f"denied-{uuid4().hex[:8]}",
+        status=AgentStatus.published,
+        graph_definition={"nodes": [], "edges": []},
+    )
+    db_session.add(denied_target)
+    await db_session.commit()
+
+    with pytest.raises(PermissionError):
+        await kernel.spawn_group(
+            caller_run_id=fx["root_run"].id,
+            parent_node_id="fanout",
+            targets=[{"target_agent_id": str(fx["target"].id)}, {"target_agent_id": str(denied_target.id)}],
+            failure_policy="best_effort",
+            join_mode="all",
+            quorum_threshold=None,
+            timeout_s=30,
+            scope_subset=["agents.execute"],
+            idempotency_key_prefix="fanout-denied",
+            start_background=False,
+        )
+
+    group_count = await db_session.scalar(
+        select(func.count()).select_from(OrchestrationGroup).where(
+            OrchestrationGroup.orchestrator_run_id == fx["root_run"].id
+        )
+    )
+    assert group_count == 0
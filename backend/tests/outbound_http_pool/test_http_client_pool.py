@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.http_client_pool import HttpClientPool, http_origin
+
+
+def _pool(handler, **kwargs) -> HttpClientPool:
+    def _transport_factory(**_):
+        return httpx.MockTransport(handler)
+
+    return HttpClientPool(http2=False, transport_factory=_transport_factory, **kwargs)
+
+
+def test_http_origin_drops_path_and_query():
+    assert http_origin("HTTPS://MCP.Example.com:8443/mcp/v1?x=1") == "https://mcp.example.com:8443"
+    assert http_origin("not a url") == "not a url"
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_clients_per_origin_identity_and_timeout_without_sharing_cookies():
+    seen_cookies: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_cookies.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "sid=tenant-a; Path=/"}, json={"ok": True})
+
+    pool = _pool(handler)
+    async with pool.client("https://mcp.example.com/a", timeout=20, auth_identity="tenant-a") as first:
+        await first.get("https://mcp.example.com/a")
+    async with pool.client("https://mcp.example.com/b", timeout=20, auth_identity="tenant-a") as second:
+        await second.get("https://mcp.example.com/b")
+    other_identity = await pool.get_client("https://mcp.example.com", timeout=20, auth_identity="tenant-b")
+    other_timeout = await pool.get_client("https://mcp.example.com", timeout=5, auth_identity="tenant-a")
+
+    assert first is second
+    assert other_identity is not first
+    assert other_timeout is not first
+    assert seen_cookies == [None, None]
+
+    metrics = pool.metrics()
+    assert metrics["clients"] == 3
+    assert metrics["requests"] == 2
+    assert metrics["in_use"] == 0
+    assert metrics["hosts"]["https://mcp.example.com"]["clients"] == 3
+    await pool.aclose()
+    assert pool.metrics()["clients"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_counts_streams_in_use_until_closed_and_records_waits():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"data: {}\n\n")
+
+    pool = _pool(handler, max_connections=1)
+    client = await pool.get_client("http://opencode.local")
+
+    async with client.stream("GET", "http://opencode.local/global/event") as first:
+        assert pool.metrics()["in_use"] == 1
+        async with client.stream("GET", "http://opencode.local/global/event") as second:
+            assert first.status_code == second.status_code == 200
+            assert pool.metrics()["in_use"] == 2
+    metrics = pool.metrics()
+    assert metrics["in_use"] == 0
+    assert metrics["waits"] == 1
+    assert metrics["max_connections_per_client"] == 1
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_closes_idle_clients_and_keeps_busy_ones():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"ok")
+
+    pool = _pool(handler, idle_client_seconds=0)
+    idle = await pool.get_client("http://idle.local")
+    busy = await pool.get_client("http://busy.local")
+    async with busy.stream("GET", "http://busy.local/") as response:
+        fresh = await pool.get_client("http://fresh.local")
+        assert response.status_code == 200
+
+    assert idle.is_closed
+    assert not busy.is_closed
+    assert not fresh.is_closed
+    assert set(pool.metrics()["hosts"]) == {"http://busy.local", "http://fresh.local"}
+    await pool.aclose()
+
+
+def test_pool_does_not_hand_out_clients_across_event_loops():
+    pool = _pool(lambda request: httpx.Response(200))
+
+    async def _get() -> httpx.AsyncClient:
+        return await pool.get_client("http://controller.local")
+
+    first = asyncio.run(_get())
+    second = asyncio.run(_get())
+
+    assert first is not second
+    assert pool.metrics()["clients"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streaming_pool_is_separate_and_not_capped_by_request_pool(monkeypatch):
+    from app.services import http_client_pool
+
+    assert http_client_pool.get_streaming_http_client_pool() is not http_client_pool.get_http_client_pool()
+    assert http_client_pool.get_streaming_http_client_pool().limits.max_connections > 32
+
+    monkeypatch.setenv("OUTBOUND_HTTP_STREAM_POOL_MAX_CONNECTIONS", "64")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=b"data: {}\n\n")
+
+    requests = _pool(handler, max_connections=1)
+    streams = _pool(handler, env_prefix="OUTBOUND_HTTP_STREAM_POOL", default_max_connections=1024)
+    assert streams.limits.max_connections == 64
+
+    stream_client = await streams.get_client("http://opencode.local")
+    open_streams = [
+        await stream_client.send(stream_client.build_request("GET", "/global/event"), stream=True)
+        for _ in range(40)
+    ]
+    request_client = await requests.get_client("http://opencode.local")
+    response = await request_client.get("/session")
+
+    assert response.status_code == 200
+    assert streams.metrics()["in_use"] == 40
+    assert streams.metrics()["waits"] == 0
+    assert requests.metrics()["waits"] == 0
+    for stream in open_streams:
+        await stream.aclose()
+    await streams.aclose()
+    await requests.aclose()
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.db.postgres.models.rag import RetrievalPolicy, StorageBackend
+from app.rag.providers.vector_store.pgvector import PgvectorIndexProfile, PgvectorVectorStore
+from app.services.retrieval_service import RetrievalService
+
+
+class _FakeConnection:
+    def __init__(self, *, fetchrow_results=None, fetch_results=None):
+        self.executed: list[str] = []
+        self.fetched: list[tuple[str, tuple]] = []
+        self.in_transaction = False
+        self.transaction_statements: list[str] = []
+        self._fetchrow_results = list(fetchrow_results or [])
+        self._fetch_results = list(fetch_results or [])
+
+    async def execute(self, sql, *args):
+        self.executed.append(" ".join(sql.split()))
+        if self.in_transaction:
+            self.transaction_statements.append(" ".join(sql.split()))
+
+    async def fetchrow(self, sql, *args):
+        self.fetched.append((" ".join(sql.split()), args))
+        return self._fetchrow_results.pop(0) if self._fetchrow_results else None
+
+    async def fetch(self, sql, *args):
+        self.fetched.append((" ".join(sql.split()), args))
+        if self.in_transaction:
+            self.transaction_statements.append(" ".join(sql.split()))
+        return self._fetch_results.pop(0) if self._fetch_results else []
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+
+class _FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def _store(conn) -> PgvectorVectorStore:
+    store = PgvectorVectorStore(connection_string="postgresql://unused")
+    store._pool = _FakePool(conn)
+    return store
+
+
+@pytest.mark.asyncio
+async def test_create_index_defaults_to_hnsw_with_gin_metadata_index():
+    conn = _FakeConnection(fetchrow_results=[{"estimate": -1}])
+    store = _store(conn)
+
+    assert await store.create_index("docs", 8, index_profile={"m": 24, "ef_construction": 128}) is True
+    assert await store.create_index("docs", 8) is True
+
+    embedding_ddl = [sql for sql in conn.executed if "_embedding_idx" in sql]
+    assert len(embedding_ddl) == 1
+    assert "USING hnsw (embedding vector_cosine_ops)" in embedding_ddl[0]
+    assert "WITH (m = 24, ef_construction = 128)" in embedding_ddl[0]
+    assert any("USING gin (metadata jsonb_path_ops)" in sql for sql in conn.executed)
+    # The second call is memoized and issues no DDL.
+    assert sum("CREATE TABLE" in sql for sql in conn.executed) == 1
+
+
+@pytest.mark.parametrize(
+    ("row_estimate", "expected_lists"),
+    [(-1, 1), (250_000, 250), (4_000_000, 2000)],
+)
+def test_ivfflat_lists_are_sized_from_row_estimate(row_estimate, expected_lists):
+    profile = PgvectorIndexProfile.from_config({"method": "ivfflat"})
+    assert profile.ivfflat_lists(row_estimate) == expected_lists
+    assert f"lists = {expected_lists}" in profile.index_sql("t", "vector_l2_ops", row_estimate)
+    assert PgvectorIndexProfile.from_config({"method": "ivfflat", "lists": 64}).ivfflat_lists(row_estimate) == 64
+
+
+@pytest.mark.asyncio
+async def test_auto_sized_ivfflat_index_waits_for_rows():
+    conn = _FakeConnection(fetchrow_results=[{"estimate": -1}])
+    store = _store(conn)
+
+    assert await store.create_index("docs", 8, index_profile={"method": "ivfflat"}) is True
+    assert not any("_embedding_idx" in sql for sql in conn.executed)
+
+    explicit = _FakeConnection(fetchrow_results=[{"estimate": -1}])
+    assert await _store(explicit).create_index("docs", 8, index_profile={"method": "ivfflat", "lists": 64}) is True
+    assert any("USING ivfflat" in sql and "lists = 64" in sql for sql in explicit.executed)
+
+
+@pytest.mark.asyncio
+async def test_ensure_embedding_index_builds_then_resizes_ivfflat_lists_from_rows():
+    profile = {"method": "ivfflat"}
+    conn = _FakeConnection(
+        fetchrow_results=[
+            {"dimension": 8, "options": None, "indexed": False},
+            {"estimate": -1},
+            {"estimate": 250_000},
+            {"estimate": 250_000},
+        ]
+    )
+    store = _store(conn)
+
+    assert await store.ensure_embedding_index("docs", index_profile=profile) is True
+    assert conn.executed[0] == "ANALYZE rag_vectors_docs"
+    assert any("USING ivfflat" in sql and "lists = 250" in sql for sql in conn.executed)
+
+    # Within the growth factor of the current lists the index is left alone.
+    unchanged = _FakeConnection(
+        fetchrow_results=[{"dimension": 8, "options": ["lists=200"], "indexed": True}, {"estimate": 250_000}]
+    )
+    assert await _store(unchanged).ensure_embedding_index("docs", index_profile=profile) is False
+    assert unchanged.executed == []
+
+    grown = _FakeConnection(
+        fetchrow_results=[
+            {"dimension": 8, "options": ["lists=100"], "indexed": True},
+            {"estimate": 250_000},
+            {"estimate": 250_000},
+        ]
+    )
+    assert await _store(grown).ensure_embedding_index("docs", index_profile=profile) is True
+    assert "DROP INDEX IF EXISTS rag_vectors_docs_embedding_idx" in grown.executed
+
+    # Empty collections and other profiles are never built here.
+    empty = _FakeConnection(fetchrow_results=[{"dimension": 8, "options": None, "indexed": False}, {"estimate": -1}])
+    assert await _store(empty).ensure_embedding_index("docs", index_profile=profile) is False
+    assert await _store(_FakeConnection()).ensure_embedding_index("docs") is False
+
+
+@pytest.mark.asyncio
+async def test_pgvector_adapter_refresh_index_ensures_the_collection_index():
+    from app.rag.adapters.vector_backend_adapter import PgVectorAdapter
+
+    adapter = PgVectorAdapter({"collection_name": "docs", "index_profile": {"method": "ivfflat"}})
+    calls = []
+
+    async def _ensure(name, metric="cosine", index_profile=None):
+        calls.append((name, index_profile))
+        return True
+
+    adapter._store.ensure_embedding_index = _ensure
+    assert await adapter.refresh_index() is True
+    assert calls == [("docs", {"method": "ivfflat"})]
+
+
+def test_index_profile_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        PgvectorIndexProfile.from_config({"method": "diskann"})
+
+
+@pytest.mark.asyncio
+async def test_search_pushes_metadata_filters_into_containment_and_sets_ef_search():
+    conn = _FakeConnection(
+        fetch_results=[[{"id": "a", "score": 0.9, "metadata": json.dumps({"kind": "faq"})}]],
+    )
+    store = _store(conn)
+
+    results = await store.search(
+        "docs",
+        [0.1, 0.2],
+        top_k=5,
+        namespace="tenant-a",
+        filter={"kind": "faq", "lang": {"$in": ["he", "en"]}, "page": 3},
+        ef_search=200,
+    )
+
+    assert [r.id for r in results] == ["a"]
+    sql, params = conn.fetched[-1]
+    assert "->>" not in sql
+    assert "namespace = $2" in sql
+    assert "metadata @> $3::jsonb" in sql
+    assert "(metadata @> $4::jsonb OR metadata @> $5::jsonb)" in sql
+    assert "(metadata @> $6::jsonb OR metadata @> $7::jsonb)" in sql
+    assert sql.endswith("LIMIT $8")
+    assert [json.loads(value) for value in params[2:7]] == [
+        {"kind": "faq"},
+        {"lang": "he"},
+        {"lang": "en"},
+        {"page": 3},
+        {"page": "3"},
+    ]
+    assert params[-1] == 5
+    assert conn.transaction_statements[0] == "SET LOCAL hnsw.ef_search = 200"
+    assert conn.transaction_statements[-1] == sql
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_unsupported_filter_operator():
+    store = _store(_FakeConnection())
+    with pytest.raises(RuntimeError, match="Unsupported metadata filter operator"):
+        await store.search("docs", [0.1], filter={"page": {"$gt": 3}})
+
+
+@pytest.mark.asyncio
+async def test_index_stats_come_from_catalog_without_table_scan():
+    conn = _FakeConnection(
+        fetchrow_results=[
+            {"estimate": 1_200_000, "dimension": 1536},
+            {"vals": ["tenant-a", ""], "freqs": [0.75, 0.25], "null_frac": 0.0},
+        ]
+    )
+    store = _store(conn)
+
+    stats = await store.get_index_stats("docs")
+
+    assert stats.total_vector_count == 1_200_000
+    assert stats.dimension == 1536
+    assert stats.namespaces == {"tenant-a": 900_000, "": 300_000}
+    assert not any("COUNT(*)" in sql for sql, _args in conn.fetched)
+
+
+def test_retrieval_search_params_apply_policy_overrides_and_filter_floor():
+    store = SimpleNamespace(
+        backend=StorageBackend.PGVECTOR,
+        backend_config={
+            "search_params": {
+                "ef_search": 60,
+                "probes": 8,
+                "policies": {"hybrid": {"ef_search": 120}},
+            }
+        },
+    )
+
+    semantic = RetrievalService._resolve_search_params(
+        store, RetrievalPolicy.SEMANTIC_ONLY, fetch_k=10, filters=None
+    )
+    hybrid = RetrievalService._resolve_search_params(
+        store, RetrievalPolicy.HYBRID, fetch_k=20, filters=None
+    )
+    filtered = RetrievalService._resolve_search_params(
+        store, RetrievalPolicy.SEMANTIC_ONLY, fetch_k=50, filters={"kind": "faq"}
+    )
+
+    assert semantic == {"ef_search": 60, "probes": 8}
+    assert hybrid == {"ef_search": 120, "probes": 8}
+    assert filtered == {"ef_search": 200, "probes": 8}
+
+    other_backend = SimpleNamespace(backend=StorageBackend.PINECONE, backend_config={})
+    assert RetrievalService._resolve_search_params(
+        other_backend, RetrievalPolicy.SEMANTIC_ONLY, fetch_k=10, filters=None
+    ) is None
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import Response
+from sqlalchemy import func, select
+from starlette.requests import Request
+
+from app.db.postgres.models.agents import Agent, AgentStatus
+from app.db.postgres.models.identity import Organization, User
+from app.db.postgres.models.published_app_analytics import (
+    PublishedAppAnalyticsEvent,
+    PublishedAppAnalyticsEventType,
+    PublishedAppAnalyticsSurface,
+)
+from app.db.postgres.models.published_apps import PublishedApp, PublishedAppStatus
+from app.services import published_app_analytics_service
+from app.services.published_app_analytics_buffer import PublishedAppAnalyticsBuffer
+from app.services.published_app_analytics_service import PublishedAppAnalyticsService
+
+
+async def _seed_app(db_session) -> PublishedApp:
+    tenant = Organization(name=f"Organization {uuid4().hex[:6]}", slug=f"tenant-{uuid4().hex[:8]}")
+    owner = User(email=f"owner-{uuid4().hex[:8]}@example.com", hashed_password="x", role="user")
+    db_session.add_all([tenant, owner])
+    await db_session.flush()
+    agent = Agent(
+        organization_id=tenant.id,
+        name="Analytics Agent",
+        slug=f"analytics-{uuid4().hex[:6]}",
+        graph_definition={"nodes": [], "edges": []},
+        status=AgentStatus.published,
+    )
+    db_session.add(agent)
+    await db_session.flush()
+    app = PublishedApp(
+        organization_id=tenant.id,
+        agent_id=agent.id,
+        name="Analytics App",
+        public_id=f"analytics-{uuid4().hex[:8]}",
+        auth_providers=["password"],
+        allowed_origins=[],
+        status=PublishedAppStatus.published,
+        created_by=owner.id,
+    )
+    db_session.add(app)
+    await db_session.commit()
+    return app
+
+
+def _row(app, event_type=PublishedAppAnalyticsEventType.bootstrap_view, visitor_key="visitor"):
+    return {
+        "organization_id": app.organization_id,
+        "published_app_id": app.id,
+        "event_type": event_type,
+        "surface": PublishedAppAnalyticsSurface.host_runtime,
+        "visitor_key": visitor_key,
+        "visit_key": uuid4().hex,
+        "metadata_": {},
+        "occurred_at": datetime.now(timezone.utc),
+    }
+
+
+async def _count_events(db_session, app, event_type=None) -> int:
+    query = select(func.count(PublishedAppAnalyticsEvent.id)).where(PublishedAppAnalyticsEvent.published_app_id == app.id)
+    if event_type is not None:
+        query = query.where(PublishedAppAnalyticsEvent.event_type == event_type)
+    return int((await db_session.execute(query)).scalar_one())
+
+
+def _request(visitor_key: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "https",
+            "path": "/_talmudpedia/runtime/bootstrap",
+            "raw_path": b"/_talmudpedia/runtime/bootstrap",
+            "query_string": b"",
+            "headers": [(b"host", b"app.apps.localhost"), (b"cookie", f"published_app_visitor={visitor_key}".encode())],
+            "client": ("203.0.113.5", 1234),
+            "server": ("app.apps.localhost", 443),
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_buffered_events_in_batches(db_session):
+    app = await _seed_app(db_session)
+    buffer = PublishedAppAnalyticsBuffer(capacity=100, batch_size=2, flush_interval_seconds=60)
+
+    # Crossing the batch size wakes the writer; aclose drains whatever it has not written yet.
+    assert buffer.emit([_row(app) for _ in range(5)]) == 5
+    await buffer.aclose()
+
+    assert await _count_events(db_session, app) == 5
+    stats = buffer.stats()
+    assert stats["batches"] == 3
+    assert stats["written"] == 5
+    assert stats["pending"] == 0
+    assert stats["drop_rate"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_on_time_threshold(db_session):
+    app = await _seed_app(db_session)
+    buffer = PublishedAppAnalyticsBuffer(capacity=100, batch_size=100, flush_interval_seconds=0.05)
+
+    buffer.emit([_row(app)])
+    for _ in range(40):
+        await asyncio.sleep(0.05)
+        if buffer.stats()["written"]:
+            break
+
+    assert buffer.stats()["written"] == 1
+    assert await _count_events(db_session, app) == 1
+    await buffer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_backpressure_samples_views_then_drops_and_reports_rate(db_session):
+    app = await _seed_app(db_session)
+    buffer = PublishedAppAnalyticsBuffer(
+        capacity=4,
+        batch_size=100,
+        flush_interval_seconds=60,
+        high_water_ratio=0.5,
+        overload_sample_rate=0.0,
+    )
+
+    assert buffer.emit([_row(app), _row(app)]) == 2
+    # Past the high-water mark bootstrap views are sampled out, visit starts still queue.
+    assert buffer.emit([_row(app)]) == 0
+    assert buffer.emit([_row(app, PublishedAppAnalyticsEventType.visit_started)] * 3) == 2
+
+    stats = buffer.stats()
+    assert stats["pending"] == 4
+    assert stats["sampled_out"] == 1
+    assert stats["dropped"] == 1
+    assert stats["drop_rate"] == pytest.approx(2 / 6)
+
+    await buffer.aclose()
+    assert await _count_events(db_session, app) == 4
+
+
+@pytest.mark.asyncio
+async def test_record_bootstrap_buffers_writes_and_dedupes_pending_visits(db_session, monkeypatch):
+    app = await _seed_app(db_session)
+    buffer = PublishedAppAnalyticsBuffer(capacity=100, batch_size=100, flush_interval_seconds=60)
+    monkeypatch.setenv("PUBLISHED_APP_ANALYTICS_BUFFERED", "1")
+    monkeypatch.setattr(published_app_analytics_service, "get_published_app_analytics_buffer", lambda: buffer)
+    service = PublishedAppAnalyticsService(db_session)
+
+    for _ in range(2):
+        response = Response()
+        await service.record_bootstrap(
+            request=_request("returning-visitor"),
+            response=response,
+            app=app,
+            surface=PublishedAppAnalyticsSurface.host_runtime,
+        )
+        assert any(cookie.startswith("published_app_visit=") for cookie in response.headers.getlist("set-cookie"))
+
+    assert await _count_events(db_session, app) == 0
+    await buffer.aclose()
+
+    assert await _count_events(db_session, app, PublishedAppAnalyticsEventType.bootstrap_view) == 2
+    assert await _count_events(db_session, app, PublishedAppAnalyticsEventType.visit_started) == 1
+    visit_keys = set(
+        (
+            await db_session.execute(
+                select(PublishedAppAnalyticsEvent.visit_key).where(PublishedAppAnalyticsEvent.published_app_id == app.id)
+            )
+        ).scalars()
+    )
+    assert len(visit_keys) == 1
+
+
+@pytest.mark.asyncio
+async def test_record_bootstrap_does_not_reuse_a_visit_whose_start_was_dropped(db_session, monkeypatch):
+    app = await _seed_app(db_session)
+    buffer = PublishedAppAnalyticsBuffer(
+        capacity=2,
+        batch_size=100,
+        flush_interval_seconds=60,
+        high_water_ratio=1.0,
+    )
+    monkeypatch.setenv("PUBLISHED_APP_ANALYTICS_BUFFERED", "1")
+    monkeypatch.setattr(published_app_analytics_service, "get_published_app_analytics_buffer", lambda: buffer)
+    service = PublishedAppAnalyticsService(db_session)
+
+    async def _bootstrap() -> None:
+        await service.record_bootstrap(
+            request=_request("crowded-visitor"),
+            response=Response(),
+            app=app,
+            surface=PublishedAppAnalyticsSurface.host_runtime,
+        )
+
+    # With one slot left the view fills the buffer, so the visit start is dropped and
+    # must not be remembered.
+    assert buffer.emit([_row(app, visitor_key="someone-else")]) == 1
+    await _bootstrap()
+    assert buffer.stats()["dropped"] == 1
+    assert buffer.recent_visit(app_id=app.id, visitor_key="crowded-visitor", since=datetime(2000, 1, 1, tzinfo=timezone.utc)) is None
+
+    await buffer.flush()
+    await _bootstrap()
+    await buffer.flush()
+    await _bootstrap()
+    await buffer.aclose()
+
+    # The second bootstrap starts the visit again once there is room; the third reuses it.
+    assert await _count_events(db_session, app, PublishedAppAnalyticsEventType.visit_started) == 1
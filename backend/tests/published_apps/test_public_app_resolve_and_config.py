@@ -16,6 +16,7 @@ from app.db.postgres.models.published_apps import (
     PublishedAppRevision,
     PublishedAppVisibility,
 )
+from app.services.published_app_bundle_storage import PublishedAppBundleAssetStream
 
 
 def _preview_token(*, organization_id: UUID, app_id: UUID, revision_id: UUID) -> str:
@@ -134,10 +135,10 @@ async def test_preview_asset_proxy_streams_dist_asset(client, db_session, monkey
     await db_session.commit()
 
     class _Storage:
-        def read_asset_bytes(self, *, dist_storage_prefix: str, asset_path: str):
+        def open_asset(self, *, dist_storage_prefix: str, asset_path: str, byte_range=None):
             assert dist_storage_prefix == "apps/t/a/revisions/r1/dist"
             assert asset_path == "assets/main.js"
-            return b"console.log('ok');", "application/javascript"
+            return PublishedAppBundleAssetStream.from_bytes(b"console.log('ok');", "application/javascript", byte_range=byte_range)
 
     monkeypatch.setattr(
         "app.api.routers.published_apps_public.PublishedAppBundleStorage.from_env",
@@ -249,7 +250,7 @@ async def test_preview_asset_html_keeps_relative_assets_tokenless(client, db_ses
     await db_session.commit()
 
     class _Storage:
-        def read_asset_bytes(self, *, dist_storage_prefix: str, asset_path: str):
+        def open_asset(self, *, dist_storage_prefix: str, asset_path: str, byte_range=None):
             assert dist_storage_prefix == "apps/t/a/revisions/rewrite/dist"
             assert asset_path == "index.html"
             html = (
@@ -259,7 +260,7 @@ async def test_preview_asset_html_keeps_relative_assets_tokenless(client, db_ses
                 '<script type="module" src="./assets/main.js"></script>'
                 "</body></html>"
             )
-            return html.encode("utf-8"), "text/html"
+            return PublishedAppBundleAssetStream.from_bytes(html.encode("utf-8"), "text/html", byte_range=byte_range)
 
     monkeypatch.setattr(
         "app.api.routers.published_apps_public.PublishedAppBundleStorage.from_env",
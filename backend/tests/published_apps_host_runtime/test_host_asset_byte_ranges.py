@@ -0,0 +1,135 @@
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+from app.api.routers import published_apps_host_runtime as host_runtime
+from app.services.published_app_bundle_storage import (
+    PublishedAppBundleStorage,
+    PublishedAppBundleStorageConfig,
+)
+
+PAYLOAD = bytes(range(256)) * 8
+
+
+class _Body:
+    def __init__(self, payload: bytes):
+        self._payload = payload
+        self.closed = False
+
+    def iter_chunks(self, chunk_size: int):
+        for offset in range(0, len(self._payload), chunk_size):
+            yield self._payload[offset:offset + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class _RecordingS3Client:
+    def __init__(self, payload: bytes):
+        self._payload = payload
+        self.calls: list[tuple[str, dict]] = []
+
+    def head_object(self, **kwargs):
+        self.calls.append(("head_object", kwargs))
+        return {"ContentLength": len(self._payload), "ContentType": "application/octet-stream"}
+
+    def get_object(self, **kwargs):
+        self.calls.append(("get_object", kwargs))
+        header = kwargs.get("Range")
+        if header is None:
+            return {"Body": _Body(self._payload), "ContentLength": len(self._payload)}
+        start, end = (int(value) for value in header.removeprefix("bytes=").split("-"))
+        return {
+            "Body": _Body(self._payload[start:end + 1]),
+            "ContentLength": end - start + 1,
+            "ContentRange": f"bytes {start}-{end}/{len(self._payload)}",
+        }
+
+
+def _request(range_header: str | None) -> Request:
+    headers = [(b"host", b"range-app.apps.localhost")]
+    if range_header is not None:
+        headers.append((b"range", range_header.encode()))
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/media/clip.bin",
+            "raw_path": b"/media/clip.bin",
+            "query_string": b"",
+            "headers": headers,
+            "server": ("range-app.apps.localhost", 80),
+            "client": ("127.0.0.1", 12345),
+        }
+    )
+
+
+async def _body(response) -> bytes:
+    if hasattr(response, "body_iterator"):
+        return b"".join([chunk async for chunk in response.body_iterator])
+    return response.body
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    client = _RecordingS3Client(PAYLOAD)
+    storage = PublishedAppBundleStorage(
+        PublishedAppBundleStorageConfig(
+            bucket="apps-test", region=None, endpoint=None, access_key=None, secret_key=None, local_dir=None
+        )
+    )
+    storage._client = client
+    revision = SimpleNamespace(dist_storage_prefix="apps/t/a/revisions/r/dist", dist_manifest={})
+
+    async def _no_principal(**_kwargs):
+        return None, False
+
+    async def _revision(_db, _app):
+        return revision
+
+    monkeypatch.setattr(host_runtime.PublishedAppBundleStorage, "from_env", staticmethod(lambda: storage))
+    monkeypatch.setattr(host_runtime, "_resolve_optional_principal_from_cookie", _no_principal)
+    monkeypatch.setattr(host_runtime, "_get_published_ui_revision", _revision)
+    return client
+
+
+async def _serve(range_header: str | None):
+    return await host_runtime._serve_published_asset_response(
+        request=_request(range_header),
+        db=None,
+        app=SimpleNamespace(auth_enabled=False),
+        asset_path="media/clip.bin",
+    )
+
+
+@pytest.mark.asyncio
+async def test_range_request_sizes_with_head_and_fetches_only_the_range(s3_client):
+    response = await _serve("bytes=100-355")
+
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes 100-355/{len(PAYLOAD)}"
+    assert response.headers["Content-Length"] == "256"
+    assert await _body(response) == PAYLOAD[100:356]
+    assert [name for name, _ in s3_client.calls] == ["head_object", "get_object"]
+    assert s3_client.calls[1][1]["Range"] == "bytes=100-355"
+
+
+@pytest.mark.asyncio
+async def test_unsatisfiable_range_answers_416_without_fetching_the_body(s3_client):
+    response = await _serve(f"bytes={len(PAYLOAD)}-")
+
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == f"bytes */{len(PAYLOAD)}"
+    assert [name for name, _ in s3_client.calls] == ["head_object"]
+
+
+@pytest.mark.asyncio
+async def test_plain_request_fetches_once_without_head(s3_client):
+    response = await _serve(None)
+
+    assert response.status_code == 200
+    assert await _body(response) == PAYLOAD
+    assert [name for name, _ in s3_client.calls] == ["get_object"]
+    assert "Range" not in s3_client.calls[0][1]
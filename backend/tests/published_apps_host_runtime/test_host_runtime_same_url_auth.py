@@ -9,6 +9,7 @@ from app.db.postgres.models.agent_threads import AgentThread, AgentThreadSurface
 from app.db.postgres.models.agents import AgentRun
 from app.db.postgres.models.identity import User
 from app.db.postgres.models.published_apps import PublishedAppAccount, PublishedAppRevision, PublishedAppRevisionKind
+from app.services.published_app_bundle_storage import PublishedAppBundleAssetStream
 from app.services.security_bootstrap_service import SecurityBootstrapService
 from app.services.thread_service import ThreadService
 from tests.published_apps._helpers import install_stub_agent_worker, seed_admin_tenant_and_agent, seed_published_app
@@ -657,10 +658,10 @@ async def test_host_assets_serve_dist_asset_with_assets_prefix(client, db_sessio
     await db_session.commit()
 
     class _Storage:
-        def read_asset_bytes(self, *, dist_storage_prefix: str, asset_path: str):
+        def open_asset(self, *, dist_storage_prefix: str, asset_path: str, byte_range=None):
             assert dist_storage_prefix == "apps/t/a/revisions/host-assets/dist"
             assert asset_path == "assets/index-abc123.js"
-            return b"console.log('ok')", "application/javascript"
+            return PublishedAppBundleAssetStream.from_bytes(b"console.log('ok')", "application/javascript", byte_range=byte_range)
 
     monkeypatch.setattr(
         "app.api.routers.published_apps_host_runtime.PublishedAppBundleStorage.from_env",
@@ -672,6 +673,71 @@ async def test_host_assets_serve_dist_asset_with_assets_prefix(client, db_sessio
     assert "console.log('ok')" in resp.text
 
 
+@pytest.mark.asyncio
+async def test_host_assets_honor_byte_range_requests(client, db_session, monkeypatch):
+    tenant, owner, _, agent = await seed_admin_tenant_and_agent(db_session)
+    app = await seed_published_app(
+        db_session,
+        tenant.id,
+        agent.id,
+        owner.id,
+        slug="host-range-assets-app",
+        auth_enabled=False,
+        auth_providers=["password"],
+    )
+
+    revision = PublishedAppRevision(
+        published_app_id=app.id,
+        kind=PublishedAppRevisionKind.published,
+        template_key="classic-chat",
+        template_runtime="vite_static",
+        files={"src/main.tsx": "export default {};"},
+        dist_storage_prefix="apps/t/a/revisions/host-range-assets/dist",
+        dist_manifest={"entry_html": "index.html"},
+        created_by=owner.id,
+    )
+    db_session.add(revision)
+    await db_session.flush()
+    app.current_published_revision_id = revision.id
+    await db_session.commit()
+
+    payload = bytes(range(256)) * 8
+    requested_ranges = []
+
+    class _Storage:
+        def stat_asset(self, *, dist_storage_prefix: str, asset_path: str):
+            assert asset_path == "media/clip.bin"
+            return len(payload), "application/octet-stream"
+
+        def open_asset(self, *, dist_storage_prefix: str, asset_path: str, byte_range=None):
+            assert asset_path == "media/clip.bin"
+            assert byte_range is not None
+            requested_ranges.append(byte_range)
+            return PublishedAppBundleAssetStream.from_bytes(payload, "application/octet-stream", byte_range=byte_range)
+
+    monkeypatch.setattr(
+        "app.api.routers.published_apps_host_runtime.PublishedAppBundleStorage.from_env",
+        staticmethod(lambda: _Storage()),
+    )
+
+    resp = await client.get(
+        "/media/clip.bin",
+        headers={**_host_headers(app.public_id), "Range": "bytes=100-355"},
+    )
+    assert resp.status_code == 206
+    assert resp.headers["Content-Range"] == f"bytes 100-355/{len(payload)}"
+    assert resp.content == payload[100:356]
+    assert requested_ranges[-1].start == 100 and requested_ranges[-1].end == 355
+
+    unsatisfiable = await client.get(
+        "/media/clip.bin",
+        headers={**_host_headers(app.public_id), "Range": f"bytes={len(payload)}-"},
+    )
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["Content-Range"] == f"bytes */{len(payload)}"
+    assert len(requested_ranges) == 1
+
+
 @pytest.mark.asyncio
 async def test_host_assets_are_private_cache_when_auth_enabled(client, db_session, monkeypatch):
     tenant, owner, _, agent = await seed_admin_tenant_and_agent(db_session)
@@ -701,10 +767,10 @@ async def test_host_assets_are_private_cache_when_auth_enabled(client, db_sessio
     await db_session.commit()
 
     class _Storage:
-        def read_asset_bytes(self, *, dist_storage_prefix: str, asset_path: str):
+        def open_asset(self, *, dist_storage_prefix: str, asset_path: str, byte_range=None):
             assert dist_storage_prefix == "apps/t/a/revisions/host-private-assets/dist"
             assert asset_path == "assets/index-auth.js"
-            return b"console.log('private')", "application/javascript"
+            return PublishedAppBundleAssetStream.from_bytes(b"console.log('private')", "application/javascript", byte_range=byte_range)
 
     monkeypatch.setattr(
         "app.api.routers.published_apps_host_runtime.PublishedAppBundleStorage.from_env",
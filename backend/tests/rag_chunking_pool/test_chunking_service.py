@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import pytest
+import tiktoken
+import tiktoken.registry
+
+from app.rag.factory import ChunkerConfig, ChunkerType
+from app.rag.providers.chunker.token_based import TokenBasedChunker
+from app.services import chunking_service
+from app.services.chunking_service import ChunkingService
+
+
+def _byte_level_encoding() -> tiktoken.Encoding:
+    # Offline stand-in for cl100k_base: one token per byte of each word/space run.
+    return tiktoken.Encoding(
+        name="cl100k_base",
+        pat_str=r"\S+|\s+",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+
+
+@pytest.fixture(autouse=True)
+def _offline_encoding(monkeypatch):
+    monkeypatch.setitem(tiktoken.registry.ENCODINGS, "cl100k_base", _byte_level_encoding())
+    chunking_service._cached_chunker.cache_clear()
+    yield
+    chunking_service._cached_chunker.cache_clear()
+
+
+def _corpus(documents: int, sentences: int) -> list[dict]:
+    return [
+        {
+            "id": f"doc-{index}",
+            "text": " ".join(f"Document {index} sentence {n} talks about topic {n % 7}." for n in range(sentences)),
+            "metadata": {"position": index},
+        }
+        for index in range(documents)
+    ]
+
+
+def _sequential(config: ChunkerConfig, documents: list[dict]) -> list[dict]:
+    chunker = TokenBasedChunker(
+        target_tokens=config.target_tokens,
+        max_tokens=config.max_tokens,
+        overlap_tokens=config.overlap_tokens,
+    )
+    chunks = []
+    for doc in documents:
+        chunks.extend(c.model_dump() for c in chunker.chunk(doc["text"], doc_id=doc["id"], metadata=doc["metadata"]))
+    return chunks
+
+
+def test_token_chunker_encodes_each_sentence_once():
+    chunker = TokenBasedChunker(target_tokens=120, max_tokens=160, overlap_tokens=60)
+    calls = []
+    original = chunker._encoding.encode_ordinary
+
+    class _CountingEncoding:
+        def encode_ordinary(self, text):
+            calls.append(text)
+            return original(text)
+
+    chunker._encoding = _CountingEncoding()
+    text = _corpus(1, 40)[0]["text"]
+
+    chunks = chunker.chunk(text, doc_id="doc")
+
+    assert len(chunks) > 3
+    assert len(calls) == 40
+    # Overlap sentences carry their cached counts into the next chunk; joins add one space token each.
+    for chunk in chunks:
+        assert chunk.token_count == len(original(chunk.text)) - chunk.text.count(". ")
+    assert chunks[1].text.split(". ")[0] in chunks[0].text
+
+
+@pytest.mark.asyncio
+async def test_small_inputs_are_chunked_in_thread_without_pool():
+    service = ChunkingService(max_workers=4, min_parallel_chars=10_000_000)
+    config = ChunkerConfig(strategy=ChunkerType.TOKEN_BASED, target_tokens=120, max_tokens=160, overlap_tokens=30)
+    documents = _corpus(3, 20)
+
+    chunks = await service.chunk_documents(config, documents)
+
+    assert chunks == _sequential(config, documents)
+    assert service._pool is None
+
+
+@pytest.mark.asyncio
+async def test_large_inputs_use_process_pool_and_keep_input_order():
+    service = ChunkingService(max_workers=2, min_parallel_chars=0, start_method="fork")
+    config = ChunkerConfig(strategy=ChunkerType.TOKEN_BASED, target_tokens=120, max_tokens=160, overlap_tokens=30)
+    documents = _corpus(12, 30)
+    try:
+        chunks = await service.chunk_documents(config, documents)
+        assert service._pool is not None
+    finally:
+        service.shutdown()
+
+    assert chunks == _sequential(config, documents)
+    assert [c["metadata"]["position"] for c in chunks] == sorted(c["metadata"]["position"] for c in chunks)
+
+
+def test_plan_batches_are_contiguous_and_cover_every_document():
+    service = ChunkingService(max_workers=3, batches_per_worker=2)
+    documents = [(f"doc-{i}", "x" * (100 if i % 3 else 1000), {}) for i in range(20)]
+
+    batches = service.plan_batches(documents)
+
+    assert 2 <= len(batches) <= 6
+    assert [doc for batch in batches for doc in batch] == documents
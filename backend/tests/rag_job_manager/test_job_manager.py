@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.workers.job_manager import JobManager, JobProgressReporter, JobStatus
+
+
+class _FakePipeline:
+    def __init__(self, redis: "_FakeRedis"):
+        self._redis = redis
+        self._commands: list[tuple[str, tuple, dict]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    async def execute(self):
+        self._redis.round_trips += 1
+        return [getattr(self._redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in self._commands]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.lists: dict[str, list[str]] = {}
+        self.published: list[tuple[str, str]] = []
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True):
+        return _FakePipeline(self)
+
+    async def hgetall(self, key):
+        self.round_trips += 1
+        return self._hgetall(key)
+
+    async def zrevrange(self, key, start, end):
+        self.round_trips += 1
+        return self._zrevrange(key, start, end)
+
+    async def delete(self, key):
+        self.round_trips += 1
+        self.hashes.pop(key, None)
+
+    def _hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({name: str(value) for name, value in mapping.items()})
+
+    def _hdel(self, key, *names):
+        for name in names:
+            self.hashes.get(key, {}).pop(name, None)
+
+    def _hincrby(self, key, name, amount):
+        row = self.hashes.setdefault(key, {})
+        row[name] = str(int(row.get(name, 0)) + amount)
+        return int(row[name])
+
+    def _hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def _zrevrange(self, key, start, end):
+        ranked = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1], reverse=True)
+        return [member for member, _ in ranked[start:end + 1]]
+
+    def _lrange(self, key, start, end):
+        return list(self.lists.get(key, [])[start:end + 1])
+
+    def _zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def _zremrangebyrank(self, key, start, end):
+        ranked = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        for member, _ in ranked[start:len(ranked) + end + 1]:
+            self.zsets[key].pop(member)
+
+    def _publish(self, channel, payload):
+        self.published.append((channel, payload))
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(JobManager, "_redis", redis)
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_progress_is_stored_per_field_and_listed_in_one_pipeline(fake_redis):
+    manager = JobManager(redis_url="redis://unused")
+    for index in range(3):
+        await manager.create_job(f"job-{index}", index_name="idx", source_type="upload")
+    await manager.update_progress("job-1", status=JobStatus.RUNNING, total_documents=4, processed_documents=1)
+    await manager.increment_progress("job-1", processed_documents=1)
+
+    row = fake_redis.hashes["rag:job:job-1"]
+    assert row["status"] == "running"
+    assert row["processed_documents"] == "2"
+    assert "data" not in row
+
+    fake_redis.round_trips = 0
+    jobs = await manager.list_jobs(limit=2)
+    assert [job.job_id for job in jobs] == ["job-2", "job-1"]
+    assert jobs[1].percent_complete == 50.0
+    assert fake_redis.round_trips == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_jobs_are_not_created_by_updates(fake_redis):
+    manager = JobManager(redis_url="redis://unused")
+    assert await manager.update_progress("missing", current_stage="chunking") is None
+    assert "rag:job:missing" not in fake_redis.hashes
+    assert fake_redis.published == []
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_progress_is_still_readable(fake_redis):
+    fake_redis.hashes["rag:job:old"] = {
+        "data": json.dumps({"job_id": "old", "status": "completed", "percent_complete": 100.0}),
+    }
+    progress = await JobManager(redis_url="redis://unused").get_progress("old")
+    assert progress.status == JobStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_updates_to_legacy_jobs_migrate_them_to_per_field_hashes(fake_redis):
+    fake_redis.hashes["rag:job:legacy"] = {
+        "data": json.dumps(
+            {"job_id": "legacy", "status": "running", "current_stage": "chunking", "total_documents": 10, "processed_documents": 4}
+        ),
+        "index_name": "idx",
+        "created_at": "2026-01-01T00:00:00",
+    }
+    fake_redis.lists["rag:jobs:list"] = ["legacy"]
+    manager = JobManager(redis_url="redis://unused")
+
+    progress = await manager.increment_progress("legacy", processed_documents=1)
+    assert progress.processed_documents == 5
+    assert progress.percent_complete == 50.0
+
+    progress = await manager.update_progress("legacy", current_stage="embedding")
+    assert progress.processed_documents == 5
+    assert progress.current_stage == "embedding"
+
+    row = fake_redis.hashes["rag:job:legacy"]
+    assert "data" not in row
+    assert row["job_id"] == "legacy"
+    assert row["processed_documents"] == "5"
+    assert row["index_name"] == "idx"
+    assert json.loads(fake_redis.published[-1][1])["current_stage"] == "embedding"
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_includes_jobs_from_the_legacy_list(fake_redis):
+    manager = JobManager(redis_url="redis://unused")
+    fake_redis.hashes["rag:job:old"] = {"data": json.dumps({"job_id": "old", "status": "completed"})}
+    fake_redis.lists["rag:jobs:list"] = ["old"]
+    await manager.create_job("new", index_name="idx", source_type="upload")
+
+    fake_redis.round_trips = 0
+    jobs = await manager.list_jobs()
+    assert [job.job_id for job in jobs] == ["new", "old"]
+    assert fake_redis.round_trips == 2
+
+
+@pytest.mark.asyncio
+async def test_reporter_coalesces_hot_loop_updates_until_interval_or_stage_change(fake_redis):
+    manager = JobManager(redis_url="redis://unused")
+    await manager.create_job("job", index_name="idx", source_type="upload", total_documents=1000)
+    now = [0.0]
+    reporter = JobProgressReporter(manager, "job", interval_seconds=0.25, clock=lambda: now[0])
+
+    for index in range(1000):
+        now[0] = index * 0.001
+        await reporter.update(current_stage="chunking", processed_documents=index + 1)
+
+    job_updates = [payload for channel, payload in fake_redis.published if channel == "rag:job:updates:job"]
+    assert 1 < len(job_updates) <= 5
+    assert reporter.has_pending
+
+    await reporter.update(current_stage="embedding")
+    assert not reporter.has_pending
+    latest = json.loads(fake_redis.published[-1][1])
+    assert latest["current_stage"] == "embedding"
+    assert latest["processed_documents"] == 1000
+    assert latest["percent_complete"] == 100.0
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+import tiktoken
+import tiktoken.registry
+
+from app.rag.providers.chunker import recursive
+from app.rag.providers.chunker.recursive import RecursiveChunker
+from app.rag.providers.chunker.token_index import TokenOffsetIndex
+
+CL100K_PATTERN = (
+    r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}+|\p{N}{1,3}| ?[^\s\p{L}\p{N}]++[\r\n]*|\s*[\r\n]|\s+(?!\S)|\s+"""
+)
+_WORDS = "the of and in that Talmud gemara it's we'll 123 4567 שלום של תורה , . ? ! ; -- (x)".split()
+_SEPARATORS = [" ", " ", " ", "  ", "\n", "\n\n", ". ", ", ", "\t", " \n", "\n ", "   \n\n"]
+
+
+def _encoding(pat_str: str = CL100K_PATTERN) -> tiktoken.Encoding:
+    # Offline stand-in for cl100k_base: the real split pattern, bytes plus a few merges.
+    ranks = {bytes([i]): i for i in range(256)}
+    for merge in ["th", "he", "the", " t", " th", " the", "in", " a", "an", "and", " and", ".\n", "\n\n", "  ", "ש", "של", "12"]:
+        ranks.setdefault(merge.encode(), len(ranks))
+    return tiktoken.Encoding(name="cl100k_base", pat_str=pat_str, mergeable_ranks=ranks, special_tokens={})
+
+
+def _document(rng: random.Random, words: int) -> str:
+    return "".join(rng.choice(_WORDS) + rng.choice(_SEPARATORS) for _ in range(words))
+
+
+class _PerSplitEncodingIndex:
+    """Reference: encode every span, as the chunker did before the token index."""
+
+    def __init__(self, encoding, text: str) -> None:
+        self._encoding = encoding
+        self._text = text
+
+    def count(self, start: int, end: int) -> int:
+        return len(self._encoding.encode(self._text[start:end]))
+
+
+@pytest.fixture(autouse=True)
+def _offline_encoding(monkeypatch):
+    monkeypatch.setitem(tiktoken.registry.ENCODINGS, "cl100k_base", _encoding())
+
+
+def test_span_counts_match_encoding_each_span():
+    encoding = _encoding()
+    rng = random.Random(5)
+    for _ in range(100):
+        text = _document(rng, rng.randint(1, 60))
+        index = TokenOffsetIndex(encoding, text)
+        assert index.exact
+        assert index.total_tokens == len(encoding.encode_ordinary(text))
+        for _ in range(40):
+            start = rng.randint(0, len(text))
+            end = rng.randint(start, len(text))
+            assert index.count(start, end) == len(encoding.encode_ordinary(text[start:end]))
+
+
+def test_patterns_with_lookbehind_fall_back_to_encoding_spans():
+    encoding = _encoding(r"(?<=\s)\S+|\S+|\s+")
+    text = "alpha beta  gamma\n\ndelta"
+    index = TokenOffsetIndex(encoding, text)
+    assert not index.exact
+    assert index.count(3, 15) == len(encoding.encode_ordinary(text[3:15]))
+
+
+@pytest.mark.parametrize("length_function", ["tokens", "chars"])
+def test_chunks_match_per_split_encoding(monkeypatch, length_function):
+    rng = random.Random(11)
+    for _ in range(40):
+        text = _document(rng, rng.randint(1, 1200))
+        chunk_size = rng.choice([20, 60, 200])
+        chunk_overlap = rng.choice([0, 10, 40])
+        chunker = RecursiveChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=length_function)
+
+        indexed = [chunk.model_dump() for chunk in chunker.chunk(text, doc_id="doc", metadata={"k": 1})]
+        with monkeypatch.context() as patch:
+            patch.setattr(recursive, "TokenOffsetIndex", _PerSplitEncodingIndex)
+            reference = [chunk.model_dump() for chunk in chunker.chunk(text, doc_id="doc", metadata={"k": 1})]
+
+        assert indexed == reference
+
+
+def test_document_is_tokenized_once():
+    chunker = RecursiveChunker(chunk_size=40, chunk_overlap=10)
+    text = _document(random.Random(3), 800)
+    calls = {"encode": 0, "encode_ordinary": 0}
+
+    class _CountingEncoding:
+        def __init__(self, inner):
+            self._inner = inner
+            self._pat_str = inner._pat_str
+            self._encode_single_piece = inner._encode_single_piece
+
+        def encode(self, value, **kwargs):
+            calls["encode"] += 1
+            return self._inner.encode(value, **kwargs)
+
+        def encode_ordinary(self, value):
+            calls["encode_ordinary"] += 1
+            return self._inner.encode_ordinary(value)
+
+    chunker._encoding = _CountingEncoding(chunker._encoding)
+    chunks = chunker.chunk(text, doc_id="doc")
+
+    assert len(chunks) > 10
+    assert calls == {"encode": 0, "encode_ordinary": 1}
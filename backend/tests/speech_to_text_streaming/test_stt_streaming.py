@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import struct
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services.audio_segmentation import (
+    AudioSegmentationError,
+    PcmFormat,
+    build_wav,
+    iter_audio_segments,
+    read_wav_header,
+)
+from app.services.model_resolver import ModelResolver
+from app.services.model_runtime import SpeechToTextResult
+from app.services.speech_to_text_service import SpeechToTextService
+
+
+class _AsyncBytes:
+    def __init__(self, payload: bytes):
+        self._buffer = io.BytesIO(payload)
+        self.max_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk = self._buffer.read(size)
+        self.max_read = max(self.max_read, len(chunk))
+        return chunk
+
+
+def _pcm(seconds: float, *, sample_rate: int = 8000) -> bytes:
+    frames = int(seconds * sample_rate)
+    return b"".join(struct.pack("<h", index % 32768) for index in range(frames))
+
+
+def _wav_with_extra_chunk(pcm: bytes, *, sample_rate: int = 8000) -> bytes:
+    wav = build_wav(PcmFormat.pcm(sample_rate=sample_rate), pcm)
+    # Insert a LIST chunk between fmt and data, as many recorders do.
+    fmt_end = 12 + 8 + 16
+    extra = b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+    body = wav[12:fmt_end] + extra + wav[fmt_end:]
+    return b"RIFF" + struct.pack("<I", 4 + len(body)) + b"WAVE" + body
+
+
+def _fake_execution(runtime):
+    async def _fake_resolve(self, model_id=None, policy_override=None, policy_snapshot=None):
+        del self, model_id, policy_override, policy_snapshot
+        return SimpleNamespace(
+            provider_instance=runtime,
+            logical_model=SimpleNamespace(id=uuid4()),
+            binding=SimpleNamespace(provider_model_id="chirp_3"),
+            resolved_provider="google",
+        )
+
+    return _fake_resolve
+
+
+@pytest.mark.asyncio
+async def test_wav_segments_are_time_bounded_standalone_wavs():
+    pcm = _pcm(2.5)
+    reader = _AsyncBytes(_wav_with_extra_chunk(pcm))
+
+    segments = [
+        segment
+        async for segment in iter_audio_segments(reader, mime_type="audio/wav", segment_seconds=1.0)
+    ]
+
+    assert [(s.index, s.start_ms, s.end_ms) for s in segments] == [(0, 0, 1000), (1, 1000, 2000), (2, 2000, 2500)]
+    assert reader.max_read <= 8000 * 2
+    rebuilt = b""
+    for segment in segments:
+        segment_reader = _AsyncBytes(segment.wav_bytes)
+        pcm_format, data_len = await read_wav_header(segment_reader)
+        assert pcm_format.sample_rate == 8000
+        assert pcm_format.channels == 1
+        payload = await segment_reader.read()
+        assert data_len == len(payload)
+        rebuilt += payload
+    assert rebuilt == pcm
+
+
+@pytest.mark.asyncio
+async def test_raw_pcm_segments_use_mime_parameters():
+    pcm = _pcm(1.0, sample_rate=16000)
+    segments = [
+        segment
+        async for segment in iter_audio_segments(
+            _AsyncBytes(pcm + b"\x01"),
+            mime_type="audio/L16; rate=16000; channels=1",
+            segment_seconds=0.4,
+        )
+    ]
+
+    assert [(s.start_ms, s.end_ms) for s in segments] == [(0, 400), (400, 800), (800, 1000)]
+    assert sum(len(s.wav_bytes) - 44 for s in segments) == len(pcm)
+
+
+@pytest.mark.asyncio
+async def test_non_wav_payload_is_rejected():
+    with pytest.raises(AudioSegmentationError):
+        async for _segment in iter_audio_segments(_AsyncBytes(b"ID3-not-a-wav"), mime_type="audio/wav"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_transcribe_stream_emits_in_order_with_bounded_concurrency(monkeypatch):
+    state = {"active": 0, "peak": 0, "calls": 0}
+
+    class _SlowFirstRuntime:
+        async def transcribe(self, audio_content: bytes, **kwargs):
+            state["calls"] += 1
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            index = int(kwargs["filename"].split("-")[1].split(".")[0])
+            # Earlier segments finish last, so ordering has to come from the service.
+            await asyncio.sleep(0.02 * (5 - index % 5))
+            state["active"] -= 1
+            return SpeechToTextResult(text=f"part-{index}")
+
+    monkeypatch.setattr(ModelResolver, "resolve_speech_to_text_execution", _fake_execution(_SlowFirstRuntime()))
+
+    segments = await SpeechToTextService(None, None).transcribe_stream(
+        _AsyncBytes(build_wav(PcmFormat.pcm(sample_rate=8000), _pcm(6.0))),
+        mime_type="audio/wav",
+        segment_seconds=0.5,
+        max_concurrency=3,
+    )
+    texts = [(segment.text, segment.start_ms) async for segment in segments]
+
+    assert texts == [(f"part-{index}", index * 500) for index in range(12)]
+    assert state["calls"] == 12
+    assert state["peak"] <= 3
+
+
+@pytest.mark.asyncio
+async def test_transcribe_stream_falls_back_to_single_call_for_compressed_audio(monkeypatch):
+    calls: list[bytes] = []
+
+    class _Runtime:
+        async def transcribe(self, audio_content: bytes, **kwargs):
+            calls.append(audio_content)
+            return SpeechToTextResult(text="whole file")
+
+    monkeypatch.setattr(ModelResolver, "resolve_speech_to_text_execution", _fake_execution(_Runtime()))
+
+    segments = await SpeechToTextService(None, None).transcribe_stream(
+        _AsyncBytes(b"mp3-bytes"),
+        mime_type="audio/mpeg",
+        filename="memo.mp3",
+    )
+
+    assert [segment.text async for segment in segments] == ["whole file"]
+    assert calls == [b"mp3-bytes"]
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_returns_ordered_sse_events(client, monkeypatch):
+    class _Runtime:
+        async def transcribe(self, audio_content: bytes, **kwargs):
+            return SpeechToTextResult(text=kwargs["filename"])
+
+    monkeypatch.setattr(ModelResolver, "resolve_speech_to_text_execution", _fake_execution(_Runtime()))
+
+    response = await client.post(
+        "/stt/transcribe/stream?segment_seconds=1",
+        files={"file": ("memo.wav", build_wav(PcmFormat.pcm(sample_rate=8000), _pcm(2.0)), "audio/wav")},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    assert [event["event"] for event in events] == ["segment", "segment", "done"]
+    assert [event["index"] for event in events[:2]] == [0, 1]
+    assert events[-1]["text"] == "segment-00000.wav segment-00001.wav"
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_reports_invalid_wav_as_error_event(client, monkeypatch):
+    class _Runtime:
+        async def transcribe(self, audio_content: bytes, **kwargs):
+            raise AssertionError("provider should not be called")
+
+    monkeypatch.setattr(ModelResolver, "resolve_speech_to_text_execution", _fake_execution(_Runtime()))
+
+    response = await client.post(
+        "/stt/transcribe/stream",
+        files={"file": ("memo.wav", b"not a wav at all", "audio/wav")},
+    )
+
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    assert events == [{"event": "error", "error": "Audio is not a RIFF/WAVE file", "code": "invalid_audio"}]
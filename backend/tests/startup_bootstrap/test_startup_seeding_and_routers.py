@@ -0,0 +1,171 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.lazy_routers import LazyRouterSpec, include_routers
+from app.middleware import published_apps_host_runtime as host_runtime_wrapper
+from app.services import registry_seeding
+from app.services.registry_seeding import (
+    compute_startup_seed_fingerprint,
+    record_startup_seed_fingerprint,
+    startup_seed_fingerprint_matches,
+)
+
+router = APIRouter()
+
+
+@router.get("/widgets")
+async def list_widgets():
+    return {"widgets": ["a"]}
+
+
+def test_startup_seed_fingerprint_tracks_seed_definitions(tmp_path, monkeypatch):
+    models_path = tmp_path / "models.json"
+    models_path.write_text('[{"system_key": "m-1"}]')
+    monkeypatch.setattr(registry_seeding, "_global_models_seed_path", lambda: str(models_path))
+
+    first = compute_startup_seed_fingerprint()
+    assert compute_startup_seed_fingerprint() == first
+
+    models_path.write_text('[{"system_key": "m-2"}]')
+    assert compute_startup_seed_fingerprint() != first
+
+    monkeypatch.setattr(registry_seeding, "is_builtin_tools_v1_enabled", lambda: False)
+    changed_flag = compute_startup_seed_fingerprint()
+    monkeypatch.setattr(registry_seeding, "is_builtin_tools_v1_enabled", lambda: True)
+    assert compute_startup_seed_fingerprint() != changed_flag
+
+
+@pytest.mark.asyncio
+async def test_startup_seed_fingerprint_round_trips_through_seed_state(db_session):
+    assert await startup_seed_fingerprint_matches(db_session, "abc") is False
+
+    await record_startup_seed_fingerprint(db_session, "abc")
+    assert await startup_seed_fingerprint_matches(db_session, "abc") is True
+    assert await startup_seed_fingerprint_matches(db_session, "def") is False
+
+    await record_startup_seed_fingerprint(db_session, "def")
+    assert await startup_seed_fingerprint_matches(db_session, "def") is True
+
+
+@pytest.mark.asyncio
+async def test_lazy_routers_load_on_first_non_probe_request():
+    app = FastAPI()
+
+    @app.get("/health")
+    def health():
+        return {"status": "healthy"}
+
+    loader = include_routers(
+        app,
+        [LazyRouterSpec(__name__, prefix="/api", tags=("widgets",))],
+        lazy=True,
+    )
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        health_response = await client.get("/health")
+        assert health_response.status_code == 200
+        assert loader.loaded is False
+
+        schema_before = app.openapi()
+        assert "/api/widgets" not in schema_before["paths"]
+
+        response = await client.get("/api/widgets")
+        assert response.status_code == 200
+        assert response.json() == {"widgets": ["a"]}
+        assert loader.loaded is True
+
+        schema = (await client.get("/openapi.json")).json()
+        assert schema["paths"]["/api/widgets"]["get"]["tags"] == ["widgets"]
+
+
+def test_include_routers_registers_eagerly_when_lazy_loading_is_off():
+    app = FastAPI()
+
+    loader = include_routers(app, [LazyRouterSpec(__name__)], lazy=False)
+
+    assert loader.loaded is True
+    assert "/widgets" in app.openapi()["paths"]
+
+
+@pytest.mark.asyncio
+async def test_lazy_router_imports_run_off_the_event_loop_and_requests_share_them():
+    app = FastAPI()
+
+    @app.get("/health")
+    def health():
+        return {"status": "healthy"}
+
+    loader = include_routers(app, [LazyRouterSpec(__name__, prefix="/api")], lazy=True)
+    release = threading.Event()
+    import_threads: list[threading.Thread] = []
+    import_routers = loader._import_routers
+
+    def _slow_import():
+        import_threads.append(threading.current_thread())
+        assert release.wait(5)
+        return import_routers()
+
+    loader._import_routers = _slow_import
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        loader.warm_up()
+        first = asyncio.create_task(client.get("/api/widgets"))
+        second = asyncio.create_task(client.get("/api/widgets"))
+        await asyncio.sleep(0.05)
+
+        health_response = await asyncio.wait_for(client.get("/health"), timeout=1)
+        assert health_response.status_code == 200
+        assert not first.done() and not second.done()
+
+        release.set()
+        responses = await asyncio.gather(first, second)
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert loader.loaded is True
+    assert len(import_threads) == 1
+    assert import_threads[0] is not threading.main_thread()
+
+
+@pytest.mark.asyncio
+async def test_host_runtime_wrapper_only_imports_the_router_for_app_hosts(monkeypatch):
+    imported: list[str] = []
+    delegated: list[str] = []
+
+    class _HostRuntimeMiddleware:
+        def __init__(self, app):
+            self.app = app
+
+        async def __call__(self, scope, receive, send):
+            delegated.append(scope["path"])
+            await self.app(scope, receive, send)
+
+    def _import_module(name):
+        imported.append(name)
+        return SimpleNamespace(PublishedAppsHostRuntimeMiddleware=_HostRuntimeMiddleware)
+
+    monkeypatch.setattr(host_runtime_wrapper.importlib, "import_module", _import_module)
+    monkeypatch.setenv("APPS_BASE_DOMAIN", "apps.localhost")
+
+    app = FastAPI()
+
+    @app.get("/health")
+    def health():
+        return {"status": "healthy"}
+
+    app.add_middleware(host_runtime_wrapper.PublishedAppsHostRuntimeMiddleware)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/health")).status_code == 200
+        assert (await client.get("/health", headers={"Host": "apps.localhost"})).status_code == 200
+        assert imported == []
+
+        await client.get("/health", headers={"Host": "demo.apps.localhost"})
+        await client.get("/health", headers={"Host": "demo.apps.localhost"})
+
+    assert imported == ["app.api.routers.published_apps_host_runtime"]
+    assert delegated == ["/health", "/health"]
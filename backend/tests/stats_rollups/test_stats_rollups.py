@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, func, select
+
+from app.db.postgres.models.agent_threads import AgentThread, AgentThreadStatus, AgentThreadSurface
+from app.db.postgres.models.agents import Agent, AgentRun, AgentStatus, RunStatus
+from app.db.postgres.models.identity import Organization, User
+from app.db.postgres.models.published_app_analytics import (
+    PublishedAppAnalyticsEvent,
+    PublishedAppAnalyticsEventType,
+    PublishedAppAnalyticsSurface,
+)
+from app.db.postgres.models.published_apps import PublishedApp, PublishedAppAccount, PublishedAppStatus
+from app.db.postgres.models.stats_rollups import StatsRollup, StatsRollupGranularity, StatsRollupWatermark
+from app.services.published_app_analytics_service import PublishedAppAnalyticsService
+from app.services.stats_rollup_service import (
+    AGENT_RUN_METRICS,
+    SUBJECT_AGENT,
+    StatsRollupService,
+    plan_rollup_read,
+)
+
+
+NOW = datetime(2026, 10, 18, 15, 40, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _clean_rollups(db_session):
+    # The test database is shared across the session; a leftover watermark would
+    # route other suites' stats reads through this module's rollups.
+    async def _clean():
+        await db_session.execute(delete(StatsRollup))
+        await db_session.execute(delete(StatsRollupWatermark))
+        await db_session.commit()
+
+    await _clean()
+    yield
+    await _clean()
+
+
+async def _seed(db_session):
+    tenant = Organization(name=f"Organization {uuid4().hex[:6]}", slug=f"tenant-{uuid4().hex[:8]}")
+    owner = User(email=f"owner-{uuid4().hex[:8]}@example.com", hashed_password="x", role="user")
+    db_session.add_all([tenant, owner])
+    await db_session.flush()
+    agent = Agent(
+        organization_id=tenant.id,
+        name="Rollup Agent",
+        slug=f"rollup-{uuid4().hex[:6]}",
+        graph_definition={"nodes": [], "edges": []},
+        status=AgentStatus.published,
+    )
+    db_session.add(agent)
+    await db_session.flush()
+    app = PublishedApp(
+        organization_id=tenant.id,
+        agent_id=agent.id,
+        name="Rollup App",
+        public_id=f"rollup-{uuid4().hex[:8]}",
+        auth_providers=["password"],
+        allowed_origins=[],
+        status=PublishedAppStatus.published,
+        created_by=owner.id,
+    )
+    db_session.add(app)
+    await db_session.flush()
+    account = PublishedAppAccount(published_app_id=app.id, email=f"user-{uuid4().hex[:6]}@example.com")
+    db_session.add(account)
+    await db_session.flush()
+    return tenant, owner, agent, app, account
+
+
+def _run(tenant, agent, *, created_at, app=None, status=RunStatus.completed, tokens=10, cost=0.25, preview=False):
+    return AgentRun(
+        organization_id=tenant.id,
+        agent_id=agent.id,
+        published_app_id=app.id if app is not None else None,
+        status=status,
+        usage_tokens=tokens,
+        total_tokens=tokens,
+        usage_source="exact",
+        cost_usd=cost,
+        cost_source="binding_pricing",
+        input_params={"context": {"published_app_preview": True}} if preview else {},
+        created_at=created_at,
+    )
+
+
+def _event(tenant, app, *, event_type, occurred_at, visitor_key, surface=PublishedAppAnalyticsSurface.host_runtime):
+    return PublishedAppAnalyticsEvent(
+        organization_id=tenant.id,
+        published_app_id=app.id,
+        event_type=event_type,
+        surface=surface,
+        visitor_key=visitor_key,
+        visit_key=uuid4().hex,
+        metadata_={"auth_state": "anonymous", "approximate_visitor": False},
+        occurred_at=occurred_at,
+    )
+
+
+def test_read_plan_limits_raw_scans_to_partial_edge_buckets():
+    start = NOW - timedelta(days=7)
+    watermark = NOW.replace(minute=0)
+
+    plan = plan_rollup_read(start, NOW, watermark)
+
+    assert plan.raw_spans == (
+        (start, datetime(2026, 10, 11, 16, tzinfo=timezone.utc), False),
+        (watermark, NOW, True),
+    )
+    assert plan.hour_spans == (
+        (datetime(2026, 10, 11, 16, tzinfo=timezone.utc), datetime(2026, 10, 12, tzinfo=timezone.utc)),
+        (datetime(2026, 10, 18, tzinfo=timezone.utc), watermark),
+    )
+    assert plan.day_span == (datetime(2026, 10, 12, tzinfo=timezone.utc), datetime(2026, 10, 18, tzinfo=timezone.utc))
+    assert plan_rollup_read(start, NOW, None).raw_spans == ((start, NOW, True),)
+
+
+def test_read_plan_scans_spans_outside_rollup_coverage_raw():
+    start = NOW - timedelta(days=7)
+    watermark = NOW.replace(minute=0)
+    covered_from = datetime(2026, 10, 13, tzinfo=timezone.utc)
+    hourly_from = datetime(2026, 10, 15, tzinfo=timezone.utc)
+
+    plan = plan_rollup_read(start, NOW, watermark, covered_from=covered_from, hourly_from=hourly_from)
+
+    assert plan.raw_spans == ((start, covered_from, False), (watermark, NOW, True))
+    assert plan.day_span == (covered_from, datetime(2026, 10, 18, tzinfo=timezone.utc))
+    assert plan.hour_spans == ((datetime(2026, 10, 18, tzinfo=timezone.utc), watermark),)
+
+    # A range older than the retained hourly rows reads its partial leading day raw.
+    old_start = datetime(2026, 10, 13, 9, 30, tzinfo=timezone.utc)
+    old_end = datetime(2026, 10, 16, 12, tzinfo=timezone.utc)
+    plan = plan_rollup_read(old_start, old_end, watermark, covered_from=covered_from, hourly_from=hourly_from)
+    assert plan.raw_spans == (
+        (old_start, datetime(2026, 10, 13, 10, tzinfo=timezone.utc), False),
+        (datetime(2026, 10, 13, 10, tzinfo=timezone.utc), datetime(2026, 10, 14, tzinfo=timezone.utc), False),
+        (old_end, old_end, True),
+    )
+    assert plan.day_span == (datetime(2026, 10, 14, tzinfo=timezone.utc), datetime(2026, 10, 16, tzinfo=timezone.utc))
+    assert plan.hour_spans == ((datetime(2026, 10, 16, tzinfo=timezone.utc), old_end),)
+
+
+@pytest.mark.asyncio
+async def test_refresh_materializes_hours_and_days_and_reads_match_raw(db_session, monkeypatch):
+    tenant, _owner, agent, _app, _account = await _seed(db_session)
+    db_session.add_all(
+        [
+            _run(tenant, agent, created_at=NOW - timedelta(days=3, minutes=5)),
+            _run(tenant, agent, created_at=NOW - timedelta(days=3, minutes=50), status=RunStatus.failed, tokens=0, cost=0.0),
+            _run(tenant, agent, created_at=NOW - timedelta(days=1, hours=2), tokens=40, cost=1.0),
+            _run(tenant, agent, created_at=NOW - timedelta(hours=5), tokens=7),
+            _run(tenant, agent, created_at=NOW - timedelta(minutes=10), tokens=3),
+        ]
+    )
+    await db_session.commit()
+    start, end = NOW - timedelta(days=7), NOW
+    service = StatsRollupService(db_session)
+
+    monkeypatch.setenv("STATS_ROLLUPS_ENABLED", "0")
+    raw = await service.load_totals(
+        organization_id=tenant.id, start=start, end=end, subject_kind=SUBJECT_AGENT, metrics=AGENT_RUN_METRICS
+    )
+
+    monkeypatch.setenv("STATS_ROLLUPS_ENABLED", "1")
+    result = await service.refresh(now=NOW)
+    assert result["rolled_up_to"] == NOW.replace(minute=0).isoformat()
+    day_rows = (
+        await db_session.execute(
+            select(func.count(StatsRollup.id)).where(StatsRollup.granularity == StatsRollupGranularity.day)
+        )
+    ).scalar_one()
+    assert day_rows > 0
+
+    rolled = await service.load_totals(
+        organization_id=tenant.id, start=start, end=end, subject_kind=SUBJECT_AGENT, metrics=AGENT_RUN_METRICS
+    )
+    for metric in AGENT_RUN_METRICS:
+        assert rolled.total(metric) == pytest.approx(raw.total(metric)), metric
+        assert rolled.by_day(metric) == pytest.approx(raw.by_day(metric)), metric
+    assert rolled.total("runs") == 5
+    assert rolled.total("runs_failed") == 1
+    assert rolled.total("tokens_total") == 60
+
+    # Buckets below the watermark are served from rollups, not the raw table;
+    # runs after the watermark still show up through the raw tail scan.
+    await db_session.execute(delete(AgentRun).where(AgentRun.created_at < NOW - timedelta(hours=1)))
+    db_session.add(_run(tenant, agent, created_at=NOW - timedelta(minutes=1), tokens=100))
+    await db_session.commit()
+    after = await service.load_totals(
+        organization_id=tenant.id, start=start, end=end, subject_kind=SUBJECT_AGENT, metrics=AGENT_RUN_METRICS
+    )
+    assert after.total("runs") == 6
+    assert after.total("tokens_total") == 160
+
+
+@pytest.mark.asyncio
+async def test_refresh_restates_recent_hours_without_duplicating_rows(db_session):
+    tenant, _owner, agent, _app, _account = await _seed(db_session)
+    run = _run(tenant, agent, created_at=NOW - timedelta(hours=3), status=RunStatus.running, tokens=0, cost=0.0)
+    db_session.add(run)
+    await db_session.commit()
+    service = StatsRollupService(db_session)
+
+    await service.refresh(now=NOW)
+    run.status = RunStatus.failed
+    run.total_tokens = 25
+    await db_session.commit()
+    await service.refresh(now=NOW + timedelta(minutes=30))
+
+    totals = await service.load_totals(
+        organization_id=tenant.id,
+        start=NOW - timedelta(days=1),
+        end=NOW,
+        subject_kind=SUBJECT_AGENT,
+        metrics=AGENT_RUN_METRICS,
+    )
+    assert totals.total("runs") == 1
+    assert totals.total("runs_failed") == 1
+    assert totals.total("tokens_total") == 25
+
+
+@pytest.mark.asyncio
+async def test_refresh_restates_older_hours_whose_runs_were_updated(db_session):
+    tenant, _owner, agent, _app, _account = await _seed(db_session)
+    run = _run(tenant, agent, created_at=NOW - timedelta(days=3), status=RunStatus.running, tokens=0, cost=0.0)
+    db_session.add(run)
+    await db_session.commit()
+    service = StatsRollupService(db_session)
+
+    await service.refresh(now=NOW)
+    run.status = RunStatus.failed
+    run.total_tokens = 25
+    run.updated_at = NOW + timedelta(minutes=40)
+    await db_session.commit()
+    result = await service.refresh(now=NOW + timedelta(hours=1))
+
+    assert result["restated_hours"] == 1
+    totals = await service.load_totals(
+        organization_id=tenant.id,
+        start=NOW - timedelta(days=7),
+        end=NOW,
+        subject_kind=SUBJECT_AGENT,
+        metrics=AGENT_RUN_METRICS,
+    )
+    assert totals.total("runs") == 1
+    assert totals.total("runs_failed") == 1
+    assert totals.total("tokens_total") == 25
+
+
+@pytest.mark.asyncio
+async def test_ranges_older_than_rollup_coverage_are_read_raw(db_session, monkeypatch):
+    tenant, _owner, agent, _app, _account = await _seed(db_session)
+    db_session.add_all(
+        [
+            _run(tenant, agent, created_at=NOW - timedelta(days=5), tokens=11),
+            _run(tenant, agent, created_at=NOW - timedelta(days=2, minutes=-60), tokens=13),
+            _run(tenant, agent, created_at=NOW - timedelta(hours=3), tokens=17),
+        ]
+    )
+    await db_session.commit()
+    service = StatsRollupService(db_session)
+    monkeypatch.setenv("STATS_ROLLUP_BACKFILL_DAYS", "3")
+    monkeypatch.setenv("STATS_ROLLUP_HOURLY_RETENTION_DAYS", "1")
+    await service.refresh(now=NOW)
+
+    state = await db_session.get(StatsRollupWatermark, "stats_hourly")
+    assert state.rolled_up_from.replace(tzinfo=timezone.utc) == datetime(2026, 10, 15, tzinfo=timezone.utc)
+    assert state.hourly_rolled_up_from.replace(tzinfo=timezone.utc) == datetime(2026, 10, 17, tzinfo=timezone.utc)
+
+    # The first run predates the backfill, and the second sits in an hour whose
+    # hourly row was pruned; both still count.
+    for start in (NOW - timedelta(days=7), NOW - timedelta(days=2, minutes=30)):
+        totals = await service.load_totals(
+            organization_id=tenant.id, start=start, end=NOW, subject_kind=SUBJECT_AGENT, metrics=AGENT_RUN_METRICS
+        )
+        expected = 41 if start < NOW - timedelta(days=5) else 30
+        assert totals.total("tokens_total") == expected
+
+
+@pytest.mark.asyncio
+async def test_published_app_stats_from_rollups_match_raw_scan(db_session, monkeypatch):
+    tenant, _owner, agent, app, account = await _seed(db_session)
+    day_ago = NOW - timedelta(days=1, hours=3)
+    db_session.add_all(
+        [
+            _event(tenant, app, event_type=PublishedAppAnalyticsEventType.visit_started, occurred_at=day_ago, visitor_key="v1"),
+            _event(tenant, app, event_type=PublishedAppAnalyticsEventType.bootstrap_view, occurred_at=day_ago, visitor_key="v1"),
+            _event(
+                tenant,
+                app,
+                event_type=PublishedAppAnalyticsEventType.visit_started,
+                occurred_at=NOW - timedelta(hours=4),
+                visitor_key="v1",
+                surface=PublishedAppAnalyticsSurface.external_runtime,
+            ),
+            _event(tenant, app, event_type=PublishedAppAnalyticsEventType.visit_started, occurred_at=NOW - timedelta(minutes=5), visitor_key="v2"),
+            _event(
+                tenant,
+                app,
+                event_type=PublishedAppAnalyticsEventType.visit_started,
+                occurred_at=NOW - timedelta(hours=2),
+                visitor_key="preview",
+                surface=PublishedAppAnalyticsSurface.preview_runtime,
+            ),
+            _run(tenant, agent, app=app, created_at=day_ago, tokens=12),
+            _run(tenant, agent, app=app, created_at=NOW - timedelta(hours=6), status=RunStatus.failed, tokens=0),
+            _run(tenant, agent, app=app, created_at=NOW - timedelta(hours=6), preview=True),
+            AgentThread(
+                organization_id=tenant.id,
+                agent_id=agent.id,
+                published_app_id=app.id,
+                app_account_id=account.id,
+                surface=AgentThreadSurface.published_host_runtime,
+                status=AgentThreadStatus.active,
+                created_at=NOW - timedelta(hours=6),
+            ),
+        ]
+    )
+    await db_session.commit()
+    service = PublishedAppAnalyticsService(db_session)
+    start, end = NOW - timedelta(days=7), NOW
+
+    monkeypatch.setenv("STATS_ROLLUPS_ENABLED", "0")
+    [raw] = await service.build_stats_for_tenant(organization_id=tenant.id, start=start, end=end, app_id=app.id)
+    monkeypatch.setenv("STATS_ROLLUPS_ENABLED", "1")
+    await StatsRollupService(db_session).refresh(now=NOW)
+    [rolled] = await service.build_stats_for_tenant(organization_id=tenant.id, start=start, end=end, app_id=app.id)
+
+    assert asdict(rolled) == asdict(raw)
+    assert rolled.visits == 3
+    assert rolled.unique_visitors == 2
+    assert rolled.agent_runs == 2
+    assert rolled.failed_runs == 1
+    assert rolled.tokens == 12
+    assert rolled.threads == 1
+    assert rolled.app_accounts == 1
+    assert rolled.visit_surface_breakdown == {"host_runtime": 2, "external_runtime": 1}
+
+    visitor_rows = await db_session.scalar(
+        select(func.count()).select_from(StatsRollup).where(StatsRollup.organization_id == tenant.id, StatsRollup.metric == "app_visitors")
+    )
+    assert visitor_rows == 0
+    [recent] = await service.build_stats_for_tenant(
+        organization_id=tenant.id, start=NOW - timedelta(hours=1), end=end, app_id=app.id
+    )
+    assert recent.unique_visitors == 1
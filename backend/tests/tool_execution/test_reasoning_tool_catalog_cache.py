@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.agent.executors.standard import ReasoningNodeExecutor
+from app.agent.executors.tool_catalog import get_run_tool_catalog_cache
+
+
+@pytest.fixture(autouse=True)
+def _reset_tool_catalog_cache():
+    get_run_tool_catalog_cache().clear()
+    yield
+    get_run_tool_catalog_cache().clear()
+
+
+def _registry_tool(tool_id: str, name: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=tool_id,
+        name=name,
+        description=f"{name} tool",
+        schema={"input": {"type": "object", "properties": {"query": {"type": "string"}}}},
+    )
+
+
+@pytest.mark.asyncio
+async def test_reasoning_nodes_share_tool_catalog_within_a_run(monkeypatch: pytest.MonkeyPatch):
+    executor = ReasoningNodeExecutor(organization_id=None, db=None)
+    loads: list[list[str]] = []
+    builds: list[str] = []
+    original_build = ReasoningNodeExecutor._build_langchain_tool
+
+    async def _fake_load_tool_records(self, tool_ids):
+        loads.append(list(tool_ids))
+        return [_registry_tool(str(tool_id), f"tool_{index}") for index, tool_id in enumerate(tool_ids)]
+
+    def _counting_build(self, tool):
+        builds.append(tool.name)
+        return original_build(self, tool)
+
+    monkeypatch.setattr(ReasoningNodeExecutor, "_load_tool_records", _fake_load_tool_records)
+    monkeypatch.setattr(ReasoningNodeExecutor, "_build_langchain_tool", _counting_build)
+    tool_ids = ["11111111-1111-1111-1111-111111111111"]
+
+    first = await executor._resolve_tool_catalog(tool_ids, {"run_id": "run-1", "node_id": "agent_a"})
+    second = await ReasoningNodeExecutor(organization_id=None, db=None)._resolve_tool_catalog(
+        tool_ids,
+        {"run_id": "run-1", "node_id": "agent_b"},
+    )
+    other_tools = await executor._resolve_tool_catalog([], {"run_id": "run-1"})
+    other_run = await executor._resolve_tool_catalog(tool_ids, {"run_id": "run-2"})
+
+    assert second is first
+    assert [tool.name for tool in first.langchain_tools] == ["tool_0"]
+    assert first.accounting_payloads[0]["name"] == "tool_0"
+    assert other_tools.tool_records == ()
+    assert other_run is not first
+    assert loads == [tool_ids, [], tool_ids]
+    assert builds == ["tool_0", "tool_0"]
+
+    get_run_tool_catalog_cache().discard_run("run-1")
+    await executor._resolve_tool_catalog(tool_ids, {"run_id": "run-1"})
+    assert len(loads) == 4
+
+
+@pytest.mark.asyncio
+async def test_reasoning_tool_catalog_is_not_cached_without_run_id(monkeypatch: pytest.MonkeyPatch):
+    executor = ReasoningNodeExecutor(organization_id=None, db=None)
+    loads: list[list[str]] = []
+
+    async def _fake_load_tool_records(self, tool_ids):
+        loads.append(list(tool_ids))
+        return []
+
+    monkeypatch.setattr(ReasoningNodeExecutor, "_load_tool_records", _fake_load_tool_records)
+
+    await executor._resolve_tool_catalog(["a"], {})
+    await executor._resolve_tool_catalog(["a"], None)
+
+    assert loads == [["a"], ["a"]]